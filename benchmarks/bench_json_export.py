@@ -0,0 +1,119 @@
+"""Benchmark: streaming JSON exporter vs. the former dict + json.dump path.
+
+Usage:
+    python benchmarks/bench_json_export.py [--segments 100000]
+
+Reports wall time and tracemalloc peak (Python heap) for each variant while
+writing to a real file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import IO
+
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exporters.json_export import _orjson, export_json
+
+
+def _legacy_export_json(result: TranscriptResult, output: IO[str]) -> None:
+    """The pre-streaming implementation, kept here as the baseline."""
+    meta = result.metadata
+    metadata_dict = {
+        "format_version": meta.format_version,
+        "source_file": meta.source_file,
+        "duration_seconds": meta.duration_seconds,
+        "language": meta.language,
+        "model": meta.model,
+        "diarization": meta.diarization,
+        "num_speakers": meta.num_speakers,
+        "processing_time_seconds": meta.processing_time_seconds,
+        "created_at": meta.created_at.isoformat(),
+    }
+    segments_list = []
+    for seg in result.segments:
+        seg_dict: dict[str, object] = {"start": seg.start, "end": seg.end, "text": seg.text}
+        if seg.speaker is not None:
+            seg_dict["speaker"] = seg.speaker
+        if seg.confidence is not None:
+            seg_dict["confidence"] = seg.confidence
+        segments_list.append(seg_dict)
+    data = {
+        "metadata": metadata_dict,
+        "segments": segments_list,
+        "full_text": result.full_text,
+    }
+    json.dump(data, output, indent=2, ensure_ascii=False)
+
+
+def _make_result(n: int) -> TranscriptResult:
+    segments = [
+        Segment(
+            start=i * 2.5,
+            end=i * 2.5 + 2.1,
+            text=f"Сегмент номер {i}: обсуждаем текущий sprint и планы.",
+            speaker=f"SPEAKER_{i % 4:02d}",
+            confidence=0.9,
+        )
+        for i in range(n)
+    ]
+    metadata = TranscriptMetadata(source_file="bench.wav", duration_seconds=n * 2.5)
+    return TranscriptResult(metadata=metadata, segments=segments)
+
+
+def _measure(
+    fn: Callable[[TranscriptResult, IO[str]], None], result: TranscriptResult,
+) -> tuple[float, float, int]:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as f:
+            fn(result, f)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak / 1024 / 1024, os.path.getsize(path)
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--segments", type=int, default=100_000)
+    args = parser.parse_args()
+
+    result = _make_result(args.segments)
+    variants: list[tuple[str, Callable[[TranscriptResult, IO[str]], None]]] = [
+        ("legacy dict + json.dump", _legacy_export_json),
+        ("streaming (stdlib)", lambda r, f: export_json(r, f, use_orjson=False)),
+        (
+            "streaming compact (stdlib)",
+            lambda r, f: export_json(r, f, compact=True, use_orjson=False),
+        ),
+    ]
+    if _orjson is not None:
+        variants += [
+            ("streaming (orjson)", lambda r, f: export_json(r, f, use_orjson=True)),
+            (
+                "streaming compact (orjson)",
+                lambda r, f: export_json(r, f, compact=True, use_orjson=True),
+            ),
+        ]
+
+    print(f"{args.segments} segments")
+    print(f"{'variant':<30} {'time, s':>8} {'peak, MB':>9} {'size, MB':>9}")
+    for name, fn in variants:
+        elapsed, peak_mb, size = _measure(fn, result)
+        print(f"{name:<30} {elapsed:>8.3f} {peak_mb:>9.1f} {size / 1024 / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
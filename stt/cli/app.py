@@ -7,7 +7,11 @@ import typer
 from stt import __version__
 from stt.cli.batch import batch_cmd
 from stt.cli.models_cmd import models_app
+from stt.cli.speakers_cmd import speakers_app
+from stt.cli.stream import stream_cmd
 from stt.cli.transcribe import transcribe_cmd
+from stt.cli.tune import tune_cmd
+from stt.cli.watch import watch_cmd
 from stt.core.gpu_utils import configure_cuda_allocator
 
 app = typer.Typer(
@@ -40,4 +44,8 @@ def main(
 
 app.command("transcribe")(transcribe_cmd)
 app.command("batch")(batch_cmd)
+app.command("watch")(watch_cmd)
+app.command("stream")(stream_cmd)
+app.command("tune")(tune_cmd)
 app.add_typer(models_app)
+app.add_typer(speakers_app)
@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import sys
+from dataclasses import replace
 from pathlib import Path
-from typing import Annotated
+from typing import IO, Annotated
 
 import typer
 
-from stt.config import build_pipeline_config, load_config, resolve_config
+from stt.config import (
+    apply_thread_budget,
+    build_pipeline_config,
+    load_config,
+    resolve_config,
+)
 from stt.core.batch import BatchRunner, discover_audio_files
+from stt.core.profiling import make_profiler
+from stt.core.tracing import configure_tracing
 from stt.exit_codes import ExitCode
+from stt.exporters.atomic import FSYNC_MODES
+from stt.exporters.jsonl_export import JsonlWriter, completed_sources, open_jsonl
 
 
 def batch_cmd(
@@ -29,7 +40,7 @@ def batch_cmd(
         str | None,
         typer.Option(
             "--format", "-f",
-            help="Output format(s): json,txt,srt.",
+            help="Output format(s): json,txt,srt,vtt,parquet,arrow,sttb.",
         ),
     ] = None,
     output: Annotated[
@@ -99,6 +110,139 @@ def batch_cmd(
             help="Directory for model storage.",
         ),
     ] = None,
+    pack_short: Annotated[
+        float | None,
+        typer.Option(
+            "--pack-short",
+            help=(
+                "Pack clips up to this many seconds into a single decode "
+                "(no diarization for packed clips)."
+            ),
+        ),
+    ] = None,
+    fsync: Annotated[
+        str | None,
+        typer.Option(
+            "--fsync",
+            help="Output durability: none, file (fsync each) or group.",
+        ),
+    ] = None,
+    fsync_group_size: Annotated[
+        int | None,
+        typer.Option(
+            "--fsync-group-size",
+            help="Files per group commit with --fsync group.",
+        ),
+    ] = None,
+    auto_batch_size: Annotated[
+        bool,
+        typer.Option(
+            "--auto-batch-size",
+            help=(
+                "Batched inference with a batch size tuned once per "
+                "model/compute type/device and saved in the model directory."
+            ),
+        ),
+    ] = False,
+    speaker_index: Annotated[
+        Path | None,
+        typer.Option(
+            "--speaker-index",
+            help="Name speakers from this enrolled-speaker index (stt speakers enroll).",
+        ),
+    ] = None,
+    speaker_embeddings: Annotated[
+        bool,
+        typer.Option(
+            "--speaker-embeddings",
+            help="Also write <stem>.speakers.json with each speaker's embedding.",
+        ),
+    ] = False,
+    cpu_budget: Annotated[
+        int | None,
+        typer.Option(
+            "--cpu-budget",
+            help="CPUs to use (default: all the cgroup/affinity allows).",
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers",
+            help="Number of stt processes sharing this machine's CPUs.",
+        ),
+    ] = None,
+    worker_index: Annotated[
+        int | None,
+        typer.Option(
+            "--worker-index",
+            help="This process's index among --workers (0-based).",
+        ),
+    ] = None,
+    pin_cpus: Annotated[
+        bool,
+        typer.Option(
+            "--pin-cpus",
+            help="Pin this worker to its own CPUs, NUMA node by node.",
+        ),
+    ] = False,
+    profile: Annotated[
+        str | None,
+        typer.Option(
+            "--profile",
+            help=(
+                "Profile each stage with cprofile, sampling (pyinstrument) or "
+                "torch; profiles go to <stem>.profile/ next to the outputs."
+            ),
+        ),
+    ] = None,
+    memory_interval: Annotated[
+        float | None,
+        typer.Option(
+            "--memory-interval",
+            help=(
+                "Sample host RSS and CUDA memory every N seconds; per-stage peaks go "
+                "into the metadata, the timeline to <stem>.memory.json."
+            ),
+        ),
+    ] = None,
+    trace: Annotated[
+        Path | None,
+        typer.Option(
+            "--trace",
+            help=(
+                "Append stage spans to this Chrome trace file (chrome://tracing, "
+                "Perfetto); subprocesses and workers can share it."
+            ),
+        ),
+    ] = None,
+    compact_json: Annotated[
+        bool,
+        typer.Option(
+            "--compact-json",
+            help="Write JSON without indentation.",
+        ),
+    ] = False,
+    parquet_dataset: Annotated[
+        Path | None,
+        typer.Option(
+            "--parquet-dataset",
+            help=(
+                "Append all segments to a Parquet dataset in this directory "
+                "instead of per-file outputs (unless --format is given)."
+            ),
+        ),
+    ] = None,
+    jsonl: Annotated[
+        str | None,
+        typer.Option(
+            "--jsonl",
+            help=(
+                "Append one JSON line per finished file to this file ('-' for "
+                "stdout) instead of per-file outputs (unless --format is given)."
+            ),
+        ),
+    ] = None,
 ) -> None:
     """Batch process audio files in a directory."""
     if not input_dir.exists():
@@ -107,6 +251,19 @@ def batch_cmd(
         )
         raise typer.Exit(code=ExitCode.ERROR_FILE)
 
+    if pack_short is not None and pack_short <= 0:
+        typer.echo("Error: --pack-short must be positive.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
+    if fsync is not None and fsync not in FSYNC_MODES:
+        typer.echo(
+            f"Error: --fsync must be one of: {', '.join(FSYNC_MODES)}.", err=True,
+        )
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+    if fsync_group_size is not None and fsync_group_size < 1:
+        typer.echo("Error: --fsync-group-size must be >= 1.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
     files = discover_audio_files(
         input_dir, recursive=recursive, pattern=pattern,
     )
@@ -129,15 +286,89 @@ def batch_cmd(
         max_speakers=max_speakers,
         no_diarize=no_diarize,
     )
+    if compact_json:
+        stt_config = stt_config.with_overrides(compact_json=True)
+    if auto_batch_size:
+        stt_config = stt_config.with_overrides(use_batched=True, auto_batch_size=True)
+    if fsync is not None:
+        stt_config = stt_config.with_overrides(fsync=fsync)
+    if fsync_group_size is not None:
+        stt_config = stt_config.with_overrides(fsync_group_size=fsync_group_size)
+    if speaker_index is not None:
+        stt_config = stt_config.with_overrides(speaker_index=str(speaker_index))
+    if speaker_embeddings:
+        stt_config = stt_config.with_overrides(export_speaker_embeddings=True)
+    if cpu_budget is not None:
+        stt_config = stt_config.with_overrides(cpu_budget=cpu_budget)
+    if profile is not None:
+        try:
+            make_profiler(profile)
+        except (ValueError, ImportError) as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+        stt_config = stt_config.with_overrides(profiler=profile)
+    if memory_interval is not None:
+        if memory_interval <= 0:
+            typer.echo("Error: --memory-interval must be positive.", err=True)
+            raise typer.Exit(code=ExitCode.ERROR_ARGS)
+        stt_config = stt_config.with_overrides(memory_interval=memory_interval)
+    if workers is not None:
+        stt_config = stt_config.with_overrides(workers=workers)
+    if worker_index is not None:
+        stt_config = stt_config.with_overrides(worker_index=worker_index)
+    if pin_cpus:
+        stt_config = stt_config.with_overrides(pin_cpus=True)
+    try:
+        stt_config = apply_thread_budget(stt_config)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
     config = build_pipeline_config(stt_config, num_speakers=num_speakers)
 
+    if trace is not None:
+        try:
+            configure_tracing(
+                trace,
+                process_name=(
+                    f"stt batch worker {stt_config.worker_index}"
+                    if stt_config.workers > 1 else "stt batch"
+                ),
+            )
+        except OSError as e:
+            typer.echo(f"Error: cannot write trace {trace}: {e}", err=True)
+            raise typer.Exit(code=ExitCode.ERROR_FILE) from None
+
+    jsonl_file: IO[str] | None = None
+    jsonl_writer: JsonlWriter | None = None
+    if jsonl is not None:
+        if jsonl == "-":
+            jsonl_writer = JsonlWriter(sys.stdout)
+        else:
+            jsonl_path = Path(jsonl)
+            done = completed_sources(jsonl_path) if skip_existing else set()
+            jsonl_file = open_jsonl(jsonl_path)
+            jsonl_writer = JsonlWriter(jsonl_file, completed=done)
+    if (jsonl is not None or parquet_dataset is not None) and format is None:
+        config = replace(config, formats="")
+
     resolved_output = Path(stt_config.output_dir)
-    runner = BatchRunner(config, skip_existing=skip_existing)
-    result = runner.run(
-        files,
-        resolved_output,
-        input_base=input_dir if recursive else None,
+    runner = BatchRunner(
+        config, skip_existing=skip_existing, pack_short=pack_short,
+        dataset_dir=parquet_dataset, jsonl=jsonl_writer,
     )
+    try:
+        result = runner.run(
+            files,
+            resolved_output,
+            input_base=input_dir if recursive else None,
+        )
+    except ImportError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+    finally:
+        configure_tracing(None)
+        if jsonl_file is not None:
+            jsonl_file.close()
 
     typer.echo(
         f"Processed {result.succeeded}/{result.total} files.",
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Annotated
 
 import typer
 
 from stt.config import load_config
+from stt.core.registry import (
+    WHISPER,
+    ModelRegistry,
+    install_diarization,
+    install_whisper,
+)
 from stt.exit_codes import ExitCode
 
 models_app = typer.Typer(name="models", help="Manage STT models.")
@@ -45,19 +50,72 @@ AVAILABLE_MODELS: dict[str, dict[str, str]] = {
     },
 }
 
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+
+def _gb(size: int) -> str:
+    return f"{size / 1e9:.1f} GB" if size >= 1e8 else f"{size / 1e6:.0f} MB"
+
 
 @models_app.command("list")
-def list_models() -> None:
-    """List available Whisper models."""
+def list_models(
+    model_dir: Annotated[
+        str | None,
+        typer.Option(
+            "--model-dir",
+            help="Directory for model storage.",
+        ),
+    ] = None,
+    verify: Annotated[
+        bool,
+        typer.Option(
+            "--verify",
+            help="Re-hash installed models against the recorded checksums.",
+        ),
+    ] = False,
+) -> None:
+    """List available Whisper models and what is installed locally."""
+    resolved_model_dir = model_dir if model_dir is not None else load_config().model_dir
+    registry = ModelRegistry(resolved_model_dir)
+    installed = {(e.kind, e.name): e for e in registry.entries()}
+    damaged = False
+
+    def status(kind: str, name: str) -> str:
+        nonlocal damaged
+        entry = installed.get((kind, name))
+        if entry is None:
+            return "-"
+        if entry.problems(checksums=verify):
+            damaged = True
+            return "damaged"
+        return "installed"
+
     typer.echo(
-        f"{'Model':<18} {'Size':<10} {'VRAM':<10} Description"
+        f"{'Model':<18} {'Size':<10} {'VRAM':<10} {'Status':<10} Description"
     )
-    typer.echo("-" * 70)
+    typer.echo("-" * 80)
     for name, info in AVAILABLE_MODELS.items():
         typer.echo(
             f"{name:<18} {info['size']:<10} {info['vram']:<10} "
-            f"{info['description']}"
+            f"{status(WHISPER, name):<10} {info['description']}"
+        )
+    extra = [
+        entry for (kind, name), entry in installed.items()
+        if kind != WHISPER or name not in AVAILABLE_MODELS
+    ]
+    if extra:
+        typer.echo("")
+        for entry in extra:
+            typer.echo(
+                f"{entry.kind}: {entry.name} ({_gb(entry.size)}, "
+                f"{status(entry.kind, entry.name)}) -> {entry.path}"
+            )
+    typer.echo(f"\nRegistry: {registry.path}")
+    if damaged:
+        typer.echo(
+            "Some models are damaged; run 'stt models download' again.", err=True,
         )
+        raise typer.Exit(code=ExitCode.ERROR_MODEL)
 
 
 @models_app.command("info")
@@ -89,7 +147,7 @@ def download_model(
         ),
     ] = None,
 ) -> None:
-    """Download a Whisper model for offline use."""
+    """Download a Whisper model for offline use and record it in the registry."""
     if model not in AVAILABLE_MODELS:
         typer.echo(f"Error: Unknown model '{model}'.", err=True)
         raise typer.Exit(code=ExitCode.ERROR_MODEL)
@@ -100,16 +158,8 @@ def download_model(
     # Download Whisper model
     typer.echo(f"Downloading Whisper model '{model}'...")
     try:
-        from faster_whisper import WhisperModel  # type: ignore[import-untyped]
-
-        download_root = str(Path(resolved_model_dir).expanduser().resolve())
-        WhisperModel(
-            model,
-            device="cpu",
-            compute_type="int8",
-            download_root=download_root,
-        )
-        typer.echo(f"Whisper model '{model}' downloaded to {download_root}.")
+        entry = install_whisper(model, resolved_model_dir)
+        typer.echo(f"Whisper model '{model}' installed at {entry.path}.")
     except Exception as e:
         typer.echo(f"Error downloading Whisper model: {e}", err=True)
         raise typer.Exit(code=ExitCode.ERROR_MODEL) from None
@@ -119,15 +169,10 @@ def download_model(
     if hf_token:
         typer.echo("Downloading pyannote diarization model...")
         try:
-            from pyannote.audio import Pipeline
-
-            cache_dir = str(Path(resolved_model_dir).expanduser().resolve())
-            Pipeline.from_pretrained(  # type: ignore[call-arg]
-                "pyannote/speaker-diarization-3.1",
-                token=hf_token,
-                cache_dir=cache_dir,
+            entry = install_diarization(
+                DIARIZATION_MODEL, resolved_model_dir, token=hf_token,
             )
-            typer.echo(f"Pyannote model downloaded to {cache_dir}.")
+            typer.echo(f"Pyannote model installed, pipeline config {entry.path}.")
         except Exception as e:
             typer.echo(
                 f"Error downloading pyannote model: {e}", err=True,
@@ -138,3 +183,4 @@ def download_model(
             "HF_TOKEN not set — skipping pyannote model download. "
             "Set HF_TOKEN to download the diarization model.",
         )
+    typer.echo(f"Recorded in {ModelRegistry(resolved_model_dir).path}.")
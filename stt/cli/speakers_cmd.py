@@ -0,0 +1,112 @@
+"""Speakers subcommands for the STT CLI."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from stt.config import load_config
+from stt.core.speaker_index import SpeakerIndex
+from stt.exit_codes import ExitCode
+
+speakers_app = typer.Typer(name="speakers", help="Manage enrolled speakers.")
+
+IndexOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--index",
+        help="Speaker index directory (default: speakers.index from config).",
+    ),
+]
+
+
+def _open_index(index: Path | None) -> SpeakerIndex:
+    path = index if index is not None else load_config().speaker_index
+    if path is None:
+        typer.echo(
+            "Error: no speaker index; pass --index or set speakers.index in config.",
+            err=True,
+        )
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+    try:
+        return SpeakerIndex(path)
+    except (OSError, ValueError) as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_FILE) from None
+
+
+@speakers_app.command("enroll")
+def enroll(
+    name: Annotated[str, typer.Argument(help="Name to give the speaker.")],
+    embeddings_file: Annotated[
+        Path,
+        typer.Argument(
+            help="<stem>.speakers.json written by transcribe --speaker-embeddings.",
+        ),
+    ],
+    speaker: Annotated[
+        str | None,
+        typer.Option(
+            "--speaker", "-s",
+            help="Label in the file to enroll (required if it has several).",
+        ),
+    ] = None,
+    index: IndexOption = None,
+) -> None:
+    """Enroll a speaker from a transcript's speaker embeddings."""
+    try:
+        speakers = json.loads(embeddings_file.read_text(encoding="utf-8"))["speakers"]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        typer.echo(f"Error: cannot read {embeddings_file}: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_FILE) from None
+    if speaker is None:
+        if len(speakers) != 1:
+            typer.echo(
+                f"Error: {embeddings_file} has speakers {', '.join(sorted(speakers))}; "
+                "choose one with --speaker.",
+                err=True,
+            )
+            raise typer.Exit(code=ExitCode.ERROR_ARGS)
+        speaker = next(iter(speakers))
+    if speaker not in speakers:
+        typer.echo(f"Error: no speaker {speaker!r} in {embeddings_file}.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
+    speaker_index = _open_index(index)
+    try:
+        speaker_index.add(name, speakers[speaker])
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+    speaker_index.save()
+    typer.echo(
+        f"Enrolled {speaker} as '{name}' "
+        f"({speaker_index.speakers()[name]} enrollment(s)) in {speaker_index.path}."
+    )
+
+
+@speakers_app.command("list")
+def list_speakers(index: IndexOption = None) -> None:
+    """List enrolled speakers."""
+    speaker_index = _open_index(index)
+    for name, count in speaker_index.speakers().items():
+        typer.echo(f"{name:<30} {count}")
+    typer.echo(f"\n{len(speaker_index)} embeddings in {speaker_index.path}")
+
+
+@speakers_app.command("remove")
+def remove(
+    name: Annotated[str, typer.Argument(help="Enrolled speaker to remove.")],
+    index: IndexOption = None,
+) -> None:
+    """Remove every enrollment of a speaker."""
+    speaker_index = _open_index(index)
+    removed = speaker_index.remove(name)
+    if not removed:
+        typer.echo(f"Error: '{name}' is not enrolled.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+    speaker_index.save()
+    typer.echo(f"Removed '{name}' ({removed} enrollment(s)).")
@@ -0,0 +1,166 @@
+"""Stream command for the STT CLI."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from dataclasses import replace
+from typing import Annotated
+
+import typer
+
+from stt.config import (
+    apply_thread_budget,
+    build_pipeline_config,
+    load_config,
+    resolve_config,
+)
+from stt.core.pipeline import build_transcriber_config
+from stt.core.streaming import (
+    PcmSource,
+    StreamConfig,
+    StreamEvent,
+    StreamingTranscriber,
+    run_stream,
+)
+from stt.core.transcriber import Transcriber
+from stt.exceptions import (
+    AudioPreprocessError,
+    CudaOomError,
+    GpuError,
+    ModelError,
+    TranscriptionError,
+)
+from stt.exit_codes import ExitCode
+
+logger = logging.getLogger(__name__)
+
+
+def _emit(event: StreamEvent) -> None:
+    typer.echo(json.dumps(event.to_dict(), ensure_ascii=False))
+
+
+def stream_cmd(
+    model: Annotated[
+        str | None,
+        typer.Option("--model", "-m", help="Whisper model size."),
+    ] = None,
+    language: Annotated[
+        str | None,
+        typer.Option("--language", "-l", help="Audio language."),
+    ] = None,
+    device: Annotated[
+        str | None,
+        typer.Option("--device", help="Device: cuda or cpu."),
+    ] = None,
+    compute_type: Annotated[
+        str | None,
+        typer.Option("--compute-type", help="Compute type."),
+    ] = None,
+    model_dir: Annotated[
+        str | None,
+        typer.Option(
+            "--model-dir",
+            help="Directory for model storage.",
+        ),
+    ] = None,
+    raw: Annotated[
+        bool,
+        typer.Option(
+            "--raw",
+            help="Input is headerless 16 kHz mono s16le PCM (default: WAV or "
+            "anything ffmpeg can decode).",
+        ),
+    ] = False,
+    step: Annotated[
+        float,
+        typer.Option(
+            "--step",
+            help="Seconds of new audio between decodes (partial update rate).",
+        ),
+    ] = 1.0,
+    max_buffer: Annotated[
+        float,
+        typer.Option(
+            "--max-buffer",
+            help="Commit at most this many seconds after audio arrives, even "
+            "without a pause.",
+        ),
+    ] = 15.0,
+    min_silence: Annotated[
+        float,
+        typer.Option(
+            "--min-silence",
+            help="Pause length (seconds) that commits the segments before it.",
+        ),
+    ] = 0.6,
+    cpu_budget: Annotated[
+        int | None,
+        typer.Option(
+            "--cpu-budget",
+            help="CPUs to use (default: all the cgroup/affinity allows).",
+        ),
+    ] = None,
+) -> None:
+    """Transcribe audio from stdin as it arrives; JSON Lines on stdout."""
+    try:
+        stream_config = StreamConfig(
+            step_seconds=step,
+            max_buffer_seconds=max_buffer,
+            min_silence_seconds=min_silence,
+        )
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+
+    stt_config = resolve_config(
+        load_config(),
+        model=model,
+        language=language,
+        device=device,
+        compute_type=compute_type,
+        model_dir=model_dir,
+    )
+    if cpu_budget is not None:
+        stt_config = stt_config.with_overrides(cpu_budget=cpu_budget)
+    try:
+        stt_config = apply_thread_budget(stt_config)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+    # Short buffers: sequential decoding has the lower latency.
+    transcriber = Transcriber(replace(
+        build_transcriber_config(build_pipeline_config(stt_config)), use_batched=False,
+    ))
+
+    source: PcmSource | None = None
+    try:
+        transcriber.load_model()
+        source = PcmSource(sys.stdin.buffer, raw=raw)
+        streamer = StreamingTranscriber(transcriber, stream_config)
+        try:
+            run_stream(source, streamer, _emit, step_seconds=stream_config.step_seconds)
+        except KeyboardInterrupt:
+            for event in streamer.flush():
+                _emit(event)
+    except AudioPreprocessError as e:
+        typer.echo(f"Audio preprocessing error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_FILE) from None
+    except CudaOomError as e:
+        typer.echo(f"CUDA out of memory: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_OOM) from None
+    except GpuError as e:
+        typer.echo(f"GPU error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_GPU) from None
+    except ModelError as e:
+        typer.echo(f"Model error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_MODEL) from None
+    except TranscriptionError as e:
+        logger.error("Inference error: %s", e, exc_info=True)
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_GENERAL) from None
+    finally:
+        if source is not None:
+            source.close()
+        transcriber.unload_model()
@@ -8,9 +8,17 @@ from typing import Annotated
 
 import typer
 
-from stt.config import build_pipeline_config, load_config, resolve_config
+from stt.config import (
+    apply_thread_budget,
+    build_pipeline_config,
+    load_config,
+    resolve_config,
+)
 from stt.core.audio import validate_audio_file
+from stt.core.incremental import run_incremental
 from stt.core.pipeline import TranscriptionPipeline
+from stt.core.profiling import make_profiler
+from stt.core.tracing import configure_tracing
 from stt.exceptions import (
     AudioPreprocessError,
     AudioValidationError,
@@ -25,6 +33,19 @@ from stt.exit_codes import ExitCode
 logger = logging.getLogger(__name__)
 
 
+def parse_time(value: str) -> float:
+    """Seconds from ``"90"``, ``"1:30"`` or ``"0:01:30.5"``."""
+    parts = value.strip().split(":")
+    if not 1 <= len(parts) <= 3 or not all(parts):
+        raise ValueError(f"invalid time {value!r}")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    if seconds < 0:
+        raise ValueError(f"invalid time {value!r}")
+    return seconds
+
+
 def transcribe_cmd(
     audio_file: Annotated[
         Path, typer.Argument(help="Path to the audio file."),
@@ -41,7 +62,7 @@ def transcribe_cmd(
         str | None,
         typer.Option(
             "--format", "-f",
-            help="Output format(s): json,txt,srt.",
+            help="Output format(s): json,txt,srt,vtt,parquet,arrow,sttb.",
         ),
     ] = None,
     output: Annotated[
@@ -105,6 +126,99 @@ def transcribe_cmd(
             help="Use batched inference (faster for long audio, coarser segmentation).",
         ),
     ] = False,
+    auto_batch_size: Annotated[
+        bool,
+        typer.Option(
+            "--auto-batch-size",
+            help=(
+                "Batched inference with a batch size tuned once per "
+                "model/compute type/device and saved in the model directory."
+            ),
+        ),
+    ] = False,
+    speaker_index: Annotated[
+        Path | None,
+        typer.Option(
+            "--speaker-index",
+            help="Name speakers from this enrolled-speaker index (stt speakers enroll).",
+        ),
+    ] = None,
+    speaker_embeddings: Annotated[
+        bool,
+        typer.Option(
+            "--speaker-embeddings",
+            help="Also write <stem>.speakers.json with each speaker's embedding.",
+        ),
+    ] = False,
+    cpu_budget: Annotated[
+        int | None,
+        typer.Option(
+            "--cpu-budget",
+            help="CPUs to use (default: all the cgroup/affinity allows).",
+        ),
+    ] = None,
+    start: Annotated[
+        str | None,
+        typer.Option(
+            "--start",
+            help="Transcribe from this time (seconds or [HH:]MM:SS).",
+        ),
+    ] = None,
+    end: Annotated[
+        str | None,
+        typer.Option(
+            "--end",
+            help="Transcribe up to this time (seconds or [HH:]MM:SS).",
+        ),
+    ] = None,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            help=(
+                "Transcribe only audio appended since the last run (growing "
+                "recordings); state is kept in <stem>.checkpoint.json next to "
+                "the outputs."
+            ),
+        ),
+    ] = False,
+    profile: Annotated[
+        str | None,
+        typer.Option(
+            "--profile",
+            help=(
+                "Profile each stage with cprofile, sampling (pyinstrument) or "
+                "torch; profiles go to <stem>.profile/ next to the outputs."
+            ),
+        ),
+    ] = None,
+    memory_interval: Annotated[
+        float | None,
+        typer.Option(
+            "--memory-interval",
+            help=(
+                "Sample host RSS and CUDA memory every N seconds; per-stage peaks go "
+                "into the metadata, the timeline to <stem>.memory.json."
+            ),
+        ),
+    ] = None,
+    trace: Annotated[
+        Path | None,
+        typer.Option(
+            "--trace",
+            help=(
+                "Append stage spans to this Chrome trace file (chrome://tracing, "
+                "Perfetto); subprocesses and workers can share it."
+            ),
+        ),
+    ] = None,
+    compact_json: Annotated[
+        bool,
+        typer.Option(
+            "--compact-json",
+            help="Write JSON without indentation.",
+        ),
+    ] = False,
 ) -> None:
     """Transcribe a single audio file."""
     # Validate audio file
@@ -114,6 +228,19 @@ def transcribe_cmd(
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(code=ExitCode.ERROR_FILE) from None
 
+    try:
+        start_seconds = parse_time(start) if start is not None else None
+        end_seconds = parse_time(end) if end is not None else None
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+    if end_seconds is not None and end_seconds <= (start_seconds or 0.0):
+        typer.echo("Error: --end must be after --start.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+    if incremental and (start_seconds is not None or end_seconds is not None):
+        typer.echo("Error: --incremental cannot be used with --start/--end.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
     # Validate speaker hint conflicts
     if num_speakers is not None and (
         min_speakers is not None or max_speakers is not None
@@ -143,11 +270,47 @@ def transcribe_cmd(
         stt_config = stt_config.with_overrides(use_subprocess=True)
     if batched:
         stt_config = stt_config.with_overrides(use_batched=True)
+    if auto_batch_size:
+        stt_config = stt_config.with_overrides(use_batched=True, auto_batch_size=True)
+    if compact_json:
+        stt_config = stt_config.with_overrides(compact_json=True)
+    if speaker_index is not None:
+        stt_config = stt_config.with_overrides(speaker_index=str(speaker_index))
+    if speaker_embeddings:
+        stt_config = stt_config.with_overrides(export_speaker_embeddings=True)
+    if cpu_budget is not None:
+        stt_config = stt_config.with_overrides(cpu_budget=cpu_budget)
+    if profile is not None:
+        try:
+            make_profiler(profile)
+        except (ValueError, ImportError) as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+        stt_config = stt_config.with_overrides(profiler=profile)
+    if memory_interval is not None:
+        if memory_interval <= 0:
+            typer.echo("Error: --memory-interval must be positive.", err=True)
+            raise typer.Exit(code=ExitCode.ERROR_ARGS)
+        stt_config = stt_config.with_overrides(memory_interval=memory_interval)
+    try:
+        stt_config = apply_thread_budget(stt_config)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
     config = build_pipeline_config(stt_config, num_speakers=num_speakers)
 
+    if trace is not None:
+        try:
+            configure_tracing(trace, process_name="stt transcribe")
+        except OSError as e:
+            typer.echo(f"Error: cannot write trace {trace}: {e}", err=True)
+            raise typer.Exit(code=ExitCode.ERROR_FILE) from None
     try:
         pipeline = TranscriptionPipeline(config)
-        pipeline.run(str(audio_file))
+        if incremental:
+            run_incremental(pipeline, str(audio_file))
+        else:
+            pipeline.run(str(audio_file), start=start_seconds, end=end_seconds)
     except AudioPreprocessError as e:
         typer.echo(f"Audio preprocessing error: {e}", err=True)
         raise typer.Exit(code=ExitCode.ERROR_FILE) from None
@@ -169,3 +332,5 @@ def transcribe_cmd(
         logger.error("Unexpected error (%s): %s", type(e).__name__, e, exc_info=True)
         typer.echo(f"Error ({type(e).__name__}): {e}", err=True)
         raise typer.Exit(code=ExitCode.ERROR_GENERAL) from None
+    finally:
+        configure_tracing(None)
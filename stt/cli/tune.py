@@ -0,0 +1,186 @@
+"""Hardware calibration command for the STT CLI."""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import Annotated
+
+import torch
+import typer
+
+from stt.config import (
+    build_pipeline_config,
+    default_config_path,
+    load_config,
+    profile_yaml,
+    resolve_config,
+    save_profile,
+)
+from stt.core.audio import preprocess_audio, validate_audio_file
+from stt.core.pipeline import build_transcriber_config
+from stt.core.tuning import (
+    DEFAULT_MAX_TRIALS,
+    TrialResult,
+    best_trial,
+    build_sweep,
+    default_batch_sizes,
+    default_compute_types,
+    default_thread_counts,
+    profile_from_trial,
+    run_sweep,
+    trim_wav,
+    write_synthetic_speech,
+)
+from stt.exceptions import AudioPreprocessError, AudioValidationError
+from stt.exit_codes import ExitCode
+
+
+def _parse_list(value: str | None, option: str, cast: type = str) -> list:  # type: ignore[type-arg]
+    if value is None:
+        return []
+    try:
+        return [cast(item.strip()) for item in value.split(",") if item.strip()]
+    except ValueError:
+        typer.echo(f"Error: invalid value for {option}: {value!r}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+
+
+def _mib(value: int | None) -> str:
+    return "-" if value is None else f"{value / 1024 / 1024:.0f}"
+
+
+def _echo_trial(result: TrialResult) -> None:
+    if result.ok:
+        typer.echo(
+            f"  {result.spec.label:<40} RTF {result.rtf:6.3f}  "
+            f"RSS {_mib(result.peak_rss_bytes):>6} MiB  "
+            f"GPU {_mib(result.peak_cuda_bytes):>6} MiB",
+            err=True,
+        )
+    else:
+        typer.echo(f"  {result.spec.label:<40} failed: {result.error}", err=True)
+
+
+def tune_cmd(
+    sample: Annotated[
+        Path | None,
+        typer.Option(
+            "--sample",
+            help="Audio file to calibrate on (default: synthetic speech-like audio).",
+        ),
+    ] = None,
+    seconds: Annotated[
+        float,
+        typer.Option("--seconds", help="Length of the calibration clip in seconds."),
+    ] = 60.0,
+    model: Annotated[
+        str | None,
+        typer.Option("--model", "-m", help="Whisper model size."),
+    ] = None,
+    device: Annotated[
+        str | None,
+        typer.Option("--device", help="Device: cuda or cpu (default: cuda if available)."),
+    ] = None,
+    compute_types: Annotated[
+        str | None,
+        typer.Option("--compute-types", help="Comma-separated compute types to try."),
+    ] = None,
+    batch_sizes: Annotated[
+        str | None,
+        typer.Option("--batch-sizes", help="Comma-separated batch sizes to try."),
+    ] = None,
+    threads: Annotated[
+        str | None,
+        typer.Option("--threads", help="Comma-separated CPU thread counts to try."),
+    ] = None,
+    max_trials: Annotated[
+        int,
+        typer.Option("--max-trials", help="Upper bound on the number of trials."),
+    ] = DEFAULT_MAX_TRIALS,
+    model_dir: Annotated[
+        str | None,
+        typer.Option("--model-dir", help="Directory for model storage."),
+    ] = None,
+    config_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--config",
+            help="Config file to write the profile to (default: $STT_CONFIG or ./config.yaml).",
+        ),
+    ] = None,
+    dry_run: Annotated[
+        bool,
+        typer.Option("--dry-run", help="Print the resulting config file without writing it."),
+    ] = False,
+) -> None:
+    """Measure speed and memory of decode settings and save the best profile.
+
+    Runs offline: the model must already be downloaded (stt models download).
+    """
+    if seconds <= 0:
+        typer.echo("Error: --seconds must be positive.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+    if max_trials < 1:
+        typer.echo("Error: --max-trials must be >= 1.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
+    resolved_device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    types = _parse_list(compute_types, "--compute-types") or list(
+        default_compute_types(resolved_device),
+    )
+    sizes = _parse_list(batch_sizes, "--batch-sizes", int) or list(
+        default_batch_sizes(resolved_device),
+    )
+    thread_counts = _parse_list(threads, "--threads", int) or list(
+        default_thread_counts(resolved_device),
+    )
+    if any(n < 1 for n in sizes) or any(n < 0 for n in thread_counts):
+        typer.echo("Error: batch sizes must be >= 1 and thread counts >= 0.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
+    target = config_file or default_config_path()
+    stt_config = resolve_config(
+        load_config(config_file),
+        model=model, device=resolved_device, model_dir=model_dir,
+    )
+    base = build_transcriber_config(build_pipeline_config(stt_config))
+    # Synthetic audio has no speech for the VAD to find; decode all of it.
+    base.vad_filter = base.vad_filter and sample is not None
+    base.local_files_only = True
+
+    specs = build_sweep(types, sizes, thread_counts, max_trials)
+    with tempfile.TemporaryDirectory(prefix=".stt_tune_") as tmp:
+        clip = Path(tmp) / "calibration.wav"
+        if sample is not None:
+            try:
+                validate_audio_file(sample)
+                preprocessed = preprocess_audio(sample)
+            except (AudioValidationError, AudioPreprocessError) as e:
+                typer.echo(f"Error: {e}", err=True)
+                raise typer.Exit(code=ExitCode.ERROR_FILE) from None
+            try:
+                trim_wav(preprocessed.path, clip, seconds)
+            finally:
+                preprocessed.cleanup()
+        else:
+            write_synthetic_speech(clip, seconds)
+
+        typer.echo(
+            f"Tuning {stt_config.model} on {resolved_device}: {len(specs)} trials",
+            err=True,
+        )
+        results = run_sweep(base, clip, specs, on_trial=_echo_trial)
+
+    best = best_trial(results)
+    if best is None:
+        typer.echo("Error: no trial succeeded.", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_MODEL)
+
+    profile = profile_from_trial(best, resolved_device)
+    typer.echo(f"Best: {best.spec.label} (RTF {best.rtf:.3f})", err=True)
+    if dry_run:
+        typer.echo(profile_yaml(target, profile), nl=False)
+        return
+    save_profile(target, profile)
+    typer.echo(f"Profile written to {target}", err=True)
@@ -0,0 +1,238 @@
+"""Watch-folder command for the STT CLI."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from stt.config import (
+    apply_thread_budget,
+    build_pipeline_config,
+    load_config,
+    resolve_config,
+)
+from stt.core.watcher import FolderWatcher, WatchConfig
+from stt.exit_codes import ExitCode
+
+
+def watch_cmd(
+    input_dir: Annotated[
+        Path,
+        typer.Argument(help="Directory to watch for new audio files."),
+    ],
+    model: Annotated[
+        str | None,
+        typer.Option("--model", "-m", help="Whisper model size."),
+    ] = None,
+    language: Annotated[
+        str | None,
+        typer.Option("--language", "-l", help="Audio language."),
+    ] = None,
+    format: Annotated[
+        str | None,
+        typer.Option(
+            "--format", "-f",
+            help="Output format(s): json,txt,srt,vtt,parquet,arrow,sttb.",
+        ),
+    ] = None,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Output directory."),
+    ] = None,
+    no_diarize: Annotated[
+        bool,
+        typer.Option(
+            "--no-diarize",
+            help="Disable speaker diarization.",
+        ),
+    ] = False,
+    num_speakers: Annotated[
+        int | None,
+        typer.Option(
+            "--num-speakers",
+            help="Exact number of speakers.",
+        ),
+    ] = None,
+    min_speakers: Annotated[
+        int | None,
+        typer.Option(
+            "--min-speakers",
+            help="Minimum number of speakers.",
+        ),
+    ] = None,
+    max_speakers: Annotated[
+        int | None,
+        typer.Option(
+            "--max-speakers",
+            help="Maximum number of speakers.",
+        ),
+    ] = None,
+    device: Annotated[
+        str | None,
+        typer.Option("--device", help="Device: cuda or cpu."),
+    ] = None,
+    compute_type: Annotated[
+        str | None,
+        typer.Option("--compute-type", help="Compute type."),
+    ] = None,
+    model_dir: Annotated[
+        str | None,
+        typer.Option(
+            "--model-dir",
+            help="Directory for model storage.",
+        ),
+    ] = None,
+    recursive: Annotated[
+        bool,
+        typer.Option(
+            "--recursive", "-r",
+            help="Watch subdirectories.",
+        ),
+    ] = False,
+    pattern: Annotated[
+        str,
+        typer.Option(
+            "--pattern", help="Glob pattern for audio files.",
+        ),
+    ] = "*",
+    interval: Annotated[
+        float,
+        typer.Option(
+            "--interval",
+            help="Seconds between polls / stability checks.",
+        ),
+    ] = 2.0,
+    stable_seconds: Annotated[
+        float,
+        typer.Option(
+            "--stable-seconds",
+            help="File must be unchanged this long before it is processed.",
+        ),
+    ] = 5.0,
+    polling: Annotated[
+        bool,
+        typer.Option(
+            "--polling",
+            help="Force directory polling instead of inotify.",
+        ),
+    ] = False,
+    keep_warm: Annotated[
+        bool,
+        typer.Option(
+            "--keep-warm/--no-keep-warm",
+            help="Keep models loaded between files.",
+        ),
+    ] = True,
+    cpu_budget: Annotated[
+        int | None,
+        typer.Option(
+            "--cpu-budget",
+            help="CPUs to use (default: all the cgroup/affinity allows).",
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers",
+            help="Number of stt processes sharing this machine's CPUs.",
+        ),
+    ] = None,
+    worker_index: Annotated[
+        int | None,
+        typer.Option(
+            "--worker-index",
+            help="This process's index among --workers (0-based).",
+        ),
+    ] = None,
+    pin_cpus: Annotated[
+        bool,
+        typer.Option(
+            "--pin-cpus",
+            help="Pin this worker to its own CPUs, NUMA node by node.",
+        ),
+    ] = False,
+    compact_json: Annotated[
+        bool,
+        typer.Option(
+            "--compact-json",
+            help="Write JSON without indentation.",
+        ),
+    ] = False,
+) -> None:
+    """Watch a directory and transcribe audio files as they arrive."""
+    if not input_dir.is_dir():
+        typer.echo(
+            f"Error: Directory not found: {input_dir}", err=True,
+        )
+        raise typer.Exit(code=ExitCode.ERROR_FILE)
+
+    if interval <= 0 or stable_seconds < 0:
+        typer.echo(
+            "Error: --interval must be positive and --stable-seconds "
+            "non-negative.",
+            err=True,
+        )
+        raise typer.Exit(code=ExitCode.ERROR_ARGS)
+
+    # Load YAML config, resolve CLI overrides, build pipeline config
+    stt_config = resolve_config(
+        load_config(),
+        model=model,
+        language=language,
+        format=format,
+        output_dir=str(output) if output is not None else None,
+        device=device,
+        compute_type=compute_type,
+        model_dir=model_dir,
+        min_speakers=min_speakers,
+        max_speakers=max_speakers,
+        no_diarize=no_diarize,
+    )
+    if compact_json:
+        stt_config = stt_config.with_overrides(compact_json=True)
+    if cpu_budget is not None:
+        stt_config = stt_config.with_overrides(cpu_budget=cpu_budget)
+    if workers is not None:
+        stt_config = stt_config.with_overrides(workers=workers)
+    if worker_index is not None:
+        stt_config = stt_config.with_overrides(worker_index=worker_index)
+    if pin_cpus:
+        stt_config = stt_config.with_overrides(pin_cpus=True)
+    try:
+        stt_config = apply_thread_budget(stt_config)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(code=ExitCode.ERROR_ARGS) from None
+    config = replace(
+        build_pipeline_config(stt_config, num_speakers=num_speakers),
+        keep_models_loaded=keep_warm,
+    )
+
+    watcher = FolderWatcher(
+        config,
+        input_dir,
+        Path(stt_config.output_dir),
+        WatchConfig(
+            recursive=recursive,
+            pattern=pattern,
+            poll_interval=interval,
+            stable_seconds=stable_seconds,
+            force_polling=polling,
+        ),
+    )
+    typer.echo(f"Watching {input_dir} (Ctrl+C to stop)...", err=True)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+    stats = watcher.stats
+    typer.echo(
+        f"Stopped. Processed {stats.succeeded + stats.failed} files "
+        f"({stats.failed} failed).",
+        err=True,
+    )
+    raise typer.Exit(code=ExitCode.SUCCESS)
@@ -30,11 +30,38 @@ class SttConfig:
     model_dir: str = "models"
     hf_token: str | None = None
     batch_size: int = 8
+    # whisper.batch_size: auto in YAML; see stt.core.autotune.
+    auto_batch_size: bool = False
     vad_filter: bool = True
     condition_on_previous_text: bool = False
     hallucination_silence_threshold: float = 2.0
     use_subprocess: bool = False
     use_batched: bool = False
+    cpu_threads: int = 0
+    num_workers: int = 1
+    # Thread budget (see stt.core.threads): 0 = all CPUs the cgroup allows.
+    cpu_budget: int = 0
+    diarizer_threads: int = 0
+    workers: int = 1
+    worker_index: int = 0
+    pin_cpus: bool = False
+    compact_json: bool = False
+    concurrent_export: bool = False
+    fsync: str = "none"
+    fsync_group_size: int = 32
+    # None uses the pipeline's full OOM ladder; an empty tuple disables it.
+    oom_ladder: tuple[str, ...] | None = None
+    oom_chunk_seconds: float = 300.0
+    # Load models only from the local registry (stt models download).
+    offline: bool = False
+    # Enrolled-speaker index (stt speakers enroll); None keeps SPEAKER_NN.
+    speaker_index: str | None = None
+    speaker_threshold: float = 0.6
+    export_speaker_embeddings: bool = False
+    # Per-stage profiler (transcribe/batch --profile); None disables it.
+    profiler: str | None = None
+    # Seconds between memory timeline samples; 0 disables the timeline.
+    memory_interval: float = 0.0
 
     def with_overrides(self, **kwargs: Any) -> SttConfig:
         return replace(self, **kwargs)
@@ -48,23 +75,24 @@ def _apply_env_overrides(config: SttConfig) -> SttConfig:
     hf_token = os.environ.get("HF_TOKEN")
     if hf_token:
         overrides["hf_token"] = hf_token
+    if os.environ.get("STT_OFFLINE", "").lower() in ("1", "true", "yes"):
+        overrides["offline"] = True
     if overrides:
         return replace(config, **overrides)
     return config
 
 
-def load_config(path: Path | None = None) -> SttConfig:
-    if path is None:
-        env_path = os.environ.get("STT_CONFIG")
-        if env_path:
-            path = Path(env_path)
+def default_config_path() -> Path:
+    """``$STT_CONFIG`` if set, else ``./config.yaml``."""
+    env_path = os.environ.get("STT_CONFIG")
+    return Path(env_path) if env_path else Path("config.yaml")
+
 
+def load_config(path: Path | None = None) -> SttConfig:
     if path is None:
-        cwd_config = Path("config.yaml")
-        if cwd_config.exists():
-            path = cwd_config
+        path = default_config_path()
 
-    if path is None or not path.exists():
+    if not path.exists():
         return _apply_env_overrides(SttConfig())
 
     with open(path) as f:
@@ -72,6 +100,8 @@ def load_config(path: Path | None = None) -> SttConfig:
 
     diarization = data.pop("diarization", None)
     whisper = data.pop("whisper", None)
+    threads = data.pop("threads", None)
+    speakers = data.pop("speakers", None)
     kwargs: dict[str, Any] = {}
 
     for key in (
@@ -82,9 +112,19 @@ def load_config(path: Path | None = None) -> SttConfig:
         "compute_type",
         "output_dir",
         "model_dir",
+        "compact_json",
+        "concurrent_export",
+        "fsync",
+        "fsync_group_size",
+        "oom_chunk_seconds",
+        "offline",
+        "memory_interval",
     ):
         if key in data:
             kwargs[key] = data[key]
+    if "oom_ladder" in data:
+        ladder = data["oom_ladder"]
+        kwargs["oom_ladder"] = tuple(ladder) if ladder else ()
 
     if isinstance(diarization, dict):
         if "enabled" in diarization:
@@ -101,13 +141,73 @@ def load_config(path: Path | None = None) -> SttConfig:
             "condition_on_previous_text",
             "hallucination_silence_threshold",
             "use_batched",
+            "cpu_threads",
+            "num_workers",
         ):
             if key in whisper:
                 kwargs[key] = whisper[key]
+        if kwargs.get("batch_size") == "auto":
+            del kwargs["batch_size"]
+            kwargs["auto_batch_size"] = True
+
+    if isinstance(threads, dict):
+        for yaml_key, key in (
+            ("budget", "cpu_budget"),
+            ("diarizer", "diarizer_threads"),
+            ("workers", "workers"),
+            ("worker_index", "worker_index"),
+            ("pin", "pin_cpus"),
+        ):
+            if yaml_key in threads:
+                kwargs[key] = threads[yaml_key]
+
+    if isinstance(speakers, dict):
+        for yaml_key, key in (
+            ("index", "speaker_index"),
+            ("threshold", "speaker_threshold"),
+            ("export_embeddings", "export_speaker_embeddings"),
+        ):
+            if yaml_key in speakers:
+                kwargs[key] = speakers[yaml_key]
 
     return _apply_env_overrides(SttConfig(**kwargs))
 
 
+def profile_yaml(path: Path, profile: dict[str, Any]) -> str:
+    """The YAML document ``save_profile(path, profile)`` would write.
+
+    Top-level keys are replaced; nested sections such as ``whisper`` are
+    updated key by key, so unrelated settings survive. Comments in an
+    existing file are not preserved.
+    """
+    data: dict[str, Any] = {}
+    if path.exists():
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+    for key, value in profile.items():
+        if isinstance(value, dict) and isinstance(data.get(key), dict):
+            data[key] = {**data[key], **value}
+        else:
+            data[key] = value
+    return yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
+
+
+def save_profile(path: Path, profile: dict[str, Any]) -> None:
+    """Merge ``profile`` (``config.yaml`` layout) into the YAML file at ``path``.
+
+    See ``profile_yaml`` for the merge. The file is replaced atomically.
+    """
+    from stt.exporters.atomic import OutputCommitter
+
+    document = profile_yaml(path, profile)
+    if path.parent != Path():
+        path.parent.mkdir(parents=True, exist_ok=True)
+    committer = OutputCommitter("file")
+    with committer.open(path) as f:
+        f.write(document)
+    committer.commit()
+
+
 def resolve_config(
     config: SttConfig,
     *,
@@ -149,6 +249,32 @@ def resolve_config(
     return config
 
 
+def apply_thread_budget(config: SttConfig) -> SttConfig:
+    """Plan and apply this process's thread budget; return the resolved config.
+
+    Pins CPU affinity when ``pin_cpus`` is set and fills in ``cpu_threads``
+    and ``diarizer_threads`` from the worker's share when they are 0.
+    Raises ValueError for an invalid worker layout.
+    """
+    from stt.core.threads import apply_thread_plan, detect_topology, plan_threads
+
+    plan = plan_threads(
+        detect_topology(),
+        budget=config.cpu_budget,
+        workers=config.workers,
+        worker_index=config.worker_index,
+        transcriber_threads=config.cpu_threads,
+        diarizer_threads=config.diarizer_threads,
+        pin=config.pin_cpus,
+    )
+    apply_thread_plan(plan)
+    return replace(
+        config,
+        cpu_threads=plan.transcriber_threads,
+        diarizer_threads=plan.diarizer_threads,
+    )
+
+
 def build_pipeline_config(
     config: SttConfig,
     *,
@@ -157,6 +283,9 @@ def build_pipeline_config(
     """Convert SttConfig to PipelineConfig."""
     from stt.core.pipeline import PipelineConfig
 
+    extra: dict[str, Any] = {}
+    if config.oom_ladder is not None:
+        extra["oom_ladder"] = config.oom_ladder
     return PipelineConfig(
         model_size=config.model,
         device=config.device,
@@ -171,9 +300,25 @@ def build_pipeline_config(
         model_dir=config.model_dir,
         hf_token=config.hf_token,
         batch_size=config.batch_size,
+        auto_batch_size=config.auto_batch_size,
         vad_filter=config.vad_filter,
         condition_on_previous_text=config.condition_on_previous_text,
         hallucination_silence_threshold=config.hallucination_silence_threshold,
         use_subprocess=config.use_subprocess,
         use_batched=config.use_batched,
+        cpu_threads=config.cpu_threads,
+        num_workers=config.num_workers,
+        diarizer_threads=config.diarizer_threads,
+        compact_json=config.compact_json,
+        concurrent_export=config.concurrent_export,
+        fsync=config.fsync,
+        fsync_group_size=config.fsync_group_size,
+        oom_chunk_seconds=config.oom_chunk_seconds,
+        offline=config.offline,
+        speaker_index=config.speaker_index,
+        speaker_threshold=config.speaker_threshold,
+        export_speaker_embeddings=config.export_speaker_embeddings,
+        profiler=config.profiler,
+        memory_interval=config.memory_interval,
+        **extra,
     )
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
-from dataclasses import replace
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import overload
 
-from stt.core.diarizer import DiarizationResult
-from stt.data_models import Segment
+from stt.core.diarizer import DiarizationResult, DiarizationTurn
+from stt.data_models import Segment, SegmentTable
+
+# Slack for float error when bounding the turn search window.
+_EPS = 1e-9
 
 
 def _compute_overlap(
@@ -17,30 +22,98 @@ def _compute_overlap(
     return max(0.0, overlap_end - overlap_start)
 
 
+def _nearest_speaker(
+    seg_start: float, seg_end: float, turns: Sequence[DiarizationTurn],
+) -> str | None:
+    best_speaker: str | None = None
+    min_dist = float("inf")
+    for turn in turns:
+        dist = min(abs(seg_start - turn.end), abs(seg_end - turn.start))
+        if dist < min_dist:
+            min_dist = dist
+            best_speaker = turn.speaker
+    return best_speaker
+
+
+def assign_speakers(
+    starts: Sequence[float],
+    ends: Sequence[float],
+    turns: Sequence[DiarizationTurn],
+) -> list[str | None]:
+    """Pick a speaker for each (start, end) interval.
+
+    The turn with the largest overlap wins (earliest turn on ties); with no
+    overlap, the nearest turn does. Turns are indexed by start time so each
+    segment only examines turns that can overlap it.
+    """
+    if not turns:
+        return [None] * len(starts)
+    order = sorted(range(len(turns)), key=lambda k: turns[k].start)
+    turn_starts = [turns[k].start for k in order]
+    max_len = max(t.end - t.start for t in turns)
+
+    speakers: list[str | None] = []
+    for seg_start, seg_end in zip(starts, ends, strict=True):
+        lo = bisect_left(turn_starts, seg_start - max_len - _EPS)
+        hi = bisect_left(turn_starts, seg_end, lo=lo)
+        best_k = -1
+        best_overlap = 0.0
+        for j in range(lo, hi):
+            k = order[j]
+            turn = turns[k]
+            overlap = _compute_overlap(seg_start, seg_end, turn.start, turn.end)
+            if overlap > best_overlap or (
+                overlap > 0.0 and overlap == best_overlap and k < best_k
+            ):
+                best_overlap = overlap
+                best_k = k
+        if best_k >= 0:
+            speakers.append(turns[best_k].speaker)
+        else:
+            speakers.append(_nearest_speaker(seg_start, seg_end, turns))
+    return speakers
+
+
+@overload
+def align_segments(
+    segments: SegmentTable, diarization: DiarizationResult
+) -> SegmentTable: ...
+
+
+@overload
 def align_segments(
     segments: list[Segment], diarization: DiarizationResult
-) -> list[Segment]:
-    """Assign speakers to segments based on diarization turns."""
+) -> list[Segment]: ...
+
+
+def align_segments(
+    segments: list[Segment] | SegmentTable, diarization: DiarizationResult
+) -> list[Segment] | SegmentTable:
+    """Assign speakers to segments based on diarization turns.
+
+    A ``SegmentTable`` yields a new table that shares the time, text and
+    confidence columns with the input; a list yields new ``Segment``
+    objects. The input is never modified.
+    """
+    if isinstance(segments, SegmentTable):
+        if not diarization.turns:
+            return segments.with_speakers(
+                segments.speaker(i) for i in range(len(segments))
+            )
+        return segments.with_speakers(
+            assign_speakers(segments.starts, segments.ends, diarization.turns)
+        )
     if not segments:
         return []
     if not diarization.turns:
-        return [replace(seg) for seg in segments]
-
-    result: list[Segment] = []
-    for seg in segments:
-        best_speaker: str | None = None
-        best_overlap = 0.0
-        for turn in diarization.turns:
-            overlap = _compute_overlap(seg.start, seg.end, turn.start, turn.end)
-            if overlap > best_overlap:
-                best_overlap = overlap
-                best_speaker = turn.speaker
-        if best_speaker is None:
-            min_dist = float("inf")
-            for turn in diarization.turns:
-                dist = min(abs(seg.start - turn.end), abs(seg.end - turn.start))
-                if dist < min_dist:
-                    min_dist = dist
-                    best_speaker = turn.speaker
-        result.append(replace(seg, speaker=best_speaker))
-    return result
+        speakers: list[str | None] = [seg.speaker for seg in segments]
+    else:
+        speakers = assign_speakers(
+            [seg.start for seg in segments],
+            [seg.end for seg in segments],
+            diarization.turns,
+        )
+    return [
+        Segment(seg.start, seg.end, seg.text, speaker, seg.confidence)
+        for seg, speaker in zip(segments, speakers, strict=True)
+    ]
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import logging
+import os
+import struct
 import subprocess
 import tempfile
+import wave
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -34,9 +37,14 @@ class PreprocessedAudio:
     """Holds the path to a preprocessed WAV file and handles cleanup."""
 
     path: Path
+    # False when ``path`` is the caller's own file (already in the target
+    # format); cleanup then leaves it alone.
+    temporary: bool = True
 
     def cleanup(self) -> None:
         """Remove the temporary preprocessed file. Safe to call multiple times."""
+        if not self.temporary:
+            return
         try:
             self.path.unlink(missing_ok=True)
         except OSError:
@@ -44,24 +52,153 @@ class PreprocessedAudio:
 
 
 _FFMPEG_TIMEOUT = 300
+TARGET_SAMPLE_RATE = 16000
+# Plain PCM only: WAVE_FORMAT_EXTENSIBLE is not readable by the ``wave``
+# module that packing and OOM chunking use, so it still goes through ffmpeg.
+_WAVE_FORMAT_PCM = 0x0001
+_MAX_WAV_CHUNKS = 64
 
 
-def preprocess_audio(source: Path) -> PreprocessedAudio:
-    """Convert audio to WAV 16kHz mono PCM_S16LE via ffmpeg.
+def is_target_wav(path: Path) -> bool:
+    """True if ``path`` is already a 16 kHz mono 16-bit PCM WAV.
 
-    Always converts regardless of source format to guarantee a consistent
-    input for both faster-whisper and pyannote.
+    Reads only the RIFF chunk headers. A header whose data size does not
+    fit the file (e.g. a recorder that never finalized it) does not
+    qualify, so ffmpeg gets to repair it.
+    """
+    try:
+        with open(path, "rb") as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+                return False
+            file_size = path.stat().st_size
+            fmt_ok = False
+            for _ in range(_MAX_WAV_CHUNKS):
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+                if chunk_id == b"fmt ":
+                    fmt = f.read(size)
+                    if len(fmt) < 16:
+                        return False
+                    tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+                    if (tag, channels, rate, bits) != (
+                        _WAVE_FORMAT_PCM, 1, TARGET_SAMPLE_RATE, 16,
+                    ):
+                        return False
+                    fmt_ok = True
+                    if size % 2:
+                        f.seek(1, 1)
+                elif chunk_id == b"data":
+                    return (
+                        fmt_ok and 0 < size and size % 2 == 0
+                        and f.tell() + size <= file_size
+                    )
+                else:
+                    f.seek(size + size % 2, 1)
+    except (OSError, struct.error):
+        return False
+    return False
+
+
+_FFPROBE_TIMEOUT = 30
+
+
+def probe_duration(path: Path) -> float | None:
+    """Duration of ``path`` in seconds without decoding it, or None if unknown.
+
+    A target-format WAV is measured from its header; anything else asks
+    ffprobe for the container duration.
     """
-    fd, tmp_path_str = tempfile.mkstemp(suffix=".wav", dir=source.parent)
-    # Close the fd immediately — ffmpeg will write to the path directly.
-    import os
+    if is_target_wav(path):
+        with wave.open(str(path), "rb") as wf:
+            return wf.getnframes() / float(wf.getframerate())
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(path),
+    ]
+    try:
+        result = subprocess.run(
+            cmd, capture_output=True, timeout=_FFPROBE_TIMEOUT, check=False,
+        )
+        return float(result.stdout.decode().strip()) if result.returncode == 0 else None
+    except (OSError, subprocess.TimeoutExpired, ValueError):
+        return None
 
+
+def _temp_wav(source: Path) -> Path:
+    # Hidden prefix so directory scanners (batch, watch) never pick it up.
+    fd, tmp_path_str = tempfile.mkstemp(
+        suffix=".wav", prefix=".stt_", dir=source.parent,
+    )
+    # Close the fd immediately — the writer opens the path itself.
     os.close(fd)
-    tmp_path = Path(tmp_path_str)
+    return Path(tmp_path_str)
 
-    cmd = [
-        "ffmpeg",
-        "-i", str(source),
+
+def _slice_wav(source: Path, start: float, end: float | None) -> Path:
+    """Copy [start, end) of a target-format WAV to a temp file (header seek, no decode)."""
+    tmp_path = _temp_wav(source)
+    try:
+        with wave.open(str(source), "rb") as src:
+            rate = src.getframerate()
+            first = min(int(start * rate), src.getnframes())
+            last = src.getnframes() if end is None else min(int(end * rate), src.getnframes())
+            src.setpos(first)
+            with wave.open(str(tmp_path), "wb") as dst:
+                dst.setparams(src.getparams())
+                remaining = max(0, last - first)
+                while remaining:
+                    frames = src.readframes(min(remaining, rate * 60))
+                    if not frames:
+                        break
+                    dst.writeframes(frames)
+                    remaining -= len(frames) // 2
+    except (OSError, wave.Error) as e:
+        tmp_path.unlink(missing_ok=True)
+        raise AudioPreprocessError(f"Failed to cut {source.name}: {e}") from e
+    return tmp_path
+
+
+def preprocess_audio(
+    source: Path, *, start: float | None = None, end: float | None = None,
+) -> PreprocessedAudio:
+    """Convert audio to WAV 16kHz mono PCM_S16LE via ffmpeg.
+
+    A source that already is such a WAV (see ``is_target_wav``) is used
+    as-is, skipping the ffmpeg process and the copy; everything else is
+    converted to guarantee a consistent input for both faster-whisper and
+    pyannote.
+
+    ``start``/``end`` (seconds) keep only that window: ffmpeg seeks the
+    input instead of decoding up to it, and a target-format WAV is cut by
+    frame offset. Timestamps in the result are relative to ``start``.
+    """
+    if start is not None and start < 0:
+        raise ValueError(f"start must be >= 0, got {start}")
+    if end is not None and end <= (start or 0.0):
+        raise ValueError(f"end ({end}) must be greater than start ({start or 0.0})")
+    ranged = start is not None or end is not None
+
+    if is_target_wav(source):
+        if not ranged:
+            logger.debug("%s is already 16 kHz mono PCM; skipping ffmpeg", source.name)
+            return PreprocessedAudio(path=source, temporary=False)
+        return PreprocessedAudio(path=_slice_wav(source, start or 0.0, end))
+
+    tmp_path = _temp_wav(source)
+
+    cmd = ["ffmpeg"]
+    if start:
+        # Before -i: seek the input rather than decode and discard.
+        cmd += ["-ss", f"{start:.3f}"]
+    cmd += ["-i", str(source)]
+    if end is not None:
+        cmd += ["-t", f"{end - (start or 0.0):.3f}"]
+    cmd += [
         "-ar", "16000",
         "-ac", "1",
         "-c:a", "pcm_s16le",
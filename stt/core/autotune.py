@@ -0,0 +1,244 @@
+"""Pick the throughput-maximizing batch size for batched inference.
+
+Probes run the loaded model on a calibration clip at increasing batch
+sizes. Each probe clip is the first ``clip_seconds`` of real audio
+repeated ``batch_size`` times, so the VAD yields roughly one chunk per
+batch slot and every batch is full. Probing stops at the first OOM, when
+free device memory falls below ``min_free_fraction`` (a long file would
+leave no headroom), or when throughput stops improving. The winner is
+persisted per (model, compute_type, device) so later runs start tuned.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+import time
+import wave
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field, replace
+from datetime import UTC, datetime
+from pathlib import Path
+
+from stt.core.gpu_utils import cuda_free_fraction, device_label, log_gpu_memory
+from stt.core.oom import is_oom
+from stt.core.transcriber import Transcriber, TranscriberConfig
+from stt.exporters.atomic import OutputCommitter
+
+logger = logging.getLogger(__name__)
+
+TUNING_FILE = "batch_size_tuning.json"
+BATCH_CANDIDATES: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64)
+DEFAULT_CLIP_SECONDS = 30.0
+# Stop once a larger batch is less than this much faster than the best.
+DEFAULT_MIN_GAIN = 0.05
+# Reject batch sizes that leave less than this fraction of VRAM free.
+DEFAULT_MIN_FREE_FRACTION = 0.10
+
+_STORE_VERSION = 1
+
+
+@dataclass
+class ProbeResult:
+    batch_size: int
+    audio_seconds: float
+    elapsed_seconds: float
+    free_fraction: float | None = None
+
+    @property
+    def throughput(self) -> float:
+        """Audio seconds transcribed per wall-clock second."""
+        return self.audio_seconds / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class TuningResult:
+    batch_size: int
+    probes: list[ProbeResult] = field(default_factory=list)
+    # Why probing ended: "oom", "memory", "plateau" or "exhausted".
+    stopped: str = "exhausted"
+
+
+def tuning_key(model: str, compute_type: str, device: str) -> str:
+    return f"{model}|{compute_type}|{device_label(device)}"
+
+
+def tuning_path(model_dir: str | None) -> Path:
+    """The tuning store lives next to the models it was measured with."""
+    return Path(model_dir).expanduser() / TUNING_FILE if model_dir else Path(TUNING_FILE)
+
+
+class TuningStore:
+    """JSON file of tuned batch sizes keyed by ``tuning_key``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _load(self) -> dict[str, dict[str, object]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable tuning file %s: %s", self.path, e)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _STORE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str) -> int | None:
+        entry = self._load().get(key)
+        if isinstance(entry, dict):
+            size = entry.get("batch_size")
+            if isinstance(size, int) and size >= 1:
+                return size
+        return None
+
+    def put(self, key: str, result: TuningResult) -> None:
+        entries = self._load()
+        best = next(
+            (p for p in result.probes if p.batch_size == result.batch_size), None,
+        )
+        entries[key] = {
+            "batch_size": result.batch_size,
+            "throughput": round(best.throughput, 3) if best else None,
+            "stopped": result.stopped,
+            "tuned_at": datetime.now(UTC).isoformat(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        committer = OutputCommitter("file")
+        with committer.open(self.path) as f:
+            json.dump(
+                {"version": _STORE_VERSION, "entries": entries}, f,
+                ensure_ascii=False, indent=2,
+            )
+        committer.commit()
+
+
+def persisted_batch_size(config: TranscriberConfig) -> int | None:
+    """Tuned batch size stored for ``config``'s model/compute_type/device."""
+    return TuningStore(tuning_path(config.model_dir)).get(
+        tuning_key(config.model_size, config.compute_type, config.device),
+    )
+
+
+def select_batch_size(
+    probe: Callable[[int], ProbeResult],
+    candidates: Sequence[int] = BATCH_CANDIDATES,
+    *,
+    min_gain: float = DEFAULT_MIN_GAIN,
+    min_free_fraction: float = DEFAULT_MIN_FREE_FRACTION,
+) -> TuningResult:
+    """Probe ``candidates`` in increasing order and keep the fastest.
+
+    ``probe`` raises an OOM error (see ``stt.core.oom.is_oom``) when a batch
+    size does not fit; other errors propagate.
+    """
+    if not candidates:
+        raise ValueError("No batch size candidates to probe")
+    probes: list[ProbeResult] = []
+    best: ProbeResult | None = None
+    stopped = "exhausted"
+    for size in sorted(candidates):
+        try:
+            result = probe(size)
+        except Exception as e:
+            if not is_oom(e):
+                raise
+            logger.info("batch_size=%d ran out of memory; stopping", size)
+            stopped = "oom"
+            break
+        probes.append(result)
+        logger.info(
+            "batch_size=%d: %.1fx realtime, free memory %s",
+            size, result.throughput,
+            "n/a" if result.free_fraction is None else f"{result.free_fraction:.0%}",
+        )
+        if result.free_fraction is not None and result.free_fraction < min_free_fraction:
+            stopped = "memory"
+            break
+        if best is not None and result.throughput < best.throughput * (1 + min_gain):
+            # A marginal gain is not worth the extra memory on long files.
+            stopped = "plateau"
+            break
+        best = result
+    if best is None:
+        # Even the smallest size failed; fall back to it and let the OOM
+        # ladder deal with the real file.
+        best_size = min(candidates)
+    else:
+        best_size = best.batch_size
+    return TuningResult(batch_size=best_size, probes=probes, stopped=stopped)
+
+
+def _write_probe_clip(
+    frames: bytes, src: wave.Wave_read, repeats: int, path: Path,
+) -> float:
+    """Write ``frames`` ``repeats`` times to ``path``; return its duration."""
+    with wave.open(str(path), "wb") as dst:
+        dst.setparams(src.getparams())
+        for _ in range(repeats):
+            dst.writeframes(frames)
+    frame_count = len(frames) // (src.getsampwidth() * src.getnchannels())
+    return repeats * frame_count / src.getframerate()
+
+
+def autotune_batch_size(
+    config: TranscriberConfig,
+    wav_path: str,
+    *,
+    candidates: Sequence[int] = BATCH_CANDIDATES,
+    clip_seconds: float = DEFAULT_CLIP_SECONDS,
+    min_gain: float = DEFAULT_MIN_GAIN,
+    min_free_fraction: float = DEFAULT_MIN_FREE_FRACTION,
+    clock: Callable[[], float] = time.perf_counter,
+) -> TuningResult:
+    """Load a batched transcriber for ``config`` and probe it on ``wav_path``.
+
+    ``wav_path`` must be a preprocessed (PCM WAV) file; only its first
+    ``clip_seconds`` are used. The model is unloaded before returning.
+    Probes are timed with ``clock``.
+    """
+    src = wave.open(wav_path, "rb")
+    with src:
+        frames = src.readframes(int(clip_seconds * src.getframerate()))
+    if not frames:
+        raise ValueError(f"Calibration audio is empty: {wav_path}")
+
+    transcriber = Transcriber(replace(config, use_batched=True))
+    log_gpu_memory("before_autotune_load")
+    transcriber.load_model()
+    try:
+        with tempfile.TemporaryDirectory(prefix=".stt_tune_") as tmp:
+            clip = Path(tmp) / "probe.wav"
+
+            def probe(size: int) -> ProbeResult:
+                audio_seconds = _write_probe_clip(frames, src, size, clip)
+                transcriber.batch_size = size
+                t0 = clock()
+                transcriber.transcribe(str(clip))
+                elapsed = clock() - t0
+                return ProbeResult(size, audio_seconds, elapsed, cuda_free_fraction())
+
+            # Warm-up: the first decode pays for kernel selection and
+            # allocator growth, which would penalize the smallest size.
+            _write_probe_clip(frames, src, 1, clip)
+            transcriber.batch_size = min(candidates)
+            transcriber.transcribe(str(clip))
+
+            result = select_batch_size(
+                probe, candidates,
+                min_gain=min_gain, min_free_fraction=min_free_fraction,
+            )
+    finally:
+        transcriber.unload_model()
+    logger.info(
+        "Tuned batch_size=%d for %s (%s; probes: %s)",
+        result.batch_size,
+        tuning_key(config.model_size, config.compute_type, config.device),
+        result.stopped,
+        json.dumps([asdict(p) for p in result.probes]),
+    )
+    return result
@@ -4,14 +4,35 @@ from __future__ import annotations
 
 import gc
 import logging
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
 import torch
 
-from stt.core.audio import SUPPORTED_EXTENSIONS
-from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.audio import (
+    SUPPORTED_EXTENSIONS,
+    preprocess_audio,
+    probe_duration,
+    validate_audio_file,
+)
+from stt.core.autotune import persisted_batch_size
+from stt.core.langid import AUTO_LANGUAGE
+from stt.core.packing import AudioPack, AudioPackWriter, split_segments, wav_duration
+from stt.core.pipeline import (
+    PipelineConfig,
+    TranscriptionPipeline,
+    build_transcriber_config,
+)
+from stt.core.tracing import span
+from stt.core.transcriber import Transcriber
+from stt.data_models import TranscriptMetadata, TranscriptResult
 from stt.exit_codes import ExitCode
+from stt.exporters import export_transcript
+from stt.exporters.atomic import OutputCommitter
+from stt.exporters.jsonl_export import JsonlWriter
+from stt.exporters.parquet_export import ParquetDatasetWriter, dataset_sources
 
 logger = logging.getLogger(__name__)
 
@@ -60,14 +81,53 @@ class BatchResult:
         return ExitCode.ERROR_GENERAL
 
 
+def resolve_output_dir(
+    audio_file: Path, output_dir: Path, input_base: Path | None = None,
+) -> Path:
+    """Mirror the input subdirectory of ``audio_file`` under ``output_dir``."""
+    if input_base is not None:
+        try:
+            return output_dir / audio_file.parent.relative_to(input_base)
+        except ValueError:
+            return output_dir
+    return output_dir
+
+
+def outputs_exist(audio_file: Path, file_output_dir: Path, formats: str) -> bool:
+    """Return True if every requested format already exists for the file."""
+    stem = audio_file.stem
+    fmts = [f.strip() for f in formats.split(",") if f.strip()]
+    return bool(fmts) and all(
+        (file_output_dir / f"{stem}.{fmt}").exists() for fmt in fmts
+    )
+
+
+_PACK_GUARD_SECONDS = 1.0
+_MAX_PACK_SECONDS = 600.0
+
+
+@dataclass
+class _PackOutcome:
+    succeeded: int = 0
+    failed: int = 0
+    errors: list[tuple[Path, str]] = field(default_factory=list)
+    leftover: list[Path] = field(default_factory=list)
+
+
 class BatchRunner:
     def __init__(
         self,
         pipeline_config: PipelineConfig,
         skip_existing: bool = False,
+        pack_short: float | None = None,
+        dataset_dir: Path | None = None,
+        jsonl: JsonlWriter | None = None,
     ) -> None:
         self._config = pipeline_config
         self._skip_existing = skip_existing
+        self._pack_short = pack_short
+        self._dataset_dir = dataset_dir
+        self._jsonl = jsonl
 
     def run(
         self,
@@ -79,51 +139,81 @@ class BatchRunner:
         failed = 0
         errors: list[tuple[Path, str]] = []
 
-        pipeline = TranscriptionPipeline(self._config)
-
+        in_dataset = (
+            dataset_sources(self._dataset_dir)
+            if self._skip_existing and self._dataset_dir is not None else set()
+        )
+        pending: list[Path] = []
         for audio_file in files:
-            # Determine output subdirectory
-            if input_base is not None:
-                try:
-                    rel = audio_file.parent.relative_to(input_base)
-                    file_output_dir = output_dir / rel
-                except ValueError:
-                    file_output_dir = output_dir
-            else:
-                file_output_dir = output_dir
-
-            # Check skip-existing
-            if self._skip_existing:
-                fmt_list = [
-                    f.strip()
-                    for f in self._config.formats.split(",")
-                ]
-                stem = audio_file.stem
-                all_exist = all(
-                    (file_output_dir / f"{stem}.{fmt}").exists()
-                    for fmt in fmt_list
-                )
-                if all_exist:
-                    succeeded += 1
-                    continue
+            file_output_dir = resolve_output_dir(audio_file, output_dir, input_base)
+            if self._skip_existing and (
+                outputs_exist(audio_file, file_output_dir, self._config.formats)
+                or (self._jsonl is not None and str(audio_file) in self._jsonl.completed)
+                or str(audio_file) in in_dataset
+            ):
+                succeeded += 1
+                continue
+            pending.append(audio_file)
 
-            # Run pipeline with per-file output_dir
-            needs_cleanup = False
-            try:
-                pipeline.run(
-                    str(audio_file),
-                    output_dir=str(file_output_dir),
+        # One committer for the whole batch so "group" fsync mode amortizes
+        # fsync over many files; whatever is pending is committed at the end.
+        committer = OutputCommitter(
+            self._config.fsync, self._config.fsync_group_size,
+        )
+        dataset = (
+            ParquetDatasetWriter(self._dataset_dir)
+            if self._dataset_dir is not None else None
+        )
+
+        def on_result(result: TranscriptResult) -> None:
+            if self._jsonl is not None:
+                self._jsonl.write(result)
+            if dataset is not None:
+                dataset.append(result)
+        try:
+            pipeline = TranscriptionPipeline(self._config, committer=committer)
+            languages: dict[Path, str] = {}
+            if self._config.language == AUTO_LANGUAGE and pending:
+                languages = self._identify_languages(pipeline, pending)
+                # Group files by language: packs never mix languages.
+                pending.sort(key=lambda f: languages.get(f, AUTO_LANGUAGE))
+
+            if self._pack_short is not None and pending:
+                packed = self._run_packed(
+                    pending, output_dir, input_base, committer, on_result, languages,
                 )
-                succeeded += 1
-            except Exception as e:
-                failed += 1
-                errors.append((audio_file, str(e)))
-                logger.error("Failed %s: %s", audio_file, e, exc_info=True)
-                needs_cleanup = True
-            if needs_cleanup:
-                gc.collect()
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+                succeeded += packed.succeeded
+                failed += packed.failed
+                errors.extend(packed.errors)
+                pending = packed.leftover
+
+            for audio_file in pending:
+                file_output_dir = resolve_output_dir(audio_file, output_dir, input_base)
+
+                # Run pipeline with per-file output_dir
+                needs_cleanup = False
+                try:
+                    result = pipeline.run(
+                        str(audio_file),
+                        output_dir=str(file_output_dir),
+                    )
+                    on_result(result)
+                    succeeded += 1
+                except Exception as e:
+                    failed += 1
+                    errors.append((audio_file, str(e)))
+                    logger.error("Failed %s: %s", audio_file, e, exc_info=True)
+                    needs_cleanup = True
+                if needs_cleanup:
+                    gc.collect()
+                    if torch.cuda.is_available():
+                        torch.cuda.empty_cache()
+        finally:
+            committer.commit()
+            if self._jsonl is not None:
+                self._jsonl.flush()
+            if dataset is not None:
+                dataset.close()
 
         return BatchResult(
             total=len(files),
@@ -131,3 +221,175 @@ class BatchRunner:
             failed=failed,
             errors=errors,
         )
+
+    def _identify_languages(
+        self, pipeline: TranscriptionPipeline, files: list[Path],
+    ) -> dict[Path, str]:
+        detections = pipeline.detect_languages([str(f) for f in files])
+        languages = {
+            f: detections[str(f)].language for f in files if str(f) in detections
+        }
+        counts: dict[str, int] = {}
+        for language in languages.values():
+            counts[language] = counts.get(language, 0) + 1
+        logger.info(
+            "Languages: %s",
+            ", ".join(f"{lang} {n}" for lang, n in sorted(counts.items())) or "none",
+        )
+        return languages
+
+    def _run_packed(
+        self,
+        files: list[Path],
+        output_dir: Path,
+        input_base: Path | None,
+        committer: OutputCommitter,
+        on_result: Callable[[TranscriptResult], None] | None = None,
+        languages: dict[Path, str] | None = None,
+    ) -> _PackOutcome:
+        """Transcribe short clips as packs; return files too long to pack.
+
+        Packs skip diarization: the point is amortizing per-call overhead on
+        clips of a few seconds, where speaker turns carry little signal.
+        With ``languages`` (files sorted by it) each pack holds one language.
+        """
+        assert self._pack_short is not None
+        outcome = _PackOutcome()
+        transcriber: Transcriber | None = None
+        writer: AudioPackWriter | None = None
+        pack_language = self._config.language
+
+        def flush() -> None:
+            nonlocal transcriber, writer
+            if writer is None:
+                return
+            pack = writer.close()
+            writer = None
+            try:
+                if transcriber is None:
+                    config = build_transcriber_config(self._config)
+                    if self._config.auto_batch_size and config.use_batched:
+                        # Packs are short-lived; reuse a tuned value, never probe.
+                        tuned = persisted_batch_size(config)
+                        if tuned is not None:
+                            config = replace(config, batch_size=tuned)
+                    transcriber = Transcriber(config)
+                    transcriber.load_model()
+                transcriber.language = pack_language
+                self._transcribe_pack(
+                    transcriber, pack, output_dir, input_base, committer,
+                    outcome, on_result,
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed pack of %d clips: %s", len(pack.entries), e,
+                    exc_info=True,
+                )
+                for entry in pack.entries:
+                    outcome.failed += 1
+                    outcome.errors.append((entry.source, str(e)))
+            finally:
+                pack.cleanup()
+
+        try:
+            for audio_file in files:
+                try:
+                    validate_audio_file(audio_file)
+                    # Too long to pack: leave the decode to the single-file
+                    # path instead of doing it twice.
+                    duration = probe_duration(audio_file)
+                    if duration is not None and duration > self._pack_short:
+                        outcome.leftover.append(audio_file)
+                        continue
+                    with span("decode", file=str(audio_file)):
+                        preprocessed = preprocess_audio(audio_file)
+                except Exception as e:
+                    outcome.failed += 1
+                    outcome.errors.append((audio_file, str(e)))
+                    logger.error("Failed %s: %s", audio_file, e)
+                    continue
+                try:
+                    if wav_duration(preprocessed.path) > self._pack_short:
+                        outcome.leftover.append(audio_file)
+                        continue
+                    language = (languages or {}).get(audio_file, self._config.language)
+                    if language != pack_language:
+                        flush()
+                        pack_language = language
+                    if writer is None:
+                        writer = AudioPackWriter(_PACK_GUARD_SECONDS)
+                    writer.add(audio_file, preprocessed.path)
+                except Exception as e:
+                    outcome.failed += 1
+                    outcome.errors.append((audio_file, str(e)))
+                    logger.error("Failed %s: %s", audio_file, e)
+                finally:
+                    preprocessed.cleanup()
+                if writer is not None and writer.duration >= _MAX_PACK_SECONDS:
+                    flush()
+            flush()
+        finally:
+            if writer is not None:
+                writer.discard()
+            if transcriber is not None:
+                try:
+                    transcriber.unload_model()
+                except Exception:
+                    logger.exception("Failed to unload transcriber")
+        return outcome
+
+    def _transcribe_pack(
+        self,
+        transcriber: Transcriber,
+        pack: AudioPack,
+        output_dir: Path,
+        input_base: Path | None,
+        committer: OutputCommitter,
+        outcome: _PackOutcome,
+        on_result: Callable[[TranscriptResult], None] | None = None,
+    ) -> None:
+        t0 = time.monotonic()
+        with span(
+            "pack", clips=len(pack.entries), audio_seconds=pack.duration,
+            language=transcriber.language,
+        ):
+            # Word timings let split_segments cut segments that run on
+            # from one clip into the next.
+            segments, words = transcriber.transcribe_words(str(pack.path))
+        elapsed = time.monotonic() - t0
+        logger.info(
+            "Pack of %d clips (%.1fs audio) transcribed in %.1fs",
+            len(pack.entries), pack.duration, elapsed,
+        )
+        per_clip = split_segments(segments, pack.entries, words)
+        total_audio = sum(e.duration for e in pack.entries) or 1.0
+        for entry in pack.entries:
+            try:
+                metadata = TranscriptMetadata(
+                    source_file=str(entry.source),
+                    duration_seconds=entry.duration,
+                    model=self._config.model_size,
+                    language=transcriber.language,
+                    diarization=False,
+                    num_speakers=0,
+                    processing_time_seconds=elapsed * entry.duration / total_audio,
+                )
+                result = TranscriptResult(
+                    metadata=metadata, segments=per_clip[entry.source],
+                )
+                with span("export", file=str(entry.source)):
+                    export_transcript(
+                        result,
+                        self._config.formats,
+                        resolve_output_dir(entry.source, output_dir, input_base),
+                        compact_json=self._config.compact_json,
+                        concurrent=self._config.concurrent_export,
+                        committer=committer,
+                    )
+                if on_result is not None:
+                    on_result(result)
+                outcome.succeeded += 1
+            except Exception as e:
+                outcome.failed += 1
+                outcome.errors.append((entry.source, str(e)))
+                logger.error("Failed %s: %s", entry.source, e, exc_info=True)
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import importlib
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -11,10 +12,11 @@ import torch
 from pyannote.audio import Pipeline
 
 from stt.core.gpu_utils import cleanup_gpu_memory
+from stt.core.registry import DIARIZATION, ModelRegistry
 from stt.exceptions import CudaOomError, DiarizationError, ModelError
 
 
-@dataclass
+@dataclass(slots=True)
 class DiarizationTurn:
     start: float
     end: float
@@ -25,6 +27,8 @@ class DiarizationTurn:
 class DiarizationResult:
     turns: list[DiarizationTurn]
     num_speakers: int
+    # Speaker label -> embedding, when the pipeline provides them.
+    embeddings: dict[str, list[float]] = field(default_factory=dict)
 
 
 @dataclass
@@ -35,6 +39,14 @@ class DiarizerConfig:
     model_name: str = "pyannote/speaker-diarization-3.1"
     cache_dir: str | None = None
     hf_token: str | None = None
+    # None keeps pyannote's defaults (CPU placement, batch size 32).
+    device: str | None = None
+    embedding_batch_size: int | None = None
+    segmentation_batch_size: int | None = None
+    # torch intra-op threads; None keeps the process setting.
+    num_threads: int | None = None
+    # Load only models recorded in the registry (stt.core.registry).
+    offline: bool = False
 
 
 class PyannoteDiarizer:
@@ -51,17 +63,40 @@ class PyannoteDiarizer:
             return False
 
     def load_model(self) -> None:
+        if self._config.num_threads:
+            torch.set_num_threads(self._config.num_threads)
+        local = ModelRegistry(self._config.cache_dir).resolve(
+            DIARIZATION, self._config.model_name, required=self._config.offline,
+        )
         try:
             kwargs: dict[str, Any] = {}
-            if self._config.cache_dir is not None:
-                kwargs["cache_dir"] = str(
-                    Path(self._config.cache_dir).expanduser().resolve()
-                )
-            if self._config.hf_token:
-                kwargs["token"] = self._config.hf_token
-            self._pipeline = Pipeline.from_pretrained(
-                self._config.model_name, **kwargs,
+            if local is None:
+                if self._config.cache_dir is not None:
+                    kwargs["cache_dir"] = str(
+                        Path(self._config.cache_dir).expanduser().resolve()
+                    )
+                if self._config.hf_token:
+                    kwargs["token"] = self._config.hf_token
+            pipeline = Pipeline.from_pretrained(
+                local or self._config.model_name, **kwargs,
             )
+            if pipeline is None:
+                # pyannote logs and returns None for a gated model it
+                # cannot fetch instead of raising.
+                raise ModelError(
+                    f"Failed to load diarization model: {self._config.model_name} "
+                    "is not available (accept its conditions on the Hub and "
+                    "set hf_token)"
+                )
+            for attr in ("embedding_batch_size", "segmentation_batch_size"):
+                value = getattr(self._config, attr)
+                if value is not None and hasattr(pipeline, attr):
+                    setattr(pipeline, attr, value)
+            if self._config.device is not None:
+                pipeline.to(torch.device(self._config.device))
+            self._pipeline = pipeline
+        except ModelError:
+            raise
         except Exception as e:
             raise ModelError(f"Failed to load diarization model: {e}") from e
 
@@ -95,4 +130,25 @@ class PyannoteDiarizer:
                 DiarizationTurn(start=turn.start, end=turn.end, speaker=speaker)
             )
             speakers.add(speaker)
-        return DiarizationResult(turns=turns, num_speakers=len(speakers))
+        return DiarizationResult(
+            turns=turns,
+            num_speakers=len(speakers),
+            embeddings=_speaker_embeddings(annotation, result),
+        )
+
+
+def _speaker_embeddings(annotation: Any, result: Any) -> dict[str, list[float]]:
+    """Per-speaker embeddings from a pyannote 4.x ``DiarizeOutput``.
+
+    Rows follow ``annotation.labels()``; rows with NaNs (speakers too short
+    to embed) are dropped.
+    """
+    vectors = getattr(result, "speaker_embeddings", None)
+    if vectors is None:
+        return {}
+    embeddings: dict[str, list[float]] = {}
+    for label, row in zip(annotation.labels(), vectors, strict=False):
+        values = [float(x) for x in row]
+        if all(math.isfinite(x) for x in values):
+            embeddings[label] = values
+    return embeddings
@@ -47,3 +47,22 @@ def configure_cuda_allocator() -> None:
     value = ",".join(f"{k}:{v}" for k, v in merged.items())
     os.environ["PYTORCH_CUDA_ALLOC_CONF"] = value
     logger.info("PYTORCH_CUDA_ALLOC_CONF=%s", value)
+
+
+def cuda_free_fraction() -> float | None:
+    """Fraction of device memory currently free, or None without CUDA.
+
+    Uses the driver's view (``cudaMemGetInfo``), so memory held by
+    CTranslate2 is counted, not just torch's allocator.
+    """
+    if not torch.cuda.is_available():
+        return None
+    free, total = torch.cuda.mem_get_info()
+    return free / total if total else None
+
+
+def device_label(device: str) -> str:
+    """Device name for keying per-hardware settings, e.g. ``cuda:NVIDIA A100``."""
+    if device.startswith("cuda") and torch.cuda.is_available():
+        return f"cuda:{torch.cuda.get_device_name()}"
+    return device
@@ -0,0 +1,264 @@
+"""Incremental transcription of a recording that keeps growing.
+
+Each run transcribes only the audio after the last committed timestamp,
+starting ``overlap`` seconds earlier so the VAD and decoder see the lead-in,
+and merges the new segments into the existing outputs. State between runs
+lives in a checkpoint next to the outputs:
+
+- the committed segments and the time they reach;
+- the tail of the committed text, used as the decoder prompt;
+- one centroid embedding per speaker, so the labels of a new window's
+  diarization map back onto the speakers already in the transcript.
+
+Segments that end within ``tail_guard`` seconds of the current end of the
+audio are written out but not committed: the recorder may still be in
+the middle of that utterance, so the next run transcribes them again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from stt.core.pipeline import TranscriptionPipeline
+from stt.data_models import Segment, SegmentTable, TranscriptResult
+from stt.exporters.atomic import OutputCommitter
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+DEFAULT_OVERLAP_SECONDS = 5.0
+DEFAULT_TAIL_GUARD_SECONDS = 2.0
+# Cosine similarity above which a window's speaker is a known speaker.
+DEFAULT_SPEAKER_THRESHOLD = 0.5
+_PROMPT_CHARS = 200
+_CHECKPOINT_VERSION = 1
+# Window-local diarizer labels; anything else is an enrolled name
+# (--speaker-index) and already the same across windows.
+_DIARIZER_LABEL = re.compile(r"^SPEAKER_\d+$")
+
+
+@dataclass
+class Checkpoint:
+    source_file: str
+    model: str
+    language: str
+    # Source size at the last run; a smaller file means a new recording.
+    source_size: int = 0
+    committed_until: float = 0.0
+    segments: list[Segment] = field(default_factory=list)
+    prompt: str = ""
+    # Speaker label -> centroid embedding and the number of windows in it.
+    speakers: dict[str, list[float]] = field(default_factory=dict)
+    speaker_weights: dict[str, int] = field(default_factory=dict)
+
+
+def checkpoint_path(output_dir: Path, audio_path: Path) -> Path:
+    return output_dir / f"{audio_path.stem}{CHECKPOINT_SUFFIX}"
+
+
+def load_checkpoint(path: Path) -> Checkpoint | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+        return None
+    if not isinstance(data, dict) or data.pop("version", None) != _CHECKPOINT_VERSION:
+        return None
+    try:
+        data["segments"] = [Segment(**s) for s in data.get("segments", [])]
+        return Checkpoint(**data)
+    except (TypeError, ValueError) as e:
+        logger.warning("Ignoring malformed checkpoint %s: %s", path, e)
+        return None
+
+
+def save_checkpoint(path: Path, checkpoint: Checkpoint) -> None:
+    data: dict[str, Any] = {"version": _CHECKPOINT_VERSION, **asdict(checkpoint)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    committer = OutputCommitter("file")
+    with committer.open(path) as f:
+        json.dump(data, f, ensure_ascii=False)
+    committer.commit()
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _next_label(taken: set[str]) -> str:
+    n = 0
+    while f"SPEAKER_{n:02d}" in taken:
+        n += 1
+    return f"SPEAKER_{n:02d}"
+
+
+def match_speakers(
+    window: dict[str, list[float]],
+    known: dict[str, list[float]],
+    *,
+    threshold: float = DEFAULT_SPEAKER_THRESHOLD,
+    labels: set[str] | None = None,
+) -> dict[str, str]:
+    """Map a window's speaker labels to known labels by embedding similarity.
+
+    Enrolled names (labels other than ``SPEAKER_NN``) are kept as they
+    are. Other pairs are taken greedily from the most similar down; each
+    known speaker is used at most once. Unmatched speakers get fresh labels
+    not in ``known`` or ``labels`` (all labels already used in the
+    transcript).
+    """
+    pairs = sorted(
+        (
+            (_cosine(vec, ref), new, old)
+            for new, vec in window.items()
+            for old, ref in known.items()
+        ),
+        reverse=True,
+    )
+    mapping = {new: new for new in window if not _DIARIZER_LABEL.match(new)}
+    used = set(mapping.values())
+    for similarity, new, old in pairs:
+        if similarity < threshold:
+            break
+        if new in mapping or old in used:
+            continue
+        mapping[new] = old
+        used.add(old)
+    taken = set(known) | (labels or set())
+    for new in window:
+        if new not in mapping:
+            mapping[new] = _next_label(taken)
+            taken.add(mapping[new])
+    return mapping
+
+
+def _update_centroids(
+    checkpoint: Checkpoint, window: dict[str, list[float]], mapping: dict[str, str],
+) -> None:
+    for new, vec in window.items():
+        label = mapping[new]
+        weight = checkpoint.speaker_weights.get(label, 0)
+        old = checkpoint.speakers.get(label)
+        if old is None or len(old) != len(vec):
+            checkpoint.speakers[label] = list(vec)
+            checkpoint.speaker_weights[label] = 1
+            continue
+        checkpoint.speakers[label] = [
+            (o * weight + v) / (weight + 1) for o, v in zip(old, vec, strict=True)
+        ]
+        checkpoint.speaker_weights[label] = weight + 1
+
+
+def _fresh_checkpoint(audio_path: str, pipeline: TranscriptionPipeline) -> Checkpoint:
+    config = pipeline.config
+    return Checkpoint(
+        source_file=audio_path, model=config.model_size, language=config.language,
+    )
+
+
+def run_incremental(
+    pipeline: TranscriptionPipeline,
+    audio_path: str,
+    output_dir: str | None = None,
+    *,
+    overlap: float = DEFAULT_OVERLAP_SECONDS,
+    tail_guard: float = DEFAULT_TAIL_GUARD_SECONDS,
+    speaker_threshold: float = DEFAULT_SPEAKER_THRESHOLD,
+) -> TranscriptResult:
+    """Transcribe what was appended to ``audio_path`` since the last run.
+
+    Exports the whole transcript so far (committed plus provisional
+    segments) and advances the checkpoint. The first run, or a run after
+    the model, language or recording changed, starts from the beginning.
+    """
+    if overlap < 0 or tail_guard < 0:
+        raise ValueError("overlap and tail_guard must be >= 0")
+    out_dir = Path(output_dir if output_dir is not None else pipeline.config.output_dir)
+    path = checkpoint_path(out_dir, Path(audio_path))
+    size = Path(audio_path).stat().st_size
+
+    checkpoint = load_checkpoint(path)
+    fresh = _fresh_checkpoint(audio_path, pipeline)
+    if checkpoint is None or (
+        checkpoint.source_file, checkpoint.model, checkpoint.language,
+    ) != (fresh.source_file, fresh.model, fresh.language) or size < checkpoint.source_size:
+        if checkpoint is not None:
+            logger.info("Checkpoint %s does not match %s; starting over", path, audio_path)
+        checkpoint = fresh
+
+    window_start = max(0.0, checkpoint.committed_until - overlap)
+    logger.info(
+        "Incremental run from %.1fs (committed until %.1fs)",
+        window_start, checkpoint.committed_until,
+    )
+    window = pipeline.process(
+        audio_path, start=window_start, initial_prompt=checkpoint.prompt or None,
+    )
+    window_end = (
+        window.metadata.time_range[1] if window.metadata.time_range is not None
+        else window_start
+    )
+
+    mapping = match_speakers(
+        window.speaker_embeddings, checkpoint.speakers,
+        threshold=speaker_threshold,
+        labels={s.speaker for s in checkpoint.segments if s.speaker is not None},
+    )
+    committed: list[Segment] = []
+    provisional: list[Segment] = []
+    for seg in window.segments:
+        # The overlap was transcribed before; keep the earlier version.
+        if (seg.start + seg.end) / 2 < checkpoint.committed_until:
+            continue
+        if seg.speaker is not None:
+            seg = replace(seg, speaker=mapping.get(seg.speaker, seg.speaker))
+        if seg.end <= window_end - tail_guard:
+            committed.append(seg)
+        else:
+            provisional.append(seg)
+
+    _update_centroids(checkpoint, window.speaker_embeddings, mapping)
+    checkpoint.segments.extend(committed)
+    if committed:
+        checkpoint.committed_until = committed[-1].end
+        text = " ".join(s.text for s in checkpoint.segments[-20:])
+        checkpoint.prompt = text[-_PROMPT_CHARS:]
+    else:
+        # Nothing said before the tail guard (silence): settle it anyway so
+        # the next run does not decode it again, but never past speech that
+        # is still provisional.
+        settled = window_end - tail_guard
+        if provisional:
+            settled = min(settled, provisional[0].start)
+        checkpoint.committed_until = max(checkpoint.committed_until, settled)
+    checkpoint.source_size = size
+
+    segments = SegmentTable.from_segments(checkpoint.segments + provisional)
+    speakers = {s.speaker for s in segments if s.speaker is not None}
+    result = TranscriptResult(
+        metadata=replace(
+            window.metadata,
+            duration_seconds=window_end,
+            num_speakers=len(speakers),
+            time_range=None,
+        ),
+        segments=segments,
+        speaker_embeddings=dict(checkpoint.speakers),
+    )
+    pipeline.export(result, str(out_dir))
+    save_checkpoint(path, checkpoint)
+    logger.info(
+        "Committed %d new segments (until %.1fs), %d provisional",
+        len(committed), checkpoint.committed_until, len(provisional),
+    )
+    return result
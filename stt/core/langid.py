@@ -0,0 +1,237 @@
+"""Language identification pre-pass for ``language: auto``.
+
+Instead of letting every full decode detect the language itself, each
+file gets one cheap look before transcription:
+
+- the first ``scan_seconds`` are decoded and Silero VAD picks up to
+  ``sample_seconds`` of speech (one Whisper window), so leading music or
+  silence does not decide the language;
+- samples of many files go through the Whisper encoder as one batch;
+- results are cached by the model and a fingerprint of the file (size,
+  mtime and a hash of its head), so re-running a batch (or retrying a
+  file) never detects twice.
+
+The detected language is then fixed in ``TranscriberConfig``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import subprocess
+import wave
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+from stt.core.audio import TARGET_SAMPLE_RATE, is_target_wav
+from stt.exceptions import AudioPreprocessError
+from stt.exporters.atomic import OutputCommitter
+
+logger = logging.getLogger(__name__)
+
+AUTO_LANGUAGE = "auto"
+LANGUAGE_CACHE_FILE = "language_cache.json"
+DEFAULT_SCAN_SECONDS = 120.0
+DEFAULT_SAMPLE_SECONDS = 30.0
+DEFAULT_BATCH_SIZE = 8
+_HASH_HEAD_BYTES = 1 << 20
+_FFMPEG_TIMEOUT = 120
+_CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Detection:
+    language: str
+    probability: float
+
+
+# Batch of 16 kHz float32 speech samples -> one detection per sample.
+LanguageDetector = Callable[[list[np.ndarray]], list[Detection]]
+
+
+def language_cache_path(model_dir: str | None) -> Path:
+    """The cache lives next to the models whose detections it holds."""
+    return (
+        Path(model_dir).expanduser() / LANGUAGE_CACHE_FILE if model_dir
+        else Path(LANGUAGE_CACHE_FILE)
+    )
+
+
+def audio_hash(path: Path) -> str:
+    """Fingerprint of ``path`` from its size, mtime and first 1 MiB.
+
+    Reading the whole file would cost as much I/O as decoding it.
+    """
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}:".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(_HASH_HEAD_BYTES))
+    return digest.hexdigest()
+
+
+class LanguageCache:
+    """JSON file of detections keyed by ``<model>/<audio hash>``."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _load(self) -> dict[str, dict[str, object]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable language cache %s: %s", self.path, e)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, Detection]:
+        entries = self._load()
+        found: dict[str, Detection] = {}
+        for key in keys:
+            entry = entries.get(key)
+            if not isinstance(entry, dict):
+                continue
+            language, probability = entry.get("language"), entry.get("probability")
+            if isinstance(language, str):
+                found[key] = Detection(
+                    language,
+                    float(probability) if isinstance(probability, int | float) else 0.0,
+                )
+        return found
+
+    def put_many(self, detections: dict[str, Detection]) -> None:
+        if not detections:
+            return
+        entries = self._load()
+        now = datetime.now(UTC).isoformat()
+        for key, detection in detections.items():
+            entries[key] = {
+                "language": detection.language,
+                "probability": round(detection.probability, 4),
+                "detected_at": now,
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        committer = OutputCommitter("file")
+        with committer.open(self.path) as f:
+            json.dump(
+                {"version": _CACHE_VERSION, "entries": entries}, f,
+                ensure_ascii=False, indent=2,
+            )
+        committer.commit()
+
+
+def _decode_head(path: Path, seconds: float) -> np.ndarray:
+    """First ``seconds`` of ``path`` as 16 kHz mono float32."""
+    if is_target_wav(path):
+        with wave.open(str(path), "rb") as w:
+            data = w.readframes(int(seconds * TARGET_SAMPLE_RATE))
+    else:
+        cmd = [
+            "ffmpeg", "-loglevel", "error", "-t", f"{seconds:.3f}", "-i", str(path),
+            "-f", "s16le", "-ar", str(TARGET_SAMPLE_RATE), "-ac", "1", "pipe:1",
+        ]
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, timeout=_FFMPEG_TIMEOUT, check=False,
+            )
+        except FileNotFoundError:
+            raise AudioPreprocessError(
+                "ffmpeg not found. Install ffmpeg to process audio files."
+            ) from None
+        except subprocess.TimeoutExpired:
+            raise AudioPreprocessError(
+                f"ffmpeg timed out after {_FFMPEG_TIMEOUT}s while sampling {path.name}"
+            ) from None
+        if result.returncode != 0:
+            raise AudioPreprocessError(
+                f"ffmpeg failed (code {result.returncode}) sampling {path.name}: "
+                f"{result.stderr.decode(errors='replace')[:200]}"
+            )
+        data = result.stdout
+    data = data[: len(data) - len(data) % 2]
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def speech_sample(
+    path: Path,
+    *,
+    scan_seconds: float = DEFAULT_SCAN_SECONDS,
+    sample_seconds: float = DEFAULT_SAMPLE_SECONDS,
+) -> np.ndarray:
+    """Up to ``sample_seconds`` of speech from the start of ``path``.
+
+    Falls back to the plain head of the file when VAD finds no speech.
+    """
+    from faster_whisper.vad import collect_chunks, get_speech_timestamps
+
+    audio = _decode_head(path, scan_seconds)
+    limit = int(sample_seconds * TARGET_SAMPLE_RATE)
+    chunks = get_speech_timestamps(audio) if len(audio) else []
+    if not chunks:
+        return audio[:limit]
+    pieces, _ = collect_chunks(audio, chunks)
+    return np.concatenate(pieces)[:limit]
+
+
+def identify_languages(
+    paths: Sequence[Path],
+    detect: LanguageDetector,
+    *,
+    model: str,
+    cache: LanguageCache | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sample: Callable[[Path], np.ndarray] = speech_sample,
+) -> dict[Path, Detection]:
+    """Detect the language of each file, batching the misses of ``cache``.
+
+    Files that cannot be read are left out of the result (and logged);
+    the normal pipeline will report them.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    keys: dict[Path, str] = {}
+    for path in paths:
+        try:
+            keys[path] = f"{model}/{audio_hash(path)}"
+        except OSError as e:
+            logger.warning("Language ID skipped for %s: %s", path, e)
+    cached = cache.get_many(list(keys.values())) if cache is not None else {}
+    found = {path: cached[key] for path, key in keys.items() if key in cached}
+
+    misses = [path for path in keys if path not in found]
+    fresh: dict[str, Detection] = {}
+    for i in range(0, len(misses), batch_size):
+        batch: list[Path] = []
+        samples: list[np.ndarray] = []
+        for path in misses[i:i + batch_size]:
+            try:
+                samples.append(sample(path))
+                batch.append(path)
+            except (OSError, AudioPreprocessError, wave.Error) as e:
+                logger.warning("Language ID skipped for %s: %s", path, e)
+        if not batch:
+            continue
+        for path, detection in zip(batch, detect(samples), strict=True):
+            found[path] = detection
+            fresh[keys[path]] = detection
+            logger.info(
+                "Detected language of %s: %s (p=%.2f)",
+                path.name, detection.language, detection.probability,
+            )
+    if cache is not None:
+        cache.put_many(fresh)
+    logger.info(
+        "Language ID: %d files, %d from cache, %d detected",
+        len(keys), len(keys) - len(misses), len(fresh),
+    )
+    return found
@@ -0,0 +1,172 @@
+"""Process and device memory measurement."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from types import TracebackType
+
+import torch
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Stage of samples taken outside any named pipeline stage.
+IDLE_STAGE = "pipeline"
+
+
+def current_rss_bytes() -> int | None:
+    """Resident set size of this process, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss_bytes() -> int:
+    """Lifetime peak RSS of this process (``getrusage``)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cuda_used_bytes() -> int | None:
+    """Device memory in use (driver view, all allocators), or None without CUDA."""
+    if not torch.cuda.is_available():
+        return None
+    free, total = torch.cuda.mem_get_info()
+    return total - free
+
+
+class PeakMemorySampler:
+    """Track peak RSS and device memory while a block of code runs.
+
+    A daemon thread samples every ``interval`` seconds, so short spikes
+    between samples can be missed. Device memory is the driver's view,
+    which includes CTranslate2 allocations that torch's own counters miss.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.peak_rss_bytes: int | None = None
+        self.peak_cuda_bytes: int | None = None
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        if rss is None:
+            # No /proc: fall back to the lifetime peak, an upper bound.
+            rss = max_rss_bytes()
+        if self.peak_rss_bytes is None or rss > self.peak_rss_bytes:
+            self.peak_rss_bytes = rss
+        used = cuda_used_bytes()
+        if used is not None and (self.peak_cuda_bytes is None or used > self.peak_cuda_bytes):
+            self.peak_cuda_bytes = used
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._sample()
+        self._thread = threading.Thread(
+            target=self._run, name="stt-memory-sampler", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sample()
+
+    def __enter__(self) -> PeakMemorySampler:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+
+class MemoryTimeline(PeakMemorySampler):
+    """Memory over time, each sample tagged with the running pipeline stage.
+
+    Host RSS is always sampled. With ``cuda`` (and a CUDA device) each
+    sample also has torch's allocated and reserved bytes and the driver's
+    used bytes, which counts CTranslate2 too. Entering or leaving a stage
+    takes an extra sample, so stages shorter than ``interval`` still show.
+    """
+
+    def __init__(self, interval: float = 0.1, *, cuda: bool = False) -> None:
+        super().__init__(interval)
+        self.interval = interval
+        self._cuda = cuda and torch.cuda.is_available()
+        self._lock = threading.Lock()
+        self._stage = IDLE_STAGE
+        self._t0 = time.monotonic()
+        self._columns: dict[str, list[object]] = {
+            name: [] for name in self._column_names()
+        }
+        self._peaks: dict[str, dict[str, int]] = {}
+
+    def _column_names(self) -> list[str]:
+        names = ["t", "stage", "rss_bytes"]
+        if self._cuda:
+            names += ["cuda_allocated_bytes", "cuda_reserved_bytes", "cuda_used_bytes"]
+        return names
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        values: dict[str, int] = {"rss_bytes": rss if rss is not None else max_rss_bytes()}
+        if self._cuda:
+            values["cuda_allocated_bytes"] = torch.cuda.memory_allocated()
+            values["cuda_reserved_bytes"] = torch.cuda.memory_reserved()
+            values["cuda_used_bytes"] = cuda_used_bytes() or 0
+        with self._lock:
+            self._columns["t"].append(round(time.monotonic() - self._t0, 3))
+            self._columns["stage"].append(self._stage)
+            for name, value in values.items():
+                self._columns[name].append(value)
+            peaks = self._peaks.setdefault(self._stage, {})
+            for name, value in values.items():
+                if value > peaks.get(name, -1):
+                    peaks[name] = value
+            self.peak_rss_bytes = max(self.peak_rss_bytes or 0, values["rss_bytes"])
+            if self._cuda:
+                self.peak_cuda_bytes = max(
+                    self.peak_cuda_bytes or 0, values["cuda_used_bytes"],
+                )
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Tag samples taken inside the block with ``name``."""
+        previous = self._stage
+        self._stage = name
+        self._sample()
+        try:
+            yield
+        finally:
+            self._sample()
+            self._stage = previous
+
+    def stage_peaks(self) -> dict[str, dict[str, int]]:
+        """Highest value of every measure, per stage."""
+        with self._lock:
+            return {stage: dict(peaks) for stage, peaks in self._peaks.items()}
+
+    def columns(self) -> dict[str, list[object]]:
+        """The timeline as columns: ``t`` (seconds from start), ``stage``, measures."""
+        with self._lock:
+            return {name: list(values) for name, values in self._columns.items()}
@@ -0,0 +1,218 @@
+"""OOM degradation ladder: retry a failed stage with lighter settings."""
+
+from __future__ import annotations
+
+import logging
+import tempfile
+import wave
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TypeVar
+
+from stt.core.diarizer import DiarizerConfig
+from stt.core.gpu_utils import cleanup_gpu_memory
+from stt.core.transcriber import TranscriberConfig
+from stt.data_models import Segment
+from stt.exceptions import CudaOomError
+
+logger = logging.getLogger(__name__)
+
+# Rungs in the order they are tried; each builds on the previous ones.
+OOM_RUNGS: tuple[str, ...] = (
+    "cleanup", "batch_size", "unbatched", "compute_type", "chunked", "cpu",
+)
+DEFAULT_CHUNK_SECONDS = 300.0
+
+_MAX_BATCH_HALVINGS = 3
+# pyannote/speaker-diarization-3.1 default segmentation/embedding batch size.
+_PYANNOTE_BATCH_SIZE = 32
+
+_LIGHTER_COMPUTE = {
+    "float32": "float16",
+    "float16": "int8_float16",
+    "bfloat16": "int8_bfloat16",
+    "int8_float32": "int8",
+    "int8_float16": "int8",
+    "int8_bfloat16": "int8",
+}
+
+T = TypeVar("T")
+A = TypeVar("A")
+
+
+def validate_ladder(ladder: Iterable[str]) -> tuple[str, ...]:
+    """Return ``ladder`` as a tuple, rejecting unknown rung names."""
+    rungs = tuple(ladder)
+    unknown = [r for r in rungs if r not in OOM_RUNGS]
+    if unknown:
+        raise ValueError(
+            f"Unknown OOM ladder rung(s) {', '.join(map(repr, unknown))}. "
+            f"Supported: {', '.join(OOM_RUNGS)}"
+        )
+    return rungs
+
+
+def is_oom(exc: BaseException) -> bool:
+    """True for CUDA OOM, including OOM errors relayed from a subprocess."""
+    if isinstance(exc, CudaOomError):
+        return True
+    return isinstance(exc, RuntimeError) and str(exc).startswith(
+        f"{CudaOomError.__name__}:"
+    )
+
+
+@dataclass(frozen=True)
+class TranscribeAttempt:
+    config: TranscriberConfig
+    chunk_seconds: float | None = None
+
+
+def transcription_attempts(
+    config: TranscriberConfig,
+    ladder: Sequence[str],
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+) -> list[tuple[str, TranscribeAttempt]]:
+    """Build the (rung label, attempt) retries for a failed transcription.
+
+    Rungs that cannot make a difference for ``config`` (e.g. ``batch_size``
+    when not batched, ``cpu`` when already on CPU) are skipped.
+    """
+    attempts: list[tuple[str, TranscribeAttempt]] = []
+    current = TranscribeAttempt(config)
+    for rung in validate_ladder(ladder):
+        cfg = current.config
+        if rung == "cleanup":
+            attempts.append((rung, current))
+        elif rung == "batch_size":
+            if not cfg.use_batched:
+                continue
+            size = cfg.batch_size
+            for _ in range(_MAX_BATCH_HALVINGS):
+                if size <= 1:
+                    break
+                size = max(1, size // 2)
+                current = replace(current, config=replace(cfg, batch_size=size))
+                attempts.append((f"batch_size={size}", current))
+        elif rung == "unbatched":
+            if cfg.use_batched:
+                current = replace(current, config=replace(cfg, use_batched=False))
+                attempts.append((rung, current))
+        elif rung == "compute_type":
+            lighter = _LIGHTER_COMPUTE.get(cfg.compute_type)
+            if lighter is not None:
+                current = replace(current, config=replace(cfg, compute_type=lighter))
+                attempts.append((f"compute_type={lighter}", current))
+        elif rung == "chunked":
+            current = replace(current, chunk_seconds=chunk_seconds)
+            attempts.append((rung, current))
+        elif rung == "cpu":
+            if cfg.device != "cpu":
+                # float16 variants are not supported by CTranslate2 on CPU.
+                current = replace(
+                    current, config=replace(cfg, device="cpu", compute_type="int8"),
+                )
+                attempts.append((rung, current))
+    return attempts
+
+
+def diarization_attempts(
+    config: DiarizerConfig, ladder: Sequence[str],
+) -> list[tuple[str, DiarizerConfig]]:
+    """Build the (rung label, config) retries for a failed diarization.
+
+    Only ``cleanup``, ``batch_size`` (pyannote segmentation/embedding
+    batches) and ``cpu`` apply; the other rungs are transcription-specific,
+    and chunking would break speaker identity across chunks.
+    """
+    attempts: list[tuple[str, DiarizerConfig]] = []
+    current = config
+    for rung in validate_ladder(ladder):
+        if rung == "cleanup":
+            attempts.append((rung, current))
+        elif rung == "batch_size":
+            size = current.embedding_batch_size or _PYANNOTE_BATCH_SIZE
+            for _ in range(_MAX_BATCH_HALVINGS):
+                if size <= 1:
+                    break
+                size = max(1, size // 2)
+                current = replace(
+                    current, embedding_batch_size=size, segmentation_batch_size=size,
+                )
+                attempts.append((f"batch_size={size}", current))
+        elif rung == "cpu":
+            # device None keeps pyannote on the CPU already.
+            if current.device not in (None, "cpu"):
+                current = replace(current, device="cpu")
+                attempts.append((rung, current))
+    return attempts
+
+
+def run_with_ladder(
+    stage: str,
+    first: Callable[[], T],
+    retry: Callable[[A], T],
+    attempts: Sequence[tuple[str, A]],
+) -> tuple[T, str | None]:
+    """Run ``first``; on OOM walk ``attempts`` until one succeeds.
+
+    Returns the result and the rung label that produced it (None when the
+    first try succeeded). Non-OOM errors propagate immediately; when every
+    rung runs out of memory the last OOM error is raised.
+    """
+    try:
+        return first(), None
+    except Exception as e:
+        if not is_oom(e) or not attempts:
+            raise
+        error = e
+    for rung, attempt in attempts:
+        logger.warning("%s ran out of memory (%s); retrying with %s", stage, error, rung)
+        cleanup_gpu_memory(f"oom_{stage}_{rung}")
+        try:
+            result = retry(attempt)
+        except Exception as e:
+            if not is_oom(e):
+                raise
+            error = e
+            continue
+        logger.info("%s recovered from OOM at rung %s", stage, rung)
+        return result, rung
+    raise error
+
+
+def transcribe_in_chunks(
+    transcribe: Callable[[str], Sequence[Segment]],
+    wav_path: str,
+    chunk_seconds: float,
+) -> list[Segment]:
+    """Transcribe a WAV file ``chunk_seconds`` at a time, shifting timestamps.
+
+    Chunks are written next to each other in a temporary directory one at a
+    time, so only one chunk is on disk and in the decoder at once.
+    """
+    segments: list[Segment] = []
+    with wave.open(wav_path, "rb") as src, tempfile.TemporaryDirectory(
+        prefix=".stt_chunks_",
+    ) as tmp:
+        rate = src.getframerate()
+        frames_per_chunk = max(1, int(chunk_seconds * rate))
+        chunk_path = str(Path(tmp) / "chunk.wav")
+        offset_frames = 0
+        while True:
+            frames = src.readframes(frames_per_chunk)
+            if not frames:
+                break
+            with wave.open(chunk_path, "wb") as dst:
+                dst.setnchannels(src.getnchannels())
+                dst.setsampwidth(src.getsampwidth())
+                dst.setframerate(rate)
+                dst.writeframes(frames)
+            offset = offset_frames / rate
+            for seg in transcribe(chunk_path):
+                segments.append(Segment(
+                    seg.start + offset, seg.end + offset, seg.text,
+                    seg.speaker, seg.confidence,
+                ))
+            offset_frames += len(frames) // (src.getsampwidth() * src.getnchannels())
+    return segments
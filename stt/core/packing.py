@@ -0,0 +1,198 @@
+"""Short-clip packing: many small clips transcribed as one decode."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import tempfile
+import wave
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from stt.data_models import Segment, Word
+
+logger = logging.getLogger(__name__)
+
+PACK_SAMPLE_RATE = 16000
+_SAMPLE_WIDTH = 2
+_COPY_CHUNK_FRAMES = 1 << 16
+
+
+def wav_duration(path: Path) -> float:
+    """Return the duration of a WAV file in seconds (header only)."""
+    with wave.open(str(path), "rb") as wf:
+        return wf.getnframes() / float(wf.getframerate())
+
+
+@dataclass
+class PackEntry:
+    """Position of one source clip inside a pack (seconds, pack time)."""
+
+    source: Path
+    offset: float
+    duration: float
+
+    @property
+    def end(self) -> float:
+        return self.offset + self.duration
+
+
+@dataclass
+class AudioPack:
+    """A packed WAV file plus the offset table of the clips it contains."""
+
+    path: Path
+    entries: list[PackEntry] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return self.entries[-1].end if self.entries else 0.0
+
+    def cleanup(self) -> None:
+        """Remove the packed WAV file. Safe to call multiple times."""
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Failed to remove pack file: %s", self.path)
+
+
+class AudioPackWriter:
+    """Append 16 kHz mono s16le clips into one WAV with silence guards.
+
+    Clips are copied frame-chunk by frame-chunk so the pack is never held
+    in memory as a whole.
+    """
+
+    def __init__(self, guard_seconds: float = 1.0, dir: str | None = None) -> None:
+        fd, tmp_path_str = tempfile.mkstemp(suffix=".wav", prefix="stt_pack_", dir=dir)
+        os.close(fd)
+        self._path = Path(tmp_path_str)
+        self._wav = wave.open(tmp_path_str, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(_SAMPLE_WIDTH)
+        self._wav.setframerate(PACK_SAMPLE_RATE)
+        self._guard = b"\x00" * (int(guard_seconds * PACK_SAMPLE_RATE) * _SAMPLE_WIDTH)
+        self._frames = 0
+        self._entries: list[PackEntry] = []
+
+    @property
+    def duration(self) -> float:
+        return self._frames / PACK_SAMPLE_RATE
+
+    @property
+    def entries(self) -> list[PackEntry]:
+        return list(self._entries)
+
+    def add(self, source: Path, wav_path: Path) -> PackEntry:
+        """Append a preprocessed clip followed by a silence guard."""
+        with wave.open(str(wav_path), "rb") as src:
+            if (
+                src.getnchannels() != 1
+                or src.getsampwidth() != _SAMPLE_WIDTH
+                or src.getframerate() != PACK_SAMPLE_RATE
+            ):
+                raise ValueError(
+                    f"Clip {wav_path} is not 16kHz mono PCM_S16LE"
+                )
+            offset_frames = self._frames
+            nframes = 0
+            while True:
+                chunk = src.readframes(_COPY_CHUNK_FRAMES)
+                if not chunk:
+                    break
+                self._wav.writeframesraw(chunk)
+                nframes += len(chunk) // _SAMPLE_WIDTH
+        self._wav.writeframesraw(self._guard)
+        self._frames += nframes + len(self._guard) // _SAMPLE_WIDTH
+        entry = PackEntry(
+            source=source,
+            offset=offset_frames / PACK_SAMPLE_RATE,
+            duration=nframes / PACK_SAMPLE_RATE,
+        )
+        self._entries.append(entry)
+        return entry
+
+    def close(self) -> AudioPack:
+        """Finalize the WAV header and return the pack."""
+        self._wav.close()
+        return AudioPack(path=self._path, entries=list(self._entries))
+
+    def discard(self) -> None:
+        """Close and remove the pack without returning it."""
+        self._wav.close()
+        self._path.unlink(missing_ok=True)
+
+
+def _cut_at_clips(
+    seg: Segment, words: list[Word], offsets: list[float],
+) -> list[Segment]:
+    """Cut ``seg`` where its words cross from one clip into the next."""
+    groups: list[list[Word]] = []
+    last_clip = -1
+    for word in words:
+        # A word belongs to the clip its midpoint falls in (or its guard).
+        clip = max(bisect.bisect_right(offsets, (word.start + word.end) / 2) - 1, 0)
+        if clip != last_clip:
+            groups.append([])
+            last_clip = clip
+        groups[-1].append(word)
+    if len(groups) < 2:
+        return [seg]
+    return [
+        replace(
+            seg,
+            start=group[0].start,
+            end=max(group[-1].end, group[0].start),
+            text="".join(w.text for w in group).strip(),
+        )
+        for group in groups
+    ]
+
+
+def split_segments(
+    segments: list[Segment],
+    entries: list[PackEntry],
+    words: list[list[Word]] | None = None,
+) -> dict[Path, list[Segment]]:
+    """Split pack segments back per clip using the offset table.
+
+    A whisper segment can run several seconds past the end of its clip and
+    carry the first words of the next one. With ``words`` (the word timings
+    of each segment, see ``Transcriber.transcribe_words``) such a segment
+    is cut at the clip boundary first.
+
+    Each segment goes to the clip it overlaps most; timestamps are shifted
+    back to clip time and clamped to the clip bounds. Segments that fall
+    entirely into a silence guard are dropped.
+    """
+    result: dict[Path, list[Segment]] = {e.source: [] for e in entries}
+    if not entries:
+        return result
+    if words is not None:
+        offsets = [e.offset for e in entries]
+        segments = [
+            part
+            for seg, seg_words in zip(segments, words, strict=True)
+            for part in _cut_at_clips(seg, seg_words, offsets)
+        ]
+
+    idx = 0
+    for seg in segments:
+        # Segments are ordered by start time, so the candidate clip only
+        # ever moves forward.
+        while idx + 1 < len(entries) and seg.start >= entries[idx + 1].offset:
+            idx += 1
+        best: PackEntry | None = None
+        best_overlap = 0.0
+        for entry in entries[max(idx - 1, 0): idx + 2]:
+            overlap = min(seg.end, entry.end) - max(seg.start, entry.offset)
+            if overlap > best_overlap:
+                best_overlap = overlap
+                best = entry
+        if best is None:
+            continue
+        start = min(max(seg.start - best.offset, 0.0), best.duration)
+        end = min(max(seg.end - best.offset, start), best.duration)
+        result[best.source].append(replace(seg, start=start, end=end))
+    return result
@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
+import contextlib
+import json
 import logging
 import time
-from dataclasses import asdict, dataclass
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
+from typing import Any
+
+import numpy as np
 
 from stt.core.aligner import align_segments
 from stt.core.audio import preprocess_audio, validate_audio_file
+from stt.core.autotune import (
+    TuningResult,
+    TuningStore,
+    autotune_batch_size,
+    tuning_key,
+    tuning_path,
+)
 from stt.core.diarizer import (
     DiarizationResult,
     DiarizationTurn,
@@ -16,16 +29,47 @@ from stt.core.diarizer import (
     PyannoteDiarizer,
 )
 from stt.core.gpu_utils import cleanup_gpu_memory, log_gpu_memory
+from stt.core.langid import (
+    AUTO_LANGUAGE,
+    Detection,
+    LanguageCache,
+    identify_languages,
+    language_cache_path,
+)
+from stt.core.memory import MemoryTimeline
+from stt.core.oom import (
+    DEFAULT_CHUNK_SECONDS,
+    OOM_RUNGS,
+    TranscribeAttempt,
+    diarization_attempts,
+    run_with_ladder,
+    transcribe_in_chunks,
+    transcription_attempts,
+    validate_ladder,
+)
+from stt.core.packing import wav_duration
+from stt.core.profiling import NULL_PROFILER, StageProfiler, make_profiler, profile_dir
+from stt.core.speaker_index import DEFAULT_MATCH_THRESHOLD, SpeakerIndex
 from stt.core.subprocess_runner import (
     run_diarization_subprocess,
     run_transcription_subprocess,
 )
+from stt.core.tracing import span
 from stt.core.transcriber import Transcriber, TranscriberConfig
-from stt.data_models import TranscriptMetadata, TranscriptResult
+from stt.data_models import (
+    Segment,
+    SegmentTable,
+    TranscriptMetadata,
+    TranscriptResult,
+)
 from stt.exporters import export_transcript
+from stt.exporters.atomic import OutputCommitter
 
 logger = logging.getLogger(__name__)
 
+SPEAKERS_SUFFIX = ".speakers.json"
+MEMORY_SUFFIX = ".memory.json"
+
 
 @dataclass
 class PipelineConfig:
@@ -47,71 +91,459 @@ class PipelineConfig:
     hallucination_silence_threshold: float = 2.0
     use_subprocess: bool = False
     use_batched: bool = False
+    cpu_threads: int = 0
+    num_workers: int = 1
+    diarizer_threads: int = 0
+    keep_models_loaded: bool = False
+    compact_json: bool = False
+    concurrent_export: bool = False
+    fsync: str = "none"
+    fsync_group_size: int = 32
+    # Empty disables OOM recovery; see stt.core.oom for the rungs.
+    oom_ladder: tuple[str, ...] = OOM_RUNGS
+    oom_chunk_seconds: float = DEFAULT_CHUNK_SECONDS
+    # Tune batch_size on first use (batched mode); see stt.core.autotune.
+    auto_batch_size: bool = False
+    # Load models only from the local registry; see stt.core.registry.
+    offline: bool = False
+    # Name diarized speakers from this index; see stt.core.speaker_index.
+    speaker_index: str | None = None
+    speaker_threshold: float = DEFAULT_MATCH_THRESHOLD
+    # Also write <stem>.speakers.json with each speaker's embedding.
+    export_speaker_embeddings: bool = False
+    # Per-stage profiles next to the outputs; see stt.core.profiling.
+    profiler: str | None = None
+    # Sample memory every this many seconds (0: off); see MemoryTimeline.
+    memory_interval: float = 0.0
+
+
+def build_transcriber_config(config: PipelineConfig) -> TranscriberConfig:
+    """Convert PipelineConfig to TranscriberConfig."""
+    return TranscriberConfig(
+        model_size=config.model_size,
+        device=config.device,
+        compute_type=config.compute_type,
+        model_dir=config.model_dir,
+        language=config.language,
+        batch_size=config.batch_size,
+        vad_filter=config.vad_filter,
+        condition_on_previous_text=config.condition_on_previous_text,
+        hallucination_silence_threshold=config.hallucination_silence_threshold,
+        use_batched=config.use_batched,
+        cpu_threads=config.cpu_threads,
+        num_workers=config.num_workers,
+        offline=config.offline,
+    )
 
 
 class TranscriptionPipeline:
-    def __init__(self, config: PipelineConfig) -> None:
+    def __init__(
+        self,
+        config: PipelineConfig,
+        committer: OutputCommitter | None = None,
+    ) -> None:
         self._config = config
+        # A shared committer (batch group fsync) is committed by its owner;
+        # without one, each run commits its own outputs before returning.
+        self._committer = committer
+        self._warm_transcriber: Transcriber | None = None
+        # Language-ID model left loaded for the decode of the same file.
+        self._handoff_transcriber: Transcriber | None = None
+        self._warm_diarizer: PyannoteDiarizer | None = None
+        self._oom_ladder = validate_ladder(config.oom_ladder)
+        self._tuned_batch_size: int | None = None
+        self._speaker_index: SpeakerIndex | None = None
+        # Source path -> language found by the language-ID pre-pass.
+        self._languages: dict[str, Detection] = {}
+        # Stage profiles of the file being processed, written by export().
+        self._profiler: StageProfiler = NULL_PROFILER
+        # Memory timeline of the file being processed (memory_interval).
+        self._memory: MemoryTimeline | None = None
 
-    def run(self, audio_path: str, output_dir: str | None = None) -> TranscriptResult:
-        start_time = time.monotonic()
+    @property
+    def config(self) -> PipelineConfig:
+        return self._config
 
-        # 1. Validate audio
-        validate_audio_file(Path(audio_path))
+    @contextlib.contextmanager
+    def _stage(self, name: str, **attrs: Any) -> Iterator[None]:
+        """A pipeline stage: traced, profiled and tagged in the memory timeline."""
+        memory = (
+            self._memory.stage(name) if self._memory is not None
+            else contextlib.nullcontext()
+        )
+        with span(name, **attrs), self._profiler.stage(name), memory:
+            yield
 
-        # 2. Preprocess: convert to WAV 16kHz mono for whisper & pyannote
-        preprocessed = preprocess_audio(Path(audio_path))
-        preprocessed_path = str(preprocessed.path)
+    def close(self) -> None:
+        """Unload models kept warm by ``keep_models_loaded``."""
+        self._release_warm_transcriber()
+        self._release_warm_diarizer()
+        cleanup_gpu_memory("after_pipeline_close")
 
-        try:
-            # 3. Transcribe: load, run, unload (free VRAM)
-            transcriber_config = TranscriberConfig(
-                model_size=self._config.model_size,
-                device=self._config.device,
-                compute_type=self._config.compute_type,
-                model_dir=self._config.model_dir,
-                language=self._config.language,
-                batch_size=self._config.batch_size,
-                vad_filter=self._config.vad_filter,
-                condition_on_previous_text=self._config.condition_on_previous_text,
-                hallucination_silence_threshold=(
-                    self._config.hallucination_silence_threshold
-                ),
-                use_batched=self._config.use_batched,
-            )
+    def _release_warm_transcriber(self) -> None:
+        self._release_handoff()
+        if self._warm_transcriber is not None:
+            try:
+                self._warm_transcriber.unload_model()
+            except Exception:
+                logger.exception("Failed to unload transcriber")
+            self._warm_transcriber = None
 
-            if self._config.use_subprocess:
-                t1 = time.monotonic()
-                segments = run_transcription_subprocess(
-                    asdict(transcriber_config), preprocessed_path,
-                )
-                t2 = time.monotonic()
-                logger.info(
-                    "Transcription (subprocess) completed in %.1fs (%d segments)",
-                    t2 - t1, len(segments),
-                )
+    def _release_handoff(self) -> None:
+        if self._handoff_transcriber is not None:
+            try:
+                self._handoff_transcriber.unload_model()
+            except Exception:
+                logger.exception("Failed to unload transcriber")
+            self._handoff_transcriber = None
+            cleanup_gpu_memory("after_language_id")
+
+    def _release_warm_diarizer(self) -> None:
+        if self._warm_diarizer is not None:
+            try:
+                self._warm_diarizer.unload_model()
+            except Exception:
+                logger.exception("Failed to unload diarizer")
+            self._warm_diarizer = None
+
+    def detect_languages(
+        self, audio_paths: Sequence[str], *, handoff: bool = False,
+    ) -> dict[str, Detection]:
+        """Language-ID pre-pass (``language: auto``); see stt.core.langid.
+
+        Files are sampled and detected in batches with the transcription
+        model, which stays loaded afterwards if ``keep_models_loaded``.
+        Results are remembered, so ``process`` does not detect again.
+        ``handoff`` keeps the model loaded for the next ``_transcribe``
+        in this process, which then unloads it as usual.
+        """
+        todo = [Path(p) for p in dict.fromkeys(audio_paths) if p not in self._languages]
+        if todo:
+            transcriber: Transcriber | None = None
+
+            def detect(samples: list[np.ndarray]) -> list[Detection]:
+                nonlocal transcriber
+                if transcriber is None:
+                    transcriber = self._warm_transcriber or Transcriber(
+                        build_transcriber_config(self._config),
+                    )
+                    if transcriber is not self._warm_transcriber:
+                        transcriber.load_model()
+                return transcriber.detect_languages(samples)
+
+            try:
+                with span("language_id", files=len(todo)):
+                    found = identify_languages(
+                        todo, detect,
+                        model=self._config.model_size,
+                        cache=LanguageCache(language_cache_path(self._config.model_dir)),
+                    )
+            finally:
+                if transcriber is not None and transcriber is not self._warm_transcriber:
+                    if self._config.use_subprocess:
+                        transcriber.unload_model()
+                        cleanup_gpu_memory("after_language_id")
+                    elif self._config.keep_models_loaded:
+                        self._warm_transcriber = transcriber
+                    elif handoff:
+                        self._handoff_transcriber = transcriber
+                    else:
+                        transcriber.unload_model()
+                        cleanup_gpu_memory("after_language_id")
+            self._languages.update({str(path): d for path, d in found.items()})
+        return {p: self._languages[p] for p in audio_paths if p in self._languages}
+
+    def _language(self, audio_path: str) -> str:
+        if self._config.language != AUTO_LANGUAGE:
+            return self._config.language
+        detection = self.detect_languages([audio_path], handoff=True).get(audio_path)
+        # Without a detection faster-whisper falls back to its own.
+        return detection.language if detection is not None else AUTO_LANGUAGE
+
+    def _name_speakers(
+        self, table: SegmentTable, embeddings: dict[str, list[float]],
+    ) -> tuple[SegmentTable, dict[str, list[float]]]:
+        """Relabel diarized speakers with the enrolled names they match."""
+        if self._config.speaker_index is None or not embeddings:
+            return table, embeddings
+        if self._speaker_index is None:
+            self._speaker_index = SpeakerIndex(self._config.speaker_index)
+        names = self._speaker_index.identify(
+            embeddings, threshold=self._config.speaker_threshold,
+        )
+        logger.info("Identified %d of %d speakers", len(names), len(embeddings))
+        if not names:
+            return table, embeddings
+        return table.renamed(names), {names.get(k, k): v for k, v in embeddings.items()}
+
+    def _tuned(self, config: TranscriberConfig, audio_path: str) -> TranscriberConfig:
+        """Apply the persisted (or freshly tuned) batch size to ``config``.
+
+        Tuning needs the model in this process, so with subprocess
+        isolation only an already persisted value is used.
+        """
+        if not (self._config.auto_batch_size and config.use_batched):
+            return config
+        if self._tuned_batch_size is None:
+            store = TuningStore(tuning_path(config.model_dir))
+            key = tuning_key(config.model_size, config.compute_type, config.device)
+            size = store.get(key)
+            if size is None and not self._config.use_subprocess:
+                self._release_warm_transcriber()
+                result = autotune_batch_size(config, audio_path)
+                store.put(key, result)
+                size = result.batch_size
+            self._tuned_batch_size = size or config.batch_size
+        return replace(config, batch_size=self._tuned_batch_size)
+
+    def _record_oom_batch_size(self, config: TranscriberConfig, rung: str) -> None:
+        """Lower the persisted batch size after a batch_size rung recovered."""
+        if not (self._config.auto_batch_size and rung.startswith("batch_size=")):
+            return
+        size = int(rung.partition("=")[2])
+        self._tuned_batch_size = size
+        TuningStore(tuning_path(config.model_dir)).put(
+            tuning_key(config.model_size, config.compute_type, config.device),
+            TuningResult(batch_size=size, stopped="oom"),
+        )
+
+    def _transcribe(
+        self,
+        config: TranscriberConfig,
+        audio_path: str,
+        chunk_seconds: float | None = None,
+        *,
+        warm: bool = True,
+    ) -> Sequence[Segment]:
+        """Run one transcription attempt with ``config``.
+
+        ``warm=False`` (OOM retries) always uses a fresh engine and unloads
+        it afterwards, so degraded settings never become the warm model.
+        Otherwise the warm model, or the one language ID just used for
+        this file, is reused instead of loading another.
+        """
+        if self._config.use_subprocess:
+            def run(path: str) -> Sequence[Segment]:
+                return run_transcription_subprocess(asdict(config), path)
+
+            if chunk_seconds is None:
+                return run(audio_path)
+            return transcribe_in_chunks(run, audio_path, chunk_seconds)
+
+        keep = warm and self._config.keep_models_loaded
+        reused: Transcriber | None = None
+        if warm:
+            reused = self._warm_transcriber or self._handoff_transcriber
+            self._handoff_transcriber = None
+        transcriber = reused or Transcriber(config)
+        try:
+            if transcriber is reused:
+                transcriber.language = config.language
+                transcriber.initial_prompt = config.initial_prompt
+                transcriber.batch_size = config.batch_size
             else:
-                transcriber = Transcriber(transcriber_config)
-                try:
-                    log_gpu_memory("before_transcriber_load")
+                log_gpu_memory("before_transcriber_load")
+                with self._stage("load", model=config.model_size):
                     transcriber.load_model()
-                    log_gpu_memory("after_transcriber_load")
-                    t1 = time.monotonic()
-                    segments = transcriber.transcribe(preprocessed_path)
-                    t2 = time.monotonic()
-                    logger.info(
-                        "Transcription completed in %.1fs (%d segments)",
-                        t2 - t1, len(segments),
-                    )
-                finally:
+                log_gpu_memory("after_transcriber_load")
+                if keep:
+                    self._warm_transcriber = transcriber
+            with span("inference", chunk_seconds=chunk_seconds):
+                if chunk_seconds is None:
+                    return transcriber.transcribe(audio_path)
+                return transcribe_in_chunks(
+                    transcriber.transcribe, audio_path, chunk_seconds,
+                )
+        finally:
+            if not keep:
+                with span("unload"):
                     try:
                         transcriber.unload_model()
                     except Exception:
                         logger.exception("Failed to unload transcriber")
-                cleanup_gpu_memory("after_transcriber_unload")
+                    cleanup_gpu_memory("after_transcriber_unload")
+
+    def _retry_transcribe(
+        self, attempt: TranscribeAttempt, audio_path: str,
+    ) -> Sequence[Segment]:
+        # A warm model still holds the VRAM the retry needs.
+        self._release_warm_transcriber()
+        with span("oom_retry", chunk_seconds=attempt.chunk_seconds):
+            return self._transcribe(
+                attempt.config, audio_path, attempt.chunk_seconds, warm=False,
+            )
+
+    def _diarize(
+        self, config: DiarizerConfig, audio_path: str, *, warm: bool = True,
+    ) -> DiarizationResult:
+        """Run one diarization attempt with ``config`` (see ``_transcribe``)."""
+        if self._config.use_subprocess:
+            raw = run_diarization_subprocess(asdict(config), audio_path)
+            return DiarizationResult(
+                turns=[DiarizationTurn(**t) for t in raw["turns"]],
+                num_speakers=raw["num_speakers"],
+                embeddings=raw.get("embeddings", {}),
+            )
+
+        keep = warm and self._config.keep_models_loaded
+        diarizer = (self._warm_diarizer if warm else None) or PyannoteDiarizer(config)
+        try:
+            if diarizer is not self._warm_diarizer:
+                log_gpu_memory("before_diarizer_load")
+                with self._stage("load"):
+                    diarizer.load_model()
+                log_gpu_memory("after_diarizer_load")
+                if keep:
+                    self._warm_diarizer = diarizer
+            with span("inference"):
+                return diarizer.diarize(audio_path)
+        finally:
+            if not keep:
+                with span("unload"):
+                    try:
+                        diarizer.unload_model()
+                    except Exception:
+                        logger.exception("Failed to unload diarizer")
+                    cleanup_gpu_memory("after_diarizer_unload")
+
+    def _retry_diarize(
+        self, config: DiarizerConfig, audio_path: str,
+    ) -> DiarizationResult:
+        self._release_warm_diarizer()
+        with span("oom_retry"):
+            return self._diarize(config, audio_path, warm=False)
+
+    def run(
+        self,
+        audio_path: str,
+        output_dir: str | None = None,
+        *,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> TranscriptResult:
+        """Transcribe ``audio_path`` and export the result.
+
+        ``start``/``end`` (seconds) process only that window of the file;
+        output timestamps stay in source time.
+        """
+        with span("file", file=audio_path):
+            result = self.process(audio_path, start=start, end=end)
+            self.export(result, output_dir)
+        return result
+
+    def process(
+        self,
+        audio_path: str,
+        *,
+        start: float | None = None,
+        end: float | None = None,
+        initial_prompt: str | None = None,
+    ) -> TranscriptResult:
+        """Transcribe (and diarize) ``audio_path`` without exporting.
+
+        ``initial_prompt`` primes the decoder, e.g. with the end of an
+        earlier transcript of the same recording. With ``memory_interval``
+        the result carries the file's memory timeline and per-stage peaks.
+        """
+        if not self._config.memory_interval:
+            return self._process(
+                audio_path, start=start, end=end, initial_prompt=initial_prompt,
+            )
+        timeline = MemoryTimeline(
+            self._config.memory_interval, cuda=self._config.device.startswith("cuda"),
+        )
+        self._memory = timeline
+        try:
+            with timeline:
+                result = self._process(
+                    audio_path, start=start, end=end, initial_prompt=initial_prompt,
+                )
+        finally:
+            self._memory = None
+        result.metadata.memory_peaks = timeline.stage_peaks()
+        result.memory_timeline = timeline.columns()
+        logger.info(
+            "Memory peaks: %s",
+            ", ".join(
+                f"{stage} {peaks['rss_bytes'] / 2**20:.0f}MB RSS"
+                + (
+                    f" / {peaks['cuda_used_bytes'] / 2**20:.0f}MB CUDA"
+                    if "cuda_used_bytes" in peaks else ""
+                )
+                for stage, peaks in result.metadata.memory_peaks.items()
+            ),
+        )
+        return result
+
+    def _process(
+        self,
+        audio_path: str,
+        *,
+        start: float | None,
+        end: float | None,
+        initial_prompt: str | None,
+    ) -> TranscriptResult:
+        start_time = time.monotonic()
+        self._profiler = make_profiler(self._config.profiler)
+
+        # 1. Validate audio; with ``language: auto`` identify it first
+        with span("validate"):
+            validate_audio_file(Path(audio_path))
+        language = self._language(audio_path)
+
+        # 2. Preprocess: convert to WAV 16kHz mono for whisper & pyannote
+        try:
+            with self._stage("decode"):
+                preprocessed = preprocess_audio(Path(audio_path), start=start, end=end)
+        except BaseException:
+            self._release_handoff()
+            raise
+        preprocessed_path = str(preprocessed.path)
+        time_range: tuple[float, float] | None = None
+
+        oom_recovery: dict[str, str] = {}
+        try:
+            # 3. Transcribe: load, run, unload (free VRAM); on CUDA OOM walk
+            # the degradation ladder with lighter settings.
+            transcriber_config = self._tuned(
+                replace(
+                    build_transcriber_config(self._config),
+                    language=language, initial_prompt=initial_prompt,
+                ),
+                preprocessed_path,
+            )
+            t1 = time.monotonic()
+            with self._stage("transcribe", language=language):
+                segments, rung = run_with_ladder(
+                    "transcription",
+                    lambda: self._transcribe(transcriber_config, preprocessed_path),
+                    lambda attempt: self._retry_transcribe(attempt, preprocessed_path),
+                    transcription_attempts(
+                        transcriber_config, self._oom_ladder,
+                        self._config.oom_chunk_seconds,
+                    ),
+                )
+            t2 = time.monotonic()
+            if rung is not None:
+                oom_recovery["transcription"] = rung
+                self._record_oom_batch_size(transcriber_config, rung)
+            logger.info(
+                "Transcription%s completed in %.1fs (%d segments)",
+                " (subprocess)" if self._config.use_subprocess else "",
+                t2 - t1, len(segments),
+            )
+
+            # Columnar from here on: alignment and export read the columns
+            # instead of per-segment objects.
+            table = (
+                segments if isinstance(segments, SegmentTable)
+                else SegmentTable.from_segments(segments)
+            )
+            del segments
 
             # 4. Diarize if enabled: load, run, unload (free VRAM)
             num_speakers = 0
+            embeddings: dict[str, list[float]] = {}
             if self._config.diarization_enabled:
                 diarizer_config = DiarizerConfig(
                     num_speakers=self._config.num_speakers,
@@ -119,61 +551,102 @@ class TranscriptionPipeline:
                     max_speakers=self._config.max_speakers,
                     cache_dir=self._config.model_dir,
                     hf_token=self._config.hf_token,
+                    num_threads=self._config.diarizer_threads or None,
+                    offline=self._config.offline,
+                    device=self._config.device,
                 )
 
-                if self._config.use_subprocess:
-                    t3 = time.monotonic()
-                    raw = run_diarization_subprocess(
-                        asdict(diarizer_config), preprocessed_path,
-                    )
-                    t4 = time.monotonic()
-                    logger.info("Diarization (subprocess) completed in %.1fs", t4 - t3)
-                    diarization_result = DiarizationResult(
-                        turns=[DiarizationTurn(**t) for t in raw["turns"]],
-                        num_speakers=raw["num_speakers"],
+                t3 = time.monotonic()
+                with self._stage("diarize"):
+                    diarization_result, rung = run_with_ladder(
+                        "diarization",
+                        lambda: self._diarize(diarizer_config, preprocessed_path),
+                        lambda cfg: self._retry_diarize(cfg, preprocessed_path),
+                        diarization_attempts(diarizer_config, self._oom_ladder),
                     )
-                else:
-                    diarizer = PyannoteDiarizer(diarizer_config)
-                    try:
-                        log_gpu_memory("before_diarizer_load")
-                        diarizer.load_model()
-                        log_gpu_memory("after_diarizer_load")
-                        t3 = time.monotonic()
-                        diarization_result = diarizer.diarize(preprocessed_path)
-                        t4 = time.monotonic()
-                        logger.info("Diarization completed in %.1fs", t4 - t3)
-                    finally:
-                        try:
-                            diarizer.unload_model()
-                        except Exception:
-                            logger.exception("Failed to unload diarizer")
-                    cleanup_gpu_memory("after_diarizer_unload")
+                t4 = time.monotonic()
+                if rung is not None:
+                    oom_recovery["diarization"] = rung
+                logger.info(
+                    "Diarization%s completed in %.1fs",
+                    " (subprocess)" if self._config.use_subprocess else "",
+                    t4 - t3,
+                )
 
                 # 5. Align segments with diarization
-                segments = align_segments(segments, diarization_result)
+                with self._stage("align"):
+                    table = align_segments(table, diarization_result)
+                    table, embeddings = self._name_speakers(
+                        table, diarization_result.embeddings,
+                    )
                 num_speakers = diarization_result.num_speakers
+
+            if start is not None or end is not None:
+                offset = start or 0.0
+                time_range = (offset, offset + wav_duration(preprocessed.path))
+                if offset:
+                    table = table.shifted(offset)
         finally:
+            self._release_handoff()
             preprocessed.cleanup()
 
         # 6. Build result
         elapsed = time.monotonic() - start_time
         logger.info("Total pipeline: %.1fs", elapsed)
-        duration = segments[-1].end if segments else 0.0
+        duration = table[-1].end if table else 0.0
         metadata = TranscriptMetadata(
             source_file=audio_path,
             duration_seconds=duration,
             model=self._config.model_size,
-            language=self._config.language,
+            language=language,
             diarization=self._config.diarization_enabled,
             num_speakers=num_speakers,
             processing_time_seconds=elapsed,
+            oom_recovery=oom_recovery,
+            time_range=time_range,
         )
-        result = TranscriptResult(
-            metadata=metadata, segments=segments,
+        return TranscriptResult(
+            metadata=metadata, segments=table, speaker_embeddings=embeddings,
         )
 
-        # 7. Export
+    def export(self, result: TranscriptResult, output_dir: str | None = None) -> None:
+        """Write ``result`` in the configured formats (and its stage profiles)."""
         resolved_dir = output_dir if output_dir is not None else self._config.output_dir
-        export_transcript(result, self._config.formats, Path(resolved_dir))
-
-        return result
+        committer = self._committer or OutputCommitter(
+            self._config.fsync, self._config.fsync_group_size,
+        )
+        with self._stage("export", formats=self._config.formats):
+            export_transcript(
+                result, self._config.formats, Path(resolved_dir),
+                compact_json=self._config.compact_json,
+                concurrent=self._config.concurrent_export,
+                committer=committer,
+            )
+            if self._config.export_speaker_embeddings and result.speaker_embeddings:
+                path = Path(resolved_dir) / (
+                    f"{Path(result.metadata.source_file).stem}{SPEAKERS_SUFFIX}"
+                )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with committer.open(path) as f:
+                    json.dump({
+                        "version": 1,
+                        "source_file": result.metadata.source_file,
+                        "speakers": result.speaker_embeddings,
+                    }, f, ensure_ascii=False)
+            if result.memory_timeline:
+                path = Path(resolved_dir) / (
+                    f"{Path(result.metadata.source_file).stem}{MEMORY_SUFFIX}"
+                )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with committer.open(path) as f:
+                    json.dump({
+                        "version": 1,
+                        "source_file": result.metadata.source_file,
+                        "interval": self._config.memory_interval,
+                        "peaks": result.metadata.memory_peaks,
+                        "samples": result.memory_timeline,
+                    }, f, ensure_ascii=False)
+            if self._committer is None:
+                committer.commit()
+        profiler, self._profiler = self._profiler, NULL_PROFILER
+        profiler.write(profile_dir(Path(resolved_dir), result.metadata.source_file))
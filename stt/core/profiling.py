@@ -0,0 +1,213 @@
+"""Per-stage profiling of pipeline runs (``--profile``).
+
+Each file gets a ``StageProfiler``; the pipeline wraps its stages
+(decode, load, transcribe, diarize, align, export) in ``stage(name)``
+and the profiles are written to ``<stem>.profile/`` next to the outputs.
+
+Stages nest (a model load happens inside transcribe): entering a stage
+pauses the enclosing one, so every profile holds only its own stage's
+time. A stage entered several times (OOM retries, chunks) accumulates
+into one profile where the backend can merge them.
+
+Backends:
+
+- ``cprofile``: deterministic, standard library; ``<stage>.prof`` for
+  ``pstats``/snakeviz;
+- ``sampling``: pyinstrument's statistical profiler, much lower overhead
+  on long stages; ``<stage>.html``;
+- ``torch``: ``torch.profiler`` with CPU and (when available) CUDA
+  activity; ``<stage>.pt.trace.json`` for Perfetto/TensorBoard.
+
+Only the calling thread is profiled, and with subprocess isolation the
+model stages run in a child process the profile does not see. Disabled,
+``stage`` returns a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import abc
+import contextlib
+import cProfile
+import functools
+import logging
+import pstats
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "sampling", "torch")
+PROFILE_SUFFIX = ".profile"
+
+
+def profile_dir(output_dir: Path, source_file: str) -> Path:
+    return output_dir / f"{Path(source_file).stem}{PROFILE_SUFFIX}"
+
+
+class StageProfiler:
+    """Profiler that records nothing; base of the real backends."""
+
+    _NOOP = contextlib.nullcontext()
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager[None]:
+        return self._NOOP
+
+    def write(self, directory: Path) -> list[Path]:
+        """Write one artifact per profiled stage into ``directory``."""
+        return []
+
+
+class _RecordingProfiler(StageProfiler, abc.ABC):
+    """Stage stack bookkeeping; subclasses start and stop one recording."""
+
+    def __init__(self) -> None:
+        self._stack: list[str] = []
+        self._active: Any = None
+        self._recordings: dict[str, list[Any]] = {}
+
+    @abc.abstractmethod
+    def _start(self) -> Any:
+        """Start recording; return the handle ``_stop`` receives."""
+
+    @abc.abstractmethod
+    def _stop(self, handle: Any) -> Any:
+        """Stop ``handle``; return the recording to keep for the stage."""
+
+    @abc.abstractmethod
+    def _write_stage(self, name: str, recordings: list[Any], directory: Path) -> list[Path]:
+        """Write the merged ``recordings`` of stage ``name``."""
+
+    def _pause(self) -> None:
+        if self._active is not None:
+            recording = self._stop(self._active)
+            self._active = None
+            self._recordings.setdefault(self._stack[-1], []).append(recording)
+
+    @contextlib.contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        self._pause()
+        self._stack.append(name)
+        self._active = self._start()
+        try:
+            yield
+        finally:
+            self._pause()
+            self._stack.pop()
+            if self._stack:
+                self._active = self._start()
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager[None]:
+        return self._stage(name)
+
+    def write(self, directory: Path) -> list[Path]:
+        if not self._recordings:
+            return []
+        directory.mkdir(parents=True, exist_ok=True)
+        written: list[Path] = []
+        for name, recordings in self._recordings.items():
+            written.extend(self._write_stage(name, recordings, directory))
+        self._recordings = {}
+        logger.info("Wrote %d stage profiles to %s", len(written), directory)
+        return written
+
+
+class CProfileProfiler(_RecordingProfiler):
+    def _start(self) -> cProfile.Profile:
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def _stop(self, handle: cProfile.Profile) -> cProfile.Profile:
+        handle.disable()
+        return handle
+
+    def _write_stage(
+        self, name: str, recordings: list[Any], directory: Path,
+    ) -> list[Path]:
+        path = directory / f"{name}.prof"
+        pstats.Stats(*recordings).dump_stats(path)
+        return [path]
+
+
+class SamplingProfiler(_RecordingProfiler):
+    def __init__(self, interval: float = 0.001) -> None:
+        super().__init__()
+        try:
+            import pyinstrument
+        except ImportError as e:
+            raise ImportError(
+                "the sampling profiler requires pyinstrument: pip install pyinstrument"
+            ) from e
+        self._pyinstrument = pyinstrument
+        self._interval = interval
+
+    def _start(self) -> Any:
+        profiler = self._pyinstrument.Profiler(interval=self._interval)
+        profiler.start()
+        return profiler
+
+    def _stop(self, handle: Any) -> Any:
+        return handle.stop()
+
+    def _write_stage(
+        self, name: str, recordings: list[Any], directory: Path,
+    ) -> list[Path]:
+        from pyinstrument.renderers import HTMLRenderer
+        from pyinstrument.session import Session
+
+        session = functools.reduce(Session.combine, recordings)
+        path = directory / f"{name}.html"
+        path.write_text(HTMLRenderer().render(session), encoding="utf-8")
+        return [path]
+
+
+class TorchProfiler(_RecordingProfiler):
+    def __init__(self) -> None:
+        super().__init__()
+        import torch
+
+        self._torch = torch
+        self._activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            self._activities.append(torch.profiler.ProfilerActivity.CUDA)
+
+    def _start(self) -> Any:
+        profiler = self._torch.profiler.profile(activities=self._activities)
+        profiler.start()
+        return profiler
+
+    def _stop(self, handle: Any) -> Any:
+        handle.stop()
+        return handle
+
+    def _write_stage(
+        self, name: str, recordings: list[Any], directory: Path,
+    ) -> list[Path]:
+        # Kineto traces cannot be merged: one file per time the stage ran.
+        paths = [
+            directory / (
+                f"{name}.pt.trace.json" if len(recordings) == 1
+                else f"{name}-{i}.pt.trace.json"
+            )
+            for i in range(len(recordings))
+        ]
+        for recording, path in zip(recordings, paths, strict=True):
+            recording.export_chrome_trace(str(path))
+        return paths
+
+
+NULL_PROFILER = StageProfiler()
+
+
+def make_profiler(kind: str | None) -> StageProfiler:
+    """Fresh profiler for one file; ``None`` gives the no-op profiler."""
+    if kind is None:
+        return NULL_PROFILER
+    if kind == "cprofile":
+        return CProfileProfiler()
+    if kind == "sampling":
+        return SamplingProfiler()
+    if kind == "torch":
+        return TorchProfiler()
+    raise ValueError(f"unknown profiler {kind!r}; expected one of: {', '.join(PROFILERS)}")
@@ -0,0 +1,292 @@
+"""Local index of downloaded models for hub-free loading.
+
+``stt models download`` resolves each model to a snapshot directory and
+records it here with a SHA-256 and size for every file. Loading then goes
+straight to that directory: faster-whisper gets a path instead of a repo
+ID, and pyannote gets a pipeline config whose sub-model references were
+rewritten to local snapshots at download time, so neither library asks
+the hub for anything. A recorded model whose files are missing or have
+the wrong size fails immediately instead of falling back to a download.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from stt.exceptions import ModelError
+from stt.exporters.atomic import OutputCommitter
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FILE = "model_registry.json"
+WHISPER = "whisper"
+DIARIZATION = "diarization"
+# Rewritten pyannote pipeline configs live here, one directory per model.
+_PIPELINES_DIR = ".pipelines"
+_STORE_VERSION = 1
+_HUB_ID = re.compile(r"^[\w.-]+/[\w.-]+$")
+_MODEL_PREFIX = "$model/"
+
+
+@dataclass
+class FileRecord:
+    size: int
+    sha256: str
+
+
+@dataclass
+class ModelEntry:
+    kind: str
+    name: str
+    # What to hand the loader: a snapshot directory (whisper) or a
+    # pipeline config file (diarization).
+    path: str
+    # Every directory the model reads from, with its files.
+    snapshots: dict[str, dict[str, FileRecord]] = field(default_factory=dict)
+    installed_at: str = ""
+
+    @property
+    def size(self) -> int:
+        return sum(f.size for files in self.snapshots.values() for f in files.values())
+
+    def problems(self, *, checksums: bool = False) -> list[str]:
+        """Files that are missing or changed; empty when the model is intact.
+
+        Sizes are always checked; ``checksums`` also re-hashes every file,
+        which reads the whole model.
+        """
+        found: list[str] = []
+        if not Path(self.path).exists():
+            found.append(f"{self.path}: missing")
+        for root, files in self.snapshots.items():
+            for rel, record in files.items():
+                path = Path(root) / rel
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    found.append(f"{path}: missing")
+                    continue
+                if size != record.size:
+                    found.append(f"{path}: size {size} != {record.size}")
+                elif checksums and file_sha256(path) != record.sha256:
+                    found.append(f"{path}: checksum mismatch")
+        return found
+
+
+def registry_path(model_dir: str | None) -> Path:
+    return Path(model_dir).expanduser() / REGISTRY_FILE if model_dir else Path(REGISTRY_FILE)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_files(root: Path) -> dict[str, FileRecord]:
+    """Size and SHA-256 of every file under ``root`` (symlinks followed)."""
+    return {
+        path.relative_to(root).as_posix(): FileRecord(path.stat().st_size, file_sha256(path))
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def _entry_from_dict(data: dict[str, Any]) -> ModelEntry:
+    return ModelEntry(
+        kind=data["kind"],
+        name=data["name"],
+        path=data["path"],
+        snapshots={
+            root: {rel: FileRecord(**record) for rel, record in files.items()}
+            for root, files in data.get("snapshots", {}).items()
+        },
+        installed_at=data.get("installed_at", ""),
+    )
+
+
+class ModelRegistry:
+    """JSON index of installed models in ``model_dir``."""
+
+    def __init__(self, model_dir: str | None) -> None:
+        self.model_dir = model_dir
+        self.path = registry_path(model_dir)
+
+    @staticmethod
+    def key(kind: str, name: str) -> str:
+        return f"{kind}:{name}"
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable model registry %s: %s", self.path, e)
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _STORE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def entries(self) -> list[ModelEntry]:
+        result: list[ModelEntry] = []
+        for key, data in sorted(self._load().items()):
+            try:
+                result.append(_entry_from_dict(data))
+            except (KeyError, TypeError) as e:
+                logger.warning("Skipping malformed registry entry %s: %s", key, e)
+        return result
+
+    def get(self, kind: str, name: str) -> ModelEntry | None:
+        data = self._load().get(self.key(kind, name))
+        if not isinstance(data, dict):
+            return None
+        try:
+            return _entry_from_dict(data)
+        except (KeyError, TypeError):
+            return None
+
+    def record(self, entry: ModelEntry) -> None:
+        entries = self._load()
+        entries[self.key(entry.kind, entry.name)] = asdict(entry)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        committer = OutputCommitter("file")
+        with committer.open(self.path) as f:
+            json.dump(
+                {"version": _STORE_VERSION, "entries": entries}, f,
+                ensure_ascii=False, indent=2,
+            )
+        committer.commit()
+
+    def resolve(self, kind: str, name: str, *, required: bool = False) -> str | None:
+        """Local path to load ``name`` from, or None when it is not recorded.
+
+        A recorded but damaged model raises ModelError; so does an
+        unrecorded one when ``required`` (offline mode).
+        """
+        entry = self.get(kind, name)
+        if entry is None:
+            if required:
+                raise ModelError(
+                    f"{kind} model '{name}' is not installed in {self.model_dir}; "
+                    f"run 'stt models download' first",
+                )
+            return None
+        problems = entry.problems()
+        if problems:
+            raise ModelError(
+                f"{kind} model '{name}' is damaged ({'; '.join(problems[:3])}); "
+                f"run 'stt models download' again",
+            )
+        return entry.path
+
+
+def install_whisper(
+    name: str,
+    model_dir: str,
+    *,
+    download: Callable[..., str] | None = None,
+) -> ModelEntry:
+    """Download a faster-whisper model into ``model_dir`` and record it."""
+    if download is None:
+        from faster_whisper import download_model
+
+        download = download_model
+    root = Path(model_dir).expanduser().resolve()
+    snapshot = Path(download(name, cache_dir=str(root))).resolve()
+    entry = ModelEntry(
+        kind=WHISPER,
+        name=name,
+        path=str(snapshot),
+        snapshots={str(snapshot): snapshot_files(snapshot)},
+        installed_at=datetime.now(UTC).isoformat(),
+    )
+    ModelRegistry(model_dir).record(entry)
+    return entry
+
+
+def _localize(
+    node: Any, snapshot: Path, fetch: Callable[[str], Path], used: dict[str, Path],
+) -> Any:
+    """Rewrite hub IDs and ``$model/`` references in a pipeline config to local paths."""
+    if isinstance(node, dict):
+        return {key: _localize(value, snapshot, fetch, used) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_localize(value, snapshot, fetch, used) for value in node]
+    if not isinstance(node, str):
+        return node
+    if node.startswith(_MODEL_PREFIX):
+        # Same shape pyannote's expand_subfolders produces for a local checkpoint.
+        # A pinned "@revision" is already the one in the snapshot.
+        subfolder = node[len(_MODEL_PREFIX):].split("@")[0]
+        return {"checkpoint": str(snapshot), "subfolder": subfolder}
+    if _HUB_ID.match(node):
+        if node not in used:
+            used[node] = fetch(node)
+        return str(used[node])
+    return node
+
+
+def install_diarization(
+    name: str,
+    model_dir: str,
+    *,
+    token: str | None = None,
+    download: Callable[..., str] | None = None,
+) -> ModelEntry:
+    """Download a pyannote pipeline and its sub-models, and record them.
+
+    The pipeline's ``config.yaml`` is copied next to the registry with
+    every model reference pointing at a local snapshot directory.
+    """
+    if download is None:
+        from huggingface_hub import snapshot_download
+
+        download = snapshot_download
+    root = Path(model_dir).expanduser().resolve()
+
+    def fetch(repo_id: str) -> Path:
+        return Path(download(repo_id=repo_id, cache_dir=str(root), token=token)).resolve()
+
+    snapshot = fetch(name)
+    try:
+        config = yaml.safe_load((snapshot / "config.yaml").read_text(encoding="utf-8"))
+    except (OSError, yaml.YAMLError) as e:
+        raise ModelError(f"No pipeline config in {snapshot}: {e}") from e
+    if not isinstance(config, dict) or "pipeline" not in config:
+        raise ModelError(f"Not a pyannote pipeline: {name}")
+    used: dict[str, Path] = {}
+    config["pipeline"] = _localize(config["pipeline"], snapshot, fetch, used)
+
+    local_config = root / _PIPELINES_DIR / name.replace("/", "--") / "config.yaml"
+    local_config.parent.mkdir(parents=True, exist_ok=True)
+    committer = OutputCommitter("file")
+    with committer.open(local_config) as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    committer.commit()
+
+    snapshots = {str(snapshot): snapshot_files(snapshot)}
+    for path in used.values():
+        snapshots[str(path)] = snapshot_files(path)
+    entry = ModelEntry(
+        kind=DIARIZATION,
+        name=name,
+        path=str(local_config),
+        snapshots=snapshots,
+        installed_at=datetime.now(UTC).isoformat(),
+    )
+    ModelRegistry(model_dir).record(entry)
+    return entry
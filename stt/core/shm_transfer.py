@@ -0,0 +1,78 @@
+"""Hand segment results between processes through shared memory.
+
+The child encodes segments in the ``.sttb`` columnar layout (fixed-width
+time/confidence/speaker columns plus a UTF-8 text heap) into a
+``multiprocessing.shared_memory`` block and sends only the block name over
+the queue. The parent maps the block, bulk-copies the columns into a
+``SegmentTable`` and unlinks it, so no per-segment pickling happens on
+either side.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+from typing import Any, cast
+
+from stt.data_models import Segment, SegmentTable, TranscriptMetadata, TranscriptResult
+from stt.exporters.binary_export import BinarySink, BinaryTranscript
+from stt.exporters.render import render
+
+
+class _ChunkBuffer:
+    """Write target that keeps encoded chunks until their total size is known."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(data)
+        self.size += len(data)
+        return len(data)
+
+
+def publish_segments(segments: Sequence[Segment]) -> dict[str, Any]:
+    """Write ``segments`` to a new shared-memory block (child side).
+
+    Returns the control message for the parent. The block is left for the
+    parent to unlink; if the parent never collects it, the multiprocessing
+    resource tracker removes it when the parent exits.
+    """
+    result = TranscriptResult(
+        metadata=TranscriptMetadata(source_file="", duration_seconds=0.0),
+        segments=segments,
+    )
+    buffer = _ChunkBuffer()
+    render(result, [BinarySink(cast(Any, buffer))])
+
+    shm = shared_memory.SharedMemory(create=True, size=buffer.size)
+    try:
+        buf = shm.buf
+        assert buf is not None  # only None after close()
+        offset = 0
+        for chunk in buffer.chunks:
+            buf[offset: offset + len(chunk)] = chunk
+            offset += len(chunk)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return {"shm": shm.name, "size": buffer.size}
+
+
+def collect_segments(message: dict[str, Any]) -> SegmentTable:
+    """Read and release a block written by ``publish_segments`` (parent side)."""
+    shm = shared_memory.SharedMemory(name=message["shm"])
+    try:
+        assert shm.buf is not None  # only None after close()
+        view = shm.buf[: message["size"]]
+        try:
+            with BinaryTranscript.from_buffer(view, name=message["shm"]) as reader:
+                return reader.to_table()
+        finally:
+            view.release()
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,248 @@
+"""Persistent index of enrolled speaker embeddings.
+
+An index is a directory:
+
+- ``vectors.npy``: one L2-normalized float32 row per enrollment,
+  memory-mapped on load so opening a large index costs no reads;
+- ``index.json``: the speaker name of each row and, for large indexes,
+  the IVF layout;
+- ``ivf_centroids.npy``: IVF list centroids (large indexes only).
+
+Small indexes are searched exhaustively, which is one matrix-vector
+product. From ``IVF_MIN_VECTORS`` rows on, ``save`` clusters the rows
+(k-means, ``sqrt(n)`` lists) and stores them grouped by list, so a query
+scans only the ``nprobe`` lists whose centroids are closest.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from stt.exporters.atomic import OutputCommitter
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+VECTORS_FILE = "vectors.npy"
+CENTROIDS_FILE = "ivf_centroids.npy"
+# Cosine similarity from which a diarization speaker is an enrolled one.
+DEFAULT_MATCH_THRESHOLD = 0.6
+IVF_MIN_VECTORS = 4096
+DEFAULT_NPROBE = 8
+_KMEANS_ITERATIONS = 10
+_INDEX_VERSION = 1
+
+
+def _normalized(vector: Any) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(v))
+    if not norm or not math.isfinite(norm):
+        raise ValueError("embedding must be a finite, non-zero vector")
+    return v / norm
+
+
+def _kmeans(vectors: np.ndarray, k: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means; returns (centroids, assignment per row)."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    assignment = np.zeros(len(vectors), dtype=np.int64)
+    for _ in range(_KMEANS_ITERATIONS):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for i in range(k):
+            members = vectors[assignment == i]
+            if len(members):
+                mean = members.sum(axis=0)
+                centroids[i] = mean / (np.linalg.norm(mean) or 1.0)
+    return centroids, assignment
+
+
+class SpeakerIndex:
+    """Enrolled speaker embeddings with nearest-neighbour lookup."""
+
+    def __init__(self, path: str | Path, *, nprobe: int = DEFAULT_NPROBE) -> None:
+        self.path = Path(path)
+        self.nprobe = nprobe
+        self._names: list[str] = []
+        self._vectors: np.ndarray | None = None
+        self._centroids: np.ndarray | None = None
+        # Row range of each IVF list: list i is rows offsets[i]:offsets[i+1].
+        self._offsets: list[int] = []
+        # Rows added since the last save or search, stacked lazily.
+        self._added: list[np.ndarray] = []
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            meta = json.loads((self.path / INDEX_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Unreadable speaker index {self.path}: {e}") from e
+        if meta.get("version") != _INDEX_VERSION:
+            raise ValueError(f"Unsupported speaker index version in {self.path}")
+        self._names = list(meta["names"])
+        if not self._names:
+            return
+        self._vectors = np.load(self.path / VECTORS_FILE, mmap_mode="r")
+        if len(self._vectors) != len(self._names):
+            raise ValueError(f"Speaker index {self.path} is inconsistent")
+        self._offsets = list(meta.get("ivf_offsets") or [])
+        if self._offsets:
+            self._centroids = np.load(self.path / CENTROIDS_FILE)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def dim(self) -> int | None:
+        if self._added:
+            return int(self._added[0].shape[0])
+        return None if self._vectors is None else int(self._vectors.shape[1])
+
+    def _rows(self) -> np.ndarray | None:
+        if self._added:
+            added = np.stack(self._added)
+            self._vectors = (
+                added if self._vectors is None else np.vstack([self._vectors, added])
+            )
+            self._added = []
+        return self._vectors
+
+    def speakers(self) -> dict[str, int]:
+        """Enrolled names and their number of enrollments."""
+        counts: dict[str, int] = {}
+        for name in self._names:
+            counts[name] = counts.get(name, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def add(self, name: str, embedding: Any) -> None:
+        """Enroll one more embedding for ``name`` (call ``save`` to persist)."""
+        vector = _normalized(embedding)
+        dim = self.dim
+        if dim is not None and vector.shape[0] != dim:
+            raise ValueError(
+                f"embedding has {vector.shape[0]} dimensions, index has {dim}"
+            )
+        self._added.append(vector)
+        self._names.append(name)
+        self._centroids = None
+        self._offsets = []
+
+    def remove(self, name: str) -> int:
+        """Drop every enrollment of ``name``; return how many there were."""
+        keep = [i for i, n in enumerate(self._names) if n != name]
+        removed = len(self._names) - len(keep)
+        if removed:
+            vectors = self._rows()
+            self._names = [self._names[i] for i in keep]
+            self._vectors = np.asarray(vectors)[keep] if keep else None
+            self._centroids = None
+            self._offsets = []
+        return removed
+
+    def save(self) -> None:
+        """Write the index atomically, rebuilding the IVF lists if it is large."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        rows = self._rows()
+        vectors = (
+            np.zeros((0, 0), dtype=np.float32) if rows is None
+            else np.ascontiguousarray(rows, dtype=np.float32)
+        )
+        names = self._names
+        centroids: np.ndarray | None = None
+        offsets: list[int] = []
+        if len(vectors) >= IVF_MIN_VECTORS:
+            centroids, assignment = _kmeans(vectors, int(math.sqrt(len(vectors))))
+            order = np.argsort(assignment, kind="stable")
+            vectors = vectors[order]
+            names = [names[i] for i in order]
+            counts = np.bincount(assignment, minlength=len(centroids))
+            offsets = [0, *np.cumsum(counts).tolist()]
+
+        committer = OutputCommitter("file")
+        with committer.open(self.path / VECTORS_FILE, binary=True) as f:
+            np.save(f, vectors)
+        if centroids is not None:
+            with committer.open(self.path / CENTROIDS_FILE, binary=True) as f:
+                np.save(f, centroids)
+        # The metadata goes last: it is what makes the new vectors current.
+        with committer.open(self.path / INDEX_FILE) as f:
+            json.dump({
+                "version": _INDEX_VERSION,
+                "names": names,
+                "ivf_offsets": offsets or None,
+            }, f, ensure_ascii=False)
+        committer.commit()
+        self._names = list(names)
+        self._centroids = centroids
+        self._offsets = offsets
+        self._load()
+
+    def _candidates(self, query: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(row numbers, cosine scores) of the rows worth comparing with ``query``."""
+        assert self._vectors is not None
+        if self._centroids is None:
+            return np.arange(len(self._names)), np.asarray(self._vectors @ query)
+        lists = np.argsort(self._centroids @ query)[::-1][: self.nprobe]
+        rows = np.concatenate([
+            np.arange(self._offsets[i], self._offsets[i + 1]) for i in lists
+        ])
+        return rows, np.asarray(self._vectors[rows] @ query)
+
+    def search(self, embedding: Any, k: int = 1) -> list[tuple[str, float]]:
+        """Best ``k`` enrolled speakers for ``embedding``, most similar first."""
+        vectors = self._rows()
+        if vectors is None:
+            return []
+        query = _normalized(embedding)
+        if query.shape[0] != vectors.shape[1]:
+            raise ValueError(
+                f"embedding has {query.shape[0]} dimensions, index has {vectors.shape[1]}"
+            )
+        rows, scores = self._candidates(query)
+        best: dict[str, float] = {}
+        for row in np.argsort(scores)[::-1]:
+            name = self._names[int(rows[row])]
+            if name not in best:
+                best[name] = float(scores[row])
+                if len(best) == k:
+                    break
+        return list(best.items())
+
+    def identify(
+        self,
+        embeddings: dict[str, list[float]],
+        *,
+        threshold: float = DEFAULT_MATCH_THRESHOLD,
+    ) -> dict[str, str]:
+        """Map diarization labels to enrolled names.
+
+        Pairs are taken greedily from the most similar down and each name
+        is used once, so two speakers of one file never merge. Labels with
+        no enrolled speaker above ``threshold`` are left out.
+        """
+        if not self._names:
+            return {}
+        pairs = sorted(
+            (
+                (score, label, name)
+                for label, vector in embeddings.items()
+                for name, score in self.search(vector, k=len(embeddings))
+                if score >= threshold
+            ),
+            reverse=True,
+        )
+        mapping: dict[str, str] = {}
+        used: set[str] = set()
+        for _score, label, name in pairs:
+            if label in mapping or name in used:
+                continue
+            mapping[label] = name
+            used.add(name)
+        return mapping
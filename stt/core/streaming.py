@@ -0,0 +1,343 @@
+"""Low-latency transcription of an audio stream.
+
+Audio arrives as 16 kHz mono PCM (see ``PcmSource``) and is kept in a
+sliding buffer. Every ``step_seconds`` the buffer is decoded with a model
+that stays loaded, and the hypothesis is reported as a *partial* segment.
+Speech detection decides what becomes *final*:
+
+- a pause of at least ``min_silence_seconds`` inside the buffer commits
+  every segment before it, and the buffer is cut in the middle of the
+  pause;
+- a buffer that reaches ``max_buffer_seconds`` without a pause commits all
+  but its last segment, which bounds the latency of final segments;
+- a buffer without any speech is dropped without decoding.
+
+Committed text is passed back to the decoder as its prompt, so the model
+keeps the context it would have had in a full-file run.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import subprocess
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import IO, Any, Protocol
+
+import numpy as np
+
+from stt.core.audio import TARGET_SAMPLE_RATE
+from stt.data_models import Segment
+from stt.exceptions import AudioPreprocessError
+
+logger = logging.getLogger(__name__)
+
+PARTIAL = "partial"
+FINAL = "final"
+_PROMPT_CHARS = 200
+_COPY_CHUNK = 64 * 1024
+_MAX_WAV_HEADER = 64 * 1024
+
+
+@dataclass
+class StreamConfig:
+    step_seconds: float = 1.0
+    max_buffer_seconds: float = 15.0
+    min_silence_seconds: float = 0.6
+    vad_threshold: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.step_seconds <= 0:
+            raise ValueError(f"step_seconds must be > 0, got {self.step_seconds}")
+        if self.max_buffer_seconds < self.step_seconds:
+            raise ValueError("max_buffer_seconds must be >= step_seconds")
+        if self.min_silence_seconds <= 0:
+            raise ValueError(
+                f"min_silence_seconds must be > 0, got {self.min_silence_seconds}"
+            )
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    kind: str
+    start: float
+    end: float
+    text: str
+    confidence: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "type": self.kind,
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "text": self.text,
+        }
+        if self.confidence is not None:
+            data["confidence"] = self.confidence
+        return data
+
+
+class StreamDecoder(Protocol):
+    """What the stream needs from ``Transcriber``."""
+
+    initial_prompt: str | None
+
+    def transcribe(self, audio: Any) -> list[Segment]: ...
+
+
+# Speech regions of a float32 buffer, in seconds from its start.
+SpeechDetector = Callable[[np.ndarray], list[tuple[float, float]]]
+
+
+def silero_speech_detector(
+    *, threshold: float = 0.5, min_silence_seconds: float = 0.6,
+) -> SpeechDetector:
+    """Speech regions via the Silero VAD bundled with faster-whisper."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(
+        threshold=threshold,
+        min_silence_duration_ms=int(min_silence_seconds * 1000),
+        speech_pad_ms=100,
+    )
+
+    def detect(audio: np.ndarray) -> list[tuple[float, float]]:
+        return [
+            (ts["start"] / TARGET_SAMPLE_RATE, ts["end"] / TARGET_SAMPLE_RATE)
+            for ts in get_speech_timestamps(audio, options)
+        ]
+
+    return detect
+
+
+class PcmSource:
+    """16 kHz mono float32 samples from a byte stream.
+
+    Raw s16le PCM (``raw=True``) and WAV already in that format are read
+    directly; anything else is piped through ffmpeg. WAV sizes are
+    ignored, since a streaming writer cannot know them up front.
+    """
+
+    def __init__(self, stream: IO[bytes], *, raw: bool = False) -> None:
+        self._stream = stream
+        self._process: subprocess.Popen[bytes] | None = None
+        self._feeder: threading.Thread | None = None
+        self._pending = b""
+        if raw:
+            self._reader = stream
+            return
+        header, ok = _read_wav_header(stream)
+        if ok:
+            self._reader = stream
+        else:
+            logger.debug("Stream is not 16 kHz mono PCM; decoding with ffmpeg")
+            self._reader = self._start_ffmpeg(header)
+
+    def _start_ffmpeg(self, header: bytes) -> IO[bytes]:
+        cmd = [
+            "ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+            "-f", "s16le", "-ar", str(TARGET_SAMPLE_RATE), "-ac", "1", "pipe:1",
+        ]
+        try:
+            process = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            raise AudioPreprocessError(
+                "ffmpeg not found. Install ffmpeg or pass raw 16 kHz mono PCM."
+            ) from None
+        assert process.stdin is not None and process.stdout is not None
+        self._process = process
+        self._feeder = threading.Thread(
+            target=_copy_stream, args=(header, self._stream, process.stdin), daemon=True,
+        )
+        self._feeder.start()
+        return process.stdout
+
+    def read(self, seconds: float) -> np.ndarray:
+        """Up to ``seconds`` of audio; blocks until that much arrives or EOF."""
+        want = int(seconds * TARGET_SAMPLE_RATE) * 2
+        data = self._pending + self._reader.read(want - len(self._pending))
+        usable = len(data) - len(data) % 2
+        self._pending = data[usable:]
+        samples = np.frombuffer(data[:usable], dtype="<i2")
+        return samples.astype(np.float32) / 32768.0
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+        self._process.kill()
+        self._process.wait()
+        self._process = None
+
+
+def _read_wav_header(stream: IO[bytes]) -> tuple[bytes, bool]:
+    """Consume a target-format WAV header; return the bytes read and whether it was one."""
+    header = stream.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return header, False
+    fmt_ok = False
+    while len(header) < _MAX_WAV_HEADER:
+        chunk = stream.read(8)
+        header += chunk
+        if len(chunk) < 8:
+            return header, False
+        chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"data":
+            return header, fmt_ok
+        if len(header) + size > _MAX_WAV_HEADER:
+            return header, False
+        body = stream.read(size + size % 2)
+        header += body
+        if chunk_id == b"fmt ":
+            if len(body) < 16:
+                return header, False
+            tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            fmt_ok = (tag, channels, rate, bits) == (1, 1, TARGET_SAMPLE_RATE, 16)
+    return header, False
+
+
+def _copy_stream(head: bytes, source: IO[bytes], sink: IO[bytes]) -> None:
+    try:
+        sink.write(head)
+        # read1: pass on whatever has arrived instead of waiting for a full chunk.
+        read = getattr(source, "read1", source.read)
+        while chunk := read(_COPY_CHUNK):
+            sink.write(chunk)
+    except (BrokenPipeError, ValueError):
+        pass
+    finally:
+        try:
+            sink.close()
+        except OSError:
+            pass
+
+
+class StreamingTranscriber:
+    """Turn pushed audio into partial and final segments (see module docstring)."""
+
+    def __init__(
+        self,
+        decoder: StreamDecoder,
+        config: StreamConfig | None = None,
+        *,
+        detect_speech: SpeechDetector | None = None,
+    ) -> None:
+        self._decoder = decoder
+        self._config = config or StreamConfig()
+        self._detect_speech = detect_speech or silero_speech_detector(
+            threshold=self._config.vad_threshold,
+            min_silence_seconds=self._config.min_silence_seconds,
+        )
+        self._buffer = np.zeros(0, dtype=np.float32)
+        # Stream time of the first sample in the buffer.
+        self._offset = 0.0
+        self._undecoded = 0
+        self._prompt = ""
+        self._last_partial: StreamEvent | None = None
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._buffer) / TARGET_SAMPLE_RATE
+
+    def feed(self, audio: np.ndarray) -> list[StreamEvent]:
+        """Add samples; decode once a step's worth has accumulated."""
+        self._buffer = np.concatenate([self._buffer, audio.astype(np.float32, copy=False)])
+        self._undecoded += len(audio)
+        if self._undecoded < self._config.step_seconds * TARGET_SAMPLE_RATE:
+            return []
+        self._undecoded = 0
+        return self._step(final=False)
+
+    def flush(self) -> list[StreamEvent]:
+        """Commit whatever is buffered (end of stream)."""
+        events = self._step(final=True) if len(self._buffer) else []
+        self._buffer = self._buffer[:0]
+        self._undecoded = 0
+        return events
+
+    def _step(self, *, final: bool) -> list[StreamEvent]:
+        duration = self.buffered_seconds
+        regions = self._detect_speech(self._buffer)
+        if not regions:
+            # Keep a pause's worth in case speech is just starting.
+            self._trim(max(0.0, duration - self._config.min_silence_seconds))
+            return []
+
+        self._decoder.initial_prompt = self._prompt or None
+        segments = self._decoder.transcribe(self._buffer)
+
+        cut = duration if final else self._commit_point(regions, duration)
+        if cut is None and duration >= self._config.max_buffer_seconds:
+            cut = segments[-1].start if len(segments) > 1 else duration
+        committed = [] if cut is None else [
+            s for s in segments if (s.start + s.end) / 2 < cut
+        ]
+        pending = segments[len(committed):]
+
+        events = [
+            StreamEvent(
+                FINAL, self._offset + s.start, self._offset + s.end, s.text, s.confidence,
+            )
+            for s in committed if s.text
+        ]
+        if committed:
+            text = f"{self._prompt} {' '.join(s.text for s in committed)}".strip()
+            self._prompt = text[-_PROMPT_CHARS:]
+        if pending:
+            partial = StreamEvent(
+                PARTIAL,
+                self._offset + pending[0].start,
+                self._offset + pending[-1].end,
+                " ".join(s.text for s in pending),
+            )
+            if partial != self._last_partial:
+                events.append(partial)
+            self._last_partial = partial
+        else:
+            self._last_partial = None
+        if cut is not None:
+            self._trim(cut)
+        return events
+
+    def _commit_point(
+        self, regions: list[tuple[float, float]], duration: float,
+    ) -> float | None:
+        """Middle of the last pause long enough to commit at, if any."""
+        min_silence = self._config.min_silence_seconds
+        gaps = [
+            (prev_end, next_start)
+            for (_, prev_end), (next_start, _) in zip(regions, regions[1:], strict=False)
+        ]
+        gaps.append((regions[-1][1], duration))
+        for gap_start, gap_end in reversed(gaps):
+            if gap_end - gap_start >= min_silence:
+                return (gap_start + gap_end) / 2
+        return None
+
+    def _trim(self, seconds: float) -> None:
+        samples = min(len(self._buffer), int(seconds * TARGET_SAMPLE_RATE))
+        self._buffer = self._buffer[samples:]
+        self._offset += samples / TARGET_SAMPLE_RATE
+
+
+def run_stream(
+    source: PcmSource,
+    streamer: StreamingTranscriber,
+    emit: Callable[[StreamEvent], None],
+    *,
+    step_seconds: float,
+) -> None:
+    """Pump ``source`` through ``streamer`` until EOF, emitting every event."""
+    step_samples = int(step_seconds * TARGET_SAMPLE_RATE)
+    while True:
+        audio = source.read(step_seconds)
+        if len(audio):
+            for event in streamer.feed(audio):
+                emit(event)
+        if len(audio) < step_samples:
+            break
+    for event in streamer.flush():
+        emit(event)
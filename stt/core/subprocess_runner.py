@@ -2,53 +2,83 @@
 
 from __future__ import annotations
 
+import logging
 import multiprocessing as mp
+from collections.abc import Sequence
 from dataclasses import asdict
 from typing import Any
 
+from stt.core.shm_transfer import collect_segments, publish_segments
+from stt.core.tracing import resume_trace, span, trace_context
 from stt.data_models import Segment
 
+logger = logging.getLogger(__name__)
+
 
 def _transcribe_worker(
-    config_dict: dict[str, Any], audio_path: str, queue: mp.Queue,  # type: ignore[type-arg]
+    config_dict: dict[str, Any],
+    audio_path: str,
+    queue: mp.Queue,  # type: ignore[type-arg]
+    trace: dict[str, Any] | None = None,
 ) -> None:
     """Run transcription in a child process."""
+    resume_trace(trace, "stt transcription subprocess")
     try:
         from stt.core.transcriber import Transcriber, TranscriberConfig
 
-        config = TranscriberConfig(**config_dict)
-        transcriber = Transcriber(config)
-        transcriber.load_model()
-        try:
-            segments = transcriber.transcribe(audio_path)
-        finally:
-            transcriber.unload_model()
-        queue.put({"status": "ok", "segments": [asdict(s) for s in segments]})
+        with span("subprocess.transcription", audio=audio_path):
+            config = TranscriberConfig(**config_dict)
+            transcriber = Transcriber(config)
+            with span("load", model=config.model_size):
+                transcriber.load_model()
+            try:
+                with span("inference"):
+                    segments = transcriber.transcribe(audio_path)
+            finally:
+                with span("unload"):
+                    transcriber.unload_model()
+            with span("publish_segments", segments=len(segments)):
+                try:
+                    message = publish_segments(segments)
+                except OSError as e:
+                    # e.g. /dev/shm missing or full; fall back to pickling.
+                    logger.warning("Shared memory unavailable (%s), pickling segments", e)
+                    message = {"segments": [asdict(s) for s in segments]}
+        queue.put({"status": "ok", **message})
     except Exception as e:
         queue.put({"status": "error", "error": f"{type(e).__name__}: {e}"})
 
 
 def _diarize_worker(
-    config_dict: dict[str, Any], audio_path: str, queue: mp.Queue,  # type: ignore[type-arg]
+    config_dict: dict[str, Any],
+    audio_path: str,
+    queue: mp.Queue,  # type: ignore[type-arg]
+    trace: dict[str, Any] | None = None,
 ) -> None:
     """Run diarization in a child process."""
+    resume_trace(trace, "stt diarization subprocess")
     try:
         from stt.core.diarizer import (
             DiarizerConfig,
             PyannoteDiarizer,
         )
 
-        config = DiarizerConfig(**config_dict)
-        diarizer = PyannoteDiarizer(config)
-        diarizer.load_model()
-        try:
-            result = diarizer.diarize(audio_path)
-        finally:
-            diarizer.unload_model()
+        with span("subprocess.diarization", audio=audio_path):
+            config = DiarizerConfig(**config_dict)
+            diarizer = PyannoteDiarizer(config)
+            with span("load"):
+                diarizer.load_model()
+            try:
+                with span("inference"):
+                    result = diarizer.diarize(audio_path)
+            finally:
+                with span("unload"):
+                    diarizer.unload_model()
         queue.put({
             "status": "ok",
             "turns": [asdict(t) for t in result.turns],
             "num_speakers": result.num_speakers,
+            "embeddings": result.embeddings,
         })
     except Exception as e:
         queue.put({"status": "error", "error": f"{type(e).__name__}: {e}"})
@@ -58,12 +88,17 @@ def run_transcription_subprocess(
     config_dict: dict[str, Any],
     audio_path: str,
     timeout: float | None = None,
-) -> list[Segment]:
-    """Run transcription in a subprocess for full GPU memory isolation."""
+) -> Sequence[Segment]:
+    """Run transcription in a subprocess for full GPU memory isolation.
+
+    Segments come back through shared memory as a ``SegmentTable`` (see
+    ``stt.core.shm_transfer``); the queue only carries the block name.
+    """
     ctx = mp.get_context("spawn")
     queue: mp.Queue[dict[str, Any]] = ctx.Queue()  # type: ignore[type-arg]
     process = ctx.Process(
-        target=_transcribe_worker, args=(config_dict, audio_path, queue),
+        target=_transcribe_worker,
+        args=(config_dict, audio_path, queue, trace_context()),
     )
     process.start()
     try:
@@ -82,6 +117,8 @@ def run_transcription_subprocess(
             process.kill()
     if result["status"] == "error":
         raise RuntimeError(result["error"])
+    if "shm" in result:
+        return collect_segments(result)
     return [Segment(**s) for s in result["segments"]]
 
 
@@ -94,7 +131,8 @@ def run_diarization_subprocess(
     ctx = mp.get_context("spawn")
     queue: mp.Queue[dict[str, Any]] = ctx.Queue()  # type: ignore[type-arg]
     process = ctx.Process(
-        target=_diarize_worker, args=(config_dict, audio_path, queue),
+        target=_diarize_worker,
+        args=(config_dict, audio_path, queue, trace_context()),
     )
     process.start()
     try:
@@ -0,0 +1,213 @@
+"""CPU thread budget and affinity for CTranslate2, torch and worker processes.
+
+The budget is what this process may actually use: the CPU affinity mask
+(which reflects cpusets) capped by the cgroup CPU quota. It is split
+evenly between ``workers`` processes sharing the node. Transcription and
+diarization run one after another, so each stage gets the whole worker
+share instead of half of it. With pinning, each worker is bound to its
+own disjoint slice of CPUs, taken NUMA node by node so a slice stays on
+one node whenever it fits.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+_CGROUP_ROOT = Path("/sys/fs/cgroup")
+_NODE_ROOT = Path("/sys/devices/system/node")
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def parse_cpulist(text: str) -> list[int]:
+    """Parse a kernel CPU list such as ``"0-3,8,10-11"``."""
+    cpus: list[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi) + 1) if sep else [int(lo)])
+    return cpus
+
+
+def allowed_cpus() -> tuple[int, ...]:
+    try:
+        return tuple(sorted(os.sched_getaffinity(0)))
+    except AttributeError:
+        return tuple(range(os.cpu_count() or 1))
+
+
+def _own_cgroup_paths(proc_cgroup: Path) -> dict[str, str]:
+    """Controller -> cgroup path of this process ("" key for cgroup v2)."""
+    paths: dict[str, str] = {}
+    try:
+        lines = proc_cgroup.read_text().splitlines()
+    except OSError:
+        return paths
+    for line in lines:
+        parts = line.split(":", 2)
+        if len(parts) != 3:
+            continue
+        _, controllers, path = parts
+        for controller in controllers.split(",") if controllers else [""]:
+            paths[controller] = path
+    return paths
+
+
+def _read_quota(directory: Path) -> float | None:
+    """CPU quota in CPUs set directly on ``directory``, or None if unlimited."""
+    try:
+        fields = (directory / "cpu.max").read_text().split()
+        if fields and fields[0] != "max":
+            return int(fields[0]) / int(fields[1])
+        return None
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        quota = int((directory / "cpu.cfs_quota_us").read_text())
+        period = int((directory / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def cgroup_cpu_quota(
+    root: Path = _CGROUP_ROOT, proc_cgroup: Path = Path("/proc/self/cgroup"),
+) -> float | None:
+    """Tightest CPU quota on this process's cgroup and its ancestors.
+
+    Checks cgroup v2 (``cpu.max``) and v1 (``cpu.cfs_quota_us``); None means
+    no quota.
+    """
+    paths = _own_cgroup_paths(proc_cgroup)
+    candidates: list[Path] = []
+    if "" in paths:
+        candidates.append(root / paths[""].lstrip("/"))
+    if "cpu" in paths:
+        for mount in ("cpu", "cpu,cpuacct"):
+            candidates.append(root / mount / paths["cpu"].lstrip("/"))
+    if not candidates:
+        candidates.append(root)
+    quotas: list[float] = []
+    for directory in candidates:
+        while True:
+            quota = _read_quota(directory)
+            if quota is not None:
+                quotas.append(quota)
+            if directory == root or root not in directory.parents:
+                break
+            directory = directory.parent
+    return min(quotas) if quotas else None
+
+
+def numa_nodes(root: Path = _NODE_ROOT) -> dict[int, int]:
+    """CPU id -> NUMA node; empty when the system exposes no nodes."""
+    mapping: dict[int, int] = {}
+    try:
+        nodes = sorted(root.glob("node[0-9]*"))
+    except OSError:
+        return mapping
+    for node in nodes:
+        try:
+            cpus = parse_cpulist((node / "cpulist").read_text())
+        except (OSError, ValueError):
+            continue
+        node_id = int(node.name[4:])
+        for cpu in cpus:
+            mapping[cpu] = node_id
+    return mapping
+
+
+@dataclass(frozen=True)
+class CpuTopology:
+    cpus: tuple[int, ...]
+    quota: float | None = None
+    nodes: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def budget(self) -> int:
+        """CPUs' worth of compute this process can use."""
+        count = len(self.cpus)
+        if self.quota is not None:
+            count = min(count, math.ceil(self.quota))
+        return max(1, count)
+
+
+def detect_topology() -> CpuTopology:
+    return CpuTopology(allowed_cpus(), cgroup_cpu_quota(), numa_nodes())
+
+
+@dataclass(frozen=True)
+class ThreadPlan:
+    transcriber_threads: int
+    diarizer_threads: int
+    # CPUs this worker is pinned to; None leaves affinity alone.
+    cpus: tuple[int, ...] | None = None
+
+
+def plan_threads(
+    topology: CpuTopology,
+    *,
+    budget: int = 0,
+    workers: int = 1,
+    worker_index: int = 0,
+    transcriber_threads: int = 0,
+    diarizer_threads: int = 0,
+    pin: bool = False,
+) -> ThreadPlan:
+    """Split the CPU budget for one of ``workers`` processes.
+
+    ``budget`` caps the total (0 = everything available); explicit
+    ``transcriber_threads`` / ``diarizer_threads`` win over the share.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    if not 0 <= worker_index < workers:
+        raise ValueError(f"worker_index must be in [0, {workers}), got {worker_index}")
+    if budget < 0:
+        raise ValueError(f"budget must be >= 0, got {budget}")
+    if pin and workers > len(topology.cpus):
+        raise ValueError(
+            f"cannot pin {workers} workers to {len(topology.cpus)} allowed CPUs; "
+            "use fewer workers or drop pinning"
+        )
+    total = min(budget, topology.budget) if budget else topology.budget
+    share = max(1, total // workers)
+
+    cpus: tuple[int, ...] | None = None
+    if pin:
+        ordered = sorted(topology.cpus, key=lambda c: (topology.nodes.get(c, 0), c))
+        start = worker_index * share
+        cpus = tuple(sorted(ordered[start:start + share]))
+    return ThreadPlan(
+        transcriber_threads=transcriber_threads or share,
+        diarizer_threads=diarizer_threads or share,
+        cpus=cpus,
+    )
+
+
+def apply_thread_plan(plan: ThreadPlan) -> None:
+    """Apply ``plan`` to this process; spawned children inherit it.
+
+    Affinity and the OpenMP/BLAS environment are inherited by subprocess
+    workers. torch's intra-op pool is set here and again by the diarizer
+    (``DiarizerConfig.num_threads``), since a spawned child starts fresh.
+    """
+    if plan.cpus is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, plan.cpus)
+    for var in _THREAD_ENV_VARS:
+        # An explicit setting by the operator wins.
+        os.environ.setdefault(var, str(plan.diarizer_threads))
+    torch.set_num_threads(plan.diarizer_threads)
+    logger.info(
+        "Threads: transcriber=%d diarizer=%d cpus=%s",
+        plan.transcriber_threads, plan.diarizer_threads,
+        "unpinned" if plan.cpus is None else ",".join(map(str, plan.cpus)),
+    )
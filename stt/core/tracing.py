@@ -0,0 +1,175 @@
+"""Span tracing of pipeline stages to a Chrome trace file (``--trace``).
+
+``span(name, **attrs)`` times a block. With tracing configured, each
+finished span is appended to the trace file as one Chrome Trace Event
+(``"ph": "X"``) line; without it, ``span`` returns a shared no-op
+context manager.
+
+The file is in the JSON array format with the closing ``]`` left off,
+which chrome://tracing and Perfetto accept. Events are appended with
+``O_APPEND``, so the subprocesses of a run, every ``--workers`` process
+and later runs can all write to one file: each process is its own track
+(named by a metadata event), and timestamps come from the system-wide
+monotonic clock, so overlap and idle gaps line up across processes.
+
+Subprocesses continue the trace of their parent: ``trace_context()`` is
+passed to the child, which calls ``resume_trace``; its spans carry the
+parent's ``trace_id`` and the id of the span that spawned them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_NOOP = contextlib.nullcontext()
+
+
+class _Tracer:
+    def __init__(self, path: Path, trace_id: str, parent_id: str | None) -> None:
+        self.path = path
+        self.trace_id = trace_id
+        self._root_parent = parent_id
+        self._local = threading.local()
+        self._fd: int | None = _open_trace(path)
+
+    def _stack(self) -> list[str]:
+        stack: list[str] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span(self) -> str | None:
+        stack = self._stack()
+        return stack[-1] if stack else self._root_parent
+
+    def emit(self, event: dict[str, Any]) -> None:
+        if self._fd is None:
+            return
+        line = json.dumps(event, ensure_ascii=False, default=str) + ",\n"
+        try:
+            os.write(self._fd, line.encode("utf-8"))
+        except OSError as e:
+            logger.warning("Tracing stopped, cannot write %s: %s", self.path, e)
+            self.close()
+
+    @contextlib.contextmanager
+    def span(self, name: str, attrs: dict[str, Any]) -> Iterator[None]:
+        span_id = secrets.token_hex(8)
+        parent_id = self.current_span()
+        stack = self._stack()
+        stack.append(span_id)
+        start = time.monotonic_ns()
+        error: str | None = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.monotonic_ns()
+            stack.pop()
+            args = {**attrs, "trace_id": self.trace_id, "span_id": span_id}
+            if parent_id is not None:
+                args["parent_id"] = parent_id
+            if error is not None:
+                args["error"] = error
+            self.emit({
+                "name": name,
+                "cat": "stt",
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": args,
+            })
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _open_trace(path: Path) -> int:
+    """Open ``path`` for appending, creating it with the opening ``[``.
+
+    The new file is linked into place complete, so concurrent processes
+    never see (or append to) a trace without its header.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text("[\n", encoding="utf-8")
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp.unlink()
+    return os.open(path, os.O_WRONLY | os.O_APPEND)
+
+
+_tracer: _Tracer | None = None
+
+
+def configure_tracing(
+    path: str | Path | None,
+    *,
+    process_name: str = "stt",
+    trace_id: str | None = None,
+    parent_id: str | None = None,
+) -> None:
+    """Send this process's spans to ``path`` (``None`` turns tracing off)."""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+        _tracer = None
+    if path is None:
+        return
+    _tracer = _Tracer(Path(path), trace_id or secrets.token_hex(16), parent_id)
+    _tracer.emit({
+        "name": "process_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "args": {"name": f"{process_name} ({os.getpid()})"},
+    })
+
+
+def span(name: str, **attrs: Any) -> contextlib.AbstractContextManager[None]:
+    """Trace the enclosed block as ``name``; ``attrs`` become event args."""
+    if _tracer is None:
+        return _NOOP
+    return _tracer.span(name, attrs)
+
+
+def trace_context() -> dict[str, Any] | None:
+    """What a child process needs to continue the current trace."""
+    if _tracer is None:
+        return None
+    return {
+        "path": str(_tracer.path),
+        "trace_id": _tracer.trace_id,
+        "parent_id": _tracer.current_span(),
+    }
+
+
+def resume_trace(context: dict[str, Any] | None, process_name: str) -> None:
+    """Continue the parent's trace (see ``trace_context``) in a child process."""
+    if context is not None:
+        configure_tracing(
+            context["path"],
+            process_name=process_name,
+            trace_id=context["trace_id"],
+            parent_id=context["parent_id"],
+        )
@@ -3,15 +3,19 @@
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import torch
 from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.audio import pad_or_trim
 
 from stt.core.gpu_utils import cleanup_gpu_memory
-from stt.data_models import Segment
+from stt.core.langid import AUTO_LANGUAGE, Detection
+from stt.core.registry import WHISPER, ModelRegistry
+from stt.data_models import Segment, Word
 from stt.exceptions import CudaOomError, GpuError, ModelError, TranscriptionError
 
 
@@ -32,6 +36,15 @@ class TranscriberConfig:
     condition_on_previous_text: bool = False
     hallucination_silence_threshold: float = 2.0
     use_batched: bool = False
+    # CTranslate2 intra-op threads (0 = library default) and parallel workers.
+    cpu_threads: int = 0
+    num_workers: int = 1
+    # Never contact the hub; the model must already be in model_dir/cache.
+    local_files_only: bool = False
+    # Load only models recorded in the registry (stt.core.registry).
+    offline: bool = False
+    # Text the decoder is primed with, e.g. the tail of an earlier transcript.
+    initial_prompt: str | None = None
 
 
 class Transcriber:
@@ -43,29 +56,113 @@ class Transcriber:
     def load_model(self) -> None:
         if self._config.device == "cuda" and not torch.cuda.is_available():
             raise GpuError("CUDA is not available")
+        local = ModelRegistry(self._config.model_dir).resolve(
+            WHISPER, self._config.model_size, required=self._config.offline,
+        )
         try:
             kwargs: dict[str, Any] = {
                 "device": self._config.device,
                 "compute_type": self._config.compute_type,
+                "cpu_threads": self._config.cpu_threads,
+                "num_workers": self._config.num_workers,
             }
-            if self._config.model_dir is not None:
+            if self._config.local_files_only:
+                kwargs["local_files_only"] = True
+            if local is None and self._config.model_dir is not None:
                 kwargs["download_root"] = str(
                     Path(self._config.model_dir).expanduser().resolve()
                 )
             self._model = WhisperModel(
-                self._config.model_size,
+                local or self._config.model_size,
                 **kwargs,
             )
             self._batched = BatchedInferencePipeline(model=self._model)
         except Exception as e:
             raise ModelError(f"Failed to load model: {e}") from e
 
+    @property
+    def batch_size(self) -> int:
+        return self._config.batch_size
+
+    @batch_size.setter
+    def batch_size(self, value: int) -> None:
+        """Change the batched-inference batch size without reloading the model."""
+        if value < 1:
+            raise ValueError(f"batch_size must be >= 1, got {value}")
+        self._config = replace(self._config, batch_size=value)
+
+    @property
+    def language(self) -> str:
+        return self._config.language
+
+    @language.setter
+    def language(self, value: str) -> None:
+        self._config = replace(self._config, language=value)
+
+    @property
+    def initial_prompt(self) -> str | None:
+        return self._config.initial_prompt
+
+    @initial_prompt.setter
+    def initial_prompt(self, value: str | None) -> None:
+        self._config = replace(self._config, initial_prompt=value)
+
+    @property
+    def use_batched(self) -> bool:
+        return self._config.use_batched
+
+    @use_batched.setter
+    def use_batched(self, value: bool) -> None:
+        """Switch between batched and sequential decoding of the loaded model."""
+        self._config = replace(self._config, use_batched=value)
+
     def unload_model(self) -> None:
         self._batched = None
         self._model = None
         cleanup_gpu_memory("transcriber_unload")
 
-    def transcribe(self, audio_path: str) -> list[Segment]:
+    @property
+    def _decode_language(self) -> str | None:
+        # "auto" without a language-ID pre-pass: let faster-whisper detect.
+        return None if self._config.language == AUTO_LANGUAGE else self._config.language
+
+    def detect_languages(self, samples: list[np.ndarray]) -> list[Detection]:
+        """Detect the language of each 16 kHz sample in one encoder batch.
+
+        Only the first 30 s (one Whisper window) of each sample is used.
+        """
+        if self._model is None:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+        if not samples:
+            return []
+        try:
+            features = np.stack([
+                pad_or_trim(self._model.feature_extractor(sample)) for sample in samples
+            ])
+            encoded = self._model.encode(features)
+            results = self._model.model.detect_language(encoded)
+        except torch.cuda.OutOfMemoryError as e:
+            raise CudaOomError(f"CUDA OOM during language detection: {e}") from e
+        except RuntimeError as e:
+            if "out of memory" in str(e).lower():
+                raise CudaOomError(f"CUDA OOM during language detection: {e}") from e
+            raise TranscriptionError(f"Language detection failed: {e}") from e
+        # Tokens look like "<|ru|>"; each result is sorted by probability.
+        return [Detection(result[0][0][2:-2], result[0][1]) for result in results]
+
+    def transcribe(self, audio: str | np.ndarray) -> list[Segment]:
+        """Transcribe a file, or 16 kHz mono float32 samples already in memory."""
+        return self._decode(audio, word_timestamps=False)[0]
+
+    def transcribe_words(
+        self, audio: str | np.ndarray,
+    ) -> tuple[list[Segment], list[list[Word]]]:
+        """Like ``transcribe``, plus the words of each segment with their timings."""
+        return self._decode(audio, word_timestamps=True)
+
+    def _decode(
+        self, audio: str | np.ndarray, *, word_timestamps: bool,
+    ) -> tuple[list[Segment], list[list[Word]]]:
         if self._model is None:
             raise RuntimeError("Model not loaded. Call load_model() first.")
         try:
@@ -73,8 +170,8 @@ class Transcriber:
                 if self._batched is None:
                     raise RuntimeError("Model not loaded. Call load_model() first.")
                 segments_iter, _info = self._batched.transcribe(
-                    audio_path,
-                    language=self._config.language,
+                    audio,
+                    language=self._decode_language,
                     batch_size=self._config.batch_size,
                     # without_timestamps=False is required so that the model
                     # generates timestamp tokens; otherwise the entire VAD
@@ -88,11 +185,13 @@ class Transcriber:
                     hallucination_silence_threshold=(
                         self._config.hallucination_silence_threshold
                     ),
+                    initial_prompt=self._config.initial_prompt,
+                    word_timestamps=word_timestamps,
                 )
             else:
                 segments_iter, _info = self._model.transcribe(
-                    audio_path,
-                    language=self._config.language,
+                    audio,
+                    language=self._decode_language,
                     vad_filter=self._config.vad_filter,
                     vad_parameters={"min_silence_duration_ms": 500},
                     condition_on_previous_text=(
@@ -101,8 +200,11 @@ class Transcriber:
                     hallucination_silence_threshold=(
                         self._config.hallucination_silence_threshold
                     ),
+                    initial_prompt=self._config.initial_prompt,
+                    word_timestamps=word_timestamps,
                 )
             result = []
+            words: list[list[Word]] = []
             for seg in segments_iter:
                 result.append(
                     Segment(
@@ -112,10 +214,15 @@ class Transcriber:
                         confidence=_map_confidence(seg.avg_logprob),
                     )
                 )
+                if word_timestamps:
+                    words.append([
+                        Word(start=w.start, end=w.end, text=w.word)
+                        for w in seg.words or ()
+                    ])
         except torch.cuda.OutOfMemoryError as e:
             raise CudaOomError(f"CUDA OOM during transcription: {e}") from e
         except RuntimeError as e:
             if "out of memory" in str(e).lower():
                 raise CudaOomError(f"CUDA OOM during transcription: {e}") from e
             raise TranscriptionError(f"Transcription failed: {e}") from e
-        return result
+        return result, words
@@ -0,0 +1,280 @@
+"""Hardware calibration sweep behind ``stt tune``.
+
+Each trial transcribes the same clip with one combination of
+``compute_type``, batched/sequential decoding, ``batch_size`` and CPU
+thread count, and records the real-time factor (wall time / audio time)
+and peak RSS / device memory. Trials sharing a ``compute_type`` and
+thread count reuse one loaded model; only the decode settings change
+between them.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import random
+import time
+import wave
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, replace
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+from stt.core.gpu_utils import cleanup_gpu_memory
+from stt.core.memory import PeakMemorySampler
+from stt.core.oom import is_oom
+from stt.core.transcriber import Transcriber, TranscriberConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TRIALS = 16
+SAMPLE_RATE = 16000
+
+
+@dataclass(frozen=True)
+class TrialSpec:
+    compute_type: str
+    use_batched: bool
+    batch_size: int
+    cpu_threads: int = 0
+
+    @property
+    def label(self) -> str:
+        decode = f"batched x{self.batch_size}" if self.use_batched else "sequential"
+        threads = f", {self.cpu_threads} threads" if self.cpu_threads else ""
+        return f"{self.compute_type}, {decode}{threads}"
+
+
+@dataclass
+class TrialResult:
+    spec: TrialSpec
+    rtf: float | None = None
+    peak_rss_bytes: int | None = None
+    peak_cuda_bytes: int | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.rtf is not None
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (affinity mask, not the host total)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_compute_types(device: str) -> tuple[str, ...]:
+    if device == "cpu":
+        return ("int8", "float32")
+    return ("float16", "int8_float16")
+
+
+def default_batch_sizes(device: str) -> tuple[int, ...]:
+    if device == "cpu":
+        return (2, 4)
+    return (4, 8, 16)
+
+
+def default_thread_counts(device: str) -> tuple[int, ...]:
+    """On CPU, all available CPUs and half of them; on GPU the default (0)."""
+    if device != "cpu":
+        return (0,)
+    cpus = available_cpus()
+    return tuple(dict.fromkeys(n for n in (cpus, cpus // 2) if n >= 1))
+
+
+def build_sweep(
+    compute_types: Sequence[str],
+    batch_sizes: Sequence[int],
+    thread_counts: Sequence[int],
+    max_trials: int = DEFAULT_MAX_TRIALS,
+) -> list[TrialSpec]:
+    """Enumerate trials, grouped by model load, capped at ``max_trials``.
+
+    The grid is walked breadth-first over (compute_type, threads) so a low
+    cap still covers every compute type with a sequential and a batched
+    trial before spending trials on larger batch sizes.
+    """
+    groups = [(ct, threads) for ct in compute_types for threads in thread_counts]
+    decodes = [(False, 1)] + [(True, b) for b in sorted(set(batch_sizes))]
+    specs: set[TrialSpec] = set()
+    for use_batched, batch_size in decodes:
+        for compute_type, threads in groups:
+            if len(specs) >= max_trials:
+                break
+            specs.add(TrialSpec(compute_type, use_batched, batch_size, threads))
+    order = {group: i for i, group in enumerate(groups)}
+    decode_order = {decode: i for i, decode in enumerate(decodes)}
+    return sorted(specs, key=lambda s: (
+        order[(s.compute_type, s.cpu_threads)],
+        decode_order[(s.use_batched, s.batch_size)],
+    ))
+
+
+def write_synthetic_speech(path: Path, seconds: float, *, seed: int = 0) -> None:
+    """Write a speech-like 16 kHz mono WAV: voiced syllables with pauses.
+
+    Each syllable is a few harmonics of a gliding pitch under a smooth
+    envelope, plus a little noise. It carries no words, so it measures
+    decoder throughput, not accuracy; a real ``--sample`` is closer to
+    production timing.
+    """
+    rng = random.Random(seed)
+    total = int(seconds * SAMPLE_RATE)
+    samples = array("h", bytes(2 * total))
+    pos = 0
+    while pos < total:
+        length = int(rng.uniform(0.12, 0.35) * SAMPLE_RATE)
+        f0 = rng.uniform(100.0, 220.0)
+        glide = rng.uniform(-0.3, 0.3)
+        phase = 0.0
+        for i in range(min(length, total - pos)):
+            t = i / length
+            freq = f0 * (1.0 + glide * t)
+            phase += 2 * math.pi * freq / SAMPLE_RATE
+            env = math.sin(math.pi * t)
+            voiced = (
+                math.sin(phase) + 0.5 * math.sin(2 * phase) + 0.25 * math.sin(3 * phase)
+            )
+            value = 6000.0 * env * voiced + rng.gauss(0.0, 300.0)
+            samples[pos + i] = max(-32768, min(32767, int(value)))
+        pos += length
+        if rng.random() < 0.3:
+            pos += int(rng.uniform(0.2, 0.6) * SAMPLE_RATE)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+
+
+def trim_wav(src: Path, dst: Path, seconds: float) -> float:
+    """Copy the first ``seconds`` of ``src`` to ``dst``; return the copied duration."""
+    with wave.open(str(src), "rb") as r:
+        params = r.getparams()
+        frames = r.readframes(int(seconds * r.getframerate()))
+    with wave.open(str(dst), "wb") as w:
+        w.setparams(params)
+        w.writeframes(frames)
+    return len(frames) / (params.sampwidth * params.nchannels) / params.framerate
+
+
+def wav_seconds(path: Path) -> float:
+    with wave.open(str(path), "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def run_sweep(
+    base: TranscriberConfig,
+    audio_path: Path,
+    specs: Iterable[TrialSpec],
+    *,
+    transcriber_factory: Callable[[TranscriberConfig], Transcriber] = Transcriber,
+    on_trial: Callable[[TrialResult], None] | None = None,
+) -> list[TrialResult]:
+    """Run every trial in ``specs`` against ``audio_path``.
+
+    Failures are recorded on the trial instead of raised: a model that
+    fails to load fails its whole group, and after an OOM the larger
+    batch sizes of that group are skipped.
+    """
+    audio_seconds = wav_seconds(audio_path)
+    results: list[TrialResult] = []
+
+    def record(result: TrialResult) -> None:
+        results.append(result)
+        if on_trial is not None:
+            on_trial(result)
+
+    for (compute_type, threads), group in groupby(
+        specs, key=lambda s: (s.compute_type, s.cpu_threads),
+    ):
+        trials = list(group)
+        config = replace(base, compute_type=compute_type, cpu_threads=threads)
+        transcriber = transcriber_factory(config)
+        try:
+            transcriber.load_model()
+        except Exception as e:
+            for spec in trials:
+                record(TrialResult(spec, error=f"{type(e).__name__}: {e}"))
+            continue
+        oom_at: int | None = None
+        try:
+            # Warm-up decode, excluded from timing.
+            transcriber.use_batched = False
+            transcriber.transcribe(str(audio_path))
+            for spec in trials:
+                if spec.use_batched and oom_at is not None and spec.batch_size >= oom_at:
+                    record(TrialResult(spec, error=f"skipped: OOM at batch {oom_at}"))
+                    continue
+                transcriber.use_batched = spec.use_batched
+                transcriber.batch_size = spec.batch_size
+                sampler = PeakMemorySampler()
+                try:
+                    with sampler:
+                        t0 = time.perf_counter()
+                        transcriber.transcribe(str(audio_path))
+                        elapsed = time.perf_counter() - t0
+                except Exception as e:
+                    if is_oom(e) and spec.use_batched:
+                        oom_at = spec.batch_size
+                    record(TrialResult(
+                        spec, error=f"{type(e).__name__}: {e}",
+                        peak_rss_bytes=sampler.peak_rss_bytes,
+                        peak_cuda_bytes=sampler.peak_cuda_bytes,
+                    ))
+                    continue
+                record(TrialResult(
+                    spec, rtf=elapsed / audio_seconds,
+                    peak_rss_bytes=sampler.peak_rss_bytes,
+                    peak_cuda_bytes=sampler.peak_cuda_bytes,
+                ))
+        except Exception as e:
+            # Warm-up failed: nothing in this group can run.
+            done = {r.spec for r in results}
+            for spec in trials:
+                if spec not in done:
+                    record(TrialResult(spec, error=f"{type(e).__name__}: {e}"))
+        finally:
+            transcriber.unload_model()
+            cleanup_gpu_memory("after_tune_group")
+    return results
+
+
+def best_trial(
+    results: Iterable[TrialResult],
+    *,
+    max_rss_bytes: int | None = None,
+    max_cuda_bytes: int | None = None,
+) -> TrialResult | None:
+    """Lowest real-time factor within the memory limits; ties go to less memory."""
+    def fits(r: TrialResult) -> bool:
+        if max_rss_bytes is not None and (r.peak_rss_bytes or 0) > max_rss_bytes:
+            return False
+        return not (
+            max_cuda_bytes is not None and (r.peak_cuda_bytes or 0) > max_cuda_bytes
+        )
+
+    candidates = [r for r in results if r.ok and fits(r)]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda r: (
+        round(r.rtf or 0.0, 3), r.peak_cuda_bytes or 0, r.peak_rss_bytes or 0,
+    ))
+
+
+def profile_from_trial(trial: TrialResult, device: str) -> dict[str, Any]:
+    """The winning settings in ``config.yaml`` layout (see ``load_config``)."""
+    spec = trial.spec
+    whisper: dict[str, Any] = {"use_batched": spec.use_batched}
+    if spec.use_batched:
+        whisper["batch_size"] = spec.batch_size
+    if spec.cpu_threads:
+        whisper["cpu_threads"] = spec.cpu_threads
+    return {"device": device, "compute_type": spec.compute_type, "whisper": whisper}
@@ -0,0 +1,328 @@
+"""Watch-folder ingestion: transcribe audio files as they land."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+from stt.core.audio import SUPPORTED_EXTENSIONS
+from stt.core.batch import discover_audio_files, outputs_exist, resolve_output_dir
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WatchConfig:
+    recursive: bool = False
+    pattern: str = "*"
+    poll_interval: float = 2.0
+    stable_seconds: float = 5.0
+    force_polling: bool = False
+    process_existing: bool = True
+
+
+def _is_candidate(path: Path, pattern: str) -> bool:
+    # Dotfiles cover our own preprocessing temp files and the usual
+    # ``.name.part`` convention of upload tools.
+    return (
+        not path.name.startswith(".")
+        and path.suffix.lower() in SUPPORTED_EXTENSIONS
+        and fnmatch.fnmatch(path.name, pattern)
+    )
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class StabilityTracker:
+    """Hold candidate files until their size and mtime stop changing."""
+
+    def __init__(
+        self,
+        stable_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._stable_seconds = stable_seconds
+        self._clock = clock
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def observe(self, path: Path) -> None:
+        sig = _file_signature(path)
+        if sig is None:
+            self._pending.pop(path, None)
+            return
+        prev = self._pending.get(path)
+        if prev is None or prev[0] != sig:
+            self._pending[path] = (sig, self._clock())
+
+    def pop_stable(self) -> list[Path]:
+        """Re-stat pending files and return those unchanged long enough."""
+        now = self._clock()
+        ready: list[Path] = []
+        for path in list(self._pending):
+            sig, since = self._pending[path]
+            current = _file_signature(path)
+            if current is None:
+                del self._pending[path]
+            elif current != sig:
+                self._pending[path] = (current, now)
+            elif sig[0] > 0 and now - since >= self._stable_seconds:
+                del self._pending[path]
+                ready.append(path)
+        return sorted(ready)
+
+
+class Watcher(Protocol):
+    def poll(self, timeout: float) -> set[Path]: ...
+
+    def close(self) -> None: ...
+
+
+class PollingWatcher:
+    """Portable watcher that rescans the directory tree every poll."""
+
+    def __init__(self, directory: Path, config: WatchConfig) -> None:
+        self._directory = directory
+        self._config = config
+        self._seen: dict[Path, tuple[int, int]] = {}
+        self._scan()
+
+    def _scan(self) -> set[Path]:
+        iterator = (
+            self._directory.rglob("*") if self._config.recursive
+            else self._directory.iterdir()
+        )
+        changed: set[Path] = set()
+        current: dict[Path, tuple[int, int]] = {}
+        for path in iterator:
+            if not _is_candidate(path, self._config.pattern) or not path.is_file():
+                continue
+            sig = _file_signature(path)
+            if sig is None:
+                continue
+            current[path] = sig
+            if self._seen.get(path) != sig:
+                changed.add(path)
+        self._seen = current
+        return changed
+
+    def poll(self, timeout: float) -> set[Path]:
+        time.sleep(timeout)
+        return self._scan()
+
+    def close(self) -> None:
+        self._seen.clear()
+
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Linux inotify watcher (via libc, no extra dependency)."""
+
+    def __init__(self, directory: Path, config: WatchConfig) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._config = config
+        self._directory = directory
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd: int = fd
+        self._dirs: dict[int, Path] = {}
+        self._overflowed = False
+        self._add_tree(directory)
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), _WATCH_MASK,
+        )
+        if wd < 0:
+            err = ctypes.get_errno()
+            logger.warning(
+                "inotify_add_watch failed for %s: %s", directory, os.strerror(err),
+            )
+            return
+        self._dirs[wd] = directory
+
+    def _add_tree(self, directory: Path) -> None:
+        self._add_watch(directory)
+        if self._config.recursive:
+            for sub in directory.rglob("*"):
+                if sub.is_dir():
+                    self._add_watch(sub)
+
+    def _scan_dir(self, directory: Path) -> set[Path]:
+        iterator = directory.rglob("*") if self._config.recursive else directory.iterdir()
+        return {
+            p for p in iterator
+            if _is_candidate(p, self._config.pattern) and p.is_file()
+        }
+
+    def poll(self, timeout: float) -> set[Path]:
+        changed: set[Path] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset: offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                self._overflowed = True
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not raw_name:
+                continue
+            path = parent / os.fsdecode(raw_name)
+            if mask & _IN_ISDIR:
+                if self._config.recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # Files may land before the new watch is in place.
+                    self._add_tree(path)
+                    changed |= self._scan_dir(path)
+                continue
+            if _is_candidate(path, self._config.pattern):
+                changed.add(path)
+        if self._overflowed:
+            logger.warning("inotify queue overflow, rescanning %s", self._directory)
+            self._overflowed = False
+            changed |= self._scan_dir(self._directory)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._dirs.clear()
+
+
+def create_watcher(directory: Path, config: WatchConfig) -> Watcher:
+    """Return an inotify watcher on Linux, a polling watcher otherwise."""
+    if not config.force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory, config)
+        except (OSError, AttributeError) as e:
+            logger.warning("inotify unavailable (%s), falling back to polling", e)
+    return PollingWatcher(directory, config)
+
+
+@dataclass
+class WatchStats:
+    succeeded: int = 0
+    failed: int = 0
+    errors: list[tuple[Path, str]] = field(default_factory=list)
+
+
+class FolderWatcher:
+    """Keep one warm pipeline and feed it stable files from a watched tree."""
+
+    def __init__(
+        self,
+        pipeline_config: PipelineConfig,
+        input_dir: Path,
+        output_dir: Path,
+        watch_config: WatchConfig | None = None,
+    ) -> None:
+        self._config = pipeline_config
+        self._input_dir = input_dir
+        self._output_dir = output_dir
+        self._watch = watch_config or WatchConfig()
+        self._tracker = StabilityTracker(self._watch.stable_seconds)
+        self._done: dict[Path, tuple[int, int]] = {}
+        self.stats = WatchStats()
+
+    def run(
+        self,
+        stop: threading.Event | None = None,
+        watcher: Watcher | None = None,
+    ) -> WatchStats:
+        """Process files until ``stop`` is set (or forever)."""
+        stop = stop or threading.Event()
+        watcher = watcher or create_watcher(self._input_dir, self._watch)
+        pipeline = TranscriptionPipeline(self._config)
+        try:
+            if self._watch.process_existing:
+                self._enqueue_existing()
+            while not stop.is_set():
+                for path in watcher.poll(self._watch.poll_interval):
+                    self._tracker.observe(path)
+                for path in self._tracker.pop_stable():
+                    if stop.is_set():
+                        break
+                    self._process(pipeline, path)
+        finally:
+            watcher.close()
+            pipeline.close()
+        return self.stats
+
+    def _enqueue_existing(self) -> None:
+        files = discover_audio_files(
+            self._input_dir, recursive=self._watch.recursive,
+            pattern=self._watch.pattern,
+        )
+        for path in files:
+            if not _is_candidate(path, self._watch.pattern):
+                continue
+            file_output_dir = resolve_output_dir(path, self._output_dir, self._input_base)
+            if outputs_exist(path, file_output_dir, self._config.formats):
+                sig = _file_signature(path)
+                if sig is not None:
+                    self._done[path] = sig
+                continue
+            self._tracker.observe(path)
+
+    @property
+    def _input_base(self) -> Path | None:
+        return self._input_dir if self._watch.recursive else None
+
+    def _process(self, pipeline: TranscriptionPipeline, path: Path) -> None:
+        sig = _file_signature(path)
+        if sig is None or self._done.get(path) == sig:
+            return
+        file_output_dir = resolve_output_dir(path, self._output_dir, self._input_base)
+        logger.info("Processing %s", path)
+        try:
+            pipeline.run(str(path), output_dir=str(file_output_dir))
+            self.stats.succeeded += 1
+        except Exception as e:
+            self.stats.failed += 1
+            self.stats.errors.append((path, str(e)))
+            logger.error("Failed %s: %s", path, e, exc_info=True)
+        self._done[path] = sig
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import math
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from typing import overload
 
 
-@dataclass
+@dataclass(slots=True)
 class Segment:
     start: float
     end: float
@@ -25,6 +29,185 @@ class Segment:
         return self.end - self.start
 
 
+@dataclass(slots=True)
+class Word:
+    """One word of a segment with its own timing (``word_timestamps``)."""
+
+    start: float
+    end: float
+    text: str
+
+
+_NO_SPEAKER = -1
+
+
+class SegmentTable(Sequence[Segment]):
+    """Columnar segment storage.
+
+    Times and confidences live in ``array('d')`` columns (NaN for a missing
+    confidence) and speakers as indexes into the interned ``speakers`` list
+    (-1 for none). Indexing and iteration build ``Segment`` objects on
+    demand, so a table can be used wherever a list of segments is read.
+    """
+
+    __slots__ = ("starts", "ends", "confidences", "speaker_ids", "speakers", "texts")
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.ends = array("d")
+        self.confidences = array("d")
+        self.speaker_ids = array("i")
+        self.speakers: list[str] = []
+        self.texts: list[str] = []
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> SegmentTable:
+        table = cls()
+        for seg in segments:
+            table.append(seg.start, seg.end, seg.text, seg.speaker, seg.confidence)
+        return table
+
+    def intern_speaker(self, speaker: str | None) -> int:
+        """Return the id for ``speaker``, adding it to ``speakers`` if new."""
+        if speaker is None:
+            return _NO_SPEAKER
+        try:
+            return self.speakers.index(speaker)
+        except ValueError:
+            self.speakers.append(speaker)
+            return len(self.speakers) - 1
+
+    def append(
+        self,
+        start: float,
+        end: float,
+        text: str,
+        speaker: str | None = None,
+        confidence: float | None = None,
+    ) -> None:
+        if start > end:
+            raise ValueError(
+                f"start ({start}) must not be greater than end ({end})"
+            )
+        self.starts.append(start)
+        self.ends.append(end)
+        self.texts.append(text)
+        self.speaker_ids.append(self.intern_speaker(speaker))
+        self.confidences.append(math.nan if confidence is None else confidence)
+
+    def with_speakers(self, speakers: Iterable[str | None]) -> SegmentTable:
+        """Return a table sharing this one's columns but with new speakers."""
+        table = SegmentTable()
+        table.starts = self.starts
+        table.ends = self.ends
+        table.confidences = self.confidences
+        table.texts = self.texts
+        ids: dict[str, int] = {}
+        speaker_ids = table.speaker_ids
+        for speaker in speakers:
+            if speaker is None:
+                speaker_ids.append(_NO_SPEAKER)
+                continue
+            sid = ids.get(speaker)
+            if sid is None:
+                sid = ids[speaker] = len(ids)
+            speaker_ids.append(sid)
+        if len(speaker_ids) != len(self.starts):
+            raise ValueError("speakers must match the number of segments")
+        table.speakers = list(ids)
+        return table
+
+    def shifted(self, offset: float) -> SegmentTable:
+        """Return a table with every time moved by ``offset`` seconds.
+
+        Text, speaker and confidence columns are shared with this table.
+        """
+        table = SegmentTable()
+        table.starts = array("d", [t + offset for t in self.starts])
+        table.ends = array("d", [t + offset for t in self.ends])
+        table.confidences = self.confidences
+        table.speaker_ids = self.speaker_ids
+        table.speakers = self.speakers
+        table.texts = self.texts
+        return table
+
+    def renamed(self, names: dict[str, str]) -> SegmentTable:
+        """Return a table with speakers relabelled by ``names`` (others kept).
+
+        Every column but the speaker names is shared with this table.
+        """
+        table = SegmentTable()
+        table.starts = self.starts
+        table.ends = self.ends
+        table.confidences = self.confidences
+        table.speaker_ids = self.speaker_ids
+        table.speakers = [names.get(s, s) for s in self.speakers]
+        table.texts = self.texts
+        return table
+
+    def speaker(self, index: int) -> str | None:
+        sid = self.speaker_ids[index]
+        return None if sid == _NO_SPEAKER else self.speakers[sid]
+
+    def _segment(self, i: int) -> Segment:
+        sid = self.speaker_ids[i]
+        confidence = self.confidences[i]
+        return Segment(
+            self.starts[i],
+            self.ends[i],
+            self.texts[i],
+            None if sid == _NO_SPEAKER else self.speakers[sid],
+            None if math.isnan(confidence) else confidence,
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> Segment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Segment]: ...
+
+    def __getitem__(self, index: int | slice) -> Segment | list[Segment]:
+        if isinstance(index, slice):
+            return [self._segment(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return self._segment(index)
+
+    def __iter__(self) -> Iterator[Segment]:
+        speakers = self.speakers
+        for start, end, text, sid, confidence in zip(
+            self.starts, self.ends, self.texts, self.speaker_ids, self.confidences,
+            strict=True,
+        ):
+            yield Segment(
+                start,
+                end,
+                text,
+                None if sid == _NO_SPEAKER else speakers[sid],
+                None if math.isnan(confidence) else confidence,
+            )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SegmentTable({len(self)} segments, {len(self.speakers)} speakers)"
+
+    def to_list(self) -> list[Segment]:
+        return list(self)
+
+
 @dataclass
 class TranscriptMetadata:
     source_file: str
@@ -36,12 +219,22 @@ class TranscriptMetadata:
     num_speakers: int = 0
     processing_time_seconds: float = 0.0
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    # Stage ("transcription"/"diarization") -> OOM ladder rung that succeeded.
+    oom_recovery: dict[str, str] = field(default_factory=dict)
+    # (start, end) in source seconds when only part of the file was processed.
+    time_range: tuple[float, float] | None = None
+    # Stage -> peak of each memory measure (bytes); see stt.core.memory.
+    memory_peaks: dict[str, dict[str, int]] = field(default_factory=dict)
 
 
 @dataclass
 class TranscriptResult:
     metadata: TranscriptMetadata
-    segments: list[Segment]
+    segments: Sequence[Segment]
+    # Speaker label -> diarization embedding; kept in memory, not exported.
+    speaker_embeddings: dict[str, list[float]] = field(default_factory=dict)
+    # Memory timeline columns, written as <stem>.memory.json by the pipeline.
+    memory_timeline: dict[str, list[object]] = field(default_factory=dict)
 
     @property
     def full_text(self) -> str:
@@ -3,44 +3,89 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from contextlib import ExitStack
+from functools import partial
 from io import StringIO
 from pathlib import Path
+from typing import IO, Any
 
 from stt.data_models import TranscriptResult
-from stt.exporters.json_export import export_json
-from stt.exporters.srt_export import export_srt
-from stt.exporters.txt_export import export_txt
+from stt.exporters.atomic import OutputCommitter
+from stt.exporters.binary_export import BinarySink, export_binary
+from stt.exporters.json_export import JsonSink, export_json
+from stt.exporters.parquet_export import ArrowSink, ParquetSink, export_arrow, export_parquet
+from stt.exporters.render import FormatSink, render
+from stt.exporters.srt_export import SrtSink, export_srt
+from stt.exporters.txt_export import TxtSink, export_txt
+from stt.exporters.vtt_export import VttSink, export_vtt
 
 _EXPORTERS: dict[str, Callable[..., None]] = {
     "json": export_json,
     "txt": export_txt,
     "srt": export_srt,
+    "vtt": export_vtt,
+    "parquet": export_parquet,
+    "arrow": export_arrow,
+    "sttb": export_binary,
 }
 
+_SINKS: dict[str, Callable[..., FormatSink]] = {
+    "json": JsonSink,
+    "txt": TxtSink,
+    "srt": SrtSink,
+    "vtt": VttSink,
+    "parquet": ParquetSink,
+    "arrow": ArrowSink,
+    "sttb": BinarySink,
+}
+
+# Formats whose sinks take a binary stream.
+_BINARY_FORMATS = frozenset({"parquet", "arrow", "sttb"})
+
 
 def export_transcript(
     result: TranscriptResult,
     formats: str,
     output_dir: Path | None = None,
+    *,
+    compact_json: bool = False,
+    concurrent: bool = False,
+    committer: OutputCommitter | None = None,
 ) -> str | None:
-    """Export transcription result in the specified formats."""
-    format_list = [f.strip() for f in formats.split(",")]
+    """Export transcription result in the specified formats.
+
+    All formats are rendered in a single pass over the segments; with
+    ``concurrent`` each format is written on its own thread. Files are
+    written atomically through ``committer`` (default: rename, no fsync).
+    An empty ``formats`` string writes nothing.
+    """
+    format_list = [f.strip() for f in formats.split(",") if f.strip()]
 
     for fmt in format_list:
         if fmt not in _EXPORTERS:
             raise ValueError(f"Unknown export format: {fmt!r}")
 
+    sink_factories = dict(_SINKS)
+    if compact_json:
+        sink_factories["json"] = partial(JsonSink, compact=True)
+
     if output_dir is None and format_list == ["json"]:
         buf = StringIO()
-        export_json(result, buf)
+        render(result, [sink_factories["json"](buf)])
         return buf.getvalue()
 
-    if output_dir is not None:
+    if output_dir is not None and format_list:
         output_dir.mkdir(parents=True, exist_ok=True)
         stem = Path(result.metadata.source_file).stem
-        for fmt in format_list:
-            out_path = output_dir / f"{stem}.{fmt}"
-            with open(out_path, "w", encoding="utf-8") as f:
-                _EXPORTERS[fmt](result, f)
+        committer = committer if committer is not None else OutputCommitter()
+        with ExitStack() as stack:
+            sinks: list[FormatSink] = []
+            for fmt in dict.fromkeys(format_list):
+                out_path = output_dir / f"{stem}.{fmt}"
+                f: IO[Any] = stack.enter_context(
+                    committer.open(out_path, binary=fmt in _BINARY_FORMATS)
+                )
+                sinks.append(sink_factories[fmt](f))
+            render(result, sinks, concurrent=concurrent)
 
     return None
@@ -0,0 +1,385 @@
+"""Compact binary transcript format (``.sttb``) with a memory-mapped reader.
+
+Layout, all little-endian, every section 8-byte aligned::
+
+    header      magic "STTB", version, flags, segment count, max segment
+                duration and (offset, length) of each section below
+    metadata    UTF-8 JSON, same fields as the JSON exporter
+    speakers    UTF-8 JSON list of distinct speaker labels
+    columns     start f64[n] | end f64[n] | confidence f64[n] (NaN = None)
+                | speaker u32[n] (0xFFFFFFFF = None) | text offset u64[n+1]
+    heap        UTF-8 segment texts, back to back
+
+Fixed-width columns let the reader address segment ``i`` directly and
+binary-search start times without parsing anything else.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Literal, overload
+
+from stt.data_models import Segment, SegmentTable, TranscriptMetadata, TranscriptResult
+from stt.exporters.json_export import metadata_dict
+from stt.exporters.render import SegmentRow, render
+
+MAGIC = b"STTB"
+FORMAT_VERSION = 1
+
+FLAG_SORTED = 0x1  # start times are non-decreasing
+
+_HEADER = struct.Struct("<4sHHQdQQQQQQQ")
+_NO_SPEAKER = 0xFFFFFFFF
+_LITTLE = sys.byteorder == "little"
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _column_bytes(values: array) -> bytes:  # type: ignore[type-arg]
+    if not _LITTLE:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class BinarySink:
+    """Incremental ``.sttb`` writer.
+
+    Columns are accumulated in typed arrays and the text heap as encoded
+    chunks; everything is written in ``end`` once the section sizes are known.
+    """
+
+    needs_clock = False
+    needs_hms = False
+
+    def __init__(self, output: IO[bytes]) -> None:
+        self._output = output
+        self._reset()
+
+    def _reset(self) -> None:
+        self._meta = b"{}"
+        self._start = array("d")
+        self._end = array("d")
+        self._confidence = array("d")
+        self._speaker = array("I")
+        self._text_offsets = array("Q", [0])
+        self._heap: list[bytes] = []
+        self._speaker_ids: dict[str, int] = {}
+        self._max_duration = 0.0
+        self._sorted = True
+
+    def begin(self, result: TranscriptResult) -> None:
+        self._reset()
+        self._meta = json.dumps(
+            metadata_dict(result.metadata), ensure_ascii=False,
+        ).encode("utf-8")
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        speaker_ids = self._speaker_ids
+        offset = self._text_offsets[-1]
+        last_start = self._start[-1] if self._start else -math.inf
+        for row in rows:
+            seg = row.segment
+            if seg.start < last_start:
+                self._sorted = False
+            last_start = seg.start
+            self._start.append(seg.start)
+            self._end.append(seg.end)
+            self._confidence.append(
+                math.nan if seg.confidence is None else seg.confidence
+            )
+            if seg.speaker is None:
+                self._speaker.append(_NO_SPEAKER)
+            else:
+                self._speaker.append(
+                    speaker_ids.setdefault(seg.speaker, len(speaker_ids))
+                )
+            text = seg.text.encode("utf-8")
+            self._heap.append(text)
+            offset += len(text)
+            self._text_offsets.append(offset)
+            if seg.end - seg.start > self._max_duration:
+                self._max_duration = seg.end - seg.start
+
+    def end(self) -> None:
+        count = len(self._start)
+        speakers = json.dumps(list(self._speaker_ids), ensure_ascii=False).encode()
+        columns = [
+            _column_bytes(self._start),
+            _column_bytes(self._end),
+            _column_bytes(self._confidence),
+            _column_bytes(self._speaker),
+            _column_bytes(self._text_offsets),
+        ]
+
+        meta_off = _HEADER.size
+        spk_off = meta_off + len(self._meta) + _pad(len(self._meta))
+        cols_off = spk_off + len(speakers) + _pad(len(speakers))
+        cols_len = sum(len(c) + _pad(len(c)) for c in columns)
+        heap_off = cols_off + cols_len
+        heap_len = self._text_offsets[-1]
+
+        out = self._output
+        out.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, FLAG_SORTED if self._sorted else 0,
+            count, self._max_duration,
+            meta_off, len(self._meta), spk_off, len(speakers),
+            cols_off, heap_off, heap_len,
+        ))
+        for chunk in (self._meta, speakers, *columns):
+            out.write(chunk)
+            out.write(b"\0" * _pad(len(chunk)))
+        for i in range(0, len(self._heap), 1024):
+            out.write(b"".join(self._heap[i: i + 1024]))
+        self._reset()
+
+
+def export_binary(result: TranscriptResult, output: IO[bytes]) -> None:
+    """Write transcription result in the ``.sttb`` format to a binary stream."""
+    render(result, [BinarySink(output)])
+
+
+class BinaryTranscript:
+    """Memory-mapped ``.sttb`` reader.
+
+    Opening the file only parses the fixed header; segments are decoded on
+    access, so ``transcript[i]`` and ``transcript.between(t0, t1)`` touch
+    only the pages they need. ``from_buffer`` reads from any buffer (e.g.
+    shared memory) instead of a file. Use as a context manager or call
+    ``close``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._file: IO[bytes] | None = open(path, "rb")
+        try:
+            self._mmap: mmap.mmap | None = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ,
+            )
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a binary transcript (empty file): {path}") from None
+        self._open(memoryview(self._mmap), str(path))
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: bytes | bytearray | memoryview, name: str = "<buffer>",
+    ) -> BinaryTranscript:
+        """Read from an in-memory buffer; the buffer must outlive the reader."""
+        reader = cls.__new__(cls)
+        reader._file = None
+        reader._mmap = None
+        reader._open(memoryview(buffer), name)
+        return reader
+
+    def _open(self, buf: memoryview, name: str) -> None:
+        self._buf = buf
+        self._views: list[memoryview[int] | memoryview[float]] = [buf]
+        self._metadata: TranscriptMetadata | None = None
+        try:
+            self._parse_header(name)
+        except Exception:
+            self.close()
+            raise
+
+    def _parse_header(self, name: str) -> None:
+        buf = self._buf
+        if len(buf) < _HEADER.size:
+            raise ValueError(f"Not a binary transcript (truncated header): {name}")
+        (
+            magic, version, flags, count, max_duration,
+            meta_off, meta_len, spk_off, spk_len, cols_off, heap_off, heap_len,
+        ) = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a binary transcript (bad magic): {name}")
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported binary transcript version {version} "
+                f"(this reader supports <= {FORMAT_VERSION}): {name}"
+            )
+        if heap_off + heap_len > len(buf):
+            raise ValueError(f"Truncated binary transcript: {name}")
+
+        self._count: int = count
+        self._sorted = bool(flags & FLAG_SORTED)
+        self._max_duration: float = max_duration
+        self._meta_range = (meta_off, meta_len)
+        self._heap_off: int = heap_off
+        self._heap_len: int = heap_len
+        self.speakers: tuple[str, ...] = tuple(
+            json.loads(bytes(buf[spk_off: spk_off + spk_len]))
+        )
+
+        offset = cols_off
+        self._column_ranges: dict[str, tuple[int, int]] = {}
+        for key, typecode, n in (
+            ("start", "d", count),
+            ("end", "d", count),
+            ("confidence", "d", count),
+            ("speaker", "I", count),
+            ("text_offsets", "Q", count + 1),
+        ):
+            size = array(typecode).itemsize * n
+            self._column_ranges[key] = (offset, size)
+            offset += size + _pad(size)
+        self._start = self._column("start", "d")
+        self._end = self._column("end", "d")
+        self._confidence = self._column("confidence", "d")
+        self._speaker = self._column("speaker", "I")
+        self._text_offsets = self._column("text_offsets", "Q")
+
+    @overload
+    def _column(self, key: str, typecode: Literal["d"]) -> Sequence[float]: ...
+
+    @overload
+    def _column(self, key: str, typecode: Literal["I", "Q"]) -> Sequence[int]: ...
+
+    def _column(
+        self, key: str, typecode: Literal["d", "I", "Q"],
+    ) -> Sequence[float] | Sequence[int]:
+        offset, size = self._column_ranges[key]
+        if _LITTLE:
+            view = self._buf[offset: offset + size].cast(typecode)
+            self._views.append(view)
+            return view
+        return self._column_copy(key, typecode)
+
+    def _column_copy(self, key: str, typecode: str) -> array:  # type: ignore[type-arg]
+        offset, size = self._column_ranges[key]
+        values = array(typecode)
+        values.frombytes(self._buf[offset: offset + size])
+        if not _LITTLE:
+            values.byteswap()
+        return values
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None and not self._mmap.closed:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> BinaryTranscript:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def metadata(self) -> TranscriptMetadata:
+        if self._metadata is None:
+            off, length = self._meta_range
+            data = json.loads(bytes(self._buf[off: off + length]))
+            self._metadata = TranscriptMetadata(
+                source_file=data["source_file"],
+                duration_seconds=data["duration_seconds"],
+                model=data["model"],
+                language=data["language"],
+                format_version=data["format_version"],
+                diarization=data["diarization"],
+                num_speakers=data["num_speakers"],
+                processing_time_seconds=data["processing_time_seconds"],
+                created_at=datetime.fromisoformat(data["created_at"]),
+                oom_recovery=data.get("oom_recovery", {}),
+                time_range=tuple(data["time_range"]) if "time_range" in data else None,
+                memory_peaks=data.get("memory_peaks", {}),
+            )
+        return self._metadata
+
+    def _segment(self, i: int) -> Segment:
+        text_start = self._heap_off + self._text_offsets[i]
+        text_end = self._heap_off + self._text_offsets[i + 1]
+        speaker = self._speaker[i]
+        confidence = self._confidence[i]
+        return Segment(
+            start=self._start[i],
+            end=self._end[i],
+            text=str(self._buf[text_start:text_end], "utf-8"),
+            speaker=None if speaker == _NO_SPEAKER else self.speakers[speaker],
+            confidence=None if math.isnan(confidence) else confidence,
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Segment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Segment]: ...
+
+    def __getitem__(self, index: int | slice) -> Segment | list[Segment]:
+        if isinstance(index, slice):
+            return [self._segment(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("segment index out of range")
+        return self._segment(index)
+
+    def __iter__(self) -> Iterator[Segment]:
+        for i in range(self._count):
+            yield self._segment(i)
+
+    def between(self, start: float, end: float) -> Iterator[Segment]:
+        """Yield segments overlapping ``[start, end)`` in file order.
+
+        For time-sorted files this binary-searches the start column, using
+        the stored maximum segment duration to bound the look-back.
+        """
+        starts, ends = self._start, self._end
+        if self._sorted:
+            first = bisect.bisect_left(starts, start - self._max_duration)
+            last = bisect.bisect_left(starts, end, lo=first)
+        else:
+            first, last = 0, self._count
+        for i in range(first, last):
+            seg_start = starts[i]
+            if seg_start < end and (ends[i] > start or seg_start >= start):
+                yield self._segment(i)
+
+    def to_table(self) -> SegmentTable:
+        """Copy all segments into a ``SegmentTable``.
+
+        The numeric columns share ``SegmentTable``'s layout (NaN confidence,
+        0xFFFFFFFF read as speaker id -1), so they are copied as raw bytes;
+        only the texts are decoded one by one.
+        """
+        table = SegmentTable()
+        table.starts = self._column_copy("start", "d")
+        table.ends = self._column_copy("end", "d")
+        table.confidences = self._column_copy("confidence", "d")
+        table.speaker_ids = self._column_copy("speaker", "i")
+        table.speakers = list(self.speakers)
+        heap = self._buf[self._heap_off: self._heap_off + self._heap_len]
+        try:
+            offsets = self._text_offsets
+            table.texts = [
+                str(heap[offsets[i]: offsets[i + 1]], "utf-8")
+                for i in range(self._count)
+            ]
+        finally:
+            heap.release()
+        return table
+
+    def to_result(self) -> TranscriptResult:
+        """Decode the whole file into a ``TranscriptResult``."""
+        return TranscriptResult(metadata=self.metadata, segments=self.to_table())
+
+
+def read_binary(path: str | Path) -> TranscriptResult:
+    """Read a ``.sttb`` file fully into memory."""
+    with BinaryTranscript(path) as transcript:
+        return transcript.to_result()
@@ -3,15 +3,25 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable, Sequence
 from typing import IO
 
-from stt.data_models import TranscriptResult
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exporters.render import SegmentRow, render
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None  # type: ignore[assignment]
 
-def export_json(result: TranscriptResult, output: IO[str]) -> None:
-    """Write transcription result as JSON to the given output stream."""
-    meta = result.metadata
-    metadata_dict = {
+# full_text chunks are encoded and written in groups to keep write() calls
+# cheap without materializing the whole string.
+_WRITE_BATCH = 1024
+
+
+def metadata_dict(meta: TranscriptMetadata) -> dict[str, object]:
+    """JSON-ready transcript metadata, shared by the exporters that embed it."""
+    data: dict[str, object] = {
         "format_version": meta.format_version,
         "source_file": meta.source_file,
         "duration_seconds": meta.duration_seconds,
@@ -22,24 +32,156 @@ def export_json(result: TranscriptResult, output: IO[str]) -> None:
         "processing_time_seconds": meta.processing_time_seconds,
         "created_at": meta.created_at.isoformat(),
     }
+    if meta.oom_recovery:
+        data["oom_recovery"] = dict(meta.oom_recovery)
+    if meta.time_range is not None:
+        data["time_range"] = list(meta.time_range)
+    if meta.memory_peaks:
+        data["memory_peaks"] = {k: dict(v) for k, v in meta.memory_peaks.items()}
+    return data
 
-    segments_list = []
-    for seg in result.segments:
-        seg_dict: dict[str, object] = {
-            "start": seg.start,
-            "end": seg.end,
-            "text": seg.text,
-        }
-        if seg.speaker is not None:
-            seg_dict["speaker"] = seg.speaker
-        if seg.confidence is not None:
-            seg_dict["confidence"] = seg.confidence
-        segments_list.append(seg_dict)
-
-    data = {
-        "metadata": metadata_dict,
-        "segments": segments_list,
-        "full_text": result.full_text,
+
+def _segment_dict(seg: Segment) -> dict[str, object]:
+    seg_dict: dict[str, object] = {
+        "start": seg.start,
+        "end": seg.end,
+        "text": seg.text,
     }
+    if seg.speaker is not None:
+        seg_dict["speaker"] = seg.speaker
+    if seg.confidence is not None:
+        seg_dict["confidence"] = seg.confidence
+    return seg_dict
+
+
+def _make_encoders(
+    compact: bool, use_orjson: bool | None,
+) -> tuple[Callable[[dict[str, object], str], str], Callable[[str], str]]:
+    """Return (object encoder, string encoder) for the chosen backend.
+
+    The object encoder takes the indentation prefix of the line the object
+    starts on, so nested output lines up with ``json.dump(..., indent=2)``.
+    """
+    if use_orjson is None:
+        use_orjson = _orjson is not None
+    if use_orjson:
+        if _orjson is None:
+            raise ImportError("orjson is not installed")
+        dumps = _orjson.dumps
+        option = 0 if compact else _orjson.OPT_INDENT_2
+
+        def orjson_obj(obj: dict[str, object], prefix: str) -> str:
+            text = dumps(obj, option=option).decode()
+            return text.replace("\n", "\n" + prefix) if prefix else text
+
+        def orjson_str(value: str) -> str:
+            return dumps(value).decode()
+
+        return orjson_obj, orjson_str
+
+    encode_str: Callable[[str], str] = json.encoder.encode_basestring  # type: ignore[attr-defined]
+    if compact:
+        compact_encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode
+        return (lambda obj, prefix: compact_encode(obj)), encode_str
+
+    # indent=2 would force the pure-Python encoder; segments are flat, so the
+    # C encoder with a newline-bearing item separator gives the same layout
+    # much faster. Objects with nested values (some metadata) take indent=2.
+    encoders: dict[str, Callable[[object], str]] = {}
 
-    json.dump(data, output, indent=2, ensure_ascii=False)
+    def encode_indented(obj: dict[str, object], prefix: str) -> str:
+        if not obj:
+            return "{}"
+        if any(isinstance(v, dict | list) for v in obj.values()):
+            text = json.dumps(obj, ensure_ascii=False, indent=2)
+            return text.replace("\n", "\n" + prefix) if prefix else text
+        encode = encoders.get(prefix)
+        if encode is None:
+            encode = json.JSONEncoder(
+                ensure_ascii=False, separators=(",\n" + prefix + "  ", ": "),
+            ).encode
+            encoders[prefix] = encode
+        body = encode(obj)[1:-1]
+        return "{\n" + prefix + "  " + body + "\n" + prefix + "}"
+
+    return encode_indented, encode_str
+
+
+class JsonSink:
+    """Incremental JSON writer.
+
+    Metadata is written in ``begin``, segments as they arrive, and
+    ``full_text`` in ``end`` from the segment texts seen so far (kept by
+    reference, not copied). The layout matches ``json.dump(..., indent=2)``;
+    ``compact`` drops all whitespace. ``use_orjson=None`` picks orjson when
+    it is installed.
+    """
+
+    needs_clock = False
+    needs_hms = False
+
+    def __init__(
+        self,
+        output: IO[str],
+        *,
+        compact: bool = False,
+        use_orjson: bool | None = None,
+    ) -> None:
+        self._output = output
+        self._encode_obj, self._encode_str = _make_encoders(compact, use_orjson)
+        if compact:
+            self._nl, self._ind1, self._ind2, self._colon = "", "", "", ":"
+        else:
+            self._nl, self._ind1, self._ind2, self._colon = "\n", "  ", "    ", ": "
+        self._sep = "," + self._nl
+        self._texts: list[str] = []
+
+    def begin(self, result: TranscriptResult) -> None:
+        self._texts = []
+        ind1 = self._ind1
+        self._output.write(
+            "{" + self._nl + ind1 + '"metadata"' + self._colon
+            + self._encode_obj(metadata_dict(result.metadata), ind1) + self._sep
+            + ind1 + '"segments"' + self._colon + "["
+        )
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        if not rows:
+            return
+        ind2 = self._ind2
+        encode_obj = self._encode_obj
+        chunk = [ind2 + encode_obj(_segment_dict(row.segment), ind2) for row in rows]
+        self._output.write(
+            (self._sep if self._texts else self._nl) + self._sep.join(chunk)
+        )
+        self._texts.extend(row.segment.text for row in rows)
+
+    def end(self) -> None:
+        nl, ind1 = self._nl, self._ind1
+        if self._texts:
+            self._output.write(nl + ind1)
+        self._output.write("]" + self._sep + ind1 + '"full_text"' + self._colon + '"')
+        # Equivalent to encode_str(result.full_text) without joining the
+        # whole transcript into one string first.
+        texts = self._texts
+        encode_str = self._encode_str
+        for i in range(0, len(texts), _WRITE_BATCH):
+            chunk = [encode_str(t)[1:-1] for t in texts[i: i + _WRITE_BATCH]]
+            if i:
+                self._output.write(" ")
+            self._output.write(" ".join(chunk))
+        self._output.write('"' + nl + "}")
+        self._texts = []
+
+
+def export_json(
+    result: TranscriptResult,
+    output: IO[str],
+    *,
+    compact: bool = False,
+    use_orjson: bool | None = None,
+) -> None:
+    """Write transcription result as JSON to the given output stream."""
+    render(result, [JsonSink(output, compact=compact, use_orjson=use_orjson)])
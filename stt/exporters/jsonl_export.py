@@ -0,0 +1,141 @@
+"""Consolidated JSON Lines output: one compact transcript per line."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from io import StringIO
+from pathlib import Path
+from typing import IO
+
+from stt.data_models import TranscriptResult
+from stt.exporters.json_export import JsonSink
+from stt.exporters.render import render
+
+_LINE_PREFIX = '{"metadata":'
+
+
+class JsonlWriter:
+    """Append one JSON line per transcript, flushing in groups.
+
+    Each line is the compact JSON export of one file. Lines are buffered
+    and written together once ``group_size`` lines are pending or
+    ``flush_interval`` seconds have passed since the last flush, so a
+    consumer tailing the stream sees results while the batch runs without
+    a write per file. A timer enforces the interval while the next file is
+    still being transcribed. ``completed`` holds the source files already
+    in the stream, including any passed in from a previous run.
+    """
+
+    def __init__(
+        self,
+        output: IO[str],
+        *,
+        group_size: int = 32,
+        flush_interval: float = 5.0,
+        completed: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if group_size < 1:
+            raise ValueError(f"group_size must be >= 1, got {group_size}")
+        self._output = output
+        self._group_size = group_size
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._pending: list[str] = []
+        self._last_flush = clock()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self.completed: set[str] = set(completed)
+        self.lines = 0
+
+    def write(self, result: TranscriptResult) -> None:
+        buf = StringIO()
+        render(result, [JsonSink(buf, compact=True)])
+        buf.write("\n")
+        with self._lock:
+            self._pending.append(buf.getvalue())
+            self.completed.add(result.metadata.source_file)
+            self.lines += 1
+            since_flush = self._clock() - self._last_flush
+            if (
+                len(self._pending) >= self._group_size
+                or since_flush >= self._flush_interval
+            ):
+                self._flush()
+            elif self._timer is None:
+                # No further write may come for a long time (the next file
+                # is being transcribed); flush on time regardless.
+                self._timer = threading.Timer(
+                    self._flush_interval - since_flush, self.flush,
+                )
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._output.write("".join(self._pending))
+            self._pending = []
+        self._output.flush()
+        self._last_flush = self._clock()
+
+
+def open_jsonl(path: Path) -> IO[str]:
+    """Open ``path`` for appending, dropping a partial last line if present.
+
+    A run killed mid-write can leave an unterminated line; truncating it
+    keeps the file valid JSON Lines before new lines are appended.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                # Scan back in blocks to the last complete line.
+                pos = size
+                keep = 0
+                while pos > 0:
+                    step = min(64 * 1024, pos)
+                    pos -= step
+                    f.seek(pos)
+                    idx = f.read(step).rfind(b"\n")
+                    if idx >= 0:
+                        keep = pos + idx + 1
+                        break
+                f.truncate(keep)
+    return open(path, "a", encoding="utf-8")
+
+
+def completed_sources(path: Path) -> set[str]:
+    """Return ``source_file`` of every complete line in an existing JSONL file.
+
+    Only the leading metadata object of each line is decoded, not the
+    segments.
+    """
+    if not path.exists():
+        return set()
+    decoder = json.JSONDecoder()
+    sources: set[str] = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n") or not line.startswith(_LINE_PREFIX):
+                continue
+            try:
+                meta, _ = decoder.raw_decode(line, len(_LINE_PREFIX))
+            except json.JSONDecodeError:
+                continue
+            source = meta.get("source_file") if isinstance(meta, dict) else None
+            if isinstance(source, str):
+                sources.add(source)
+    return sources
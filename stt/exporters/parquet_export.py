@@ -0,0 +1,314 @@
+"""Columnar Parquet / Arrow IPC export (optional ``pyarrow`` dependency)."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from types import ModuleType
+from typing import IO, Any, cast
+
+from stt.data_models import Segment, SegmentTable, TranscriptMetadata, TranscriptResult
+from stt.exporters.atomic import default_file_mode
+from stt.exporters.json_export import metadata_dict
+from stt.exporters.render import SegmentRow, render
+
+METADATA_KEY = b"stt.metadata"
+
+# One recording is usually far below these; the dataset writer buffers many
+# recordings into a row group so analytics scans don't hit tiny row groups.
+DATASET_ROW_GROUP_ROWS = 65_536
+DATASET_ROWS_PER_FILE = 1_048_576
+
+_PART_RE = re.compile(r"^part-(\d+)\.parquet$")
+
+
+def _require_pyarrow() -> ModuleType:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "parquet/arrow export requires pyarrow: pip install 'stt[parquet]'"
+        ) from e
+    return cast(ModuleType, pyarrow)
+
+
+def segment_schema(metadata: TranscriptMetadata | None = None) -> Any:
+    """Arrow schema for segment rows, optionally tagged with transcript metadata."""
+    pa = _require_pyarrow()
+    dict_str = pa.dictionary(pa.int32(), pa.string())
+    schema = pa.schema([
+        pa.field("start", pa.float64(), nullable=False),
+        pa.field("end", pa.float64(), nullable=False),
+        pa.field("text", pa.string(), nullable=False),
+        pa.field("speaker", dict_str),
+        pa.field("confidence", pa.float64()),
+        pa.field("source_file", dict_str, nullable=False),
+    ])
+    if metadata is not None:
+        meta_json = json.dumps(metadata_dict(metadata), ensure_ascii=False)
+        schema = schema.with_metadata({METADATA_KEY: meta_json})
+    return schema
+
+
+class _Columns:
+    """Column buffers for a run of segments sharing one schema."""
+
+    def __init__(self) -> None:
+        self.start: list[float] = []
+        self.end: list[float] = []
+        self.text: list[str] = []
+        self.speaker: list[str | None] = []
+        self.confidence: list[float | None] = []
+        self.source_file: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def extend(self, segments: Iterable[Segment], source_file: str) -> None:
+        before = len(self.start)
+        if isinstance(segments, SegmentTable):
+            self.start.extend(segments.starts)
+            self.end.extend(segments.ends)
+            self.text.extend(segments.texts)
+            self.speaker.extend(segments.speaker(i) for i in range(len(segments)))
+            self.confidence.extend(
+                None if math.isnan(c) else c for c in segments.confidences
+            )
+            self.source_file.extend([source_file] * len(segments))
+            return
+        for seg in segments:
+            self.start.append(seg.start)
+            self.end.append(seg.end)
+            self.text.append(seg.text)
+            self.speaker.append(seg.speaker)
+            self.confidence.append(seg.confidence)
+        self.source_file.extend([source_file] * (len(self.start) - before))
+
+    def to_batch(self, schema: Any) -> Any:
+        pa = _require_pyarrow()
+        return pa.record_batch([
+            pa.array(self.start, pa.float64()),
+            pa.array(self.end, pa.float64()),
+            pa.array(self.text, pa.string()),
+            pa.array(self.speaker, pa.string()).dictionary_encode(),
+            pa.array(self.confidence, pa.float64()),
+            pa.array(self.source_file, pa.string()).dictionary_encode(),
+        ], schema=schema)
+
+
+class ParquetSink:
+    """Write one transcript as a single Parquet file.
+
+    Parquet needs a whole row group before it can write, so rows are
+    buffered as columns (not ``Segment`` objects) and written in ``end``.
+    Transcript metadata is stored as JSON under the ``stt.metadata`` schema key.
+    """
+
+    needs_clock = False
+    needs_hms = False
+
+    def __init__(self, output: IO[bytes], *, compression: str = "zstd") -> None:
+        _require_pyarrow()
+        self._output = output
+        self._compression = compression
+        self._columns = _Columns()
+        self._schema: Any = None
+        self._source = ""
+
+    def begin(self, result: TranscriptResult) -> None:
+        self._schema = segment_schema(result.metadata)
+        self._source = result.metadata.source_file
+        self._columns = _Columns()
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        self._columns.extend((row.segment for row in rows), self._source)
+
+    def end(self) -> None:
+        import pyarrow.parquet as pq
+
+        pa = _require_pyarrow()
+        table = pa.Table.from_batches(
+            [self._columns.to_batch(self._schema)], schema=self._schema,
+        )
+        pq.write_table(table, self._output, compression=self._compression)
+        self._columns = _Columns()
+
+
+class ArrowSink:
+    """Stream one transcript as an Arrow IPC file, one record batch per render batch."""
+
+    needs_clock = False
+    needs_hms = False
+
+    def __init__(self, output: IO[bytes]) -> None:
+        _require_pyarrow()
+        self._output = output
+        self._writer: Any = None
+        self._schema: Any = None
+        self._source = ""
+
+    def begin(self, result: TranscriptResult) -> None:
+        import pyarrow.ipc as ipc
+
+        self._schema = segment_schema(result.metadata)
+        self._source = result.metadata.source_file
+        self._writer = ipc.new_file(self._output, self._schema)
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        columns = _Columns()
+        columns.extend((row.segment for row in rows), self._source)
+        self._writer.write_batch(columns.to_batch(self._schema))
+
+    def end(self) -> None:
+        self._writer.close()
+        self._writer = None
+
+
+def export_parquet(result: TranscriptResult, output: IO[bytes]) -> None:
+    """Write transcription result as Parquet to the given binary stream."""
+    render(result, [ParquetSink(output)])
+
+
+def export_arrow(result: TranscriptResult, output: IO[bytes]) -> None:
+    """Write transcription result as an Arrow IPC file to the given binary stream."""
+    render(result, [ArrowSink(output)])
+
+
+def dataset_sources(directory: Path) -> set[str]:
+    """Return ``source_file`` of every recording in a dataset's published parts.
+
+    Only the ``source_file`` column is read. Unfinished (hidden temp)
+    parts are ignored, like readers ignore them.
+    """
+    if not directory.is_dir():
+        return set()
+    import pyarrow.parquet as pq
+
+    _require_pyarrow()
+    sources: set[str] = set()
+    for part in sorted(directory.iterdir()):
+        if _PART_RE.match(part.name):
+            column = pq.read_table(str(part), columns=["source_file"]).column(0)
+            sources.update(column.unique().to_pylist())
+    return sources
+
+
+class ParquetDatasetWriter:
+    """Append many transcripts to one Parquet dataset directory.
+
+    Segments from successive recordings are buffered and written as row
+    groups of about ``row_group_rows`` rows into ``part-NNNNN.parquet``
+    files, rolling to a new part after ``rows_per_file`` rows. Parts are
+    written under a hidden temp name and renamed into place when finished,
+    so readers only ever see complete files. Numbering continues after any
+    parts already in the directory, so repeated batches append.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        row_group_rows: int = DATASET_ROW_GROUP_ROWS,
+        rows_per_file: int = DATASET_ROWS_PER_FILE,
+        compression: str = "zstd",
+    ) -> None:
+        if row_group_rows < 1 or rows_per_file < 1:
+            raise ValueError("row_group_rows and rows_per_file must be >= 1")
+        _require_pyarrow()
+        self._directory = directory
+        self._row_group_rows = row_group_rows
+        self._rows_per_file = rows_per_file
+        self._compression = compression
+        self._schema = segment_schema()
+        self._buffer = _Columns()
+        self._writer: Any = None
+        self._tmp: Path | None = None
+        self._file_rows = 0
+        self._next_part = self._first_free_part()
+        self.parts: list[Path] = []
+        self.recordings = 0
+
+    def _first_free_part(self) -> int:
+        if not self._directory.is_dir():
+            return 0
+        numbers = [
+            int(m.group(1))
+            for p in self._directory.iterdir()
+            if (m := _PART_RE.match(p.name))
+        ]
+        return max(numbers, default=-1) + 1
+
+    def append(self, result: TranscriptResult) -> None:
+        """Buffer one transcript's segments, flushing full row groups."""
+        self._buffer.extend(result.segments, result.metadata.source_file)
+        self.recordings += 1
+        if len(self._buffer) >= self._row_group_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not len(self._buffer):
+            return
+        import pyarrow.parquet as pq
+
+        pa = _require_pyarrow()
+        table = pa.Table.from_batches(
+            [self._buffer.to_batch(self._schema)], schema=self._schema,
+        )
+        self._buffer = _Columns()
+        if self._writer is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".part-{self._next_part:05d}.", suffix=".tmp",
+                dir=self._directory,
+            )
+            os.fchmod(fd, default_file_mode())
+            os.close(fd)
+            self._tmp = Path(tmp)
+            self._writer = pq.ParquetWriter(
+                str(self._tmp), self._schema, compression=self._compression,
+            )
+        self._writer.write_table(table, row_group_size=self._row_group_rows)
+        self._file_rows += table.num_rows
+        if self._file_rows >= self._rows_per_file:
+            self._finish_part()
+
+    def _finish_part(self) -> None:
+        if self._writer is None or self._tmp is None:
+            return
+        self._writer.close()
+        final = self._directory / f"part-{self._next_part:05d}.parquet"
+        os.replace(self._tmp, final)
+        self.parts.append(final)
+        self._writer = None
+        self._tmp = None
+        self._file_rows = 0
+        self._next_part += 1
+
+    def close(self) -> None:
+        """Flush buffered rows and publish the current part."""
+        self._flush()
+        self._finish_part()
+
+    def abort(self) -> None:
+        """Drop buffered rows and the unfinished part."""
+        self._buffer = _Columns()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._tmp is not None:
+            self._tmp.unlink(missing_ok=True)
+            self._tmp = None
+
+    def __enter__(self) -> ParquetDatasetWriter:
+        return self
+
+    def __exit__(self, exc_type: object, *_: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
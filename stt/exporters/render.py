@@ -0,0 +1,167 @@
+"""Single-pass rendering of a transcript into one or more format sinks."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Protocol
+
+from stt.data_models import Segment, TranscriptResult
+
+RENDER_BATCH = 1024
+
+
+def clock_ms(seconds: float) -> tuple[str, int]:
+    """Split seconds into ("HH:MM:SS", milliseconds), rounded to the ms."""
+    total_ms = round(seconds * 1000)
+    total_s, ms = divmod(total_ms, 1000)
+    m, s = divmod(total_s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}", ms
+
+
+def clock_truncated(seconds: float) -> str:
+    """Format seconds as HH:MM:SS, truncating fractions."""
+    total = int(seconds)
+    m, s = divmod(total, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+@dataclass(slots=True)
+class SegmentRow:
+    """Per-segment fields shared by all sinks, computed once per render."""
+
+    index: int
+    segment: Segment
+    start_clock: str = ""
+    start_ms: int = 0
+    end_clock: str = ""
+    end_ms: int = 0
+    start_hms: str = ""
+
+
+class FormatSink(Protocol):
+    """Incremental writer for one output format.
+
+    ``needs_clock`` / ``needs_hms`` tell the renderer which shared
+    timestamp fields to fill in on each ``SegmentRow``.
+    """
+
+    needs_clock: bool
+    needs_hms: bool
+
+    def begin(self, result: TranscriptResult) -> None: ...
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None: ...
+
+    def end(self) -> None: ...
+
+
+def iter_rows(
+    segments: Iterable[Segment],
+    *,
+    needs_clock: bool = True,
+    needs_hms: bool = True,
+    start_index: int = 1,
+    batch_size: int = RENDER_BATCH,
+) -> Iterator[list[SegmentRow]]:
+    """Yield batches of ``SegmentRow`` with only the requested fields set."""
+    batch: list[SegmentRow] = []
+    for index, seg in enumerate(segments, start=start_index):
+        row = SegmentRow(index=index, segment=seg)
+        if needs_clock:
+            row.start_clock, row.start_ms = clock_ms(seg.start)
+            row.end_clock, row.end_ms = clock_ms(seg.end)
+        if needs_hms:
+            row.start_hms = clock_truncated(seg.start)
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def render(
+    result: TranscriptResult,
+    sinks: Sequence[FormatSink],
+    *,
+    concurrent: bool = False,
+) -> None:
+    """Walk ``result.segments`` once and feed every sink.
+
+    With ``concurrent=True`` each sink consumes the shared row batches on
+    its own thread, so encoding and file I/O of different formats overlap.
+    """
+    if not sinks:
+        return
+    rows = iter_rows(
+        result.segments,
+        needs_clock=any(s.needs_clock for s in sinks),
+        needs_hms=any(s.needs_hms for s in sinks),
+    )
+    if not concurrent or len(sinks) == 1:
+        for sink in sinks:
+            sink.begin(result)
+        for batch in rows:
+            for sink in sinks:
+                sink.write_rows(batch)
+        for sink in sinks:
+            sink.end()
+        return
+    _render_concurrent(result, sinks, rows)
+
+
+_DONE = object()
+
+
+def _render_concurrent(
+    result: TranscriptResult,
+    sinks: Sequence[FormatSink],
+    rows: Iterator[list[SegmentRow]],
+) -> None:
+    queues: list[queue.Queue[object]] = [queue.Queue(maxsize=8) for _ in sinks]
+    errors: list[BaseException] = []
+    failed = threading.Event()
+
+    def worker(sink: FormatSink, q: queue.Queue[object]) -> None:
+        done = False
+        try:
+            sink.begin(result)
+            while True:
+                item = q.get()
+                if item is _DONE:
+                    done = True
+                    break
+                sink.write_rows(item)  # type: ignore[arg-type]
+            sink.end()
+        except BaseException as e:
+            errors.append(e)
+            failed.set()
+            # Keep draining so the producer never blocks on a full queue
+            # (unless _DONE was already taken, e.g. end() failed).
+            while not done:
+                done = q.get() is _DONE
+
+    threads = [
+        threading.Thread(target=worker, args=(sink, q), daemon=True)
+        for sink, q in zip(sinks, queues, strict=True)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for batch in rows:
+            if failed.is_set():
+                break
+            for q in queues:
+                q.put(batch)
+    finally:
+        for q in queues:
+            q.put(_DONE)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
@@ -2,32 +2,49 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import IO
 
 from stt.data_models import TranscriptResult
+from stt.exporters.render import SegmentRow, render
 
 
-def _format_srt_timestamp(seconds: float) -> str:
-    """Format seconds as HH:MM:SS,mmm for SRT."""
-    total_ms = round(seconds * 1000)
-    h = total_ms // 3_600_000
-    total_ms %= 3_600_000
-    m = total_ms // 60_000
-    total_ms %= 60_000
-    s = total_ms // 1000
-    ms = total_ms % 1000
-    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+class SrtSink:
+    """Incremental SRT writer."""
+
+    needs_clock = True
+    needs_hms = False
+
+    def __init__(self, output: IO[str]) -> None:
+        self._output = output
+        self._count = 0
+
+    def begin(self, result: TranscriptResult) -> None:
+        self._count = 0
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        entries = []
+        for row in rows:
+            seg = row.segment
+            if seg.speaker is not None:
+                text = f"[{seg.speaker}] {seg.text}"
+            else:
+                text = seg.text
+            entries.append(
+                f"{row.index}\n"
+                f"{row.start_clock},{row.start_ms:03d} --> "
+                f"{row.end_clock},{row.end_ms:03d}\n{text}"
+            )
+        if not entries:
+            return
+        prefix = "\n\n" if self._count else ""
+        self._output.write(prefix + "\n\n".join(entries))
+        self._count += len(entries)
+
+    def end(self) -> None:
+        self._output.write("\n")
 
 
 def export_srt(result: TranscriptResult, output: IO[str]) -> None:
     """Write transcription result as SRT subtitles to the given output stream."""
-    entries = []
-    for i, seg in enumerate(result.segments, start=1):
-        start_ts = _format_srt_timestamp(seg.start)
-        end_ts = _format_srt_timestamp(seg.end)
-        if seg.speaker is not None:
-            text = f"[{seg.speaker}] {seg.text}"
-        else:
-            text = seg.text
-        entries.append(f"{i}\n{start_ts} --> {end_ts}\n{text}")
-    output.write("\n\n".join(entries) + "\n")
+    render(result, [SrtSink(output)])
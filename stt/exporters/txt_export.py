@@ -2,27 +2,42 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import IO
 
 from stt.data_models import TranscriptResult
+from stt.exporters.render import SegmentRow, render
 
 
-def _format_timestamp(seconds: float) -> str:
-    """Format seconds as HH:MM:SS."""
-    total = int(seconds)
-    h = total // 3600
-    m = (total % 3600) // 60
-    s = total % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
+class TxtSink:
+    """Incremental plain-text writer: one ``[HH:MM:SS] speaker: text`` line per segment."""
+
+    needs_clock = False
+    needs_hms = True
+
+    def __init__(self, output: IO[str]) -> None:
+        self._output = output
+        self._count = 0
+
+    def begin(self, result: TranscriptResult) -> None:
+        self._count = 0
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        lines = []
+        for row in rows:
+            seg = row.segment
+            if seg.speaker is not None:
+                lines.append(f"[{row.start_hms}] {seg.speaker}: {seg.text}\n")
+            else:
+                lines.append(f"[{row.start_hms}] {seg.text}\n")
+        self._output.write("".join(lines))
+        self._count += len(rows)
+
+    def end(self) -> None:
+        if self._count == 0:
+            self._output.write("\n")
 
 
 def export_txt(result: TranscriptResult, output: IO[str]) -> None:
     """Write transcription result as plain text to the given output stream."""
-    lines = []
-    for seg in result.segments:
-        ts = _format_timestamp(seg.start)
-        if seg.speaker is not None:
-            lines.append(f"[{ts}] {seg.speaker}: {seg.text}")
-        else:
-            lines.append(f"[{ts}] {seg.text}")
-    output.write("\n".join(lines) + "\n")
+    render(result, [TxtSink(output)])
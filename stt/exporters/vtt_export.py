@@ -0,0 +1,64 @@
+"""WebVTT exporter for transcription results."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import IO
+
+from stt.data_models import TranscriptResult
+from stt.exporters.render import SegmentRow, render
+
+
+def _escape_cue_text(text: str) -> str:
+    """Escape cue text; a blank line would terminate the cue early."""
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    while "\n\n" in text:
+        text = text.replace("\n\n", "\n")
+    return text
+
+
+class VttSink:
+    """Incremental WebVTT writer.
+
+    Speakers are emitted as voice spans (``<v SPEAKER_00>text``) unless
+    ``voice_tags`` is False, in which case the SRT-style ``[SPEAKER_00]``
+    prefix is used.
+    """
+
+    needs_clock = True
+    needs_hms = False
+
+    def __init__(self, output: IO[str], *, voice_tags: bool = True) -> None:
+        self._output = output
+        self._voice_tags = voice_tags
+
+    def begin(self, result: TranscriptResult) -> None:
+        self._output.write("WEBVTT\n")
+
+    def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+        cues = []
+        for row in rows:
+            seg = row.segment
+            text = _escape_cue_text(seg.text)
+            if seg.speaker is not None:
+                speaker = _escape_cue_text(seg.speaker)
+                if self._voice_tags:
+                    text = f"<v {speaker}>{text}"
+                else:
+                    text = f"[{speaker}] {text}"
+            cues.append(
+                f"\n{row.index}\n"
+                f"{row.start_clock}.{row.start_ms:03d} --> "
+                f"{row.end_clock}.{row.end_ms:03d}\n{text}\n"
+            )
+        self._output.write("".join(cues))
+
+    def end(self) -> None:
+        pass
+
+
+def export_vtt(
+    result: TranscriptResult, output: IO[str], *, voice_tags: bool = True,
+) -> None:
+    """Write transcription result as WebVTT subtitles to the given output stream."""
+    render(result, [VttSink(output, voice_tags=voice_tags)])
@@ -6,7 +6,7 @@ import pytest
 
 from stt.core.aligner import _compute_overlap, align_segments
 from stt.core.diarizer import DiarizationResult, DiarizationTurn
-from stt.data_models import Segment
+from stt.data_models import Segment, SegmentTable
 
 # ---------------------------------------------------------------------------
 # _compute_overlap
@@ -161,3 +161,41 @@ class TestAlignSegmentsEdgeCases:
 
         assert len(result) == 1
         assert result[0].speaker is None
+
+
+class TestAlignSegmentTable:
+    def test_table_aligned_without_copying_columns(self) -> None:
+        table = SegmentTable.from_segments([
+            Segment(start=0.0, end=5.0, text="zero", confidence=0.5),
+            Segment(start=5.0, end=10.0, text="one"),
+        ])
+        turns = [
+            DiarizationTurn(start=0.0, end=5.0, speaker="SPEAKER_00"),
+            DiarizationTurn(start=5.0, end=10.0, speaker="SPEAKER_01"),
+        ]
+
+        result = align_segments(table, DiarizationResult(turns=turns, num_speakers=2))
+
+        assert isinstance(result, SegmentTable)
+        assert result.starts is table.starts
+        assert [s.speaker for s in result] == ["SPEAKER_00", "SPEAKER_01"]
+        assert table.speaker(0) is None
+        assert result[0].confidence == pytest.approx(0.5)
+
+    def test_unsorted_turns_tie_goes_to_first_turn(self) -> None:
+        segments = [Segment(start=4.0, end=6.0, text="tie")]
+        turns = [
+            DiarizationTurn(start=5.0, end=10.0, speaker="SPEAKER_01"),
+            DiarizationTurn(start=0.0, end=5.0, speaker="SPEAKER_00"),
+        ]
+        result = align_segments(segments, DiarizationResult(turns=turns, num_speakers=2))
+        assert result[0].speaker == "SPEAKER_01"
+
+    def test_long_turn_found_from_far_back(self) -> None:
+        segments = [Segment(start=100.0, end=101.0, text="late")]
+        turns = [
+            DiarizationTurn(start=0.0, end=200.0, speaker="SPEAKER_00"),
+            DiarizationTurn(start=50.0, end=60.0, speaker="SPEAKER_01"),
+        ]
+        result = align_segments(segments, DiarizationResult(turns=turns, num_speakers=2))
+        assert result[0].speaker == "SPEAKER_00"
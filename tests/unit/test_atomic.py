@@ -0,0 +1,125 @@
+"""Tests for stt.exporters.atomic — atomic output writes."""
+
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.exporters.atomic import OutputCommitter, default_file_mode
+
+
+def _hidden(directory: Path) -> list[Path]:
+    return sorted(p for p in directory.iterdir() if p.name.startswith("."))
+
+
+class TestOutputCommitterModes:
+    def test_invalid_mode_raises(self) -> None:
+        with pytest.raises(ValueError, match="fsync mode"):
+            OutputCommitter("always")
+
+    def test_invalid_group_size_raises(self) -> None:
+        with pytest.raises(ValueError, match="group_size"):
+            OutputCommitter("group", group_size=0)
+
+    @pytest.mark.parametrize("mode", ["none", "file"])
+    def test_file_visible_after_close(self, mode: str, tmp_path: Path) -> None:
+        target = tmp_path / "a.json"
+        committer = OutputCommitter(mode)
+        with committer.open(target) as f:
+            f.write("{}")
+            assert not target.exists()
+        assert target.read_text() == "{}"
+        assert _hidden(tmp_path) == []
+
+    def test_overwrites_existing_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.txt"
+        target.write_text("old")
+        with OutputCommitter().open(target) as f:
+            f.write("new")
+        assert target.read_text() == "new"
+
+    @patch("stt.exporters.atomic.os.fsync")
+    def test_file_mode_fsyncs_each_file(self, mock_fsync: MagicMock, tmp_path: Path) -> None:
+        committer = OutputCommitter("file")
+        for name in ("a.txt", "b.txt"):
+            with committer.open(tmp_path / name) as f:
+                f.write("x")
+        # file data + directory, per file
+        assert mock_fsync.call_count == 4
+
+    @patch("stt.exporters.atomic.os.fsync")
+    def test_none_mode_never_fsyncs(self, mock_fsync: MagicMock, tmp_path: Path) -> None:
+        with OutputCommitter("none").open(tmp_path / "a.txt") as f:
+            f.write("x")
+        mock_fsync.assert_not_called()
+
+
+class TestOutputCommitterFailure:
+    def test_error_removes_temp_and_keeps_old_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "a.json"
+        target.write_text("complete")
+        with pytest.raises(RuntimeError):
+            with OutputCommitter().open(target) as f:
+                f.write("partial")
+                raise RuntimeError("crash")
+        assert target.read_text() == "complete"
+        assert _hidden(tmp_path) == []
+
+
+class TestOutputCommitterGroup:
+    @patch("stt.exporters.atomic.os.fsync")
+    def test_group_commit_every_n_files(self, mock_fsync: MagicMock, tmp_path: Path) -> None:
+        committer = OutputCommitter("group", group_size=3)
+        for i in range(2):
+            with committer.open(tmp_path / f"{i}.txt") as f:
+                f.write("x")
+        assert committer.pending == 2
+        assert not (tmp_path / "0.txt").exists()
+        mock_fsync.assert_not_called()
+
+        with committer.open(tmp_path / "2.txt") as f:
+            f.write("x")
+        assert committer.pending == 0
+        assert all((tmp_path / f"{i}.txt").exists() for i in range(3))
+        # three files + one shared directory
+        assert mock_fsync.call_count == 4
+
+    def test_commit_flushes_remaining(self, tmp_path: Path) -> None:
+        committer = OutputCommitter("group", group_size=10)
+        with committer.open(tmp_path / "a.txt") as f:
+            f.write("x")
+        committer.commit()
+        assert (tmp_path / "a.txt").read_text() == "x"
+        assert _hidden(tmp_path) == []
+
+    def test_abort_discards_pending(self, tmp_path: Path) -> None:
+        committer = OutputCommitter("group", group_size=10)
+        with committer.open(tmp_path / "a.txt") as f:
+            f.write("x")
+        committer.abort()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestFileMode:
+    @pytest.mark.parametrize("umask", [0o022, 0o077])
+    def test_output_mode_follows_umask(self, umask: int, tmp_path: Path) -> None:
+        old = os.umask(umask)
+        try:
+            assert default_file_mode() == 0o666 & ~umask
+            with OutputCommitter().open(tmp_path / "a.txt") as f:
+                f.write("x")
+        finally:
+            os.umask(old)
+        assert stat.S_IMODE((tmp_path / "a.txt").stat().st_mode) == 0o666 & ~umask
+
+    def test_probe_without_procfs(self, tmp_path: Path) -> None:
+        old = os.umask(0o027)
+        try:
+            with patch("builtins.open", side_effect=OSError):
+                assert default_file_mode() == 0o640
+        finally:
+            os.umask(old)
@@ -2,30 +2,39 @@
 
 from __future__ import annotations
 
+import struct
 import subprocess
+import wave
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from stt.core.audio import preprocess_audio
+from stt.core.audio import is_target_wav, preprocess_audio, probe_duration
 from stt.exceptions import AudioPreprocessError
 
 
+def _write_wav(path: Path, rate: int, channels: int) -> Path:
+    """Write 0.1s of silence."""
+    frames = rate // 10
+    with wave.open(str(path), "w") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(struct.pack("<" + "h" * frames * channels, *([0] * frames * channels)))
+    return path
+
+
 @pytest.fixture()
 def minimal_wav(tmp_path: Path) -> Path:
-    """Create a minimal valid WAV file (silence, 16kHz mono, 0.1s)."""
-    import struct
-    import wave
+    """Create a minimal WAV that needs conversion (silence, 44.1kHz stereo, 0.1s)."""
+    return _write_wav(tmp_path / "test.wav", 44100, 2)
 
-    wav_path = tmp_path / "test.wav"
-    with wave.open(str(wav_path), "w") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(16000)
-        # 0.1s of silence = 1600 frames
-        wf.writeframes(struct.pack("<" + "h" * 1600, *([0] * 1600)))
-    return wav_path
+
+@pytest.fixture()
+def target_wav(tmp_path: Path) -> Path:
+    """Create a WAV already in the target format (silence, 16kHz mono, 0.1s)."""
+    return _write_wav(tmp_path / "target.wav", 16000, 1)
 
 
 class TestPreprocessAudio:
@@ -113,3 +122,119 @@ class TestPreprocessFfmpegReturncode:
         )
         with pytest.raises(AudioPreprocessError, match="Invalid data found"):
             preprocess_audio(minimal_wav)
+
+
+class TestTargetWavFastPath:
+    @patch("stt.core.audio.subprocess.run")
+    def test_target_wav_used_in_place(
+        self, mock_run: patch, target_wav: Path,
+    ) -> None:
+        result = preprocess_audio(target_wav)
+        assert result.path == target_wav
+        mock_run.assert_not_called()
+
+    def test_cleanup_keeps_source(self, target_wav: Path) -> None:
+        preprocess_audio(target_wav).cleanup()
+        assert target_wav.exists()
+
+    def test_other_formats_need_ffmpeg(self, tmp_path: Path) -> None:
+        assert not is_target_wav(_write_wav(tmp_path / "a.wav", 44100, 1))
+        assert not is_target_wav(_write_wav(tmp_path / "b.wav", 16000, 2))
+        assert is_target_wav(_write_wav(tmp_path / "c.wav", 16000, 1))
+
+    def test_extra_chunks_before_data(self, target_wav: Path, tmp_path: Path) -> None:
+        raw = target_wav.read_bytes()
+        # RIFF header + fmt chunk (24 bytes), then an odd-sized LIST chunk.
+        extra = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+        patched = raw[:36] + extra + raw[36:]
+        patched = patched[:4] + struct.pack("<I", len(patched) - 8) + patched[8:]
+        path = tmp_path / "list.wav"
+        path.write_bytes(patched)
+        assert is_target_wav(path)
+
+    def test_truncated_data_needs_ffmpeg(self, target_wav: Path, tmp_path: Path) -> None:
+        path = tmp_path / "cut.wav"
+        path.write_bytes(target_wav.read_bytes()[:-100])
+        assert not is_target_wav(path)
+
+    def test_not_riff(self, tmp_path: Path) -> None:
+        path = tmp_path / "x.wav"
+        path.write_bytes(b"ID3" + b"\x00" * 64)
+        assert not is_target_wav(path)
+
+
+class TestTimeRange:
+    def test_target_wav_is_cut_without_ffmpeg(self, tmp_path: Path) -> None:
+        source = tmp_path / "long.wav"
+        with wave.open(str(source), "w") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(struct.pack("<32000h", *range(32000)))
+        with patch("stt.core.audio.subprocess.run") as mock_run:
+            result = preprocess_audio(source, start=0.5, end=1.5)
+        mock_run.assert_not_called()
+        try:
+            assert result.path != source
+            with wave.open(str(result.path), "rb") as wf:
+                assert wf.getnframes() == 16000
+                first = struct.unpack("<h", wf.readframes(1))[0]
+            assert first == 8000
+        finally:
+            result.cleanup()
+        assert source.exists()
+        assert not result.path.exists()
+
+    def test_range_past_end_is_empty(self, target_wav: Path) -> None:
+        result = preprocess_audio(target_wav, start=10.0)
+        try:
+            with wave.open(str(result.path), "rb") as wf:
+                assert wf.getnframes() == 0
+        finally:
+            result.cleanup()
+
+    @patch("stt.core.audio.subprocess.run")
+    def test_ffmpeg_seeks_input(self, mock_run: patch, minimal_wav: Path) -> None:
+        def run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+            Path(cmd[-1]).write_bytes(b"RIFF")
+            return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+        mock_run.side_effect = run
+        result = preprocess_audio(minimal_wav, start=1800.0, end=2700.0)
+        result.cleanup()
+        cmd = mock_run.call_args.args[0]
+        assert cmd[1:5] == ["-ss", "1800.000", "-i", str(minimal_wav)]
+        assert cmd[cmd.index("-t") + 1] == "900.000"
+
+    @pytest.mark.parametrize(("start", "end"), [(-1.0, None), (5.0, 5.0), (None, 0.0)])
+    def test_invalid_range(self, target_wav: Path, start: float | None, end: float | None) -> None:
+        with pytest.raises(ValueError):
+            preprocess_audio(target_wav, start=start, end=end)
+
+
+class TestProbeDuration:
+    @patch("stt.core.audio.subprocess.run")
+    def test_target_wav_from_header(self, mock_run: patch, target_wav: Path) -> None:
+        assert probe_duration(target_wav) == pytest.approx(0.1)
+        mock_run.assert_not_called()
+
+    @patch("stt.core.audio.subprocess.run")
+    def test_ffprobe_duration(self, mock_run: patch, minimal_wav: Path) -> None:
+        mock_run.return_value = subprocess.CompletedProcess([], 0, b"12.480000\n", b"")
+        assert probe_duration(minimal_wav) == pytest.approx(12.48)
+        assert mock_run.call_args.args[0][0] == "ffprobe"
+
+    @pytest.mark.parametrize("outcome", [
+        subprocess.CompletedProcess([], 1, b"", b"Invalid data"),
+        subprocess.CompletedProcess([], 0, b"N/A\n", b""),
+        FileNotFoundError("ffprobe"),
+    ])
+    @patch("stt.core.audio.subprocess.run")
+    def test_unknown_duration(
+        self, mock_run: patch, minimal_wav: Path, outcome: object,
+    ) -> None:
+        if isinstance(outcome, Exception):
+            mock_run.side_effect = outcome
+        else:
+            mock_run.return_value = outcome
+        assert probe_duration(minimal_wav) is None
@@ -0,0 +1,250 @@
+"""Tests for stt.core.autotune — batch_size tuning and persistence."""
+
+from __future__ import annotations
+
+import json
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.core.autotune import (
+    ProbeResult,
+    TuningResult,
+    TuningStore,
+    autotune_batch_size,
+    select_batch_size,
+    tuning_key,
+    tuning_path,
+)
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.transcriber import TranscriberConfig
+from stt.data_models import Segment
+from stt.exceptions import CudaOomError, TranscriptionError
+
+
+def _write_wav(path: Path, seconds: float, rate: int = 16000) -> None:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00" * int(seconds * rate))
+
+
+def _probe(
+    throughput: dict[int, float],
+    free: dict[int, float] | None = None,
+    oom_from: int | None = None,
+):  # type: ignore[no-untyped-def]
+    def probe(size: int) -> ProbeResult:
+        if oom_from is not None and size >= oom_from:
+            raise CudaOomError("oom")
+        return ProbeResult(
+            size, throughput[size], 1.0, (free or {}).get(size),
+        )
+    return probe
+
+
+class TestSelectBatchSize:
+    def test_stops_on_plateau(self) -> None:
+        probe = _probe({1: 10.0, 2: 18.0, 4: 30.0, 8: 31.0, 16: 50.0})
+        result = select_batch_size(probe, (1, 2, 4, 8, 16))
+        assert result.batch_size == 4
+        assert result.stopped == "plateau"
+        assert [p.batch_size for p in result.probes] == [1, 2, 4, 8]
+
+    def test_stops_on_oom(self) -> None:
+        probe = _probe({1: 10.0, 2: 18.0, 4: 30.0}, oom_from=8)
+        result = select_batch_size(probe, (1, 2, 4, 8, 16))
+        assert (result.batch_size, result.stopped) == (4, "oom")
+
+    def test_rejects_size_without_headroom(self) -> None:
+        probe = _probe({1: 10.0, 2: 18.0, 4: 30.0}, free={1: 0.6, 2: 0.4, 4: 0.05})
+        result = select_batch_size(probe, (1, 2, 4), min_free_fraction=0.1)
+        assert (result.batch_size, result.stopped) == (2, "memory")
+
+    def test_exhausted_keeps_largest(self) -> None:
+        result = select_batch_size(_probe({1: 1.0, 2: 2.0, 4: 4.0}), (4, 1, 2))
+        assert (result.batch_size, result.stopped) == (4, "exhausted")
+
+    def test_smallest_oom_falls_back_to_smallest(self) -> None:
+        result = select_batch_size(_probe({}, oom_from=1), (2, 4))
+        assert result.batch_size == 2
+        assert result.probes == []
+
+    def test_other_errors_propagate(self) -> None:
+        def probe(size: int) -> ProbeResult:
+            raise TranscriptionError("broken")
+
+        with pytest.raises(TranscriptionError):
+            select_batch_size(probe, (1, 2))
+
+
+class TestTuningStore:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        store = TuningStore(tmp_path / "sub" / "tuning.json")
+        assert store.get("k") is None
+        result = TuningResult(batch_size=16, probes=[ProbeResult(16, 480.0, 10.0)])
+        store.put("k", result)
+        store.put("other", TuningResult(batch_size=2))
+
+        assert store.get("k") == 16
+        assert store.get("other") == 2
+        entry = json.loads(store.path.read_text())["entries"]["k"]
+        assert entry["throughput"] == 48.0
+
+    def test_unreadable_file_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "tuning.json"
+        path.write_text("{not json")
+        store = TuningStore(path)
+        assert store.get("k") is None
+        store.put("k", TuningResult(batch_size=4))
+        assert store.get("k") == 4
+
+    def test_key_and_path(self) -> None:
+        assert tuning_key("large-v3", "int8", "cpu") == "large-v3|int8|cpu"
+        assert tuning_path("models") == Path("models") / "batch_size_tuning.json"
+
+
+class TestAutotuneBatchSize:
+    def _run(
+        self,
+        mock_transcriber_cls: MagicMock,
+        tmp_path: Path,
+        seconds_per_call: dict[int, float],
+    ) -> tuple[TuningResult, list[tuple[int, float]]]:
+        """Tune with a fake clock that advances by ``seconds_per_call[batch_size]``."""
+        wav = tmp_path / "audio.wav"
+        _write_wav(wav, 5.0)
+        transcriber = mock_transcriber_cls.return_value
+        seen: list[tuple[int, float]] = []
+        now = [0.0]
+
+        def transcribe(path: str) -> list[Segment]:
+            with wave.open(path, "rb") as f:
+                seen.append((transcriber.batch_size, f.getnframes() / f.getframerate()))
+            now[0] += seconds_per_call[transcriber.batch_size]
+            return []
+
+        transcriber.transcribe.side_effect = transcribe
+        config = TranscriberConfig(device="cpu", use_batched=False)
+        result = autotune_batch_size(
+            config, str(wav), candidates=(1, 2, 4), clip_seconds=2.0,
+            clock=lambda: now[0],
+        )
+        return result, seen
+
+    @patch("stt.core.autotune.cuda_free_fraction", return_value=None)
+    @patch("stt.core.autotune.Transcriber")
+    def test_probe_clips_fill_each_batch(
+        self, mock_transcriber_cls: MagicMock, mock_free: MagicMock, tmp_path: Path,
+    ) -> None:
+        result, seen = self._run(mock_transcriber_cls, tmp_path, {1: 1.0, 2: 1.0, 4: 1.0})
+
+        assert mock_transcriber_cls.call_args.args[0].use_batched is True
+        # warm-up, then one probe per candidate with batch_size clip copies
+        assert seen == [(1, 2.0), (1, 2.0), (2, 4.0), (4, 8.0)]
+        assert [p.throughput for p in result.probes] == [2.0, 4.0, 8.0]
+        assert (result.batch_size, result.stopped) == (4, "exhausted")
+        mock_transcriber_cls.return_value.unload_model.assert_called_once()
+
+    @patch("stt.core.autotune.cuda_free_fraction", return_value=None)
+    @patch("stt.core.autotune.Transcriber")
+    def test_stops_on_measured_plateau(
+        self, mock_transcriber_cls: MagicMock, mock_free: MagicMock, tmp_path: Path,
+    ) -> None:
+        # batch_size=4 takes twice as long as 2: no throughput gain.
+        result, _ = self._run(mock_transcriber_cls, tmp_path, {1: 1.0, 2: 1.0, 4: 2.0})
+
+        assert [p.throughput for p in result.probes] == [2.0, 4.0, 4.0]
+        assert (result.batch_size, result.stopped) == (2, "plateau")
+        mock_transcriber_cls.return_value.unload_model.assert_called_once()
+
+
+@patch("stt.core.pipeline.autotune_batch_size")
+@patch("stt.core.pipeline.export_transcript")
+@patch("stt.core.pipeline.Transcriber")
+@patch("stt.core.pipeline.preprocess_audio")
+@patch("stt.core.pipeline.validate_audio_file")
+class TestPipelineAutoBatchSize:
+    def _config(self, tmp_path: Path, **kwargs: object) -> PipelineConfig:
+        return PipelineConfig(
+            diarization_enabled=False, use_batched=True, auto_batch_size=True,
+            model_dir=str(tmp_path), device="cpu", **kwargs,  # type: ignore[arg-type]
+        )
+
+    def test_tunes_once_and_persists(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        mock_autotune: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value.path = "/fake/preprocessed.wav"
+        mock_transcriber_cls.return_value.transcribe.return_value = []
+        mock_autotune.return_value = TuningResult(batch_size=16)
+
+        pipeline = TranscriptionPipeline(self._config(tmp_path))
+        pipeline.run("/fake/a.wav")
+        pipeline.run("/fake/b.wav")
+
+        mock_autotune.assert_called_once()
+        for call in mock_transcriber_cls.call_args_list:
+            assert call.args[0].batch_size == 16
+        key = tuning_key("large-v3", "float16", "cpu")
+        assert TuningStore(tuning_path(str(tmp_path))).get(key) == 16
+
+        # A new process starts tuned without probing.
+        TranscriptionPipeline(self._config(tmp_path)).run("/fake/c.wav")
+        mock_autotune.assert_called_once()
+
+    def test_subprocess_uses_persisted_only(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        mock_autotune: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value.path = "/fake/preprocessed.wav"
+        config = self._config(tmp_path, use_subprocess=True)
+        with patch("stt.core.pipeline.run_transcription_subprocess") as mock_sub:
+            mock_sub.return_value = []
+            TranscriptionPipeline(config).run("/fake/a.wav")
+
+        mock_autotune.assert_not_called()
+        assert mock_sub.call_args.args[0]["batch_size"] == 8
+
+    @patch("stt.core.oom.cleanup_gpu_memory")
+    def test_oom_recovery_lowers_persisted_size(
+        self,
+        mock_cleanup: MagicMock,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        mock_autotune: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value.path = "/fake/preprocessed.wav"
+        key = tuning_key("large-v3", "float16", "cpu")
+        TuningStore(tuning_path(str(tmp_path))).put(key, TuningResult(batch_size=16))
+
+        def make(config: TranscriberConfig) -> MagicMock:
+            transcriber = MagicMock()
+            if config.batch_size > 4:
+                transcriber.transcribe.side_effect = CudaOomError("oom")
+            else:
+                transcriber.transcribe.return_value = []
+            return transcriber
+
+        mock_transcriber_cls.side_effect = make
+        result = TranscriptionPipeline(self._config(tmp_path)).run("/fake/a.wav")
+
+        assert result.metadata.oom_recovery == {"transcription": "batch_size=4"}
+        assert TuningStore(tuning_path(str(tmp_path))).get(key) == 4
+        mock_autotune.assert_not_called()
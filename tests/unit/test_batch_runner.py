@@ -5,6 +5,8 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from stt.core.batch import BatchResult, BatchRunner
 from stt.core.pipeline import PipelineConfig
 from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
@@ -246,3 +248,259 @@ class TestBatchRunnerVramCleanup:
         assert result.failed == 1
         mock_gc.collect.assert_called_once()
         mock_torch.cuda.empty_cache.assert_called_once()
+
+
+def _mock_preprocessed(path: Path) -> MagicMock:
+    preprocessed = MagicMock()
+    preprocessed.path = path
+    return preprocessed
+
+
+class TestBatchRunnerPackShort:
+    @patch("stt.core.batch.export_transcript")
+    @patch("stt.core.batch.Transcriber")
+    @patch("stt.core.batch.wav_duration")
+    @patch("stt.core.batch.AudioPackWriter")
+    @patch("stt.core.batch.preprocess_audio")
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_short_clips_packed_long_clips_use_pipeline(
+        self,
+        mock_pipeline_cls: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_writer_cls: MagicMock,
+        mock_duration: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        from stt.core.packing import AudioPack, PackEntry
+
+        files = [tmp_path / "a.mp3", tmp_path / "b.mp3", tmp_path / "long.mp3"]
+        for f in files:
+            f.write_bytes(b"\x00" * 10)
+        mock_preprocess.side_effect = [
+            _mock_preprocessed(tmp_path / f"{f.stem}.wav") for f in files
+        ]
+        mock_duration.side_effect = [2.0, 3.0, 120.0]
+
+        entries = [
+            PackEntry(source=files[0], offset=0.0, duration=2.0),
+            PackEntry(source=files[1], offset=3.0, duration=3.0),
+        ]
+        mock_writer = MagicMock()
+        mock_writer.duration = 7.0
+        mock_writer.close.return_value = AudioPack(
+            path=tmp_path / "pack.wav", entries=entries,
+        )
+        mock_writer_cls.return_value = mock_writer
+
+        mock_transcriber = MagicMock()
+        mock_transcriber.transcribe_words.return_value = (
+            [
+                Segment(start=0.0, end=1.5, text="a"),
+                Segment(start=3.2, end=5.0, text="b"),
+            ],
+            [[], []],
+        )
+        mock_transcriber_cls.return_value = mock_transcriber
+
+        mock_pipeline = MagicMock()
+        mock_pipeline_cls.return_value = mock_pipeline
+
+        runner = BatchRunner(PipelineConfig(), pack_short=10.0)
+        result = runner.run(files, tmp_path / "output")
+
+        assert result.succeeded == 3
+        mock_transcriber.transcribe_words.assert_called_once()
+        mock_transcriber.unload_model.assert_called_once()
+        assert mock_writer.add.call_count == 2
+        mock_pipeline.run.assert_called_once()
+        assert mock_pipeline.run.call_args[0][0] == str(files[2])
+
+        exported = {
+            c[0][0].metadata.source_file: c[0][0] for c in mock_export.call_args_list
+        }
+        b_result = exported[str(files[1])]
+        assert b_result.metadata.diarization is False
+        assert b_result.segments[0].start == pytest.approx(0.2)
+
+    @patch("stt.core.batch.probe_duration", return_value=120.0)
+    @patch("stt.core.batch.preprocess_audio")
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_long_clip_not_decoded_for_packing(
+        self,
+        mock_pipeline_cls: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_probe: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        audio = tmp_path / "long.mp3"
+        audio.write_bytes(b"\x00" * 10)
+
+        result = BatchRunner(PipelineConfig(), pack_short=10.0).run(
+            [audio], tmp_path / "output",
+        )
+
+        assert result.succeeded == 1
+        mock_probe.assert_called_once_with(audio)
+        # Decoded once, by the single-file pipeline.
+        mock_preprocess.assert_not_called()
+        mock_pipeline_cls.return_value.run.assert_called_once()
+
+    @patch("stt.core.batch.export_transcript")
+    @patch("stt.core.batch.Transcriber")
+    @patch("stt.core.batch.wav_duration")
+    @patch("stt.core.batch.AudioPackWriter")
+    @patch("stt.core.batch.preprocess_audio")
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_pack_failure_fails_every_clip(
+        self,
+        mock_pipeline_cls: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_writer_cls: MagicMock,
+        mock_duration: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        from stt.core.packing import AudioPack, PackEntry
+
+        files = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+        for f in files:
+            f.write_bytes(b"\x00" * 10)
+        mock_preprocess.side_effect = [
+            _mock_preprocessed(tmp_path / f"{f.stem}.wav") for f in files
+        ]
+        mock_duration.return_value = 1.0
+
+        mock_writer = MagicMock()
+        mock_writer.duration = 3.0
+        mock_writer.close.return_value = AudioPack(
+            path=tmp_path / "pack.wav",
+            entries=[
+                PackEntry(source=files[0], offset=0.0, duration=1.0),
+                PackEntry(source=files[1], offset=2.0, duration=1.0),
+            ],
+        )
+        mock_writer_cls.return_value = mock_writer
+
+        mock_transcriber = MagicMock()
+        mock_transcriber.transcribe_words.side_effect = RuntimeError("boom")
+        mock_transcriber_cls.return_value = mock_transcriber
+
+        runner = BatchRunner(PipelineConfig(), pack_short=10.0)
+        result = runner.run(files, tmp_path / "output")
+
+        assert result.failed == 2
+        assert result.succeeded == 0
+        mock_export.assert_not_called()
+        mock_pipeline_cls.return_value.run.assert_not_called()
+
+
+class TestBatchRunnerCommitter:
+    @patch("stt.core.batch.OutputCommitter")
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_shared_committer_committed_after_batch(
+        self,
+        mock_pipeline_cls: MagicMock,
+        mock_committer_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        files = [tmp_path / "a.mp3"]
+        files[0].write_bytes(b"\x00")
+        mock_pipeline_cls.return_value.run.side_effect = Exception("crash")
+
+        config = PipelineConfig(fsync="group", fsync_group_size=4)
+        BatchRunner(config).run(files, tmp_path / "output")
+
+        mock_committer_cls.assert_called_once_with("group", 4)
+        committer = mock_committer_cls.return_value
+        assert mock_pipeline_cls.call_args.kwargs["committer"] is committer
+        committer.commit.assert_called_once()
+
+
+class TestBatchRunnerParquetDataset:
+    @patch("stt.core.batch.ParquetDatasetWriter")
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_successful_results_appended_and_closed(
+        self,
+        mock_pipeline_cls: MagicMock,
+        mock_writer_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        files = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+        for f in files:
+            f.write_bytes(b"\x00")
+        ok = _make_result(str(files[0]))
+        mock_pipeline_cls.return_value.run.side_effect = [ok, Exception("crash")]
+
+        BatchRunner(PipelineConfig(), dataset_dir=tmp_path / "ds").run(
+            files, tmp_path / "output",
+        )
+
+        mock_writer_cls.assert_called_once_with(tmp_path / "ds")
+        writer = mock_writer_cls.return_value
+        writer.append.assert_called_once_with(ok)
+        writer.close.assert_called_once()
+
+
+    @patch("stt.core.batch.ParquetDatasetWriter")
+    @patch("stt.core.batch.dataset_sources")
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_skip_existing_uses_dataset_sources(
+        self,
+        mock_pipeline_cls: MagicMock,
+        mock_sources: MagicMock,
+        mock_writer_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        files = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+        for f in files:
+            f.write_bytes(b"\x00")
+        mock_sources.return_value = {str(files[0])}
+
+        result = BatchRunner(
+            PipelineConfig(formats=""), skip_existing=True, dataset_dir=tmp_path / "ds",
+        ).run(files, tmp_path / "output")
+
+        assert result.succeeded == 2
+        mock_sources.assert_called_once_with(tmp_path / "ds")
+        mock_pipeline_cls.return_value.run.assert_called_once()
+        assert mock_pipeline_cls.return_value.run.call_args.args[0] == str(files[1])
+
+
+class TestBatchRunnerJsonl:
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_results_streamed_and_flushed(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        files = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+        for f in files:
+            f.write_bytes(b"\x00")
+        ok = _make_result(str(files[0]))
+        mock_pipeline_cls.return_value.run.side_effect = [ok, Exception("crash")]
+        jsonl = MagicMock()
+        jsonl.completed = set()
+
+        BatchRunner(PipelineConfig(), jsonl=jsonl).run(files, tmp_path / "output")
+
+        jsonl.write.assert_called_once_with(ok)
+        jsonl.flush.assert_called_once()
+
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_skip_existing_uses_completed_sources(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        files = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+        for f in files:
+            f.write_bytes(b"\x00")
+        jsonl = MagicMock()
+        jsonl.completed = {str(files[0])}
+
+        result = BatchRunner(
+            PipelineConfig(formats=""), skip_existing=True, jsonl=jsonl,
+        ).run(files, tmp_path / "output")
+
+        assert result.succeeded == 2
+        mock_pipeline_cls.return_value.run.assert_called_once()
+        assert mock_pipeline_cls.return_value.run.call_args.args[0] == str(files[1])
@@ -0,0 +1,140 @@
+"""Tests for stt.exporters.binary_export."""
+
+from __future__ import annotations
+
+import struct
+from datetime import UTC, datetime
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exporters import export_transcript
+from stt.exporters.binary_export import (
+    FORMAT_VERSION,
+    MAGIC,
+    BinaryTranscript,
+    export_binary,
+    read_binary,
+)
+
+
+def _make_result(segments: list[Segment]) -> TranscriptResult:
+    metadata = TranscriptMetadata(
+        source_file="test.mp3",
+        duration_seconds=60.0,
+        diarization=True,
+        num_speakers=2,
+        created_at=datetime(2026, 2, 9, 12, 0, 0, tzinfo=UTC),
+    )
+    return TranscriptResult(metadata=metadata, segments=segments)
+
+
+def _write(tmp_path: Path, segments: list[Segment]) -> Path:
+    path = tmp_path / "test.sttb"
+    with path.open("wb") as f:
+        export_binary(_make_result(segments), f)
+    return path
+
+
+SEGMENTS = [
+    Segment(start=0.0, end=2.0, text="Привет", speaker="SPEAKER_00", confidence=0.9),
+    Segment(start=2.5, end=4.0, text="world", speaker=None, confidence=None),
+    Segment(start=4.0, end=9.0, text="", speaker="SPEAKER_01", confidence=0.5),
+    Segment(start=9.5, end=10.0, text="end", speaker="SPEAKER_00"),
+]
+
+
+class TestRoundTrip:
+    def test_segments_and_metadata(self, tmp_path: Path) -> None:
+        result = read_binary(_write(tmp_path, SEGMENTS))
+        assert result.segments == SEGMENTS
+        assert result.metadata == _make_result([]).metadata
+
+    def test_time_range_round_trips(self, tmp_path: Path) -> None:
+        result = _make_result(SEGMENTS)
+        result.metadata.time_range = (1800.0, 2700.0)
+        path = tmp_path / "range.sttb"
+        with path.open("wb") as f:
+            export_binary(result, f)
+        assert read_binary(path).metadata.time_range == (1800.0, 2700.0)
+
+    def test_empty_transcript(self, tmp_path: Path) -> None:
+        with BinaryTranscript(_write(tmp_path, [])) as t:
+            assert len(t) == 0
+            assert list(t) == []
+            assert list(t.between(0.0, 100.0)) == []
+
+    def test_header_versioned(self) -> None:
+        buf = BytesIO()
+        export_binary(_make_result(SEGMENTS), buf)
+        magic, version = struct.unpack_from("<4sH", buf.getvalue())
+        assert (magic, version) == (MAGIC, FORMAT_VERSION)
+
+    def test_dispatch_writes_sttb(self, tmp_path: Path) -> None:
+        export_transcript(_make_result(SEGMENTS), "sttb,json", output_dir=tmp_path)
+        assert read_binary(tmp_path / "test.sttb").segments == SEGMENTS
+
+
+class TestRandomAccess:
+    def test_index_and_slice(self, tmp_path: Path) -> None:
+        with BinaryTranscript(_write(tmp_path, SEGMENTS)) as t:
+            assert len(t) == 4
+            assert t[1] == SEGMENTS[1]
+            assert t[-1] == SEGMENTS[-1]
+            assert t[1:3] == SEGMENTS[1:3]
+            assert t.speakers == ("SPEAKER_00", "SPEAKER_01")
+            with pytest.raises(IndexError):
+                t[4]
+
+    def test_between_overlap(self, tmp_path: Path) -> None:
+        with BinaryTranscript(_write(tmp_path, SEGMENTS)) as t:
+            # The long segment starting at 4.0 overlaps 8.0-9.2.
+            assert list(t.between(8.0, 9.2)) == [SEGMENTS[2]]
+            assert list(t.between(1.0, 3.0)) == SEGMENTS[0:2]
+            assert list(t.between(20.0, 30.0)) == []
+
+    def test_between_unsorted_falls_back_to_scan(self, tmp_path: Path) -> None:
+        unsorted = [SEGMENTS[3], SEGMENTS[0], SEGMENTS[1]]
+        with BinaryTranscript(_write(tmp_path, unsorted)) as t:
+            assert list(t.between(0.0, 3.0)) == [SEGMENTS[0], SEGMENTS[1]]
+
+    def test_between_matches_linear_scan(self, tmp_path: Path) -> None:
+        segments = [
+            Segment(start=i * 0.7, end=i * 0.7 + (i % 5) * 0.9, text=str(i))
+            for i in range(500)
+        ]
+        with BinaryTranscript(_write(tmp_path, segments)) as t:
+            for lo, hi in [(0.0, 1.0), (33.3, 40.0), (349.0, 400.0), (12.0, 12.0)]:
+                expected = [
+                    s for s in segments
+                    if s.start < hi and (s.end > lo or s.start >= lo)
+                ]
+                assert list(t.between(lo, hi)) == expected
+
+
+class TestInvalidFiles:
+    def test_bad_magic(self, tmp_path: Path) -> None:
+        path = tmp_path / "x.sttb"
+        path.write_bytes(b"NOPE" + b"\0" * 100)
+        with pytest.raises(ValueError, match="bad magic"):
+            BinaryTranscript(path)
+
+    def test_newer_version_rejected(self, tmp_path: Path) -> None:
+        path = _write(tmp_path, SEGMENTS)
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<H", data, 4, FORMAT_VERSION + 1)
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="Unsupported"):
+            BinaryTranscript(path)
+
+    def test_empty_and_truncated(self, tmp_path: Path) -> None:
+        empty = tmp_path / "empty.sttb"
+        empty.write_bytes(b"")
+        with pytest.raises(ValueError):
+            BinaryTranscript(empty)
+        path = _write(tmp_path, SEGMENTS)
+        path.write_bytes(path.read_bytes()[:-3])
+        with pytest.raises(ValueError, match="Truncated"):
+            BinaryTranscript(path)
@@ -54,3 +54,14 @@ class TestTranscribeHelp:
         result = runner.invoke(app, ["transcribe", "--help"])
         assert result.exit_code == 0
         assert "--no-diarize" in result.output
+
+
+class TestCliWatch:
+    def test_help_shows_watch_command(self) -> None:
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        assert "watch" in result.output.lower()
+
+    def test_watch_nonexistent_dir_exits_3(self) -> None:
+        result = runner.invoke(app, ["watch", "/nonexistent/dir"])
+        assert result.exit_code == 3
@@ -68,3 +68,137 @@ class TestBatchEmptyDir:
         result = runner.invoke(app, ["batch", str(input_dir)])
         # Should warn and exit cleanly or with appropriate code
         assert "no audio" in result.output.lower() or result.exit_code == 0
+
+
+class TestBatchPackShort:
+    @patch("stt.cli.batch.BatchRunner")
+    @patch("stt.cli.batch.discover_audio_files")
+    def test_pack_short_passed_to_runner(
+        self,
+        mock_discover: MagicMock,
+        mock_runner_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        mock_discover.return_value = [input_dir / "a.wav"]
+
+        mock_batch_result = MagicMock()
+        mock_batch_result.exit_code = ExitCode.SUCCESS
+        mock_batch_result.errors = []
+        mock_runner_cls.return_value.run.return_value = mock_batch_result
+
+        result = runner.invoke(
+            app, ["batch", str(input_dir), "--pack-short", "15"],
+        )
+        assert result.exit_code == 0
+        assert mock_runner_cls.call_args.kwargs["pack_short"] == 15.0
+
+    def test_non_positive_pack_short_exits_2(self, tmp_path: Path) -> None:
+        result = runner.invoke(
+            app, ["batch", str(tmp_path), "--pack-short", "0"],
+        )
+        assert result.exit_code == ExitCode.ERROR_ARGS
+
+
+    @patch("stt.cli.batch.discover_audio_files")
+    def test_bad_worker_index_exits_2(
+        self, mock_discover: MagicMock, tmp_path: Path,
+    ) -> None:
+        mock_discover.return_value = [tmp_path / "a.wav"]
+        result = runner.invoke(
+            app, ["batch", str(tmp_path), "--workers", "2", "--worker-index", "2"],
+        )
+        assert result.exit_code == ExitCode.ERROR_ARGS
+        assert "worker_index" in result.output
+
+    @patch("stt.core.threads.detect_topology")
+    @patch("stt.cli.batch.discover_audio_files")
+    def test_pin_more_workers_than_cpus_exits_2(
+        self, mock_discover: MagicMock, mock_topology: MagicMock, tmp_path: Path,
+    ) -> None:
+        from stt.core.threads import CpuTopology
+
+        mock_discover.return_value = [tmp_path / "a.wav"]
+        mock_topology.return_value = CpuTopology((0, 1, 2, 3))
+        result = runner.invoke(app, [
+            "batch", str(tmp_path), "--workers", "8", "--worker-index", "5", "--pin-cpus",
+        ])
+        assert result.exit_code == ExitCode.ERROR_ARGS
+        assert "cannot pin" in result.output
+
+class TestBatchJsonl:
+    @patch("stt.cli.batch.BatchRunner")
+    @patch("stt.cli.batch.discover_audio_files")
+    def test_jsonl_replaces_per_file_outputs(
+        self,
+        mock_discover: MagicMock,
+        mock_runner_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        mock_discover.return_value = [input_dir / "a.wav"]
+        mock_batch_result = MagicMock()
+        mock_batch_result.exit_code = ExitCode.SUCCESS
+        mock_batch_result.errors = []
+        mock_runner_cls.return_value.run.return_value = mock_batch_result
+
+        out = tmp_path / "out.jsonl"
+        result = runner.invoke(app, ["batch", str(input_dir), "--jsonl", str(out)])
+
+        assert result.exit_code == 0
+        config = mock_runner_cls.call_args.args[0]
+        assert config.formats == ""
+        assert mock_runner_cls.call_args.kwargs["jsonl"] is not None
+        assert out.exists()
+
+    @patch("stt.cli.batch.BatchRunner")
+    @patch("stt.cli.batch.discover_audio_files")
+    def test_explicit_format_kept_with_jsonl(
+        self,
+        mock_discover: MagicMock,
+        mock_runner_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        mock_discover.return_value = [input_dir / "a.wav"]
+        mock_batch_result = MagicMock()
+        mock_batch_result.exit_code = ExitCode.SUCCESS
+        mock_batch_result.errors = []
+        mock_runner_cls.return_value.run.return_value = mock_batch_result
+
+        result = runner.invoke(
+            app, ["batch", str(input_dir), "--jsonl", "-", "--format", "srt"],
+        )
+
+        assert result.exit_code == 0
+        assert mock_runner_cls.call_args.args[0].formats == "srt"
+
+
+class TestBatchParquetDataset:
+    @patch("stt.cli.batch.BatchRunner")
+    @patch("stt.cli.batch.discover_audio_files")
+    def test_parquet_dataset_replaces_per_file_outputs(
+        self,
+        mock_discover: MagicMock,
+        mock_runner_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        mock_discover.return_value = [input_dir / "a.wav"]
+        mock_batch_result = MagicMock()
+        mock_batch_result.exit_code = ExitCode.SUCCESS
+        mock_batch_result.errors = []
+        mock_runner_cls.return_value.run.return_value = mock_batch_result
+
+        dataset = tmp_path / "ds"
+        result = runner.invoke(
+            app, ["batch", str(input_dir), "--parquet-dataset", str(dataset)],
+        )
+
+        assert result.exit_code == 0
+        assert mock_runner_cls.call_args.args[0].formats == ""
+        assert mock_runner_cls.call_args.kwargs["dataset_dir"] == dataset
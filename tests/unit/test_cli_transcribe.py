@@ -5,9 +5,11 @@ from __future__ import annotations
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
 from typer.testing import CliRunner
 
 from stt.cli.app import app
+from stt.cli.transcribe import parse_time
 from stt.exit_codes import ExitCode
 
 runner = CliRunner()
@@ -199,3 +201,62 @@ class TestTranscribeNoDiarize:
         # Verify pipeline was created with diarization disabled
         config = mock_pipeline_cls.call_args[0][0]
         assert config.diarization_enabled is False
+
+
+class TestTranscribeTimeRange:
+    @pytest.mark.parametrize(
+        ("value", "seconds"),
+        [("90", 90.0), ("1:30", 90.0), ("0:30:00", 1800.0), ("1.5", 1.5)],
+    )
+    def test_parse_time(self, value: str, seconds: float) -> None:
+        assert parse_time(value) == seconds
+
+    @pytest.mark.parametrize("value", ["", "1::2", "a", "1:2:3:4", "-5"])
+    def test_parse_time_invalid(self, value: str) -> None:
+        with pytest.raises(ValueError):
+            parse_time(value)
+
+    @patch("stt.cli.transcribe.TranscriptionPipeline")
+    def test_range_passed_to_pipeline(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        audio = tmp_path / "test.wav"
+        audio.write_bytes(b"\x00" * 100)
+        result = runner.invoke(
+            app,
+            ["transcribe", str(audio), "--no-diarize", "--start", "30:00", "--end", "45:00"],
+        )
+        assert result.exit_code == 0
+        assert mock_pipeline_cls.return_value.run.call_args.kwargs == {
+            "start": 1800.0, "end": 2700.0,
+        }
+
+    def test_end_before_start_exits_2(self, tmp_path: Path) -> None:
+        audio = tmp_path / "test.wav"
+        audio.write_bytes(b"\x00" * 100)
+        result = runner.invoke(
+            app, ["transcribe", str(audio), "--start", "60", "--end", "30"],
+        )
+        assert result.exit_code == ExitCode.ERROR_ARGS
+
+
+class TestTranscribeIncremental:
+    @patch("stt.cli.transcribe.run_incremental")
+    @patch("stt.cli.transcribe.TranscriptionPipeline")
+    def test_incremental_uses_checkpointed_run(
+        self, mock_pipeline_cls: MagicMock, mock_incremental: MagicMock, tmp_path: Path,
+    ) -> None:
+        audio = tmp_path / "test.wav"
+        audio.write_bytes(b"\x00" * 100)
+        result = runner.invoke(app, ["transcribe", str(audio), "--incremental"])
+        assert result.exit_code == 0
+        mock_incremental.assert_called_once_with(mock_pipeline_cls.return_value, str(audio))
+        mock_pipeline_cls.return_value.run.assert_not_called()
+
+    def test_incremental_with_range_exits_2(self, tmp_path: Path) -> None:
+        audio = tmp_path / "test.wav"
+        audio.write_bytes(b"\x00" * 100)
+        result = runner.invoke(
+            app, ["transcribe", str(audio), "--incremental", "--start", "60"],
+        )
+        assert result.exit_code == ExitCode.ERROR_ARGS
@@ -0,0 +1,76 @@
+"""Tests for the stt tune command."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import yaml
+from typer.testing import CliRunner
+
+from stt.cli.app import app
+from stt.core.tuning import TrialResult, TrialSpec
+from stt.exit_codes import ExitCode
+
+runner = CliRunner()
+
+
+def _results(*_: object, **__: object) -> list[TrialResult]:
+    return [
+        TrialResult(TrialSpec("int8", False, 1), rtf=0.4),
+        TrialResult(TrialSpec("int8", True, 4, cpu_threads=2), rtf=0.2),
+    ]
+
+
+class TestTune:
+    @patch("stt.cli.tune.run_sweep", side_effect=_results)
+    def test_writes_profile_offline(
+        self, mock_sweep: MagicMock, tmp_path: Path,
+    ) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("language: en\n")
+        result = runner.invoke(app, [
+            "tune", "--device", "cpu", "--seconds", "1",
+            "--threads", "2", "--config", str(config_file),
+        ])
+        assert result.exit_code == 0, result.output
+
+        base = mock_sweep.call_args.args[0]
+        assert base.local_files_only is True
+        assert base.vad_filter is False
+        assert base.language == "en"
+        data = yaml.safe_load(config_file.read_text())
+        assert data["language"] == "en"
+        assert data["compute_type"] == "int8"
+        assert data["whisper"] == {"use_batched": True, "batch_size": 4, "cpu_threads": 2}
+
+    @patch("stt.cli.tune.run_sweep", side_effect=_results)
+    def test_dry_run_writes_nothing(
+        self, mock_sweep: MagicMock, tmp_path: Path,
+    ) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("language: en\n")
+        result = runner.invoke(app, [
+            "tune", "--device", "cpu", "--seconds", "1",
+            "--config", str(config_file), "--dry-run",
+        ])
+        assert result.exit_code == 0
+        assert config_file.read_text() == "language: en\n"
+        # stdout is the config file a real run would write.
+        assert yaml.safe_load(result.stdout) == {
+            "language": "en", "device": "cpu", "compute_type": "int8",
+            "whisper": {"use_batched": True, "batch_size": 4, "cpu_threads": 2},
+        }
+
+    @patch("stt.cli.tune.run_sweep")
+    def test_all_trials_failed(self, mock_sweep: MagicMock, tmp_path: Path) -> None:
+        mock_sweep.return_value = [TrialResult(TrialSpec("int8", False, 1), error="x")]
+        result = runner.invoke(app, [
+            "tune", "--device", "cpu", "--seconds", "1",
+            "--config", str(tmp_path / "c.yaml"),
+        ])
+        assert result.exit_code == ExitCode.ERROR_MODEL
+
+    def test_invalid_batch_sizes(self) -> None:
+        result = runner.invoke(app, ["tune", "--batch-sizes", "4,x"])
+        assert result.exit_code == ExitCode.ERROR_ARGS
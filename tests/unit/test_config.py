@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -385,3 +386,108 @@ class TestSttConfigBatchParams:
         cfg = SttConfig(use_batched=True)
         pc = build_pipeline_config(cfg)
         assert pc.use_batched is True
+
+
+class TestSttConfigCompactJson:
+    def test_default_compact_json_false(self) -> None:
+        assert SttConfig().compact_json is False
+
+    def test_compact_json_from_yaml(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("compact_json: true\n")
+        cfg = load_config(config_file)
+        assert cfg.compact_json is True
+        assert build_pipeline_config(cfg).compact_json is True
+
+
+class TestSttConfigOomLadder:
+    def test_default_uses_pipeline_ladder(self) -> None:
+        from stt.core.oom import OOM_RUNGS
+
+        assert SttConfig().oom_ladder is None
+        assert build_pipeline_config(SttConfig()).oom_ladder == OOM_RUNGS
+
+    def test_ladder_from_yaml(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("oom_ladder: [cleanup, cpu]\noom_chunk_seconds: 60\n")
+        cfg = load_config(config_file)
+        pc = build_pipeline_config(cfg)
+        assert pc.oom_ladder == ("cleanup", "cpu")
+        assert pc.oom_chunk_seconds == 60
+
+    def test_empty_ladder_disables(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("oom_ladder: []\n")
+        assert build_pipeline_config(load_config(config_file)).oom_ladder == ()
+
+
+class TestSttConfigAutoBatchSize:
+    def test_batch_size_auto_from_yaml(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("whisper:\n  batch_size: auto\n")
+        cfg = load_config(config_file)
+        assert cfg.auto_batch_size is True
+        assert cfg.batch_size == 8
+        assert build_pipeline_config(cfg).auto_batch_size is True
+
+
+class TestSttConfigThreads:
+    def test_threads_section_from_yaml(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "threads:\n  budget: 8\n  diarizer: 2\n  workers: 2\n"
+            "  worker_index: 1\n  pin: true\n",
+        )
+        cfg = load_config(config_file)
+        assert cfg.cpu_budget == 8
+        assert cfg.diarizer_threads == 2
+        assert (cfg.workers, cfg.worker_index, cfg.pin_cpus) == (2, 1, True)
+        assert build_pipeline_config(cfg).diarizer_threads == 2
+
+    def test_apply_thread_budget_resolves_threads(self) -> None:
+        from stt.config import apply_thread_budget
+        from stt.core.threads import CpuTopology
+
+        cfg = SttConfig(workers=2, worker_index=1, cpu_threads=3)
+        with (
+            patch("stt.core.threads.detect_topology", return_value=CpuTopology(tuple(range(8)))),
+            patch("stt.core.threads.apply_thread_plan") as apply,
+        ):
+            resolved = apply_thread_budget(cfg)
+        assert resolved.cpu_threads == 3
+        assert resolved.diarizer_threads == 4
+        assert apply.call_args.args[0].cpus is None
+
+    def test_apply_thread_budget_rejects_bad_index(self) -> None:
+        from stt.config import apply_thread_budget
+
+        with pytest.raises(ValueError, match="worker_index"):
+            apply_thread_budget(SttConfig(workers=2, worker_index=5))
+
+
+class TestSttConfigOffline:
+    def test_offline_from_yaml(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("offline: true\n")
+        assert build_pipeline_config(load_config(config_file)).offline is True
+
+    def test_offline_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("STT_OFFLINE", "1")
+        assert load_config(Path("/nonexistent.yaml")).offline is True
+
+
+class TestSttConfigSpeakers:
+    def test_speakers_section(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "speakers:\n  index: /srv/speakers\n  threshold: 0.7\n  export_embeddings: true\n"
+        )
+        config = build_pipeline_config(load_config(config_file))
+        assert config.speaker_index == "/srv/speakers"
+        assert config.speaker_threshold == 0.7
+        assert config.export_speaker_embeddings is True
+
+    def test_defaults(self) -> None:
+        config = build_pipeline_config(load_config(Path("/nonexistent.yaml")))
+        assert config.speaker_index is None
+        assert config.export_speaker_embeddings is False
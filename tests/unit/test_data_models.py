@@ -4,7 +4,7 @@ from datetime import UTC, datetime
 
 import pytest
 
-from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.data_models import Segment, SegmentTable, TranscriptMetadata, TranscriptResult
 
 
 class TestSegment:
@@ -128,3 +128,68 @@ class TestTranscriptResult:
         segments = [Segment(start=0.0, end=1.0, text="Only one")]
         result = TranscriptResult(metadata=meta, segments=segments)
         assert result.full_text == "Only one"
+
+
+class TestSlots:
+    def test_segment_has_no_instance_dict(self) -> None:
+        seg = Segment(start=0.0, end=1.0, text="hi")
+        assert not hasattr(seg, "__dict__")
+        with pytest.raises(AttributeError):
+            seg.extra = 1  # type: ignore[attr-defined]
+
+
+class TestSegmentTable:
+    SEGMENTS = [
+        Segment(start=0.0, end=1.0, text="a", speaker="SPEAKER_00", confidence=0.9),
+        Segment(start=1.0, end=2.0, text="b"),
+        Segment(start=2.0, end=3.0, text="c", speaker="SPEAKER_01"),
+        Segment(start=3.0, end=4.0, text="d", speaker="SPEAKER_00", confidence=0.1),
+    ]
+
+    def test_round_trip_and_list_view(self) -> None:
+        table = SegmentTable.from_segments(self.SEGMENTS)
+        assert len(table) == 4
+        assert table == self.SEGMENTS
+        assert self.SEGMENTS == table
+        assert table.to_list() == self.SEGMENTS
+        assert table[-1] == self.SEGMENTS[-1]
+        assert table[1:3] == self.SEGMENTS[1:3]
+        assert [s.text for s in table] == ["a", "b", "c", "d"]
+        with pytest.raises(IndexError):
+            table[4]
+
+    def test_speakers_interned(self) -> None:
+        table = SegmentTable.from_segments(self.SEGMENTS)
+        assert table.speakers == ["SPEAKER_00", "SPEAKER_01"]
+        assert list(table.speaker_ids) == [0, -1, 1, 0]
+        assert table.speaker(1) is None
+
+    def test_with_speakers_shares_columns(self) -> None:
+        table = SegmentTable.from_segments(self.SEGMENTS)
+        relabeled = table.with_speakers(["X", "Y", "X", None])
+        assert relabeled.starts is table.starts
+        assert relabeled.texts is table.texts
+        assert [s.speaker for s in relabeled] == ["X", "Y", "X", None]
+        assert [s.speaker for s in table] == [s.speaker for s in self.SEGMENTS]
+        with pytest.raises(ValueError):
+            table.with_speakers(["X"])
+
+    def test_shifted_moves_times_only(self) -> None:
+        table = SegmentTable.from_segments(self.SEGMENTS)
+        moved = table.shifted(60.0)
+        assert list(moved.starts) == [s.start + 60.0 for s in self.SEGMENTS]
+        assert list(moved.ends) == [s.end + 60.0 for s in self.SEGMENTS]
+        assert moved.texts is table.texts
+        assert [s.speaker for s in moved] == [s.speaker for s in self.SEGMENTS]
+        assert table == self.SEGMENTS
+
+    def test_append_validates_order(self) -> None:
+        with pytest.raises(ValueError):
+            SegmentTable().append(5.0, 3.0, "bad")
+
+    def test_usable_as_result_segments(self) -> None:
+        metadata = TranscriptMetadata(source_file="a.mp3", duration_seconds=4.0)
+        result = TranscriptResult(
+            metadata=metadata, segments=SegmentTable.from_segments(self.SEGMENTS),
+        )
+        assert result.full_text == "a b c d"
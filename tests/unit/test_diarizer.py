@@ -86,6 +86,25 @@ class TestPyannoteDiarizerDiarize:
         assert len(result.turns) == 2
         assert result.num_speakers == 2
 
+    @patch("stt.core.diarizer.Pipeline")
+    def test_speaker_embeddings_by_label(self, mock_pipeline_cls: MagicMock) -> None:
+        mock_annotation = MagicMock()
+        mock_annotation.itertracks.return_value = []
+        mock_annotation.labels.return_value = ["SPEAKER_00", "SPEAKER_01"]
+        mock_pipeline = MagicMock()
+        mock_pipeline.return_value = MagicMock(
+            speaker_diarization=mock_annotation,
+            # The second speaker was too short to embed.
+            speaker_embeddings=[[0.5, 1.0], [float("nan"), float("nan")]],
+        )
+        mock_pipeline_cls.from_pretrained.return_value = mock_pipeline
+
+        d = PyannoteDiarizer(DiarizerConfig())
+        d.load_model()
+        result = d.diarize("/fake/audio.wav")
+
+        assert result.embeddings == {"SPEAKER_00": [0.5, 1.0]}
+
     @patch("stt.core.diarizer.Pipeline")
     def test_passes_num_speakers(self, mock_pipeline_cls: MagicMock) -> None:
         mock_annotation = MagicMock()
@@ -197,6 +216,15 @@ class TestPyannoteDiarizerErrors:
         with pytest.raises(ModelError):
             d.load_model()
 
+    @patch("stt.core.diarizer.Pipeline")
+    def test_no_pipeline_raises_model_error(self, mock_pipeline_cls: MagicMock) -> None:
+        mock_pipeline_cls.from_pretrained.return_value = None
+
+        d = PyannoteDiarizer(DiarizerConfig(device="cpu"))
+        with pytest.raises(ModelError, match="not available") as exc_info:
+            d.load_model()
+        assert exc_info.value.__cause__ is None
+
 
 class TestPyannoteDiarizerLifecycle:
     @patch("stt.core.diarizer.cleanup_gpu_memory")
@@ -246,3 +274,33 @@ class TestPyannoteDiarizerCleanup:
         d.load_model()
         d.unload_model()
         mock_cleanup.assert_called_once_with("diarizer_unload")
+
+
+class TestPyannoteDiarizerOomSettings:
+    @patch("stt.core.diarizer.Pipeline")
+    def test_batch_sizes_and_device_applied(
+        self, mock_pipeline_cls: MagicMock,
+    ) -> None:
+        pipeline = MagicMock()
+        mock_pipeline_cls.from_pretrained.return_value = pipeline
+
+        config = DiarizerConfig(
+            device="cpu", embedding_batch_size=8, segmentation_batch_size=4,
+        )
+        PyannoteDiarizer(config).load_model()
+
+        assert pipeline.embedding_batch_size == 8
+        assert pipeline.segmentation_batch_size == 4
+        pipeline.to.assert_called_once()
+        assert str(pipeline.to.call_args.args[0]) == "cpu"
+
+    @patch("stt.core.diarizer.Pipeline")
+    def test_defaults_leave_pipeline_untouched(
+        self, mock_pipeline_cls: MagicMock,
+    ) -> None:
+        pipeline = MagicMock()
+        mock_pipeline_cls.from_pretrained.return_value = pipeline
+
+        PyannoteDiarizer(DiarizerConfig()).load_model()
+
+        pipeline.to.assert_not_called()
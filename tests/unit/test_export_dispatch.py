@@ -4,11 +4,13 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
 from stt.exporters import export_transcript
+from stt.exporters.atomic import OutputCommitter
 
 
 def _make_result(source_file: str = "test.mp3") -> TranscriptResult:
@@ -61,3 +63,66 @@ class TestExportInvalidFormat:
         result = _make_result()
         with pytest.raises(ValueError):
             export_transcript(result, formats="xml")
+
+
+class TestExportCompactJson:
+    def test_compact_json_file(self, tmp_path: Path) -> None:
+        result = _make_result()
+        export_transcript(result, formats="json", output_dir=tmp_path, compact_json=True)
+        assert "\n" not in (tmp_path / "test.json").read_text()
+
+    def test_default_json_indented(self) -> None:
+        output = export_transcript(_make_result(), formats="json")
+        assert output is not None
+        assert output.startswith("{\n  ")
+
+
+class TestExportConcurrent:
+    def test_concurrent_matches_sequential(self, tmp_path: Path) -> None:
+        result = _make_result()
+        seq_dir = tmp_path / "seq"
+        con_dir = tmp_path / "con"
+        export_transcript(result, formats="json,txt,srt", output_dir=seq_dir)
+        export_transcript(
+            result, formats="json,txt,srt", output_dir=con_dir, concurrent=True,
+        )
+        for fmt in ("json", "txt", "srt"):
+            assert (seq_dir / f"test.{fmt}").read_text() == (
+                con_dir / f"test.{fmt}"
+            ).read_text()
+
+
+class TestExportAtomic:
+    def test_failed_render_leaves_no_partial_files(self, tmp_path: Path) -> None:
+        result = _make_result()
+        with patch(
+            "stt.exporters.srt_export.SrtSink.write_rows",
+            side_effect=OSError("disk full"),
+        ):
+            with pytest.raises(OSError):
+                export_transcript(result, formats="json,srt", output_dir=tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_group_committer_defers_visibility(self, tmp_path: Path) -> None:
+        committer = OutputCommitter("group", group_size=100)
+        export_transcript(
+            _make_result(), formats="json,txt", output_dir=tmp_path,
+            committer=committer,
+        )
+        assert not (tmp_path / "test.json").exists()
+        committer.commit()
+        assert (tmp_path / "test.json").exists()
+        assert (tmp_path / "test.txt").exists()
+
+
+class TestExportVtt:
+    def test_vtt_registered(self, tmp_path: Path) -> None:
+        export_transcript(_make_result(), formats="srt,vtt", output_dir=tmp_path)
+        assert (tmp_path / "test.vtt").read_text().startswith("WEBVTT\n")
+
+
+class TestExportNoFormats:
+    def test_empty_formats_write_nothing(self, tmp_path: Path) -> None:
+        out = tmp_path / "out"
+        assert export_transcript(_make_result(), formats="", output_dir=out) is None
+        assert not out.exists()
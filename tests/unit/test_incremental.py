@@ -0,0 +1,254 @@
+"""Tests for stt.core.incremental."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.core.diarizer import DiarizationResult, DiarizationTurn
+from stt.core.incremental import (
+    Checkpoint,
+    checkpoint_path,
+    load_checkpoint,
+    match_speakers,
+    run_incremental,
+    save_checkpoint,
+)
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.speaker_index import SpeakerIndex
+from stt.data_models import Segment, SegmentTable, TranscriptMetadata, TranscriptResult
+
+
+class StubPipeline:
+    """Returns canned windows and records what run_incremental asks for."""
+
+    def __init__(self, output_dir: Path, windows: list[TranscriptResult]) -> None:
+        self.config = PipelineConfig(output_dir=str(output_dir), model_size="small")
+        self.windows = windows
+        self.calls: list[dict[str, Any]] = []
+        self.exported: list[TranscriptResult] = []
+
+    def process(self, audio_path: str, **kwargs: Any) -> TranscriptResult:
+        self.calls.append(kwargs)
+        return self.windows.pop(0)
+
+    def export(self, result: TranscriptResult, output_dir: str | None = None) -> None:
+        self.exported.append(result)
+
+
+def _window(
+    start: float, end: float, segments: list[Segment],
+    embeddings: dict[str, list[float]] | None = None,
+) -> TranscriptResult:
+    return TranscriptResult(
+        metadata=TranscriptMetadata(
+            source_file="rec.wav", duration_seconds=end, model="small",
+            time_range=(start, end),
+        ),
+        segments=SegmentTable.from_segments(segments),
+        speaker_embeddings=embeddings or {},
+    )
+
+
+@pytest.fixture()
+def recording(tmp_path: Path) -> Path:
+    path = tmp_path / "rec.wav"
+    path.write_bytes(b"\x00" * 1000)
+    return path
+
+
+class TestMatchSpeakers:
+    def test_maps_by_similarity(self) -> None:
+        known = {"SPEAKER_00": [1.0, 0.0], "SPEAKER_01": [0.0, 1.0]}
+        window = {"SPEAKER_00": [0.1, 0.9], "SPEAKER_01": [0.9, 0.1]}
+        assert match_speakers(window, known) == {
+            "SPEAKER_00": "SPEAKER_01", "SPEAKER_01": "SPEAKER_00",
+        }
+
+    def test_unmatched_get_fresh_labels(self) -> None:
+        known = {"SPEAKER_00": [1.0, 0.0]}
+        window = {"SPEAKER_00": [0.0, 1.0], "SPEAKER_01": [1.0, 0.1]}
+        mapping = match_speakers(window, known, labels={"SPEAKER_01"})
+        assert mapping == {"SPEAKER_01": "SPEAKER_00", "SPEAKER_00": "SPEAKER_02"}
+
+    def test_known_speaker_used_once(self) -> None:
+        known = {"SPEAKER_00": [1.0, 0.0]}
+        window = {"SPEAKER_00": [1.0, 0.0], "SPEAKER_01": [0.99, 0.01]}
+        mapping = match_speakers(window, known)
+        assert sorted(mapping.values()) == ["SPEAKER_00", "SPEAKER_01"]
+
+    def test_enrolled_names_kept(self) -> None:
+        window = {"Alice": [1.0, 0.0], "SPEAKER_01": [0.0, 1.0]}
+        assert match_speakers(window, {}) == {"Alice": "Alice", "SPEAKER_01": "SPEAKER_00"}
+        # A known centroid named Alice is not handed to another speaker.
+        known = {"Alice": [0.0, 1.0]}
+        assert match_speakers(window, known) == {"Alice": "Alice", "SPEAKER_01": "SPEAKER_00"}
+
+
+class TestCheckpointStore:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        path = tmp_path / "rec.checkpoint.json"
+        checkpoint = Checkpoint(
+            source_file="rec.wav", model="small", language="ru",
+            committed_until=5.0, segments=[Segment(0.0, 5.0, "a", "SPEAKER_00", 0.9)],
+            prompt="a", speakers={"SPEAKER_00": [1.0]}, speaker_weights={"SPEAKER_00": 1},
+        )
+        save_checkpoint(path, checkpoint)
+        assert load_checkpoint(path) == checkpoint
+
+    def test_malformed_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "rec.checkpoint.json"
+        path.write_text('{"version": 1, "bogus": true}')
+        assert load_checkpoint(path) is None
+        path.write_text("not json")
+        assert load_checkpoint(path) is None
+
+
+class TestRunIncremental:
+    def test_first_run_commits_all_but_tail(self, tmp_path: Path, recording: Path) -> None:
+        pipeline = StubPipeline(tmp_path, [_window(0.0, 30.0, [
+            Segment(0.0, 10.0, "one", "SPEAKER_00"),
+            Segment(10.0, 20.0, "two", "SPEAKER_00"),
+            Segment(20.0, 29.5, "tail", "SPEAKER_00"),
+        ], {"SPEAKER_00": [1.0, 0.0]})])
+
+        result = run_incremental(pipeline, str(recording))  # type: ignore[arg-type]
+
+        assert pipeline.calls == [{"start": 0.0, "initial_prompt": None}]
+        assert [s.text for s in result.segments] == ["one", "two", "tail"]
+        checkpoint = load_checkpoint(checkpoint_path(tmp_path, recording))
+        assert checkpoint is not None
+        assert checkpoint.committed_until == 20.0
+        assert [s.text for s in checkpoint.segments] == ["one", "two"]
+        assert checkpoint.prompt == "one two"
+        assert pipeline.exported == [result]
+
+    def test_next_run_transcribes_only_new_audio(
+        self, tmp_path: Path, recording: Path,
+    ) -> None:
+        pipeline = StubPipeline(tmp_path, [
+            _window(0.0, 30.0, [
+                Segment(0.0, 10.0, "one", "SPEAKER_00"),
+                Segment(10.0, 20.0, "two", "SPEAKER_01"),
+            ], {"SPEAKER_00": [1.0, 0.0], "SPEAKER_01": [0.0, 1.0]}),
+            # Window-local labels are swapped relative to the first run.
+            _window(15.0, 60.0, [
+                Segment(15.0, 20.0, "two again", "SPEAKER_00"),
+                Segment(20.0, 40.0, "three", "SPEAKER_00"),
+                Segment(40.0, 50.0, "four", "SPEAKER_01"),
+            ], {"SPEAKER_00": [0.1, 1.0], "SPEAKER_01": [1.0, 0.1]}),
+        ])
+        run_incremental(pipeline, str(recording))  # type: ignore[arg-type]
+        result = run_incremental(pipeline, str(recording))  # type: ignore[arg-type]
+
+        assert pipeline.calls[1] == {"start": 15.0, "initial_prompt": "one two"}
+        assert [(s.text, s.speaker) for s in result.segments] == [
+            ("one", "SPEAKER_00"), ("two", "SPEAKER_01"),
+            ("three", "SPEAKER_01"), ("four", "SPEAKER_00"),
+        ]
+        assert result.metadata.duration_seconds == 60.0
+        assert result.metadata.time_range is None
+        checkpoint = load_checkpoint(checkpoint_path(tmp_path, recording))
+        assert checkpoint is not None
+        assert checkpoint.committed_until == 50.0
+        assert checkpoint.speaker_weights == {"SPEAKER_00": 2, "SPEAKER_01": 2}
+
+    def test_silence_is_not_decoded_again(self, tmp_path: Path, recording: Path) -> None:
+        pipeline = StubPipeline(tmp_path, [
+            _window(0.0, 30.0, []),
+            _window(23.0, 60.0, [Segment(50.0, 58.0, "late", "SPEAKER_00")]),
+            _window(48.0, 90.0, [Segment(50.0, 58.0, "late", "SPEAKER_00")]),
+        ])
+        for _ in range(3):
+            run_incremental(
+                pipeline, str(recording), overlap=2.0, tail_guard=5.0,  # type: ignore[arg-type]
+            )
+
+        # Silence up to the tail guard is settled; provisional speech is not.
+        assert [c["start"] for c in pipeline.calls] == [0.0, 25.0 - 2.0, 50.0 - 2.0]
+        checkpoint = load_checkpoint(checkpoint_path(tmp_path, recording))
+        assert checkpoint is not None
+        assert checkpoint.committed_until == 58.0
+        assert [s.text for s in checkpoint.segments] == ["late"]
+
+    def test_shrunk_file_starts_over(self, tmp_path: Path, recording: Path) -> None:
+        save_checkpoint(checkpoint_path(tmp_path, recording), Checkpoint(
+            source_file=str(recording), model="small", language="ru",
+            source_size=10_000, committed_until=100.0,
+            segments=[Segment(0.0, 100.0, "old")],
+        ))
+        pipeline = StubPipeline(tmp_path, [_window(0.0, 10.0, [Segment(0.0, 5.0, "new")])])
+        result = run_incremental(pipeline, str(recording))  # type: ignore[arg-type]
+        assert pipeline.calls[0]["start"] == 0.0
+        assert [s.text for s in result.segments] == ["new"]
+
+    def test_other_model_starts_over(self, tmp_path: Path, recording: Path) -> None:
+        save_checkpoint(checkpoint_path(tmp_path, recording), Checkpoint(
+            source_file=str(recording), model="large-v3", language="ru",
+            committed_until=100.0,
+        ))
+        pipeline = StubPipeline(tmp_path, [_window(0.0, 10.0, [])])
+        run_incremental(pipeline, str(recording))  # type: ignore[arg-type]
+        assert pipeline.calls[0]["start"] == 0.0
+
+    def test_negative_overlap_rejected(self, tmp_path: Path, recording: Path) -> None:
+        with pytest.raises(ValueError):
+            run_incremental(
+                StubPipeline(tmp_path, []), str(recording), overlap=-1.0,  # type: ignore[arg-type]
+            )
+
+
+class TestIncrementalSpeakerIndex:
+    @patch("stt.core.pipeline.wav_duration", return_value=30.0)
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.PyannoteDiarizer")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_enrolled_names_survive_windows(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_diarizer_cls: MagicMock,
+        mock_export: MagicMock,
+        mock_duration: MagicMock,
+        tmp_path: Path,
+        recording: Path,
+    ) -> None:
+        index = SpeakerIndex(tmp_path / "index")
+        index.add("alice", [1.0, 0.0, 0.0])
+        index.save()
+        alice, other = [0.9, 0.1, 0.0], [0.0, 0.0, 1.0]
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        # Window-relative times; the second window starts at 15 s.
+        mock_transcriber_cls.return_value.transcribe.side_effect = [
+            [Segment(0.0, 10.0, "hi"), Segment(10.0, 20.0, "hello")],
+            [Segment(6.0, 9.0, "me again"), Segment(10.0, 20.0, "you again")],
+        ]
+        mock_diarizer_cls.return_value.diarize.side_effect = [
+            DiarizationResult(
+                turns=[DiarizationTurn(0.0, 10.0, "SPEAKER_00"),
+                       DiarizationTurn(10.0, 20.0, "SPEAKER_01")],
+                num_speakers=2, embeddings={"SPEAKER_00": alice, "SPEAKER_01": other},
+            ),
+            DiarizationResult(
+                turns=[DiarizationTurn(6.0, 9.0, "SPEAKER_01"),
+                       DiarizationTurn(10.0, 20.0, "SPEAKER_00")],
+                num_speakers=2, embeddings={"SPEAKER_01": alice, "SPEAKER_00": other},
+            ),
+        ]
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            device="cpu", speaker_index=str(tmp_path / "index"), output_dir=str(tmp_path),
+        ))
+
+        run_incremental(pipeline, str(recording))
+        result = run_incremental(pipeline, str(recording))
+
+        assert [(s.text, s.speaker) for s in result.segments] == [
+            ("hi", "alice"), ("hello", "SPEAKER_00"),
+            ("me again", "alice"), ("you again", "SPEAKER_00"),
+        ]
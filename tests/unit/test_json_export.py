@@ -7,6 +7,8 @@ from datetime import datetime
 from io import StringIO
 from pathlib import Path
 
+import pytest
+
 from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
 from stt.exporters.json_export import export_json
 
@@ -54,6 +56,23 @@ class TestJsonExportStructure:
         assert "duration_seconds" in meta
         assert "model" in meta
         assert "created_at" in meta
+        assert "oom_recovery" not in meta
+
+    def test_oom_recovery_in_metadata(self) -> None:
+        result = _make_result()
+        result.metadata.oom_recovery = {"transcription": "cpu"}
+        output = StringIO()
+        export_json(result, output)
+        meta = json.loads(output.getvalue())["metadata"]
+        assert meta["oom_recovery"] == {"transcription": "cpu"}
+
+    def test_time_range_in_metadata(self) -> None:
+        result = _make_result()
+        result.metadata.time_range = (1800.0, 2700.0)
+        output = StringIO()
+        export_json(result, output)
+        meta = json.loads(output.getvalue())["metadata"]
+        assert meta["time_range"] == [1800.0, 2700.0]
 
     def test_segment_fields(self) -> None:
         result = _make_result()
@@ -109,3 +128,90 @@ class TestJsonExportFullText:
         export_json(result, output)
         data = json.loads(output.getvalue())
         assert data["full_text"] == "Hello World"
+
+
+class TestJsonExportStreaming:
+    def _legacy_dump(self, result: TranscriptResult) -> str:
+        buf = StringIO()
+        json.dump(
+            {
+                "metadata": json.loads(self._export(result))["metadata"],
+                "segments": [
+                    {
+                        k: v
+                        for k, v in (
+                            ("start", s.start), ("end", s.end), ("text", s.text),
+                            ("speaker", s.speaker), ("confidence", s.confidence),
+                        )
+                        if v is not None
+                    }
+                    for s in result.segments
+                ],
+                "full_text": result.full_text,
+            },
+            buf, indent=2, ensure_ascii=False,
+        )
+        return buf.getvalue()
+
+    def _export(self, result: TranscriptResult, **kwargs: object) -> str:
+        buf = StringIO()
+        export_json(result, buf, **kwargs)  # type: ignore[arg-type]
+        return buf.getvalue()
+
+    def test_layout_matches_json_dump_indent_2(self) -> None:
+        segments = [
+            Segment(start=float(i), end=i + 0.5, text=f'Привет "{i}"\n',
+                    speaker="SPEAKER_00" if i % 2 else None)
+            for i in range(3000)
+        ]
+        result = _make_result(segments=segments)
+        assert self._export(result, use_orjson=False) == self._legacy_dump(result)
+
+    def test_empty_segments_layout(self) -> None:
+        result = _make_result(segments=[])
+        out = self._export(result, use_orjson=False)
+        assert out == self._legacy_dump(result)
+        assert json.loads(out)["full_text"] == ""
+
+    def test_compact_has_no_whitespace_layout(self) -> None:
+        result = _make_result()
+        out = self._export(result, compact=True, use_orjson=False)
+        assert "\n" not in out
+        assert json.loads(out) == json.loads(self._export(result, use_orjson=False))
+
+
+try:
+    import orjson  # noqa: F401
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
+@pytest.mark.skipif(not _HAS_ORJSON, reason="orjson not installed")
+class TestJsonExportOrjson:
+    def test_orjson_matches_stdlib(self) -> None:
+        result = _make_result()
+        for compact in (False, True):
+            a = StringIO()
+            b = StringIO()
+            export_json(result, a, compact=compact, use_orjson=True)
+            export_json(result, b, compact=compact, use_orjson=False)
+            assert a.getvalue() == b.getvalue()
+
+    def test_nested_metadata_matches_stdlib(self) -> None:
+        result = _make_result()
+        result.metadata.time_range = (1.0, 2.0)
+        result.metadata.oom_recovery = {"transcription": "batch_size=4"}
+        result.metadata.memory_peaks = {
+            "decode": {"rss_bytes": 1}, "transcribe": {"rss_bytes": 2, "cuda_used_bytes": 3},
+        }
+        outputs = []
+        for use_orjson in (True, False):
+            buf = StringIO()
+            export_json(result, buf, use_orjson=use_orjson)
+            outputs.append(buf.getvalue())
+        assert outputs[0] == outputs[1]
+        meta = json.loads(outputs[1])["metadata"]
+        expected = json.dumps({"metadata": meta}, ensure_ascii=False, indent=2)[:-2]
+        assert outputs[1].startswith(expected)
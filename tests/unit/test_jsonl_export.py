@@ -0,0 +1,106 @@
+"""Tests for stt.exporters.jsonl_export."""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exporters.jsonl_export import JsonlWriter, completed_sources, open_jsonl
+
+
+def _make_result(source_file: str = "test.mp3") -> TranscriptResult:
+    metadata = TranscriptMetadata(
+        source_file=source_file,
+        duration_seconds=3.0,
+        created_at=datetime(2026, 2, 9, 12, 0, 0),
+    )
+    segments = [Segment(start=0.0, end=3.0, text="line\nbreak", speaker="SPEAKER_00")]
+    return TranscriptResult(metadata=metadata, segments=segments)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestJsonlWriter:
+    def test_one_compact_line_per_result(self) -> None:
+        out = StringIO()
+        writer = JsonlWriter(out)
+        writer.write(_make_result("a.mp3"))
+        writer.write(_make_result("b.mp3"))
+        writer.flush()
+
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 2
+        first = json.loads(lines[0])
+        assert first["metadata"]["source_file"] == "a.mp3"
+        assert first["segments"][0]["text"] == "line\nbreak"
+        assert writer.completed == {"a.mp3", "b.mp3"}
+        assert writer.lines == 2
+
+    def test_flushes_in_groups(self) -> None:
+        out = StringIO()
+        clock = _Clock()
+        writer = JsonlWriter(out, group_size=3, flush_interval=60.0, clock=clock)
+        writer.write(_make_result("a.mp3"))
+        writer.write(_make_result("b.mp3"))
+        assert out.getvalue() == ""
+        writer.write(_make_result("c.mp3"))
+        assert len(out.getvalue().splitlines()) == 3
+
+    def test_flushes_after_interval(self) -> None:
+        out = StringIO()
+        clock = _Clock()
+        writer = JsonlWriter(out, group_size=100, flush_interval=5.0, clock=clock)
+        writer.write(_make_result("a.mp3"))
+        assert out.getvalue() == ""
+        clock.now = 6.0
+        writer.write(_make_result("b.mp3"))
+        assert len(out.getvalue().splitlines()) == 2
+
+    def test_pending_line_flushed_without_next_write(self) -> None:
+        out = StringIO()
+        writer = JsonlWriter(out, group_size=100, flush_interval=0.05)
+        writer.write(_make_result("a.mp3"))
+        assert out.getvalue() == ""
+        # While the next file is still being transcribed.
+        deadline = time.monotonic() + 5.0
+        while not out.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(out.getvalue().splitlines()) == 1
+
+
+class TestJsonlFiles:
+    def test_open_truncates_partial_last_line(self, tmp_path: Path) -> None:
+        path = tmp_path / "out.jsonl"
+        path.write_text('{"metadata":{"source_file":"a.mp3"}}\n{"metadata":{"sou')
+        with open_jsonl(path) as f:
+            f.write("next\n")
+        assert path.read_text() == '{"metadata":{"source_file":"a.mp3"}}\nnext\n'
+
+    def test_open_partial_only_line(self, tmp_path: Path) -> None:
+        path = tmp_path / "sub" / "out.jsonl"
+        path.parent.mkdir()
+        path.write_text("partial")
+        open_jsonl(path).close()
+        assert path.read_text() == ""
+
+    def test_completed_sources_reads_metadata_only(self, tmp_path: Path) -> None:
+        path = tmp_path / "out.jsonl"
+        with open_jsonl(path) as f:
+            writer = JsonlWriter(f)
+            writer.write(_make_result("a.mp3"))
+            writer.write(_make_result("b.mp3"))
+            writer.flush()
+        with open(path, "a") as f:
+            f.write('{"metadata":{"source_file":"c.mp3"')  # crashed mid-line
+        assert completed_sources(path) == {"a.mp3", "b.mp3"}
+        assert completed_sources(tmp_path / "missing.jsonl") == set()
@@ -0,0 +1,299 @@
+"""Tests for stt.core.langid and the language-ID pre-pass."""
+
+from __future__ import annotations
+
+import os
+import wave
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from stt.core.batch import BatchRunner
+from stt.core.langid import (
+    Detection,
+    LanguageCache,
+    audio_hash,
+    identify_languages,
+    speech_sample,
+)
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.transcriber import Transcriber, TranscriberConfig
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exceptions import AudioPreprocessError
+
+
+def _files(tmp_path: Path, *names: str) -> list[Path]:
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(name.encode() * 10)
+        paths.append(path)
+    return paths
+
+
+def _silence_wav(path: Path, seconds: float) -> Path:
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x00\x00" * int(seconds * 16000))
+    return path
+
+
+class TestLanguageCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = LanguageCache(tmp_path / "cache.json")
+        cache.put_many({"small/abc": Detection("de", 0.91)})
+        assert cache.get_many(["small/abc", "small/other"]) == {
+            "small/abc": Detection("de", 0.91),
+        }
+
+    def test_unreadable_is_empty(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.json"
+        path.write_text("{oops")
+        assert LanguageCache(path).get_many(["x"]) == {}
+
+    def test_hash_follows_content(self, tmp_path: Path) -> None:
+        a, b = _files(tmp_path, "a.wav", "b.wav")
+        assert audio_hash(a) != audio_hash(b)
+        assert audio_hash(a) == audio_hash(a)
+
+    def test_hash_reads_head_only(self, tmp_path: Path) -> None:
+        path = tmp_path / "long.wav"
+        path.write_bytes(b"\x00" * (4 << 20))
+        before = audio_hash(path)
+        stat = path.stat()
+        with open(path, "r+b") as f:
+            f.seek(3 << 20)
+            f.write(b"\x01")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        # A change past the head with size and mtime kept is not seen ...
+        assert audio_hash(path) == before
+        # ... but a rewrite (new mtime) or a different size is.
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert audio_hash(path) != before
+
+
+class TestIdentifyLanguages:
+    def test_batches_and_caches(self, tmp_path: Path) -> None:
+        files = _files(tmp_path, "a.mp3", "b.mp3", "c.mp3")
+        detect = MagicMock(side_effect=lambda samples: [Detection("en", 0.9)] * len(samples))
+        sample = MagicMock(return_value=np.zeros(16000, dtype=np.float32))
+        cache = LanguageCache(tmp_path / "cache.json")
+
+        found = identify_languages(
+            files, detect, model="small", cache=cache, batch_size=2, sample=sample,
+        )
+        assert set(found) == set(files)
+        assert [len(c.args[0]) for c in detect.call_args_list] == [2, 1]
+
+        detect.reset_mock()
+        again = identify_languages(files, detect, model="small", cache=cache, sample=sample)
+        assert again == found
+        detect.assert_not_called()
+
+        # Another model does not reuse the detections.
+        identify_languages(files[:1], detect, model="large-v3", cache=cache, sample=sample)
+        detect.assert_called_once()
+
+    def test_unreadable_file_skipped(self, tmp_path: Path) -> None:
+        good, bad = _files(tmp_path, "good.mp3", "bad.mp3")
+
+        def sample(path: Path) -> np.ndarray:
+            if path == bad:
+                raise AudioPreprocessError("broken")
+            return np.zeros(10, dtype=np.float32)
+
+        found = identify_languages(
+            [good, bad, tmp_path / "missing.mp3"],
+            lambda samples: [Detection("ru", 0.8)] * len(samples),
+            model="small", sample=sample,
+        )
+        assert found == {good: Detection("ru", 0.8)}
+
+    def test_speech_sample_without_speech_uses_head(self, tmp_path: Path) -> None:
+        path = _silence_wav(tmp_path / "quiet.wav", 3.0)
+        sample = speech_sample(path, scan_seconds=2.0, sample_seconds=1.0)
+        assert len(sample) == 16000
+
+
+class TestTranscriberLanguage:
+    @patch("stt.core.transcriber.BatchedInferencePipeline")
+    @patch("stt.core.transcriber.WhisperModel")
+    def test_detect_languages_one_encoder_batch(
+        self, mock_whisper: MagicMock, _batched: MagicMock,
+    ) -> None:
+        model = mock_whisper.return_value
+        model.feature_extractor.side_effect = lambda audio: np.zeros((80, 100))
+        model.model.detect_language.return_value = [
+            [("<|de|>", 0.95), ("<|en|>", 0.03)],
+            [("<|ru|>", 0.7), ("<|uk|>", 0.2)],
+        ]
+        transcriber = Transcriber(TranscriberConfig(device="cpu", language="auto"))
+        transcriber.load_model()
+
+        detections = transcriber.detect_languages([np.zeros(100), np.zeros(200)])
+
+        assert detections == [Detection("de", 0.95), Detection("ru", 0.7)]
+        assert model.encode.call_args.args[0].shape == (2, 80, 3000)
+
+    @patch("stt.core.transcriber.BatchedInferencePipeline")
+    @patch("stt.core.transcriber.WhisperModel")
+    def test_auto_without_pre_pass_lets_whisper_detect(
+        self, mock_whisper: MagicMock, _batched: MagicMock,
+    ) -> None:
+        model = mock_whisper.return_value
+        model.transcribe.return_value = (iter([]), MagicMock())
+        transcriber = Transcriber(TranscriberConfig(device="cpu", language="auto"))
+        transcriber.load_model()
+        transcriber.transcribe("/fake.wav")
+        assert model.transcribe.call_args.kwargs["language"] is None
+
+
+def _identify_as(language: str) -> Callable[..., dict[Path, Detection]]:
+    """identify_languages stand-in that runs the model once per call."""
+    def identify(
+        todo: list[Path], detect: Callable[..., Any], **kwargs: Any,
+    ) -> dict[Path, Detection]:
+        detect([np.zeros(16, dtype=np.float32)])
+        return {path: Detection(language, 0.9) for path in todo}
+
+    return identify
+
+
+class TestPipelineLanguageId:
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.identify_languages")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_detected_language_fixed_for_decode(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_identify: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(0.0, 1.0, "hallo"),
+        ]
+        mock_identify.return_value = {Path("/a.mp3"): Detection("de", 0.9)}
+
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            language="auto", diarization_enabled=False, model_dir=str(tmp_path),
+        ))
+        result = pipeline.run("/a.mp3")
+        pipeline.run("/a.mp3")
+
+        decode_configs = [
+            c.args[0] for c in mock_transcriber_cls.call_args_list
+            if c.args[0].language != "auto"
+        ]
+        assert [c.language for c in decode_configs] == ["de", "de"]
+        assert result.metadata.language == "de"
+        mock_identify.assert_called_once()
+
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.identify_languages")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_detection_model_reused_for_decode(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_identify: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        transcriber = mock_transcriber_cls.return_value
+        transcriber.transcribe.return_value = [Segment(0.0, 1.0, "hallo")]
+
+        mock_identify.side_effect = _identify_as("de")
+
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            language="auto", diarization_enabled=False, model_dir=str(tmp_path),
+        ))
+        pipeline.run("/a.mp3")
+
+        mock_transcriber_cls.assert_called_once()
+        transcriber.load_model.assert_called_once()
+        transcriber.unload_model.assert_called_once()
+        assert transcriber.language == "de"
+        assert pipeline._handoff_transcriber is None
+
+    @patch("stt.core.pipeline.identify_languages")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_detection_model_unloaded_when_decode_fails(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_identify: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.side_effect = RuntimeError("ffmpeg failed")
+        mock_identify.side_effect = _identify_as("de")
+
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            language="auto", diarization_enabled=False, model_dir=str(tmp_path),
+        ))
+        with pytest.raises(RuntimeError):
+            pipeline.run("/a.mp3")
+
+        mock_transcriber_cls.return_value.unload_model.assert_called_once()
+        assert pipeline._handoff_transcriber is None
+
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.identify_languages")
+    def test_fixed_language_skips_pre_pass(
+        self, mock_identify: MagicMock, mock_transcriber_cls: MagicMock,
+    ) -> None:
+        pipeline = TranscriptionPipeline(PipelineConfig(language="ru"))
+        assert pipeline._language("/a.mp3") == "ru"
+        mock_identify.assert_not_called()
+
+
+class TestBatchLanguageGrouping:
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_files_grouped_by_language(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        files = _files(tmp_path, "a.mp3", "b.mp3", "c.mp3")
+        pipeline = mock_pipeline_cls.return_value
+        pipeline.detect_languages.return_value = {
+            str(files[0]): Detection("ru", 0.9),
+            str(files[1]): Detection("en", 0.9),
+            str(files[2]): Detection("ru", 0.9),
+        }
+        pipeline.run.side_effect = lambda path, **kw: TranscriptResult(
+            metadata=TranscriptMetadata(source_file=path, duration_seconds=1.0),
+            segments=[],
+        )
+
+        result = BatchRunner(PipelineConfig(language="auto")).run(files, tmp_path / "out")
+
+        assert result.succeeded == 3
+        assert [c.args[0] for c in pipeline.run.call_args_list] == [
+            str(files[1]), str(files[0]), str(files[2]),
+        ]
+
+    @pytest.mark.parametrize("language", ["ru", "en"])
+    @patch("stt.core.batch.TranscriptionPipeline")
+    def test_fixed_language_no_pre_pass(
+        self, mock_pipeline_cls: MagicMock, language: str, tmp_path: Path,
+    ) -> None:
+        files = _files(tmp_path, "a.mp3")
+        BatchRunner(PipelineConfig(language=language)).run(files, tmp_path / "out")
+        mock_pipeline_cls.return_value.detect_languages.assert_not_called()
@@ -0,0 +1,120 @@
+"""Tests for stt.core.memory.MemoryTimeline and the pipeline memory timeline."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from stt.core.memory import IDLE_STAGE, MemoryTimeline
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.data_models import Segment, TranscriptMetadata
+from stt.exporters.json_export import metadata_dict
+
+MB = 1024 * 1024
+
+
+class TestMemoryTimeline:
+    def test_peaks_tagged_by_stage(self) -> None:
+        with MemoryTimeline(interval=0.01) as timeline:
+            with timeline.stage("transcribe"):
+                block = bytearray(64 * MB)
+                block[::4096] = b"\x01" * len(block[::4096])
+            del block
+
+        peaks = timeline.stage_peaks()
+        assert set(peaks) == {IDLE_STAGE, "transcribe"}
+        assert peaks["transcribe"]["rss_bytes"] >= 64 * MB
+
+    def test_cpu_only_records_rss(self) -> None:
+        with MemoryTimeline(interval=0.01, cuda=False) as timeline:
+            with timeline.stage("decode"):
+                pass
+        columns = timeline.columns()
+        assert set(columns) == {"t", "stage", "rss_bytes"}
+        assert "decode" in columns["stage"]
+        assert len(columns["t"]) == len(columns["rss_bytes"]) >= 4
+        assert columns["t"] == sorted(columns["t"])
+
+    @patch("stt.core.memory.torch")
+    def test_cuda_measures(self, mock_torch: MagicMock) -> None:
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.cuda.memory_allocated.return_value = 100
+        mock_torch.cuda.memory_reserved.return_value = 200
+        mock_torch.cuda.mem_get_info.return_value = (700, 1000)
+
+        timeline = MemoryTimeline(interval=10.0, cuda=True)
+        with timeline, timeline.stage("diarize"):
+            pass
+
+        peaks = timeline.stage_peaks()["diarize"]
+        assert peaks["rss_bytes"] > 0
+        assert peaks["cuda_allocated_bytes"] == 100
+        assert peaks["cuda_reserved_bytes"] == 200
+        assert peaks["cuda_used_bytes"] == 300
+        assert timeline.peak_cuda_bytes == 300
+
+    def test_peaks_in_metadata_dict(self) -> None:
+        meta = TranscriptMetadata(
+            source_file="a.wav", duration_seconds=1.0,
+            memory_peaks={"transcribe": {"rss_bytes": 5}},
+        )
+        assert metadata_dict(meta)["memory_peaks"] == {"transcribe": {"rss_bytes": 5}}
+        assert "memory_peaks" not in metadata_dict(
+            TranscriptMetadata(source_file="a.wav", duration_seconds=1.0),
+        )
+
+
+class TestPipelineMemoryTimeline:
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_timeline_written_next_to_outputs(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(0.0, 1.0, "hi"),
+        ]
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            device="cpu", diarization_enabled=False,
+            output_dir=str(tmp_path), memory_interval=0.01,
+        ))
+        result = pipeline.run("/fake/call.wav")
+
+        assert {"decode", "transcribe", "load"} <= set(result.metadata.memory_peaks)
+        data = json.loads((tmp_path / "call.memory.json").read_text())
+        assert data["interval"] == 0.01
+        assert set(data["samples"]) == {"t", "stage", "rss_bytes"}
+        assert data["peaks"] == result.metadata.memory_peaks
+
+    @patch("stt.core.pipeline.MemoryTimeline")
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_disabled_by_default(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        mock_timeline_cls: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        mock_transcriber_cls.return_value.transcribe.return_value = []
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            diarization_enabled=False, output_dir=str(tmp_path),
+        ))
+        result = pipeline.run("/fake/call.wav")
+
+        mock_timeline_cls.assert_not_called()
+        assert result.metadata.memory_peaks == {}
+        assert not (tmp_path / "call.memory.json").exists()
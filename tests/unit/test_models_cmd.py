@@ -31,17 +31,14 @@ class TestModelsDownloadValid:
             model_dir="/tmp/test-models",
         )
 
-        with patch(
-            "faster_whisper.WhisperModel",
-        ) as mock_whisper:
+        with patch("stt.cli.models_cmd.install_whisper") as mock_install:
+            mock_install.return_value.path = "/tmp/test-models/snap"
             result = runner.invoke(
                 app, ["models", "download", "tiny"],
             )
 
         assert result.exit_code == 0
-        mock_whisper.assert_called_once()
-        call_kwargs = mock_whisper.call_args
-        assert call_kwargs[0][0] == "tiny"
+        mock_install.assert_called_once_with("tiny", "/tmp/test-models")
 
 
 class TestModelsDownloadModelDir:
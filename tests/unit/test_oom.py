@@ -0,0 +1,301 @@
+"""Tests for stt.core.oom — OOM degradation ladder."""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.core.diarizer import DiarizationResult, DiarizationTurn, DiarizerConfig
+from stt.core.oom import (
+    OOM_RUNGS,
+    diarization_attempts,
+    is_oom,
+    run_with_ladder,
+    transcribe_in_chunks,
+    transcription_attempts,
+    validate_ladder,
+)
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.transcriber import TranscriberConfig
+from stt.data_models import Segment
+from stt.exceptions import CudaOomError, TranscriptionError
+
+
+def _labels(attempts: list[tuple[str, object]]) -> list[str]:
+    return [label for label, _ in attempts]
+
+
+def _write_wav(path: Path, seconds: float, rate: int = 16000) -> None:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00" * int(seconds * rate))
+
+
+class StubTranscriber:
+    """Transcriber stand-in that runs out of memory for chosen configs."""
+
+    instances: list[StubTranscriber] = []
+    oom_when: staticmethod = staticmethod(lambda config: False)
+
+    def __init__(self, config: TranscriberConfig) -> None:
+        self.config = config
+        self.loaded = False
+        StubTranscriber.instances.append(self)
+
+    def load_model(self) -> None:
+        self.loaded = True
+
+    def unload_model(self) -> None:
+        self.loaded = False
+
+    def transcribe(self, audio_path: str) -> list[Segment]:
+        if StubTranscriber.oom_when(self.config):
+            raise CudaOomError("CUDA OOM during transcription")
+        return [Segment(start=0.0, end=2.0, text="ok")]
+
+
+class TestValidateLadder:
+    def test_all_rungs_valid(self) -> None:
+        assert validate_ladder(list(OOM_RUNGS)) == OOM_RUNGS
+
+    def test_unknown_rung(self) -> None:
+        with pytest.raises(ValueError, match="'smaller'"):
+            validate_ladder(["cleanup", "smaller"])
+
+    def test_pipeline_rejects_unknown_rung(self) -> None:
+        with pytest.raises(ValueError):
+            TranscriptionPipeline(PipelineConfig(oom_ladder=("nope",)))
+
+
+class TestIsOom:
+    def test_cuda_oom(self) -> None:
+        assert is_oom(CudaOomError("x"))
+
+    def test_subprocess_relayed_oom(self) -> None:
+        assert is_oom(RuntimeError("CudaOomError: CUDA OOM during transcription"))
+
+    def test_other_errors(self) -> None:
+        assert not is_oom(RuntimeError("ModelError: boom"))
+        assert not is_oom(TranscriptionError("out of memory"))
+
+
+class TestTranscriptionAttempts:
+    def test_full_ladder_batched(self) -> None:
+        config = TranscriberConfig(use_batched=True, batch_size=8)
+        attempts = transcription_attempts(config, OOM_RUNGS, chunk_seconds=60.0)
+        assert _labels(attempts) == [
+            "cleanup", "batch_size=4", "batch_size=2", "batch_size=1",
+            "unbatched", "compute_type=int8_float16", "chunked", "cpu",
+        ]
+        last = attempts[-1][1]
+        assert last.config.device == "cpu"
+        assert last.config.compute_type == "int8"
+        assert last.config.use_batched is False
+        assert last.chunk_seconds == 60.0
+
+    def test_rungs_are_cumulative(self) -> None:
+        config = TranscriberConfig(use_batched=True, batch_size=8)
+        attempts = dict(transcription_attempts(config, OOM_RUNGS))
+        assert attempts["unbatched"].config.batch_size == 1
+        assert attempts["chunked"].config.compute_type == "int8_float16"
+
+    def test_inapplicable_rungs_skipped(self) -> None:
+        config = TranscriberConfig(device="cpu", compute_type="int8")
+        attempts = transcription_attempts(config, OOM_RUNGS)
+        assert _labels(attempts) == ["cleanup", "chunked"]
+
+    def test_respects_configured_order(self) -> None:
+        attempts = transcription_attempts(TranscriberConfig(), ["cpu", "cleanup"])
+        assert _labels(attempts) == ["cpu", "cleanup"]
+        assert attempts[1][1].config.device == "cpu"
+
+    def test_empty_ladder(self) -> None:
+        assert transcription_attempts(TranscriberConfig(), ()) == []
+
+
+class TestDiarizationAttempts:
+    def test_full_ladder(self) -> None:
+        attempts = diarization_attempts(DiarizerConfig(device="cuda"), OOM_RUNGS)
+        assert _labels(attempts) == [
+            "cleanup", "batch_size=16", "batch_size=8", "batch_size=4", "cpu",
+        ]
+        last = attempts[-1][1]
+        assert last.device == "cpu"
+        assert last.embedding_batch_size == last.segmentation_batch_size == 4
+
+    @pytest.mark.parametrize("device", [None, "cpu"])
+    def test_no_cpu_rung_when_already_on_cpu(self, device: str | None) -> None:
+        attempts = diarization_attempts(DiarizerConfig(device=device), ["cpu"])
+        assert attempts == []
+
+
+class TestRunWithLadder:
+    @patch("stt.core.oom.cleanup_gpu_memory")
+    def test_first_success_has_no_rung(self, mock_cleanup: MagicMock) -> None:
+        result = run_with_ladder("stage", lambda: 1, lambda a: 2, [("cleanup", 0)])
+        assert result == (1, None)
+        mock_cleanup.assert_not_called()
+
+    @patch("stt.core.oom.cleanup_gpu_memory")
+    def test_walks_until_success(self, mock_cleanup: MagicMock) -> None:
+        tried: list[int] = []
+
+        def retry(attempt: int) -> str:
+            tried.append(attempt)
+            if attempt < 2:
+                raise CudaOomError("oom")
+            return f"ok{attempt}"
+
+        def first() -> str:
+            raise CudaOomError("oom")
+
+        result = run_with_ladder(
+            "stage", first, retry, [("a", 0), ("b", 1), ("c", 2), ("d", 3)],
+        )
+        assert result == ("ok2", "c")
+        assert tried == [0, 1, 2]
+        assert mock_cleanup.call_count == 3
+
+    @patch("stt.core.oom.cleanup_gpu_memory")
+    def test_non_oom_error_propagates(self, mock_cleanup: MagicMock) -> None:
+        def first() -> int:
+            raise TranscriptionError("bad audio")
+
+        retry = MagicMock()
+        with pytest.raises(TranscriptionError):
+            run_with_ladder("stage", first, retry, [("cleanup", 0)])
+        retry.assert_not_called()
+
+    @patch("stt.core.oom.cleanup_gpu_memory")
+    def test_exhausted_reraises_last_oom(self, mock_cleanup: MagicMock) -> None:
+        def fail(*_: object) -> int:
+            raise CudaOomError("still oom")
+
+        with pytest.raises(CudaOomError, match="still oom"):
+            run_with_ladder("stage", fail, fail, [("a", 0), ("b", 1)])
+
+
+class TestTranscribeInChunks:
+    def test_offsets_and_chunk_lengths(self, tmp_path: Path) -> None:
+        wav = tmp_path / "audio.wav"
+        _write_wav(wav, 2.5)
+        durations: list[float] = []
+
+        def transcribe(path: str) -> list[Segment]:
+            with wave.open(path, "rb") as f:
+                durations.append(f.getnframes() / f.getframerate())
+            return [Segment(start=0.25, end=0.75, text="x", confidence=0.5)]
+
+        segments = transcribe_in_chunks(transcribe, str(wav), chunk_seconds=1.0)
+        assert durations == [1.0, 1.0, 0.5]
+        assert [(s.start, s.end) for s in segments] == [
+            (0.25, 0.75), (1.25, 1.75), (2.25, 2.75),
+        ]
+        assert segments[0].confidence == 0.5
+
+
+@patch("stt.core.pipeline.cleanup_gpu_memory")
+@patch("stt.core.oom.cleanup_gpu_memory")
+@patch("stt.core.pipeline.log_gpu_memory")
+@patch("stt.core.pipeline.export_transcript")
+@patch("stt.core.pipeline.preprocess_audio")
+@patch("stt.core.pipeline.validate_audio_file")
+class TestPipelineOomRecovery:
+    @pytest.fixture(autouse=True)
+    def _stub_transcriber(self) -> object:
+        StubTranscriber.instances = []
+        with patch("stt.core.pipeline.Transcriber", StubTranscriber):
+            yield
+        StubTranscriber.oom_when = staticmethod(lambda config: False)
+
+    def _run(self, config: PipelineConfig, mock_preprocess: MagicMock):  # type: ignore[no-untyped-def]
+        mock_preprocess.return_value.path = "/fake/preprocessed.wav"
+        return TranscriptionPipeline(config).run("/fake/audio.wav")
+
+    def test_recovers_on_compute_type_rung(
+        self, mock_validate: MagicMock, mock_preprocess: MagicMock, *_: MagicMock,
+    ) -> None:
+        StubTranscriber.oom_when = staticmethod(
+            lambda config: config.compute_type == "float16",
+        )
+        config = PipelineConfig(
+            diarization_enabled=False, use_batched=True, batch_size=4,
+        )
+        result = self._run(config, mock_preprocess)
+
+        assert result.metadata.oom_recovery == {
+            "transcription": "compute_type=int8_float16",
+        }
+        assert len(result.segments) == 1
+        # first try + cleanup + 2 halvings + unbatched + compute_type
+        assert len(StubTranscriber.instances) == 6
+        assert not any(t.loaded for t in StubTranscriber.instances)
+
+    def test_no_oom_records_nothing(
+        self, mock_validate: MagicMock, mock_preprocess: MagicMock, *_: MagicMock,
+    ) -> None:
+        result = self._run(PipelineConfig(diarization_enabled=False), mock_preprocess)
+        assert result.metadata.oom_recovery == {}
+        assert len(StubTranscriber.instances) == 1
+
+    def test_disabled_ladder_raises(
+        self, mock_validate: MagicMock, mock_preprocess: MagicMock, *_: MagicMock,
+    ) -> None:
+        StubTranscriber.oom_when = staticmethod(lambda config: True)
+        config = PipelineConfig(diarization_enabled=False, oom_ladder=())
+        with pytest.raises(CudaOomError):
+            self._run(config, mock_preprocess)
+        assert len(StubTranscriber.instances) == 1
+
+    def test_warm_model_released_before_retry(
+        self, mock_validate: MagicMock, mock_preprocess: MagicMock, *_: MagicMock,
+    ) -> None:
+        StubTranscriber.oom_when = staticmethod(lambda config: config.device == "cuda")
+        config = PipelineConfig(
+            diarization_enabled=False, keep_models_loaded=True, oom_ladder=("cpu",),
+        )
+        pipeline = TranscriptionPipeline(config)
+        mock_preprocess.return_value.path = "/fake/preprocessed.wav"
+        result = pipeline.run("/fake/audio.wav")
+
+        warm, retry = StubTranscriber.instances
+        assert result.metadata.oom_recovery == {"transcription": "cpu"}
+        assert not warm.loaded
+        assert retry.config.device == "cpu"
+        assert pipeline._warm_transcriber is None
+
+    @patch("stt.core.pipeline.align_segments")
+    @patch("stt.core.pipeline.PyannoteDiarizer")
+    def test_diarization_recovers_on_cpu(
+        self,
+        mock_diarizer_cls: MagicMock,
+        mock_align: MagicMock,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        *_: MagicMock,
+    ) -> None:
+        configs: list[DiarizerConfig] = []
+
+        def make_diarizer(config: DiarizerConfig) -> MagicMock:
+            configs.append(config)
+            diarizer = MagicMock()
+            if config.device == "cpu":
+                diarizer.diarize.return_value = DiarizationResult(
+                    turns=[DiarizationTurn(0.0, 2.0, "SPEAKER_00")], num_speakers=1,
+                )
+            else:
+                diarizer.diarize.side_effect = CudaOomError("oom")
+            return diarizer
+
+        mock_diarizer_cls.side_effect = make_diarizer
+        mock_align.side_effect = lambda table, result: table
+        result = self._run(PipelineConfig(), mock_preprocess)
+
+        assert result.metadata.oom_recovery == {"diarization": "cpu"}
+        assert result.metadata.num_speakers == 1
+        assert configs[-1].embedding_batch_size == 4
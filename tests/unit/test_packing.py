@@ -0,0 +1,131 @@
+"""Tests for stt.core.packing — short-clip packing."""
+
+from __future__ import annotations
+
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from stt.core.packing import (
+    AudioPackWriter,
+    PackEntry,
+    split_segments,
+    wav_duration,
+)
+from stt.data_models import Segment, Word
+
+
+def _write_wav(path: Path, seconds: float, rate: int = 16000, value: int = 0) -> Path:
+    frames = int(seconds * rate)
+    with wave.open(str(path), "w") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(struct.pack("<" + "h" * frames, *([value] * frames)))
+    return path
+
+
+class TestWavDuration:
+    def test_duration_from_header(self, tmp_path: Path) -> None:
+        wav = _write_wav(tmp_path / "a.wav", 1.5)
+        assert wav_duration(wav) == pytest.approx(1.5)
+
+
+class TestAudioPackWriter:
+    def test_offsets_include_guard(self, tmp_path: Path) -> None:
+        a = _write_wav(tmp_path / "a.wav", 2.0)
+        b = _write_wav(tmp_path / "b.wav", 3.0)
+        writer = AudioPackWriter(guard_seconds=1.0, dir=str(tmp_path))
+        writer.add(Path("a.mp3"), a)
+        writer.add(Path("b.mp3"), b)
+        pack = writer.close()
+        try:
+            assert [e.offset for e in pack.entries] == [0.0, 3.0]
+            assert [e.duration for e in pack.entries] == [2.0, 3.0]
+            assert wav_duration(pack.path) == pytest.approx(7.0)
+        finally:
+            pack.cleanup()
+        assert not pack.path.exists()
+
+    def test_rejects_wrong_sample_rate(self, tmp_path: Path) -> None:
+        bad = _write_wav(tmp_path / "bad.wav", 1.0, rate=8000)
+        writer = AudioPackWriter(dir=str(tmp_path))
+        try:
+            with pytest.raises(ValueError, match="16kHz"):
+                writer.add(Path("bad.mp3"), bad)
+        finally:
+            writer.discard()
+
+    def test_discard_removes_file(self, tmp_path: Path) -> None:
+        writer = AudioPackWriter(dir=str(tmp_path))
+        writer.discard()
+        assert list(tmp_path.glob("stt_pack_*")) == []
+
+
+class TestSplitSegments:
+    def _entries(self) -> list[PackEntry]:
+        return [
+            PackEntry(source=Path("a.mp3"), offset=0.0, duration=2.0),
+            PackEntry(source=Path("b.mp3"), offset=3.0, duration=4.0),
+        ]
+
+    def test_segments_shifted_to_clip_time(self) -> None:
+        segments = [
+            Segment(start=0.1, end=1.9, text="first"),
+            Segment(start=3.5, end=6.0, text="second"),
+        ]
+        result = split_segments(segments, self._entries())
+        assert [s.text for s in result[Path("a.mp3")]] == ["first"]
+        second = result[Path("b.mp3")][0]
+        assert second.start == pytest.approx(0.5)
+        assert second.end == pytest.approx(3.0)
+
+    def test_segment_spilling_into_guard_is_clamped(self) -> None:
+        segments = [Segment(start=1.0, end=2.6, text="spill")]
+        result = split_segments(segments, self._entries())
+        seg = result[Path("a.mp3")][0]
+        assert seg.end == pytest.approx(2.0)
+
+    def test_segment_in_guard_only_is_dropped(self) -> None:
+        segments = [Segment(start=2.2, end=2.8, text="noise")]
+        result = split_segments(segments, self._entries())
+        assert result == {Path("a.mp3"): [], Path("b.mp3"): []}
+
+    def test_clip_without_segments_gets_empty_list(self) -> None:
+        segments = [Segment(start=3.1, end=3.9, text="only b")]
+        result = split_segments(segments, self._entries())
+        assert result[Path("a.mp3")] == []
+        assert len(result[Path("b.mp3")]) == 1
+
+    def test_segment_across_boundary_cut_at_words(self) -> None:
+        # Speech in a.mp3 runs up to its end; whisper keeps decoding through
+        # the guard and puts b.mp3's first words into the same segment.
+        segments = [
+            Segment(start=1.0, end=4.6, text="end of a start of b", confidence=0.9),
+            Segment(start=4.8, end=6.5, text="rest of b"),
+        ]
+        words = [
+            [
+                Word(1.0, 1.3, " end"), Word(1.3, 1.6, " of"), Word(1.6, 2.0, " a"),
+                Word(3.1, 3.6, " start"), Word(3.6, 3.9, " of"), Word(3.9, 4.6, " b"),
+            ],
+            [Word(4.8, 5.5, " rest"), Word(5.5, 5.8, " of"), Word(5.8, 6.5, " b")],
+        ]
+        result = split_segments(segments, self._entries(), words)
+
+        a, b = result[Path("a.mp3")], result[Path("b.mp3")]
+        assert [s.text for s in a] == ["end of a"]
+        assert [s.text for s in b] == ["start of b", "rest of b"]
+        assert (a[0].start, a[0].end) == pytest.approx((1.0, 2.0))
+        assert (b[0].start, b[0].end) == pytest.approx((0.1, 1.6))
+        assert b[0].confidence == 0.9
+
+    def test_segment_within_one_clip_kept_whole(self) -> None:
+        segments = [Segment(start=3.2, end=4.0, text="hello there")]
+        words = [[Word(3.2, 3.5, " hello"), Word(3.5, 4.0, " there")]]
+        result = split_segments(segments, self._entries(), words)
+        [seg] = result[Path("b.mp3")]
+        assert seg.text == "hello there"
+        assert (seg.start, seg.end) == pytest.approx((0.2, 1.0))
@@ -0,0 +1,150 @@
+"""Tests for stt.exporters.parquet_export."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from stt.data_models import Segment, SegmentTable, TranscriptMetadata, TranscriptResult
+from stt.exporters import export_transcript
+from stt.exporters.parquet_export import (
+    METADATA_KEY,
+    ParquetDatasetWriter,
+    dataset_sources,
+    export_arrow,
+    export_parquet,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ipc = pytest.importorskip("pyarrow.ipc")
+
+
+def _make_result(
+    source_file: str = "test.mp3", n: int = 2,
+) -> TranscriptResult:
+    segments = [
+        Segment(
+            start=float(i), end=float(i) + 0.5, text=f"text {i}",
+            speaker="SPEAKER_00" if i % 2 == 0 else None,
+            confidence=0.9 if i % 2 == 0 else None,
+        )
+        for i in range(n)
+    ]
+    metadata = TranscriptMetadata(
+        source_file=source_file,
+        duration_seconds=60.0,
+        created_at=datetime(2026, 2, 9, 12, 0, 0),
+    )
+    return TranscriptResult(metadata=metadata, segments=segments)
+
+
+class TestExportParquet:
+    def test_columns_and_types(self) -> None:
+        buf = BytesIO()
+        export_parquet(_make_result(), buf)
+        table = pq.read_table(BytesIO(buf.getvalue()))
+
+        assert table.column_names == [
+            "start", "end", "text", "speaker", "confidence", "source_file",
+        ]
+        assert table.schema.field("start").type == pa.float64()
+        assert pa.types.is_dictionary(table.schema.field("speaker").type)
+        assert table.to_pylist() == [
+            {"start": 0.0, "end": 0.5, "text": "text 0", "speaker": "SPEAKER_00",
+             "confidence": 0.9, "source_file": "test.mp3"},
+            {"start": 1.0, "end": 1.5, "text": "text 1", "speaker": None,
+             "confidence": None, "source_file": "test.mp3"},
+        ]
+
+    def test_metadata_in_schema(self) -> None:
+        buf = BytesIO()
+        export_parquet(_make_result(), buf)
+        schema = pq.read_schema(BytesIO(buf.getvalue()))
+        meta = json.loads(schema.metadata[METADATA_KEY])
+        assert meta["source_file"] == "test.mp3"
+        assert meta["created_at"] == "2026-02-09T12:00:00"
+
+    def test_empty_result(self) -> None:
+        buf = BytesIO()
+        export_parquet(_make_result(n=0), buf)
+        assert pq.read_table(BytesIO(buf.getvalue())).num_rows == 0
+
+
+class TestExportArrow:
+    def test_round_trip(self) -> None:
+        buf = BytesIO()
+        export_arrow(_make_result(n=3), buf)
+        table = ipc.open_file(BytesIO(buf.getvalue())).read_all()
+        assert table.column("text").to_pylist() == ["text 0", "text 1", "text 2"]
+
+
+class TestExportDispatch:
+    def test_binary_formats_alongside_text(self, tmp_path: Path) -> None:
+        export_transcript(_make_result(), "json,parquet,arrow", output_dir=tmp_path)
+        assert json.loads((tmp_path / "test.json").read_text())["segments"]
+        assert pq.read_table(tmp_path / "test.parquet").num_rows == 2
+        assert ipc.open_file(tmp_path / "test.arrow").read_all().num_rows == 2
+
+
+class TestParquetDatasetWriter:
+    def test_appends_recordings_into_shared_row_groups(self, tmp_path: Path) -> None:
+        with ParquetDatasetWriter(tmp_path, row_group_rows=4) as writer:
+            for name in ("a.mp3", "b.mp3", "c.mp3"):
+                writer.append(_make_result(name, n=2))
+
+        assert writer.parts == [tmp_path / "part-00000.parquet"]
+        meta = pq.ParquetFile(writer.parts[0]).metadata
+        assert [meta.row_group(i).num_rows for i in range(meta.num_row_groups)] == [4, 2]
+        table = pq.read_table(writer.parts[0])
+        assert table.column("source_file").to_pylist() == [
+            "a.mp3", "a.mp3", "b.mp3", "b.mp3", "c.mp3", "c.mp3",
+        ]
+
+    def test_rolls_parts_and_continues_numbering(self, tmp_path: Path) -> None:
+        with ParquetDatasetWriter(tmp_path, row_group_rows=2, rows_per_file=2) as w:
+            w.append(_make_result("a.mp3"))
+            w.append(_make_result("b.mp3"))
+        with ParquetDatasetWriter(tmp_path) as w2:
+            w2.append(_make_result("c.mp3"))
+
+        names = sorted(p.name for p in tmp_path.iterdir())
+        assert names == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+        assert pq.read_table(tmp_path).num_rows == 6
+
+    def test_abort_leaves_no_files(self, tmp_path: Path) -> None:
+        with pytest.raises(RuntimeError):
+            with ParquetDatasetWriter(tmp_path, row_group_rows=1) as writer:
+                writer.append(_make_result())
+                raise RuntimeError("boom")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_empty_writer_creates_nothing(self, tmp_path: Path) -> None:
+        ParquetDatasetWriter(tmp_path / "ds").close()
+        assert not (tmp_path / "ds").exists()
+
+    def test_dataset_sources(self, tmp_path: Path) -> None:
+        assert dataset_sources(tmp_path / "missing") == set()
+        with ParquetDatasetWriter(tmp_path, row_group_rows=2, rows_per_file=2) as w:
+            for name in ("a.mp3", "b.mp3", "c.mp3"):
+                w.append(_make_result(name))
+        (tmp_path / ".part-00009.abc.tmp").write_bytes(b"unfinished")
+        assert dataset_sources(tmp_path) == {"a.mp3", "b.mp3", "c.mp3"}
+
+
+class TestSegmentTableInput:
+    def test_dataset_accepts_segment_table(self, tmp_path: Path) -> None:
+        result = _make_result(n=3)
+        table_result = TranscriptResult(
+            metadata=result.metadata,
+            segments=SegmentTable.from_segments(result.segments),
+        )
+        with ParquetDatasetWriter(tmp_path) as writer:
+            writer.append(table_result)
+            writer.append(result)
+        rows = pq.read_table(tmp_path).to_pylist()
+        assert rows[:3] == rows[3:]
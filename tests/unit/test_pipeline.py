@@ -96,6 +96,8 @@ class TestPipelineModelDir:
         # Verify DiarizerConfig got cache_dir
         diarizer_config = mock_diarizer_cls.call_args[0][0]
         assert diarizer_config.cache_dir == "/custom/models"
+        # ... and the pipeline's device, so the OOM "cpu" rung is a real move
+        assert diarizer_config.device == "cuda"
 
 
 class TestPipelineUseBatched:
@@ -478,6 +480,56 @@ class TestPipelineResult:
         assert result.metadata.language == "ru"
 
 
+
+class TestPipelineTimeRange:
+    @patch("stt.core.pipeline.wav_duration", return_value=900.0)
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_range_offsets_timestamps_to_source_time(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        mock_duration: MagicMock,
+    ) -> None:
+        _mock_preprocess(mock_preprocess)
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(start=0.5, end=2.0, text="Test"),
+        ]
+
+        pipeline = TranscriptionPipeline(PipelineConfig(diarization_enabled=False))
+        result = pipeline.run("/fake/audio.wav", start=1800.0, end=2700.0)
+
+        assert mock_preprocess.call_args.kwargs == {"start": 1800.0, "end": 2700.0}
+        assert (result.segments[0].start, result.segments[0].end) == (1800.5, 1802.0)
+        assert result.metadata.time_range == (1800.0, 2700.0)
+
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_no_range_keeps_times(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+    ) -> None:
+        _mock_preprocess(mock_preprocess)
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(start=0.5, end=2.0, text="Test"),
+        ]
+
+        result = TranscriptionPipeline(
+            PipelineConfig(diarization_enabled=False),
+        ).run("/fake/audio.wav")
+
+        assert result.segments[0].start == 0.5
+        assert result.metadata.time_range is None
+
 class TestPipelineTryFinally:
     @patch("stt.core.pipeline.cleanup_gpu_memory")
     @patch("stt.core.pipeline.log_gpu_memory")
@@ -654,3 +706,42 @@ class TestPipelineSubprocess:
 
         mock_run_sub.assert_called_once()
         assert isinstance(result, TranscriptResult)
+
+
+class TestPipelineKeepModelsLoaded:
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.align_segments")
+    @patch("stt.core.pipeline.PyannoteDiarizer")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_models_loaded_once_across_runs(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_diarizer_cls: MagicMock,
+        mock_align: MagicMock,
+        mock_export: MagicMock,
+    ) -> None:
+        _mock_preprocess(mock_preprocess)
+        mock_transcriber = mock_transcriber_cls.return_value
+        mock_transcriber.transcribe.return_value = [
+            Segment(start=0.0, end=2.0, text="Test"),
+        ]
+        mock_diarizer = mock_diarizer_cls.return_value
+        mock_diarizer.diarize.return_value.num_speakers = 1
+        mock_align.return_value = [Segment(start=0.0, end=2.0, text="Test")]
+
+        pipeline = TranscriptionPipeline(PipelineConfig(keep_models_loaded=True))
+        pipeline.run("/fake/a.wav")
+        pipeline.run("/fake/b.wav")
+
+        mock_transcriber.load_model.assert_called_once()
+        mock_diarizer.load_model.assert_called_once()
+        mock_transcriber.unload_model.assert_not_called()
+        mock_diarizer.unload_model.assert_not_called()
+
+        pipeline.close()
+        mock_transcriber.unload_model.assert_called_once()
+        mock_diarizer.unload_model.assert_called_once()
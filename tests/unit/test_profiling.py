@@ -0,0 +1,111 @@
+"""Tests for stt.core.profiling and --profile."""
+
+from __future__ import annotations
+
+import pstats
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from stt.cli.app import app
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.profiling import NULL_PROFILER, make_profiler
+from stt.data_models import Segment
+from stt.exit_codes import ExitCode
+
+runner = CliRunner()
+
+
+def _loading() -> None:
+    time.sleep(0.001)
+
+
+def _decoding() -> None:
+    time.sleep(0.001)
+
+
+def _functions(path: Path) -> set[str]:
+    return {name for _file, _line, name in pstats.Stats(str(path)).stats}
+
+
+class TestStageProfiler:
+    def test_disabled_records_nothing(self, tmp_path: Path) -> None:
+        profiler = make_profiler(None)
+        assert profiler is NULL_PROFILER
+        with profiler.stage("decode"):
+            _decoding()
+        assert profiler.write(tmp_path / "out") == []
+        assert not (tmp_path / "out").exists()
+
+    def test_nested_stage_is_exclusive(self, tmp_path: Path) -> None:
+        profiler = make_profiler("cprofile")
+        with profiler.stage("transcribe"):
+            _decoding()
+            with profiler.stage("load"):
+                _loading()
+            _decoding()
+
+        written = profiler.write(tmp_path)
+
+        assert sorted(p.name for p in written) == ["load.prof", "transcribe.prof"]
+        assert "_loading" in _functions(tmp_path / "load.prof")
+        assert "_loading" not in _functions(tmp_path / "transcribe.prof")
+        assert "_decoding" in _functions(tmp_path / "transcribe.prof")
+
+    def test_repeated_stage_merged(self, tmp_path: Path) -> None:
+        profiler = make_profiler("cprofile")
+        for _ in range(3):
+            with profiler.stage("load"):
+                _loading()
+        profiler.write(tmp_path)
+        stats = pstats.Stats(str(tmp_path / "load.prof")).stats
+        calls = [v[1] for (_f, _l, name), v in stats.items() if name == "_loading"]
+        assert calls == [3]
+
+    def test_torch_profiler_writes_chrome_trace(self, tmp_path: Path) -> None:
+        profiler = make_profiler("torch")
+        with profiler.stage("align"):
+            _loading()
+        assert [p.name for p in profiler.write(tmp_path)] == ["align.pt.trace.json"]
+
+    def test_unknown_profiler(self) -> None:
+        with pytest.raises(ValueError, match="unknown profiler"):
+            make_profiler("perf")
+
+
+class TestPipelineProfile:
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_stage_profiles_next_to_outputs(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(0.0, 1.0, "hi"),
+        ]
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            diarization_enabled=False, output_dir=str(tmp_path), profiler="cprofile",
+        ))
+        pipeline.run("/fake/call.wav")
+
+        assert sorted(p.name for p in (tmp_path / "call.profile").iterdir()) == [
+            "decode.prof", "export.prof", "load.prof", "transcribe.prof",
+        ]
+
+    def test_bad_profile_option(self, tmp_path: Path) -> None:
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"RIFF" + b"\x00" * 100)
+        with patch("stt.cli.transcribe.validate_audio_file"):
+            result = runner.invoke(app, ["transcribe", str(audio), "--profile", "perf"])
+        assert result.exit_code == ExitCode.ERROR_ARGS
+        assert "unknown profiler" in result.output
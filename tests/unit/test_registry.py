@@ -0,0 +1,196 @@
+"""Tests for stt.core.registry and hub-free model loading."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from stt.cli.app import app
+from stt.core.diarizer import DiarizerConfig, PyannoteDiarizer
+from stt.core.registry import (
+    DIARIZATION,
+    WHISPER,
+    ModelRegistry,
+    install_diarization,
+    install_whisper,
+)
+from stt.core.transcriber import Transcriber, TranscriberConfig
+from stt.exceptions import ModelError
+from stt.exit_codes import ExitCode
+
+runner = CliRunner()
+
+
+def _fake_whisper_download(name: str, cache_dir: str) -> str:
+    snapshot = Path(cache_dir) / f"models--Systran--faster-whisper-{name}" / "snapshots" / "abc"
+    snapshot.mkdir(parents=True)
+    (snapshot / "model.bin").write_bytes(b"\x00" * 64)
+    (snapshot / "config.json").write_text("{}")
+    return str(snapshot)
+
+
+def _fake_hub(pipeline_params: dict[str, object]) -> MagicMock:
+    def download(repo_id: str, cache_dir: str, token: str | None) -> str:
+        snapshot = Path(cache_dir) / f"models--{repo_id.replace('/', '--')}" / "snapshots" / "r1"
+        snapshot.mkdir(parents=True, exist_ok=True)
+        if repo_id == "pyannote/speaker-diarization-3.1":
+            (snapshot / "config.yaml").write_text(yaml.safe_dump({
+                "version": "3.1.0",
+                "pipeline": {
+                    "name": "pyannote.audio.pipelines.SpeakerDiarization",
+                    "params": pipeline_params,
+                },
+            }))
+        else:
+            (snapshot / "pytorch_model.bin").write_bytes(b"\x01" * 32)
+        return str(snapshot)
+
+    return MagicMock(side_effect=download)
+
+
+class TestInstallWhisper:
+    def test_records_snapshot_and_checksums(self, tmp_path: Path) -> None:
+        entry = install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        stored = ModelRegistry(str(tmp_path)).get(WHISPER, "tiny")
+        assert stored == entry
+        files = stored.snapshots[stored.path]
+        assert files["model.bin"].size == 64
+        assert len(files["model.bin"].sha256) == 64
+        assert ModelRegistry(str(tmp_path)).resolve(WHISPER, "tiny") == entry.path
+
+    def test_reinstall_replaces_entry(self, tmp_path: Path) -> None:
+        install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        install_whisper(
+            "base", str(tmp_path), download=_fake_whisper_download,
+        )
+        names = [e.name for e in ModelRegistry(str(tmp_path)).entries()]
+        assert names == ["base", "tiny"]
+
+
+class TestResolve:
+    def test_unrecorded_returns_none(self, tmp_path: Path) -> None:
+        assert ModelRegistry(str(tmp_path)).resolve(WHISPER, "tiny") is None
+
+    def test_unrecorded_required_fails_fast(self, tmp_path: Path) -> None:
+        with pytest.raises(ModelError, match="not installed"):
+            ModelRegistry(str(tmp_path)).resolve(WHISPER, "tiny", required=True)
+
+    def test_missing_file_is_damaged(self, tmp_path: Path) -> None:
+        entry = install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        (Path(entry.path) / "model.bin").unlink()
+        with pytest.raises(ModelError, match="damaged"):
+            ModelRegistry(str(tmp_path)).resolve(WHISPER, "tiny")
+
+    def test_checksum_only_checked_on_request(self, tmp_path: Path) -> None:
+        entry = install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        (Path(entry.path) / "model.bin").write_bytes(b"\x02" * 64)
+        assert entry.problems() == []
+        assert entry.problems(checksums=True) == [
+            f"{Path(entry.path) / 'model.bin'}: checksum mismatch",
+        ]
+
+    def test_unreadable_registry_is_empty(self, tmp_path: Path) -> None:
+        (tmp_path / "model_registry.json").write_text("{not json")
+        assert ModelRegistry(str(tmp_path)).entries() == []
+
+
+class TestInstallDiarization:
+    def test_rewrites_hub_ids_to_local_snapshots(self, tmp_path: Path) -> None:
+        hub = _fake_hub({
+            "clustering": "AgglomerativeClustering",
+            "embedding": "pyannote/wespeaker-voxceleb-resnet34-LM",
+            "segmentation": "pyannote/segmentation-3.0",
+            "segmentation_batch_size": 32,
+        })
+        entry = install_diarization(
+            "pyannote/speaker-diarization-3.1", str(tmp_path), token="t", download=hub,
+        )
+        config = yaml.safe_load(Path(entry.path).read_text())
+        params = config["pipeline"]["params"]
+        assert params["clustering"] == "AgglomerativeClustering"
+        assert Path(params["segmentation"], "pytorch_model.bin").is_file()
+        assert Path(params["embedding"], "pytorch_model.bin").is_file()
+        assert len(entry.snapshots) == 3
+        assert hub.call_count == 3
+        assert all(call.kwargs["token"] == "t" for call in hub.call_args_list)
+
+    def test_model_subfolders_point_at_snapshot(self, tmp_path: Path) -> None:
+        hub = _fake_hub({"segmentation": "$model/segmentation@v2"})
+        entry = install_diarization(
+            "pyannote/speaker-diarization-3.1", str(tmp_path), download=hub,
+        )
+        params = yaml.safe_load(Path(entry.path).read_text())["pipeline"]["params"]
+        assert params["segmentation"]["subfolder"] == "segmentation"
+        assert Path(params["segmentation"]["checkpoint"]).is_dir()
+
+    def test_not_a_pipeline(self, tmp_path: Path) -> None:
+        def download(repo_id: str, cache_dir: str, token: str | None) -> str:
+            snapshot = Path(cache_dir) / "snap"
+            snapshot.mkdir(parents=True, exist_ok=True)
+            (snapshot / "config.yaml").write_text("model: {}\n")
+            return str(snapshot)
+
+        with pytest.raises(ModelError, match="Not a pyannote pipeline"):
+            install_diarization("org/other", str(tmp_path), download=download)
+
+
+class TestHubFreeLoading:
+    @patch("stt.core.transcriber.BatchedInferencePipeline")
+    @patch("stt.core.transcriber.WhisperModel")
+    def test_transcriber_loads_recorded_path(
+        self, mock_whisper: MagicMock, _batched: MagicMock, tmp_path: Path,
+    ) -> None:
+        entry = install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        Transcriber(TranscriberConfig(
+            model_size="tiny", device="cpu", model_dir=str(tmp_path),
+        )).load_model()
+        assert mock_whisper.call_args.args[0] == entry.path
+        assert "download_root" not in mock_whisper.call_args.kwargs
+
+    @patch("stt.core.transcriber.WhisperModel")
+    def test_transcriber_offline_fails_before_loading(
+        self, mock_whisper: MagicMock, tmp_path: Path,
+    ) -> None:
+        transcriber = Transcriber(TranscriberConfig(
+            model_size="tiny", device="cpu", model_dir=str(tmp_path), offline=True,
+        ))
+        with pytest.raises(ModelError, match="not installed"):
+            transcriber.load_model()
+        mock_whisper.assert_not_called()
+
+    @patch("stt.core.diarizer.Pipeline")
+    def test_diarizer_loads_local_config_without_token(
+        self, mock_pipeline: MagicMock, tmp_path: Path,
+    ) -> None:
+        hub = _fake_hub({"segmentation": "pyannote/segmentation-3.0"})
+        entry = install_diarization(
+            "pyannote/speaker-diarization-3.1", str(tmp_path), download=hub,
+        )
+        PyannoteDiarizer(DiarizerConfig(
+            cache_dir=str(tmp_path), hf_token="secret",
+        )).load_model()
+        mock_pipeline.from_pretrained.assert_called_once_with(entry.path)
+        assert ModelRegistry(str(tmp_path)).get(DIARIZATION, entry.name) is not None
+
+
+class TestModelsListInstalled:
+    def test_shows_installed_and_registry(self, tmp_path: Path) -> None:
+        install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        result = runner.invoke(app, ["models", "list", "--model-dir", str(tmp_path)])
+        assert result.exit_code == 0
+        tiny_line = next(line for line in result.output.splitlines() if line.startswith("tiny "))
+        assert "installed" in tiny_line
+        assert "model_registry.json" in result.output
+
+    def test_verify_reports_damaged(self, tmp_path: Path) -> None:
+        entry = install_whisper("tiny", str(tmp_path), download=_fake_whisper_download)
+        (Path(entry.path) / "config.json").write_text("[]")
+        result = runner.invoke(
+            app, ["models", "list", "--model-dir", str(tmp_path), "--verify"],
+        )
+        assert result.exit_code == ExitCode.ERROR_MODEL
+        assert "damaged" in result.output
@@ -0,0 +1,145 @@
+"""Tests for stt.exporters.render — single-pass multi-format rendering."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from io import StringIO
+
+import pytest
+
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exporters.json_export import JsonSink, export_json
+from stt.exporters.render import (
+    SegmentRow,
+    clock_ms,
+    clock_truncated,
+    iter_rows,
+    render,
+)
+from stt.exporters.srt_export import SrtSink, export_srt
+from stt.exporters.txt_export import TxtSink, export_txt
+
+
+class _CountingList(list[Segment]):
+    """List that counts how many times it is iterated."""
+
+    iterations = 0
+
+    def __iter__(self) -> Iterator[Segment]:
+        self.iterations += 1
+        return super().__iter__()
+
+
+def _make_result(n: int = 2500) -> TranscriptResult:
+    segments = _CountingList(
+        Segment(
+            start=i * 1.25, end=i * 1.25 + 1.0, text=f"Сегмент {i}",
+            speaker="SPEAKER_01" if i % 2 else None, confidence=0.9,
+        )
+        for i in range(n)
+    )
+    metadata = TranscriptMetadata(
+        source_file="test.mp3", duration_seconds=n * 1.25,
+        created_at=datetime(2026, 2, 9, 12, 0, 0),
+    )
+    return TranscriptResult(metadata=metadata, segments=segments)
+
+
+class TestClockHelpers:
+    def test_clock_ms_rounds_and_carries(self) -> None:
+        assert clock_ms(3661.5) == ("01:01:01", 500)
+        assert clock_ms(59.9996) == ("00:01:00", 0)
+
+    def test_clock_truncated(self) -> None:
+        assert clock_truncated(59.9996) == "00:00:59"
+
+
+class TestIterRows:
+    def test_only_requested_fields_computed(self) -> None:
+        segments = [Segment(start=1.0, end=2.0, text="a")]
+        (batch,) = list(iter_rows(segments, needs_clock=False, needs_hms=True))
+        assert batch[0].start_hms == "00:00:01"
+        assert batch[0].start_clock == ""
+
+    def test_batches_and_indices(self) -> None:
+        segments = [Segment(start=float(i), end=i + 0.5, text="x") for i in range(5)]
+        batches = list(iter_rows(segments, batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[-1][0].index == 5
+
+
+class TestRender:
+    @pytest.mark.parametrize("concurrent", [False, True])
+    def test_single_pass_matches_individual_exporters(self, concurrent: bool) -> None:
+        result = _make_result()
+        outputs = {"json": StringIO(), "txt": StringIO(), "srt": StringIO()}
+        render(
+            result,
+            [JsonSink(outputs["json"]), TxtSink(outputs["txt"]), SrtSink(outputs["srt"])],
+            concurrent=concurrent,
+        )
+        assert result.segments.iterations == 1  # type: ignore[attr-defined]
+
+        for name, exporter in (("json", export_json), ("txt", export_txt),
+                               ("srt", export_srt)):
+            expected = StringIO()
+            exporter(result, expected)
+            assert outputs[name].getvalue() == expected.getvalue()
+
+    def test_concurrent_sink_error_propagates(self) -> None:
+        class _FailingSink:
+            needs_clock = False
+            needs_hms = False
+
+            def begin(self, result: TranscriptResult) -> None:
+                pass
+
+            def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+                raise OSError("disk full")
+
+            def end(self) -> None:
+                pass
+
+        result = _make_result()
+        with pytest.raises(OSError, match="disk full"):
+            render(result, [TxtSink(StringIO()), _FailingSink()], concurrent=True)
+
+    def test_concurrent_sink_error_in_end_propagates(self) -> None:
+        class _FailingEndSink:
+            needs_clock = False
+            needs_hms = False
+
+            def begin(self, result: TranscriptResult) -> None:
+                pass
+
+            def write_rows(self, rows: Sequence[SegmentRow]) -> None:
+                pass
+
+            def end(self) -> None:
+                raise OSError("disk full")
+
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            try:
+                render(
+                    _make_result(), [TxtSink(StringIO()), _FailingEndSink()],
+                    concurrent=True,
+                )
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+        assert not thread.is_alive(), "render hung after end() failed"
+        assert [str(e) for e in errors] == ["disk full"]
+
+    def test_empty_result(self) -> None:
+        result = _make_result(0)
+        txt, srt = StringIO(), StringIO()
+        render(result, [TxtSink(txt), SrtSink(srt)])
+        assert txt.getvalue() == "\n"
+        assert srt.getvalue() == "\n"
@@ -0,0 +1,79 @@
+"""Tests for stt.core.shm_transfer."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.core.shm_transfer import collect_segments, publish_segments
+from stt.core.subprocess_runner import _transcribe_worker
+from stt.data_models import Segment, SegmentTable
+
+SEGMENTS = [
+    Segment(start=0.0, end=1.5, text="Привет", speaker="SPEAKER_00", confidence=0.9),
+    Segment(start=1.5, end=3.0, text="", confidence=None),
+    Segment(start=3.0, end=4.0, text="мир", speaker="SPEAKER_01", confidence=0.2),
+]
+
+
+def _publish_in_child(queue: Any) -> None:
+    queue.put(publish_segments(SEGMENTS))
+
+
+class TestRoundTrip:
+    def test_in_process(self) -> None:
+        table = collect_segments(publish_segments(SEGMENTS))
+        assert isinstance(table, SegmentTable)
+        assert table == SEGMENTS
+        assert table.speakers == ["SPEAKER_00", "SPEAKER_01"]
+
+    def test_empty(self) -> None:
+        assert collect_segments(publish_segments([])) == []
+
+    def test_block_unlinked_after_collect(self) -> None:
+        message = publish_segments(SEGMENTS)
+        collect_segments(message)
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=message["shm"])
+
+    def test_across_spawned_process(self) -> None:
+        ctx = mp.get_context("spawn")
+        queue = ctx.Queue()
+        process = ctx.Process(target=_publish_in_child, args=(queue,))
+        process.start()
+        message = queue.get(timeout=60)
+        process.join(timeout=30)
+        assert set(message) == {"shm", "size"}
+        assert collect_segments(message) == SEGMENTS
+
+
+class TestTranscribeWorker:
+    @patch("stt.core.transcriber.Transcriber")
+    def test_worker_sends_only_control_message(self, mock_cls: MagicMock) -> None:
+        mock_cls.return_value.transcribe.return_value = SEGMENTS
+        queue = MagicMock()
+
+        _transcribe_worker({}, "/fake.wav", queue)
+
+        message = queue.put.call_args.args[0]
+        assert message["status"] == "ok"
+        assert "segments" not in message
+        assert collect_segments(message) == SEGMENTS
+
+    @patch("stt.core.subprocess_runner.publish_segments", side_effect=OSError("no shm"))
+    @patch("stt.core.transcriber.Transcriber")
+    def test_worker_falls_back_to_pickle(
+        self, mock_cls: MagicMock, _mock_publish: MagicMock,
+    ) -> None:
+        mock_cls.return_value.transcribe.return_value = SEGMENTS
+        queue = MagicMock()
+
+        _transcribe_worker({}, "/fake.wav", queue)
+
+        message = queue.put.call_args.args[0]
+        assert message["status"] == "ok"
+        assert [Segment(**s) for s in message["segments"]] == SEGMENTS
@@ -0,0 +1,178 @@
+"""Tests for stt.core.speaker_index and speaker naming in the pipeline."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from stt.cli.app import app
+from stt.core.diarizer import DiarizationResult, DiarizationTurn
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.speaker_index import SpeakerIndex
+from stt.data_models import Segment
+from stt.exit_codes import ExitCode
+
+runner = CliRunner()
+
+ALICE = [1.0, 0.0, 0.0]
+BOB = [0.0, 1.0, 0.0]
+
+
+@pytest.fixture()
+def index_dir(tmp_path: Path) -> Path:
+    index = SpeakerIndex(tmp_path / "index")
+    index.add("alice", ALICE)
+    index.add("bob", BOB)
+    index.save()
+    return tmp_path / "index"
+
+
+class TestSpeakerIndex:
+    def test_search_after_reload(self, index_dir: Path) -> None:
+        index = SpeakerIndex(index_dir)
+        assert len(index) == 2
+        assert index.dim == 3
+        name, score = index.search([0.9, 0.1, 0.0])[0]
+        assert name == "alice"
+        assert score == pytest.approx(0.9 / np.hypot(0.9, 0.1))
+
+    def test_vectors_memory_mapped(self, index_dir: Path) -> None:
+        assert isinstance(SpeakerIndex(index_dir)._vectors, np.memmap)
+
+    def test_identify_is_one_to_one(self, index_dir: Path) -> None:
+        mapping = SpeakerIndex(index_dir).identify({
+            "SPEAKER_00": [0.9, 0.3, 0.0],
+            "SPEAKER_01": [1.0, 0.1, 0.0],
+            "SPEAKER_02": [0.0, 0.0, 1.0],
+        })
+        # SPEAKER_01 is the closer match to alice; SPEAKER_00 gets nothing
+        # because bob is below the threshold for it.
+        assert mapping == {"SPEAKER_01": "alice"}
+
+    def test_identify_threshold(self, index_dir: Path) -> None:
+        index = SpeakerIndex(index_dir)
+        assert index.identify({"A": [1.0, 1.0, 0.0]}, threshold=0.8) == {}
+        assert index.identify({"A": [1.0, 1.0, 0.0]}, threshold=0.7) in (
+            {"A": "alice"}, {"A": "bob"},
+        )
+
+    def test_several_enrollments_per_name(self, index_dir: Path) -> None:
+        index = SpeakerIndex(index_dir)
+        index.add("alice", [0.0, 0.0, 1.0])
+        assert index.speakers() == {"alice": 2, "bob": 1}
+        assert index.search([0.0, 0.1, 1.0])[0][0] == "alice"
+
+    def test_remove(self, index_dir: Path) -> None:
+        index = SpeakerIndex(index_dir)
+        assert index.remove("alice") == 1
+        assert index.remove("carol") == 0
+        index.save()
+        assert SpeakerIndex(index_dir).speakers() == {"bob": 1}
+
+    def test_dimension_mismatch(self, index_dir: Path) -> None:
+        with pytest.raises(ValueError, match="dimensions"):
+            SpeakerIndex(index_dir).add("carol", [1.0, 0.0])
+
+    def test_zero_vector_rejected(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            SpeakerIndex(tmp_path).add("x", [0.0, 0.0])
+
+    def test_empty_index(self, tmp_path: Path) -> None:
+        index = SpeakerIndex(tmp_path / "missing")
+        assert index.search(ALICE) == []
+        assert index.identify({"SPEAKER_00": ALICE}) == {}
+
+    def test_ivf_finds_enrolled_speaker(self, tmp_path: Path) -> None:
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((300, 16))
+        index = SpeakerIndex(tmp_path, nprobe=4)
+        for i, vector in enumerate(vectors):
+            index.add(f"s{i}", vector)
+        with patch("stt.core.speaker_index.IVF_MIN_VECTORS", 100):
+            index.save()
+        reloaded = SpeakerIndex(tmp_path, nprobe=4)
+        assert reloaded._centroids is not None
+        assert reloaded.search(vectors[42] + 0.01)[0][0] == "s42"
+
+
+class TestPipelineSpeakerNaming:
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.PyannoteDiarizer")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_enrolled_speakers_named_inline(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_diarizer_cls: MagicMock,
+        mock_export: MagicMock,
+        index_dir: Path,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(0.0, 1.0, "hi"), Segment(1.0, 2.0, "hello"),
+        ]
+        mock_diarizer_cls.return_value.diarize.return_value = DiarizationResult(
+            turns=[
+                DiarizationTurn(0.0, 1.0, "SPEAKER_00"),
+                DiarizationTurn(1.0, 2.0, "SPEAKER_01"),
+            ],
+            num_speakers=2,
+            embeddings={"SPEAKER_00": [0.1, 0.9, 0.0], "SPEAKER_01": [0.0, 0.0, 1.0]},
+        )
+
+        pipeline = TranscriptionPipeline(PipelineConfig(
+            speaker_index=str(index_dir),
+            export_speaker_embeddings=True,
+            output_dir=str(tmp_path),
+        ))
+        result = pipeline.run("/fake/audio.wav")
+
+        assert [s.speaker for s in result.segments] == ["bob", "SPEAKER_01"]
+        sidecar = json.loads((tmp_path / "audio.speakers.json").read_text())
+        assert sorted(sidecar["speakers"]) == ["SPEAKER_01", "bob"]
+
+
+class TestSpeakersCommand:
+    def _sidecar(self, tmp_path: Path, speakers: dict[str, list[float]]) -> Path:
+        path = tmp_path / "call.speakers.json"
+        path.write_text(json.dumps({"version": 1, "speakers": speakers}))
+        return path
+
+    def test_enroll_list_remove(self, tmp_path: Path) -> None:
+        sidecar = self._sidecar(tmp_path, {"SPEAKER_00": ALICE, "SPEAKER_01": BOB})
+        index = str(tmp_path / "index")
+
+        result = runner.invoke(app, [
+            "speakers", "enroll", "bob", str(sidecar), "-s", "SPEAKER_01", "--index", index,
+        ])
+        assert result.exit_code == 0, result.output
+        assert SpeakerIndex(index).search(BOB)[0][0] == "bob"
+
+        result = runner.invoke(app, ["speakers", "list", "--index", index])
+        assert "bob" in result.output
+
+        result = runner.invoke(app, ["speakers", "remove", "bob", "--index", index])
+        assert result.exit_code == 0
+        assert len(SpeakerIndex(index)) == 0
+
+    def test_ambiguous_file_needs_speaker(self, tmp_path: Path) -> None:
+        sidecar = self._sidecar(tmp_path, {"SPEAKER_00": ALICE, "SPEAKER_01": BOB})
+        result = runner.invoke(app, [
+            "speakers", "enroll", "x", str(sidecar), "--index", str(tmp_path / "i"),
+        ])
+        assert result.exit_code == ExitCode.ERROR_ARGS
+
+    def test_no_index_configured(self, tmp_path: Path) -> None:
+        with patch("stt.cli.speakers_cmd.load_config") as mock_config:
+            mock_config.return_value.speaker_index = None
+            result = runner.invoke(app, ["speakers", "list"])
+        assert result.exit_code == ExitCode.ERROR_ARGS
@@ -0,0 +1,207 @@
+"""Tests for stt.core.streaming and the stream command."""
+
+from __future__ import annotations
+
+import io
+import json
+import struct
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from stt.cli.app import app
+from stt.core.streaming import (
+    FINAL,
+    PARTIAL,
+    PcmSource,
+    StreamConfig,
+    StreamEvent,
+    StreamingTranscriber,
+    run_stream,
+)
+from stt.data_models import Segment
+from stt.exit_codes import ExitCode
+
+runner = CliRunner()
+RATE = 16000
+
+
+def _wav_bytes(seconds: float, *, rate: int = RATE, channels: int = 1) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(struct.pack("<h", 1000) * int(seconds * rate) * channels)
+    return buf.getvalue()
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+class FakeDecoder:
+    """Returns canned segments (relative to the buffer) and records calls."""
+
+    def __init__(self, *results: list[Segment]) -> None:
+        self.results = list(results)
+        self.initial_prompt: str | None = None
+        self.prompts: list[str | None] = []
+        self.lengths: list[float] = []
+
+    def transcribe(self, audio: np.ndarray) -> list[Segment]:
+        self.prompts.append(self.initial_prompt)
+        self.lengths.append(len(audio) / RATE)
+        return self.results.pop(0)
+
+
+class TestPcmSource:
+    def test_raw_pcm_read_as_is(self) -> None:
+        data = struct.pack("<3h", 16384, -16384, 0)
+        source = PcmSource(io.BytesIO(data), raw=True)
+        assert source.read(1.0).tolist() == [0.5, -0.5, 0.0]
+
+    def test_target_wav_header_skipped(self) -> None:
+        source = PcmSource(io.BytesIO(_wav_bytes(0.5)))
+        audio = source.read(1.0)
+        assert len(audio) == RATE // 2
+        assert audio[0] == pytest.approx(1000 / 32768)
+
+    def test_other_wav_goes_through_ffmpeg(self) -> None:
+        process = MagicMock()
+        process.stdout = io.BytesIO(struct.pack("<2h", 0, 0))
+        with patch("stt.core.streaming.subprocess.Popen", return_value=process) as popen:
+            source = PcmSource(io.BytesIO(_wav_bytes(0.1, rate=44100, channels=2)))
+            assert len(source.read(1.0)) == 2
+        cmd = popen.call_args.args[0]
+        assert cmd[:5] == ["ffmpeg", "-loglevel", "error", "-i", "pipe:0"]
+        # The sniffed header is replayed to ffmpeg before the rest of stdin.
+        written = b"".join(c.args[0] for c in process.stdin.write.call_args_list)
+        assert written.startswith(b"RIFF")
+
+    def test_odd_byte_kept_for_next_read(self) -> None:
+        stream = io.BytesIO(struct.pack("<2h", 100, 200))
+        source = PcmSource(stream, raw=True)
+        source._reader = MagicMock(read=MagicMock(side_effect=[b"\x64\x00\xc8", b"\x00", b""]))
+        assert len(source.read(2 / RATE)) == 1
+        assert source.read(1 / RATE).tolist() == [200 / 32768]
+
+
+class TestStreamConfig:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"step_seconds": 0}, {"max_buffer_seconds": 0.5}, {"min_silence_seconds": 0}],
+    )
+    def test_invalid(self, kwargs: dict[str, float]) -> None:
+        with pytest.raises(ValueError):
+            StreamConfig(**kwargs)
+
+
+class TestStreamingTranscriber:
+    def test_partial_until_pause_then_final(self) -> None:
+        decoder = FakeDecoder(
+            [Segment(0.0, 1.0, "hello")],
+            [Segment(0.0, 1.0, "hello"), Segment(1.6, 2.0, "wor")],
+        )
+        regions = iter([[(0.0, 1.0)], [(0.0, 1.0), (1.5, 2.0)]])
+        streamer = StreamingTranscriber(
+            decoder, StreamConfig(min_silence_seconds=0.4),
+            detect_speech=lambda audio: next(regions),
+        )
+        first = streamer.feed(_silence(1.0))
+        assert first == [StreamEvent(PARTIAL, 0.0, 1.0, "hello")]
+
+        second = streamer.feed(_silence(1.0))
+        assert [(e.kind, e.text) for e in second] == [(FINAL, "hello"), (PARTIAL, "wor")]
+        # Buffer cut in the middle of the pause; times stay in stream time.
+        assert streamer.buffered_seconds == pytest.approx(0.75)
+        assert second[1].start == pytest.approx(1.6)
+        assert decoder.prompts == [None, None]
+
+    def test_committed_text_primes_decoder(self) -> None:
+        decoder = FakeDecoder([Segment(0.0, 0.5, "one")], [Segment(0.0, 0.5, "two")])
+        streamer = StreamingTranscriber(
+            decoder, StreamConfig(min_silence_seconds=0.4),
+            detect_speech=lambda audio: [(0.0, 0.5)],
+        )
+        streamer.feed(_silence(1.0))
+        events = streamer.feed(_silence(1.0))
+        assert decoder.prompts == [None, "one"]
+        assert events[0].start == pytest.approx(0.75)
+
+    def test_long_buffer_forces_commit(self) -> None:
+        decoder = FakeDecoder([Segment(0.0, 1.5, "a"), Segment(1.5, 3.0, "b")])
+        streamer = StreamingTranscriber(
+            decoder,
+            StreamConfig(step_seconds=3.0, max_buffer_seconds=3.0),
+            detect_speech=lambda audio: [(0.0, 3.0)],
+        )
+        events = streamer.feed(_silence(3.0))
+        assert [(e.kind, e.text) for e in events] == [(FINAL, "a"), (PARTIAL, "b")]
+        assert streamer.buffered_seconds == pytest.approx(1.5)
+
+    def test_silence_not_decoded(self) -> None:
+        decoder = FakeDecoder()
+        streamer = StreamingTranscriber(
+            decoder, StreamConfig(min_silence_seconds=0.5), detect_speech=lambda audio: [],
+        )
+        assert streamer.feed(_silence(2.0)) == []
+        assert decoder.lengths == []
+        assert streamer.buffered_seconds == pytest.approx(0.5)
+
+    def test_unchanged_partial_not_repeated(self) -> None:
+        decoder = FakeDecoder([Segment(0.0, 1.0, "x")], [Segment(0.0, 1.0, "x")])
+        streamer = StreamingTranscriber(decoder, detect_speech=lambda audio: [(0.0, 2.0)])
+        assert len(streamer.feed(_silence(1.0))) == 1
+        assert streamer.feed(_silence(1.0)) == []
+
+    def test_flush_commits_everything(self) -> None:
+        decoder = FakeDecoder([Segment(0.0, 0.5, "a")], [Segment(0.0, 0.5, "a")])
+        streamer = StreamingTranscriber(decoder, detect_speech=lambda audio: [(0.0, 0.5)])
+        streamer.feed(_silence(0.5))
+        assert streamer.feed(_silence(0.5)) == [StreamEvent(PARTIAL, 0.0, 0.5, "a")]
+        assert [e.kind for e in streamer.flush()] == [FINAL]
+        assert streamer.buffered_seconds == 0.0
+
+
+class TestRunStream:
+    def test_pumps_until_eof_and_flushes(self) -> None:
+        source = PcmSource(io.BytesIO(b"\x00\x00" * int(2.5 * RATE)), raw=True)
+        decoder = FakeDecoder(
+            [Segment(0.0, 1.0, "a")], [Segment(0.0, 1.0, "a")], [Segment(0.0, 2.5, "a b")],
+        )
+        streamer = StreamingTranscriber(decoder, detect_speech=lambda audio: [(0.0, 2.5)])
+        events: list[StreamEvent] = []
+        run_stream(source, streamer, events.append, step_seconds=1.0)
+        assert decoder.lengths == [1.0, 2.0, 2.5]
+        assert events[-1] == StreamEvent(FINAL, 0.0, 2.5, "a b")
+
+
+class TestStreamCommand:
+    @patch("stt.cli.stream.StreamingTranscriber")
+    @patch("stt.cli.stream.Transcriber")
+    def test_wav_on_stdin_to_jsonl(
+        self, mock_transcriber_cls: MagicMock, mock_streamer_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        streamer = mock_streamer_cls.return_value
+        streamer.feed.return_value = []
+        streamer.flush.return_value = [StreamEvent(FINAL, 0.0, 1.0, "привет", 0.9)]
+
+        result = runner.invoke(app, ["stream", "--device", "cpu"], input=_wav_bytes(1.0))
+
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.stdout.splitlines()[-1]) == {
+            "type": "final", "start": 0.0, "end": 1.0, "text": "привет", "confidence": 0.9,
+        }
+        config = mock_transcriber_cls.call_args.args[0]
+        assert config.device == "cpu"
+        assert config.use_batched is False
+        mock_transcriber_cls.return_value.unload_model.assert_called_once()
+
+    def test_bad_step_exits_2(self) -> None:
+        result = runner.invoke(app, ["stream", "--step", "0"], input=b"")
+        assert result.exit_code == ExitCode.ERROR_ARGS
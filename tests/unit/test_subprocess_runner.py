@@ -7,8 +7,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from stt.core.shm_transfer import publish_segments
 from stt.core.subprocess_runner import run_diarization_subprocess, run_transcription_subprocess
-from stt.data_models import Segment
+from stt.data_models import Segment, SegmentTable
 
 
 class TestRunTranscriptionSubprocess:
@@ -89,6 +90,23 @@ class TestRunTranscriptionSubprocess:
             )
 
 
+    @patch("stt.core.subprocess_runner.mp")
+    def test_transcription_collects_shared_memory(self, mock_mp: MagicMock) -> None:
+        segments = [Segment(start=0.0, end=2.0, text="Hello", confidence=0.9)]
+        mock_ctx = MagicMock()
+        mock_mp.get_context.return_value = mock_ctx
+        mock_queue = MagicMock()
+        mock_queue.get.return_value = {"status": "ok", **publish_segments(segments)}
+        mock_ctx.Queue.return_value = mock_queue
+        mock_process = MagicMock()
+        mock_process.is_alive.return_value = False
+        mock_ctx.Process.return_value = mock_process
+
+        result = run_transcription_subprocess({}, "/fake/audio.wav")
+
+        assert isinstance(result, SegmentTable)
+        assert result == segments
+
 class TestRunDiarizationSubprocess:
     @patch("stt.core.subprocess_runner.mp")
     def test_diarization_returns_result(self, mock_mp: MagicMock) -> None:
@@ -118,3 +136,4 @@ class TestRunDiarizationSubprocess:
 
         assert result["num_speakers"] == 1
         assert len(result["turns"]) == 1
+
@@ -0,0 +1,180 @@
+"""Tests for stt.core.threads."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from stt.core.threads import (
+    CpuTopology,
+    ThreadPlan,
+    apply_thread_plan,
+    cgroup_cpu_quota,
+    numa_nodes,
+    parse_cpulist,
+    plan_threads,
+)
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+class TestParseCpulist:
+    def test_ranges_and_singles(self) -> None:
+        assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+
+    def test_empty(self) -> None:
+        assert parse_cpulist("\n") == []
+
+
+class TestCgroupCpuQuota:
+    def test_v2_cpu_max(self, tmp_path: Path) -> None:
+        proc = tmp_path / "cgroup"
+        proc.write_text("0::/jobs/stt\n")
+        _write(tmp_path / "fs" / "jobs" / "stt" / "cpu.max", "250000 100000\n")
+        assert cgroup_cpu_quota(tmp_path / "fs", proc) == 2.5
+
+    def test_v2_unlimited(self, tmp_path: Path) -> None:
+        proc = tmp_path / "cgroup"
+        proc.write_text("0::/jobs/stt\n")
+        _write(tmp_path / "fs" / "jobs" / "stt" / "cpu.max", "max 100000\n")
+        assert cgroup_cpu_quota(tmp_path / "fs", proc) is None
+
+    def test_v2_ancestor_is_tighter(self, tmp_path: Path) -> None:
+        proc = tmp_path / "cgroup"
+        proc.write_text("0::/jobs/stt\n")
+        _write(tmp_path / "fs" / "jobs" / "cpu.max", "100000 100000\n")
+        _write(tmp_path / "fs" / "jobs" / "stt" / "cpu.max", "400000 100000\n")
+        assert cgroup_cpu_quota(tmp_path / "fs", proc) == 1.0
+
+    def test_v1_cfs_quota(self, tmp_path: Path) -> None:
+        proc = tmp_path / "cgroup"
+        proc.write_text("4:cpu,cpuacct:/docker/abc\n3:memory:/docker/abc\n")
+        base = tmp_path / "fs" / "cpu,cpuacct" / "docker" / "abc"
+        _write(base / "cpu.cfs_quota_us", "300000\n")
+        _write(base / "cpu.cfs_period_us", "100000\n")
+        assert cgroup_cpu_quota(tmp_path / "fs", proc) == 3.0
+
+    def test_v1_no_quota(self, tmp_path: Path) -> None:
+        proc = tmp_path / "cgroup"
+        proc.write_text("4:cpu,cpuacct:/\n")
+        base = tmp_path / "fs" / "cpu,cpuacct"
+        _write(base / "cpu.cfs_quota_us", "-1\n")
+        _write(base / "cpu.cfs_period_us", "100000\n")
+        assert cgroup_cpu_quota(tmp_path / "fs", proc) is None
+
+    def test_missing_proc_file(self, tmp_path: Path) -> None:
+        assert cgroup_cpu_quota(tmp_path, tmp_path / "missing") is None
+
+
+class TestNumaNodes:
+    def test_maps_cpus_to_nodes(self, tmp_path: Path) -> None:
+        _write(tmp_path / "node0" / "cpulist", "0-1,4-5\n")
+        _write(tmp_path / "node1" / "cpulist", "2-3,6-7\n")
+        nodes = numa_nodes(tmp_path)
+        assert nodes[4] == 0
+        assert nodes[3] == 1
+        assert len(nodes) == 8
+
+    def test_no_nodes(self, tmp_path: Path) -> None:
+        assert numa_nodes(tmp_path / "missing") == {}
+
+
+class TestCpuTopology:
+    def test_budget_capped_by_quota(self) -> None:
+        assert CpuTopology(tuple(range(8)), quota=2.5).budget == 3
+
+    def test_budget_without_quota(self) -> None:
+        assert CpuTopology(tuple(range(8))).budget == 8
+
+
+class TestPlanThreads:
+    def test_single_worker_gets_everything(self) -> None:
+        plan = plan_threads(CpuTopology(tuple(range(8))))
+        assert plan == ThreadPlan(8, 8, None)
+
+    def test_workers_split_budget(self) -> None:
+        plan = plan_threads(CpuTopology(tuple(range(8))), workers=3)
+        assert plan.transcriber_threads == 2
+        assert plan.diarizer_threads == 2
+
+    def test_budget_and_quota(self) -> None:
+        topology = CpuTopology(tuple(range(16)), quota=6.0)
+        assert plan_threads(topology, budget=12).transcriber_threads == 6
+        assert plan_threads(topology, budget=4).transcriber_threads == 4
+
+    def test_explicit_stage_threads_win(self) -> None:
+        plan = plan_threads(
+            CpuTopology(tuple(range(8))), transcriber_threads=3, diarizer_threads=1,
+        )
+        assert (plan.transcriber_threads, plan.diarizer_threads) == (3, 1)
+
+    def test_never_below_one(self) -> None:
+        plan = plan_threads(CpuTopology((0,)), workers=4, worker_index=3)
+        assert plan.transcriber_threads == 1
+
+    def test_pin_slices_numa_node_first(self) -> None:
+        # Interleaved numbering: even CPUs on node 0, odd on node 1.
+        topology = CpuTopology(
+            tuple(range(8)), nodes={c: c % 2 for c in range(8)},
+        )
+        first = plan_threads(topology, workers=2, worker_index=0, pin=True)
+        second = plan_threads(topology, workers=2, worker_index=1, pin=True)
+        assert first.cpus == (0, 2, 4, 6)
+        assert second.cpus == (1, 3, 5, 7)
+
+    def test_pin_disjoint_under_quota(self) -> None:
+        topology = CpuTopology(tuple(range(16)), quota=4.0)
+        plans = [
+            plan_threads(topology, workers=2, worker_index=i, pin=True) for i in range(2)
+        ]
+        assert plans[0].cpus == (0, 1)
+        assert plans[1].cpus == (2, 3)
+
+    def test_pin_more_workers_than_cpus(self) -> None:
+        with pytest.raises(ValueError, match="cannot pin 8 workers to 4"):
+            plan_threads(CpuTopology((0, 1, 2, 3)), workers=8, worker_index=5, pin=True)
+        # Over a smaller budget every worker still gets its own CPU.
+        plans = [
+            plan_threads(CpuTopology((0, 1, 2, 3)), budget=2, workers=4, worker_index=i,
+                         pin=True)
+            for i in range(4)
+        ]
+        assert [p.cpus for p in plans] == [(0,), (1,), (2,), (3,)]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"workers": 0}, {"workers": 2, "worker_index": 2}, {"worker_index": -1},
+         {"budget": -1}],
+    )
+    def test_invalid(self, kwargs: dict[str, int]) -> None:
+        with pytest.raises(ValueError):
+            plan_threads(CpuTopology((0, 1)), **kwargs)
+
+
+class TestApplyThreadPlan:
+    def test_pins_and_sets_threads(self) -> None:
+        with (
+            patch("stt.core.threads.os.sched_setaffinity", create=True) as setaffinity,
+            patch("stt.core.threads.torch.set_num_threads") as set_threads,
+            patch.dict(os.environ, {}, clear=True),
+        ):
+            apply_thread_plan(ThreadPlan(4, 2, (2, 3)))
+            assert os.environ["OMP_NUM_THREADS"] == "2"
+        setaffinity.assert_called_once_with(0, (2, 3))
+        set_threads.assert_called_once_with(2)
+
+    def test_unpinned_keeps_affinity_and_env(self) -> None:
+        with (
+            patch("stt.core.threads.os.sched_setaffinity", create=True) as setaffinity,
+            patch("stt.core.threads.torch.set_num_threads"),
+            patch.dict(os.environ, {"OMP_NUM_THREADS": "7"}, clear=True),
+        ):
+            apply_thread_plan(ThreadPlan(4, 4))
+            assert os.environ["OMP_NUM_THREADS"] == "7"
+        setaffinity.assert_not_called()
@@ -0,0 +1,145 @@
+"""Tests for stt.core.tracing."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.core.pipeline import PipelineConfig, TranscriptionPipeline
+from stt.core.subprocess_runner import _transcribe_worker
+from stt.core.tracing import configure_tracing, span, trace_context
+from stt.data_models import Segment
+
+
+@pytest.fixture(autouse=True)
+def _tracing_off() -> Iterator[None]:
+    yield
+    configure_tracing(None)
+
+
+def _events(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text()
+    assert text.startswith("[\n")
+    # What trace viewers do with an unterminated array.
+    return json.loads(text.rstrip().rstrip(",") + "]")
+
+
+def _spans(path: Path) -> dict[str, dict[str, Any]]:
+    return {e["name"]: e for e in _events(path) if e["ph"] == "X"}
+
+
+_CHILD = """
+import json, sys
+from stt.core.tracing import resume_trace, span
+resume_trace(json.loads(sys.argv[1]), "child")
+with span("in_child"):
+    pass
+"""
+
+
+class TestSpans:
+    def test_disabled_writes_nothing(self, tmp_path: Path) -> None:
+        with span("anything", x=1):
+            pass
+        assert trace_context() is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_nested_spans(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        configure_tracing(path)
+        with span("outer", file="a.wav"):
+            with span("inner"):
+                pass
+
+        spans = _spans(path)
+        outer, inner = spans["outer"], spans["inner"]
+        assert outer["args"]["file"] == "a.wav"
+        assert inner["args"]["parent_id"] == outer["args"]["span_id"]
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+        assert any(e["ph"] == "M" for e in _events(path))
+
+    def test_error_recorded(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        configure_tracing(path)
+        with pytest.raises(KeyError), span("failing"):
+            raise KeyError("x")
+        assert _spans(path)["failing"]["args"]["error"] == "KeyError"
+
+    def test_runs_append_to_one_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        for name in ("first", "second"):
+            configure_tracing(path)
+            with span(name):
+                pass
+            configure_tracing(None)
+        spans = _spans(path)
+        assert spans["first"]["args"]["trace_id"] != spans["second"]["args"]["trace_id"]
+
+    def test_child_process_continues_trace(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        configure_tracing(path)
+        with span("parent"):
+            subprocess.run(
+                [sys.executable, "-c", _CHILD, json.dumps(trace_context())],
+                check=True, timeout=60,
+            )
+
+        spans = _spans(path)
+        parent, child = spans["parent"], spans["in_child"]
+        assert child["pid"] != parent["pid"] == os.getpid()
+        assert child["args"]["trace_id"] == parent["args"]["trace_id"]
+        assert child["args"]["parent_id"] == parent["args"]["span_id"]
+        assert parent["ts"] <= child["ts"] <= parent["ts"] + parent["dur"]
+
+
+class TestPipelineTracing:
+    @patch("stt.core.pipeline.export_transcript")
+    @patch("stt.core.pipeline.Transcriber")
+    @patch("stt.core.pipeline.preprocess_audio")
+    @patch("stt.core.pipeline.validate_audio_file")
+    def test_stage_spans(
+        self,
+        mock_validate: MagicMock,
+        mock_preprocess: MagicMock,
+        mock_transcriber_cls: MagicMock,
+        mock_export: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_preprocess.return_value = MagicMock(path="/fake/preprocessed.wav")
+        mock_transcriber_cls.return_value.transcribe.return_value = [
+            Segment(0.0, 1.0, "hi"),
+        ]
+        path = tmp_path / "trace.json"
+        configure_tracing(path)
+        TranscriptionPipeline(PipelineConfig(diarization_enabled=False)).run("/a.wav")
+
+        spans = _spans(path)
+        assert {
+            "file", "validate", "decode", "transcribe", "load", "inference", "unload", "export",
+        } <= set(spans)
+        file_id = spans["file"]["args"]["span_id"]
+        assert spans["export"]["args"]["parent_id"] == file_id
+        assert spans["load"]["args"]["parent_id"] == spans["transcribe"]["args"]["span_id"]
+
+    def test_subprocess_worker_resumes_context(self, tmp_path: Path) -> None:
+        path = tmp_path / "trace.json"
+        context = {"path": str(path), "trace_id": "t" * 32, "parent_id": "p" * 16}
+        queue = MagicMock()
+        with patch("stt.core.transcriber.Transcriber") as mock_transcriber_cls, \
+                patch("stt.core.subprocess_runner.publish_segments", return_value={}):
+            mock_transcriber_cls.return_value.transcribe.return_value = []
+            _transcribe_worker({}, "/a.wav", queue, context)
+
+        assert queue.put.call_args.args[0]["status"] == "ok"
+        spans = _spans(path)
+        assert spans["subprocess.transcription"]["args"]["parent_id"] == "p" * 16
+        assert spans["load"]["args"]["trace_id"] == "t" * 32
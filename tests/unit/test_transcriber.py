@@ -520,6 +520,34 @@ class TestTranscriberBatchedPipeline:
         call_kwargs = mock_batched.transcribe.call_args.kwargs
         assert call_kwargs["batch_size"] == 16
 
+    @patch("stt.core.transcriber.cleanup_gpu_memory")
+    @patch("stt.core.transcriber.BatchedInferencePipeline")
+    @patch("stt.core.transcriber.WhisperModel")
+    @patch("stt.core.transcriber.torch")
+    def test_batch_size_changed_without_reload(
+        self,
+        mock_torch: MagicMock,
+        mock_whisper_cls: MagicMock,
+        mock_batched_cls: MagicMock,
+        mock_cleanup: MagicMock,
+    ) -> None:
+        mock_torch.cuda.is_available.return_value = True
+        mock_batched = MagicMock()
+        mock_batched.transcribe.return_value = (iter([]), MagicMock())
+        mock_batched_cls.return_value = mock_batched
+        mock_whisper_cls.return_value = MagicMock()
+
+        config = TranscriberConfig(batch_size=16, use_batched=True)
+        t = Transcriber(config)
+        t.load_model()
+        t.batch_size = 4
+        t.transcribe("/fake.wav")
+        assert mock_batched.transcribe.call_args.kwargs["batch_size"] == 4
+        assert config.batch_size == 16
+        mock_whisper_cls.assert_called_once()
+        with pytest.raises(ValueError):
+            t.batch_size = 0
+
     @patch("stt.core.transcriber.cleanup_gpu_memory")
     @patch("stt.core.transcriber.BatchedInferencePipeline")
     @patch("stt.core.transcriber.WhisperModel")
@@ -652,6 +680,37 @@ class TestTranscriberRouting:
         mock_batched.transcribe.assert_called_once()
         mock_model.transcribe.assert_not_called()
 
+    @patch("stt.core.transcriber.cleanup_gpu_memory")
+    @patch("stt.core.transcriber.BatchedInferencePipeline")
+    @patch("stt.core.transcriber.WhisperModel")
+    @patch("stt.core.transcriber.torch")
+    def test_transcribe_words_returns_word_timings(
+        self,
+        mock_torch: MagicMock,
+        mock_whisper_cls: MagicMock,
+        mock_batched_cls: MagicMock,
+        mock_cleanup: MagicMock,
+    ) -> None:
+        mock_torch.cuda.is_available.return_value = True
+        mock_seg = MagicMock(
+            start=0.0, end=1.0, text=" Hi there", avg_logprob=-0.3,
+            words=[MagicMock(start=0.0, end=0.4, word=" Hi"),
+                   MagicMock(start=0.5, end=1.0, word=" there")],
+        )
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = (iter([mock_seg]), MagicMock())
+        mock_whisper_cls.return_value = mock_model
+
+        t = Transcriber(TranscriberConfig())
+        t.load_model()
+        segments, words = t.transcribe_words("/fake.wav")
+
+        assert mock_model.transcribe.call_args.kwargs["word_timestamps"] is True
+        assert [s.text for s in segments] == ["Hi there"]
+        assert [(w.start, w.end, w.text) for w in words[0]] == [
+            (0.0, 0.4, " Hi"), (0.5, 1.0, " there"),
+        ]
+
     @patch("stt.core.transcriber.cleanup_gpu_memory")
     @patch("stt.core.transcriber.BatchedInferencePipeline")
     @patch("stt.core.transcriber.WhisperModel")
@@ -752,3 +811,29 @@ class TestTranscriberRouting:
 
         call_kwargs = mock_model.transcribe.call_args.kwargs
         assert call_kwargs["condition_on_previous_text"] is True
+
+    @patch("stt.core.transcriber.cleanup_gpu_memory")
+    @patch("stt.core.transcriber.BatchedInferencePipeline")
+    @patch("stt.core.transcriber.WhisperModel")
+    @patch("stt.core.transcriber.torch")
+    def test_initial_prompt_passed_and_changeable(
+        self,
+        mock_torch: MagicMock,
+        mock_whisper_cls: MagicMock,
+        mock_batched_cls: MagicMock,
+        mock_cleanup: MagicMock,
+    ) -> None:
+        mock_torch.cuda.is_available.return_value = True
+        mock_model = MagicMock()
+        mock_model.transcribe.side_effect = lambda *a, **kw: (iter([]), MagicMock())
+        mock_whisper_cls.return_value = mock_model
+        mock_batched_cls.return_value = MagicMock()
+
+        t = Transcriber(TranscriberConfig(initial_prompt="earlier text"))
+        t.load_model()
+        t.transcribe("/fake.wav")
+        assert mock_model.transcribe.call_args.kwargs["initial_prompt"] == "earlier text"
+
+        t.initial_prompt = None
+        t.transcribe("/fake.wav")
+        assert mock_model.transcribe.call_args.kwargs["initial_prompt"] is None
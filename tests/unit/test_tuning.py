@@ -0,0 +1,181 @@
+"""Tests for stt.core.tuning and stt.core.memory."""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import pytest
+
+from stt.config import load_config, save_profile
+from stt.core.memory import PeakMemorySampler
+from stt.core.transcriber import TranscriberConfig
+from stt.core.tuning import (
+    TrialResult,
+    TrialSpec,
+    best_trial,
+    build_sweep,
+    profile_from_trial,
+    run_sweep,
+    trim_wav,
+    wav_seconds,
+    write_synthetic_speech,
+)
+from stt.data_models import Segment
+from stt.exceptions import CudaOomError, ModelError
+
+
+class StubTranscriber:
+    """Fake engine whose speed depends on its settings."""
+
+    loads: list[TranscriberConfig] = []
+    fail_load: set[str] = set()
+    oom_batch: int | None = None
+
+    def __init__(self, config: TranscriberConfig) -> None:
+        self.config = config
+        self.use_batched = config.use_batched
+        self.batch_size = config.batch_size
+        self.unloaded = False
+
+    def load_model(self) -> None:
+        if self.config.compute_type in StubTranscriber.fail_load:
+            raise ModelError("not downloaded")
+        StubTranscriber.loads.append(self.config)
+
+    def unload_model(self) -> None:
+        self.unloaded = True
+
+    def transcribe(self, audio_path: str) -> list[Segment]:
+        oom = StubTranscriber.oom_batch
+        if self.use_batched and oom is not None and self.batch_size >= oom:
+            raise CudaOomError("oom")
+        return []
+
+
+@pytest.fixture(autouse=True)
+def _reset_stub() -> None:
+    StubTranscriber.loads = []
+    StubTranscriber.fail_load = set()
+    StubTranscriber.oom_batch = None
+
+
+def _wav(tmp_path: Path, seconds: float = 1.0) -> Path:
+    path = tmp_path / "clip.wav"
+    write_synthetic_speech(path, seconds)
+    return path
+
+
+class TestBuildSweep:
+    def test_grouped_by_model_load(self) -> None:
+        specs = build_sweep(["int8", "float32"], [4, 2], [0])
+        assert specs == [
+            TrialSpec("int8", False, 1), TrialSpec("int8", True, 2),
+            TrialSpec("int8", True, 4),
+            TrialSpec("float32", False, 1), TrialSpec("float32", True, 2),
+            TrialSpec("float32", True, 4),
+        ]
+
+    def test_cap_covers_every_group_first(self) -> None:
+        specs = build_sweep(["int8", "float32"], [2, 4, 8], [4, 2], max_trials=5)
+        assert len(specs) == 5
+        assert {(s.compute_type, s.cpu_threads) for s in specs if not s.use_batched} == {
+            ("int8", 4), ("int8", 2), ("float32", 4), ("float32", 2),
+        }
+
+
+class TestRunSweep:
+    def test_one_load_per_group(self, tmp_path: Path) -> None:
+        specs = build_sweep(["int8", "float32"], [2], [3])
+        seen: list[TrialResult] = []
+        results = run_sweep(
+            TranscriberConfig(device="cpu"), _wav(tmp_path), specs,
+            transcriber_factory=StubTranscriber,  # type: ignore[arg-type]
+            on_trial=seen.append,
+        )
+        assert [c.compute_type for c in StubTranscriber.loads] == ["int8", "float32"]
+        assert all(c.cpu_threads == 3 for c in StubTranscriber.loads)
+        assert seen == results
+        assert all(r.ok and r.rtf is not None and r.rtf >= 0 for r in results)
+        assert all(r.peak_rss_bytes for r in results)
+
+    def test_load_failure_fails_group(self, tmp_path: Path) -> None:
+        StubTranscriber.fail_load = {"float32"}
+        specs = build_sweep(["int8", "float32"], [2], [0])
+        results = run_sweep(
+            TranscriberConfig(device="cpu"), _wav(tmp_path), specs,
+            transcriber_factory=StubTranscriber,  # type: ignore[arg-type]
+        )
+        assert [r.ok for r in results] == [True, True, False, False]
+        assert "not downloaded" in (results[-1].error or "")
+
+    def test_oom_skips_larger_batches(self, tmp_path: Path) -> None:
+        StubTranscriber.oom_batch = 4
+        specs = build_sweep(["float16"], [2, 4, 8], [0])
+        results = run_sweep(
+            TranscriberConfig(), _wav(tmp_path), specs,
+            transcriber_factory=StubTranscriber,  # type: ignore[arg-type]
+        )
+        assert [r.ok for r in results] == [True, True, False, False]
+        assert results[-1].error == "skipped: OOM at batch 4"
+
+
+class TestBestTrial:
+    def test_lowest_rtf_within_limits(self) -> None:
+        a = TrialResult(TrialSpec("int8", False, 1), rtf=0.5, peak_rss_bytes=100)
+        b = TrialResult(TrialSpec("int8", True, 4), rtf=0.2, peak_rss_bytes=900)
+        c = TrialResult(TrialSpec("int8", True, 8), error="oom")
+        assert best_trial([a, b, c]) is b
+        assert best_trial([a, b, c], max_rss_bytes=500) is a
+        assert best_trial([c]) is None
+
+    def test_tie_prefers_less_memory(self) -> None:
+        a = TrialResult(TrialSpec("int8", True, 4), rtf=0.2, peak_rss_bytes=900)
+        b = TrialResult(TrialSpec("int8", True, 2), rtf=0.2, peak_rss_bytes=500)
+        assert best_trial([a, b]) is b
+
+
+class TestProfile:
+    def test_profile_round_trips_through_load_config(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "model: small\nwhisper:\n  vad_filter: false\n  batch_size: 32\n"
+        )
+        trial = TrialResult(TrialSpec("int8", True, 4, cpu_threads=6), rtf=0.1)
+        save_profile(config_file, profile_from_trial(trial, "cpu"))
+
+        cfg = load_config(config_file)
+        assert cfg.model == "small"
+        assert cfg.vad_filter is False
+        assert (cfg.device, cfg.compute_type) == ("cpu", "int8")
+        assert (cfg.use_batched, cfg.batch_size, cfg.cpu_threads) == (True, 4, 6)
+
+    def test_sequential_profile_omits_batch_size(self) -> None:
+        trial = TrialResult(TrialSpec("float16", False, 1), rtf=0.1)
+        assert profile_from_trial(trial, "cuda") == {
+            "device": "cuda", "compute_type": "float16",
+            "whisper": {"use_batched": False},
+        }
+
+
+class TestAudio:
+    def test_synthetic_is_16k_mono_with_signal(self, tmp_path: Path) -> None:
+        path = _wav(tmp_path, 2.0)
+        with wave.open(str(path), "rb") as f:
+            assert (f.getnchannels(), f.getframerate(), f.getsampwidth()) == (1, 16000, 2)
+            assert f.getnframes() == 32000
+            assert any(f.readframes(32000))
+
+    def test_trim(self, tmp_path: Path) -> None:
+        src = _wav(tmp_path, 2.0)
+        assert trim_wav(src, tmp_path / "short.wav", 0.5) == 0.5
+        assert wav_seconds(tmp_path / "short.wav") == 0.5
+
+
+class TestPeakMemorySampler:
+    def test_tracks_rss_peak(self) -> None:
+        with PeakMemorySampler(interval=0.01) as sampler:
+            block = bytearray(64 * 1024 * 1024)
+            block[::4096] = b"\x01" * len(block[::4096])
+        assert sampler.peak_rss_bytes is not None
+        assert sampler.peak_rss_bytes >= 64 * 1024 * 1024
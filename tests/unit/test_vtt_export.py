@@ -0,0 +1,81 @@
+"""Tests for stt.exporters.vtt_export."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from io import StringIO
+
+from stt.data_models import Segment, TranscriptMetadata, TranscriptResult
+from stt.exporters.render import render
+from stt.exporters.srt_export import SrtSink
+from stt.exporters.vtt_export import VttSink, export_vtt
+
+
+def _make_result(segments: list[Segment]) -> TranscriptResult:
+    metadata = TranscriptMetadata(
+        source_file="test.mp3",
+        duration_seconds=60.0,
+        model="large-v3",
+        created_at=datetime(2026, 2, 9, 12, 0, 0),
+    )
+    return TranscriptResult(metadata=metadata, segments=segments)
+
+
+def _export(segments: list[Segment], **kwargs: bool) -> str:
+    output = StringIO()
+    export_vtt(_make_result(segments), output, **kwargs)
+    return output.getvalue()
+
+
+class TestVttFormat:
+    def test_header_and_cue(self) -> None:
+        content = _export([Segment(start=83.456, end=90.123, text="Test")])
+        assert content == "WEBVTT\n\n1\n00:01:23.456 --> 00:01:30.123\nTest\n"
+
+    def test_empty_result_is_valid(self) -> None:
+        assert _export([]) == "WEBVTT\n"
+
+    def test_cues_separated_by_blank_line(self) -> None:
+        content = _export([
+            Segment(start=0.0, end=1.0, text="One"),
+            Segment(start=1.0, end=2.0, text="Two"),
+        ])
+        assert "\nOne\n\n2\n" in content
+
+
+class TestVttSpeakers:
+    def test_voice_tag(self) -> None:
+        content = _export([Segment(start=0.0, end=1.0, text="Hi", speaker="SPEAKER_00")])
+        assert "<v SPEAKER_00>Hi\n" in content
+
+    def test_voice_tags_disabled(self) -> None:
+        content = _export(
+            [Segment(start=0.0, end=1.0, text="Hi", speaker="SPEAKER_00")],
+            voice_tags=False,
+        )
+        assert "[SPEAKER_00] Hi\n" in content
+
+    def test_no_speaker_plain_text(self) -> None:
+        content = _export([Segment(start=0.0, end=1.0, text="Hi")])
+        assert "<v" not in content
+
+
+class TestVttEscaping:
+    def test_markup_characters_escaped(self) -> None:
+        content = _export([Segment(start=0.0, end=1.0, text="a < b & c --> d")])
+        assert "a &lt; b &amp; c --&gt; d" in content
+
+    def test_blank_lines_collapsed(self) -> None:
+        content = _export([Segment(start=0.0, end=1.0, text="line1\n\n\nline2")])
+        assert "line1\nline2" in content
+
+
+class TestVttSinglePass:
+    def test_same_pass_as_srt(self) -> None:
+        result = _make_result([
+            Segment(start=0.5, end=1.5, text="One", speaker="SPEAKER_00"),
+        ])
+        vtt, srt = StringIO(), StringIO()
+        render(result, [VttSink(vtt), SrtSink(srt)])
+        assert "00:00:00.500 --> 00:00:01.500" in vtt.getvalue()
+        assert "00:00:00,500 --> 00:00:01,500" in srt.getvalue()
@@ -0,0 +1,222 @@
+"""Tests for stt.core.watcher — watch-folder ingestion."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stt.core.pipeline import PipelineConfig
+from stt.core.watcher import (
+    FolderWatcher,
+    InotifyWatcher,
+    PollingWatcher,
+    StabilityTracker,
+    WatchConfig,
+    create_watcher,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestStabilityTracker:
+    def test_file_released_after_stable_period(self, tmp_path: Path) -> None:
+        clock = _FakeClock()
+        tracker = StabilityTracker(stable_seconds=5.0, clock=clock)
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"\x00" * 10)
+
+        tracker.observe(audio)
+        clock.now = 4.0
+        assert tracker.pop_stable() == []
+        clock.now = 5.0
+        assert tracker.pop_stable() == [audio]
+        assert len(tracker) == 0
+
+    def test_growing_file_resets_timer(self, tmp_path: Path) -> None:
+        clock = _FakeClock()
+        tracker = StabilityTracker(stable_seconds=5.0, clock=clock)
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"\x00" * 10)
+
+        tracker.observe(audio)
+        clock.now = 4.0
+        audio.write_bytes(b"\x00" * 20)
+        assert tracker.pop_stable() == []
+        clock.now = 8.0
+        assert tracker.pop_stable() == []
+        clock.now = 9.0
+        assert tracker.pop_stable() == [audio]
+
+    def test_empty_file_not_released(self, tmp_path: Path) -> None:
+        clock = _FakeClock()
+        tracker = StabilityTracker(stable_seconds=0.0, clock=clock)
+        audio = tmp_path / "a.wav"
+        audio.touch()
+        tracker.observe(audio)
+        clock.now = 100.0
+        assert tracker.pop_stable() == []
+
+    def test_deleted_file_dropped(self, tmp_path: Path) -> None:
+        tracker = StabilityTracker(stable_seconds=0.0)
+        audio = tmp_path / "a.wav"
+        audio.write_bytes(b"\x00")
+        tracker.observe(audio)
+        audio.unlink()
+        assert tracker.pop_stable() == []
+        assert len(tracker) == 0
+
+
+class TestPollingWatcher:
+    def test_reports_new_audio_files_only(self, tmp_path: Path) -> None:
+        (tmp_path / "old.wav").write_bytes(b"\x00")
+        watcher = PollingWatcher(tmp_path, WatchConfig())
+
+        (tmp_path / "new.mp3").write_bytes(b"\x00")
+        (tmp_path / "notes.txt").write_text("x")
+        (tmp_path / ".stt_tmp.wav").write_bytes(b"\x00")
+        assert watcher.poll(0) == {tmp_path / "new.mp3"}
+        assert watcher.poll(0) == set()
+
+    def test_recursive(self, tmp_path: Path) -> None:
+        watcher = PollingWatcher(tmp_path, WatchConfig(recursive=True))
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        (sub / "a.wav").write_bytes(b"\x00")
+        assert watcher.poll(0) == {sub / "a.wav"}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestInotifyWatcher:
+    def test_reports_written_file(self, tmp_path: Path) -> None:
+        watcher = InotifyWatcher(tmp_path, WatchConfig())
+        try:
+            (tmp_path / "a.wav").write_bytes(b"\x00" * 10)
+            (tmp_path / "b.txt").write_text("x")
+            assert watcher.poll(1.0) == {tmp_path / "a.wav"}
+        finally:
+            watcher.close()
+
+    def test_new_subdirectory_watched_when_recursive(self, tmp_path: Path) -> None:
+        watcher = InotifyWatcher(tmp_path, WatchConfig(recursive=True))
+        try:
+            sub = tmp_path / "sub"
+            sub.mkdir()
+            watcher.poll(1.0)
+            (sub / "a.wav").write_bytes(b"\x00")
+            assert watcher.poll(1.0) == {sub / "a.wav"}
+        finally:
+            watcher.close()
+
+
+class TestCreateWatcher:
+    def test_force_polling(self, tmp_path: Path) -> None:
+        watcher = create_watcher(tmp_path, WatchConfig(force_polling=True))
+        assert isinstance(watcher, PollingWatcher)
+
+    @patch("stt.core.watcher.InotifyWatcher", side_effect=OSError("no inotify"))
+    def test_falls_back_to_polling(self, _mock: MagicMock, tmp_path: Path) -> None:
+        watcher = create_watcher(tmp_path, WatchConfig())
+        assert isinstance(watcher, PollingWatcher)
+
+
+class _ScriptedWatcher:
+    """Yield scripted poll results, then set the stop event."""
+
+    def __init__(self, batches: list[set[Path]], stop: threading.Event) -> None:
+        self._batches = batches
+        self._stop = stop
+        self.closed = False
+
+    def poll(self, timeout: float) -> set[Path]:
+        if not self._batches:
+            self._stop.set()
+            return set()
+        return self._batches.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestFolderWatcher:
+    @patch("stt.core.watcher.TranscriptionPipeline")
+    def test_processes_stable_files_with_mirrored_output(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        input_dir = tmp_path / "in"
+        sub = input_dir / "sub"
+        sub.mkdir(parents=True)
+        audio = sub / "a.wav"
+        audio.write_bytes(b"\x00" * 10)
+        mock_pipeline = mock_pipeline_cls.return_value
+
+        stop = threading.Event()
+        watcher = FolderWatcher(
+            PipelineConfig(),
+            input_dir,
+            tmp_path / "out",
+            WatchConfig(recursive=True, stable_seconds=0.0, process_existing=False),
+        )
+        scripted = _ScriptedWatcher([{audio}, {audio}], stop)
+        stats = watcher.run(stop=stop, watcher=scripted)
+
+        mock_pipeline.run.assert_called_once_with(
+            str(audio), output_dir=str(tmp_path / "out" / "sub"),
+        )
+        assert stats.succeeded == 1
+        assert scripted.closed
+        mock_pipeline.close.assert_called_once()
+
+    @patch("stt.core.watcher.TranscriptionPipeline")
+    def test_existing_files_with_outputs_skipped(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        done = input_dir / "done.wav"
+        done.write_bytes(b"\x00")
+        todo = input_dir / "todo.wav"
+        todo.write_bytes(b"\x00")
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "done.json").write_text("{}")
+
+        stop = threading.Event()
+        watcher = FolderWatcher(
+            PipelineConfig(formats="json"), input_dir, out,
+            WatchConfig(stable_seconds=0.0),
+        )
+        watcher.run(stop=stop, watcher=_ScriptedWatcher([set()], stop))
+
+        calls = [c[0][0] for c in mock_pipeline_cls.return_value.run.call_args_list]
+        assert calls == [str(todo)]
+
+    @patch("stt.core.watcher.TranscriptionPipeline")
+    def test_failure_recorded_and_loop_continues(
+        self, mock_pipeline_cls: MagicMock, tmp_path: Path,
+    ) -> None:
+        a = tmp_path / "a.wav"
+        b = tmp_path / "b.wav"
+        for f in (a, b):
+            f.write_bytes(b"\x00")
+        mock_pipeline_cls.return_value.run.side_effect = [RuntimeError("boom"), None]
+
+        stop = threading.Event()
+        watcher = FolderWatcher(
+            PipelineConfig(), tmp_path, tmp_path / "out",
+            WatchConfig(stable_seconds=0.0, process_existing=False),
+        )
+        stats = watcher.run(stop=stop, watcher=_ScriptedWatcher([{a, b}], stop))
+
+        assert stats.failed == 1
+        assert stats.succeeded == 1
+        assert stats.errors[0][0] == a